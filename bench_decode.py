@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+MAVLink çözme yollarının karşılaştırması: kayıtlı bayt akışları kurulu çözücülerden geçirilir.
+
+Örnekler:
+  python bench_decode.py                          # Dahili örnek telemetri akışı
+  python bench_decode.py flight_log_*.tlog --chunk 256
+  python bench_decode.py capture.raw --decoder framed --decoder pymavlink
+
+.tlog dosyalarında zaman damgaları ayıklanıp paketler ardışık bayt akışına çevrilir;
+diğer dosyalar ham seri/UDP dökümü olarak okunur.
+"""
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from core.mavlink_decode import (DECODERS, available_decoders, benchmark, crc_backend,
+                                 native_available, sample_stream, select_decoder)
+
+
+def load_stream(path: str) -> bytes:
+    """Dosyadan bayt akışı; .tlog ise zaman damgaları atılır"""
+    if not path.lower().endswith('.tlog'):
+        with open(path, 'rb') as f:
+            return f.read()
+    conn = mavutil.mavlink_connection(path)
+    out = bytearray()
+    try:
+        while True:
+            msg = conn.recv_msg()
+            if msg is None:
+                break
+            if msg.get_type() != 'BAD_DATA':
+                out += msg.get_msgbuf()
+    finally:
+        conn.close()
+    return bytes(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='MAVLink çözücü karşılaştırması (msg/s)')
+    parser.add_argument('files', nargs='*', help='.tlog ya da ham bayt dökümü; verilmezse örnek akış')
+    parser.add_argument('--count', type=int, default=20000, help='Örnek akıştaki paket sayısı')
+    parser.add_argument('--chunk', type=int, default=4096, help='Tek okumada çözücüye verilen bayt')
+    parser.add_argument('--repeat', type=int, default=5, help='Tekrar sayısı (en iyi süre alınır)')
+    parser.add_argument('--decoder', action='append', choices=DECODERS, help='Yalnızca bu çözücü(ler)')
+    args = parser.parse_args(argv)
+
+    print(f"[DECODE] CRC: {crc_backend()}, C ayrıştırıcı (mavnative): "
+          f"{'var' if native_available() else 'yok'}, mevcut: {', '.join(available_decoders())}")
+    streams = [(path, load_stream(path)) for path in args.files] or [('örnek', sample_stream(args.count))]
+    for name, data in streams:
+        results = benchmark(data, args.decoder, chunk=args.chunk, repeat=args.repeat)
+        baseline = results.get('pymavlink', {}).get('msgs_per_s') or 0.0
+        print(f"\n{name}: {len(data)} bayt")
+        print(f"{'çözücü':<10} {'mesaj':>8} {'bozuk':>6} {'msg/s':>10} {'MB/s':>7} {'kat':>6}  doğru")
+        for decoder, r in sorted(results.items(), key=lambda item: -item[1]['msgs_per_s']):
+            ratio = r['msgs_per_s'] / baseline if baseline else 0.0
+            print(f"{decoder:<10} {r['messages']:>8} {r['bad_data']:>6} {r['msgs_per_s']:>10.0f} "
+                  f"{r['mb_per_s']:>7.2f} {ratio:>5.2f}x  {'evet' if r['matches_reference'] else 'HAYIR'}")
+    select_decoder()  # Alım yolunun başlangıçta seçeceği çözücü
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
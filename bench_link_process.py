@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Bağlantı G/Ç'si thread'de mi ayrı süreçte mi: arayüz takılması (jank) ve kayıp paket karşılaştırması.
+
+Sentetik araç ayrı bir süreçte yüksek hızda UDP yayını yapar; ana thread 60 Hz arayüz
+döngüsünü taklit eder (her karede --load-ms kadar GIL tutan iş). İki modda kare aralığı
+dağılımı, takılan kare sayısı, alınan paket, sequence boşluğu kaybı ve halka taşması raporlanır.
+
+Örnekler:
+  python bench_link_process.py --duration 10 --load-ms 8
+  python bench_link_process.py --stream ATTITUDE=500 --stream RAW_IMU=500 --process-rate 50
+"""
+import argparse
+import multiprocessing
+import socket
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+FRAME_HZ = 60.0
+
+
+def run_vehicle(port, streams, duration):
+    """Ayrı süreç: GCS hız isteklerini yok sayan sentetik araç"""
+    from core.synthetic_vehicle import SyntheticVehicle, open_transport, run
+    transport = open_transport(f'udpout:127.0.0.1:{port}')
+    vehicle = SyntheticVehicle(transport.write, streams=streams, honor_rate_requests=False)
+    try:
+        run(vehicle, transport, duration=duration, report_interval=0)
+    finally:
+        transport.close()
+
+
+def free_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+def measure(mode, args, streams):
+    from core.mavlink_thread import MAVLinkThread
+
+    port = free_port()
+    ctx = multiprocessing.get_context('spawn')
+    vehicle = ctx.Process(target=run_vehicle, args=(port, streams, args.duration + 8.0), daemon=True)
+    vehicle.start()
+
+    thread = MAVLinkThread()
+    thread.tlog_enabled = not args.no_tlog
+    thread.tlog_directory = args.tlog_dir
+    thread.auto_reconnect = False
+    thread.link_process = mode == 'process'
+    thread.link_process_rate = args.process_rate
+    frames = []
+    thread.telemetry_frame.connect(lambda frame: frames.append(frame.get('seq', 0)), mode='sync')
+    try:
+        if not thread.connect(f'udpin:127.0.0.1:{port}', 57600):
+            print(f"[BENCH] {mode}: bağlantı kurulamadı")
+            return None
+        thread.start()
+        time.sleep(1.0)  # Parametre indirme ve ilk yayınlar otursun
+        base = thread.get_link_stats()
+
+        period = 1.0 / FRAME_HZ
+        intervals = []
+        last = time.perf_counter()
+        next_frame = last + period
+        end = last + args.duration
+        while last < end:
+            # Arayüz karesi: GIL'i tutan hesap (çizim/harita güncellemesi yerine)
+            busy_until = time.perf_counter() + args.load_ms / 1000.0
+            while time.perf_counter() < busy_until:
+                pass
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            now = time.perf_counter()
+            intervals.append(now - last)
+            last = now
+            next_frame = max(next_frame + period, now)
+
+        link = thread.get_link_stats()
+        process = link.get('process', {})
+        received = link['received'] - base['received']
+        return {
+            'mode': mode,
+            'p50_ms': percentile(intervals, 50) * 1000.0,
+            'p99_ms': percentile(intervals, 99) * 1000.0,
+            'max_ms': max(intervals) * 1000.0,
+            'jank': sum(1 for i in intervals if i > 2 * period),
+            'frames': len(intervals),
+            'received': received,
+            'rate': received / args.duration,
+            'dropped': link['dropped'] - base['dropped'],
+            'overruns': process.get('ring_overruns', 0),
+            'telemetry_frames': len(frames),
+        }
+    finally:
+        thread.stop()
+        thread.wait(2000)
+        thread.bus.close()
+        vehicle.terminate()
+        vehicle.join(2.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Thread ve süreç bağlantı modlarının karşılaştırması')
+    parser.add_argument('--duration', type=float, default=10.0, help='Mod başına ölçüm süresi (s)')
+    parser.add_argument('--load-ms', type=float, default=8.0, help='Arayüz karesi başına GIL tutan iş (ms)')
+    parser.add_argument('--stream', action='append', metavar='MESAJ=HZ', help='Araç yayın hızı, tekrarlanabilir')
+    parser.add_argument('--process-rate', type=float, default=0.0,
+                        help='Süreç modunda yüksek hızlı telemetriyi ana sürece bu hızda ilet (Hz)')
+    parser.add_argument('--mode', choices=['thread', 'process', 'both'], default='both')
+    parser.add_argument('--no-tlog', action='store_true', help='Ham .tlog kaydını kapat')
+    parser.add_argument('--tlog-dir', default='', help='.tlog dizini')
+    args = parser.parse_args(argv)
+
+    streams = {'HEARTBEAT': 1.0, 'ATTITUDE': 200.0, 'GLOBAL_POSITION_INT': 50.0, 'VFR_HUD': 50.0,
+               'SYS_STATUS': 5.0, 'GPS_RAW_INT': 10.0, 'RAW_IMU': 200.0}
+    for value in args.stream or []:
+        name, _, rate = value.partition('=')
+        streams[name.strip().upper()] = float(rate)
+
+    modes = ['thread', 'process'] if args.mode == 'both' else [args.mode]
+    results = [r for r in (measure(mode, args, streams) for mode in modes) if r]
+    print(f"\n{'mod':<8} {'p50':>7} {'p99':>7} {'max':>7} {'jank':>6} {'paket/s':>9} {'kayıp':>7} {'taşma':>7}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['p50_ms']:>6.1f}ms {r['p99_ms']:>5.1f}ms {r['max_ms']:>5.1f}ms "
+              f"{r['jank']:>4}/{r['frames']:<4} {r['rate']:>8.0f} {r['dropped']:>7} {r['overruns']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
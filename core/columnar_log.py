@@ -0,0 +1,452 @@
+import array
+import bisect
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from datetime import datetime
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.log_files import is_compressed, open_log, read_log_bytes, strip_compression
+
+try:
+    import numpy as np
+except ImportError:  # Okuma/yazma numpy'sız çalışır; read() zaman dilimleme için gerekir
+    np = None
+
+# Dosya düzeni (tüm sayılar little-endian, bloklar 8 bayta hizalı):
+#   başlık:  MAGIC, u32 json uzunluğu, şema JSON'u
+#   blok:    BLOCK başlığı (satır, enum ek uzunluğu, blok uzunluğu, t_min, t_max),
+#            yeni enum değerleri (JSON), sütun dizileri (sütun başına satır sayısı kadar değer)
+#   dizin:   INDEX, u32 blok sayısı, blok başına (ofset, satır, t_min, t_max)
+#   son:     u64 dizin ofseti, END
+# Dizin kapanışta yazılır; yoksa (çökme) bloklar baştan taranarak dizin yeniden kurulur.
+MAGIC = b'GCSLOG1\n'
+END = b'GCSLEND\n'
+_BLOCK = struct.Struct('<4sIIIdd')
+_BLOCK_MAGIC = b'BLK1'
+_INDEX = struct.Struct('<4sI')
+_INDEX_MAGIC = b'IDX1'
+_INDEX_ENTRY = struct.Struct('<QIIdd')
+_TRAILER = struct.Struct('<Q8s')
+
+# Sütun tipi -> (array kodu, bayt); 'enum' değerleri u16 koddur (0 = boş)
+_TYPES = {'f8': ('d', 8), 'f4': ('f', 4), 'enum': ('H', 2)}
+_SWAP = sys.byteorder != 'little'
+
+# (sütun, tip, CSV başlığı): DataLogger CSV sütunlarıyla birebir aynı sıra
+DEFAULT_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ('time', 'f8', 'Timestamp'),
+    ('lat', 'f8', 'Latitude'),
+    ('lon', 'f8', 'Longitude'),
+    ('alt', 'f4', 'Altitude'),
+    ('groundspeed', 'f4', 'Ground Speed'),
+    ('verticalspeed', 'f4', 'Vertical Speed'),
+    ('heading', 'f4', 'Heading'),
+    ('roll', 'f4', 'Roll'),
+    ('pitch', 'f4', 'Pitch'),
+    ('yaw', 'f4', 'Yaw'),
+    ('voltage', 'f4', 'Battery Voltage'),
+    ('current', 'f4', 'Battery Current'),
+    ('battery', 'f4', 'Battery Remaining'),
+    ('rssi', 'f4', 'RSSI'),
+    ('ping', 'f4', 'Ping'),
+    ('data_loss', 'f4', 'Data Loss'),
+    ('gps_fix', 'f4', 'GPS Fix Type'),
+    ('satellites', 'f4', 'GPS Satellites'),
+    ('system_status', 'enum', 'System Status'),
+    ('flight_mode', 'enum', 'Flight Mode'),
+    ('time_boot_ms', 'f8', 'Vehicle Time (ms)'),
+    ('rx_time', 'f8', 'Receive Time'),
+    ('source', 'enum', 'Source'),
+)
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def _to_float(value) -> float:
+    if value is None or value == '':
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class ColumnarLogWriter:
+    """Sabit şemalı, tipli kayıtları sütun blokları halinde yazan uçuş kaydı.
+
+    Satırlar sütun listelerinde biriktirilir; block_rows satıra ulaşınca ya da en
+    eski satır block_interval saniyeyi geçince tek write() ile blok olarak yazılır.
+    '.gz' yolu (ya da compress='gzip') dosyayı akış halinde sıkıştırır.
+    """
+
+    BLOCK_ROWS = 1024
+    BLOCK_INTERVAL = 5.0
+
+    def __init__(self, path: str, columns: Sequence[Tuple[str, str, str]] = DEFAULT_COLUMNS,
+                 block_rows: int = BLOCK_ROWS, block_interval: float = BLOCK_INTERVAL,
+                 start_time: Optional[datetime] = None, compress: Optional[str] = None):
+        if columns[0][1] != 'f8':
+            raise ValueError("İlk sütun f8 zaman sütunu olmalı")
+        self.path = path
+        self.columns = [tuple(c) for c in columns]
+        self.block_rows = block_rows
+        self.block_interval = block_interval
+        self._enum_codes: Dict[int, Dict[str, int]] = {i: {'': 0} for i, c in enumerate(self.columns)
+                                                      if c[1] == 'enum'}
+        self._new_enums: Dict[str, List[str]] = {}
+        self._pending: List[list] = [[] for _ in self.columns]
+        self._pending_since = 0.0
+        self._index: List[Tuple[int, int, float, float]] = []
+        self.rows = 0
+        self.coerced = 0  # Sayıya çevrilemeyip NaN yazılan hücreler
+        self._file = open_log(path, 'wb', compress=compress)
+        header = json.dumps({
+            'version': 1,
+            'columns': [{'name': n, 'type': t, 'csv': h} for n, t, h in self.columns],
+            'start_time': (start_time or datetime.now()).isoformat(),
+        }).encode('utf-8')
+        data = MAGIC + struct.pack('<I', len(header)) + header
+        self._file.write(data + b'\0' * _pad(len(data)))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending[0])
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Şema sırasında bir satır (sayılar float/int/str, enum sütunları str); eksik sütunlar boş"""
+        if not self._pending[0]:
+            self._pending_since = time.monotonic()
+        if len(row) < len(self.columns):
+            row = list(row) + [''] * (len(self.columns) - len(row))
+        for i, value in enumerate(row):
+            codes = self._enum_codes.get(i)
+            if codes is None:
+                number = _to_float(value)
+                if number != number and value not in (None, ''):
+                    self.coerced += 1
+                self._pending[i].append(number)
+                continue
+            text = '' if value is None else str(value)
+            code = codes.get(text)
+            if code is None:
+                code = codes[text] = len(codes)
+                self._new_enums.setdefault(self.columns[i][0], []).append(text)
+            self._pending[i].append(code)
+        if self.pending >= self.block_rows:
+            self.write_block()
+
+    def append_many(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def write_block(self) -> None:
+        """Bekleyen satırları tek blok olarak dosyaya yaz"""
+        n = self.pending
+        if not n:
+            return
+        times = self._pending[0]
+        enums = json.dumps(self._new_enums).encode('utf-8') if self._new_enums else b''
+        parts = [b'', enums, b'\0' * _pad(len(enums))]
+        for (name, kind, _), values in zip(self.columns, self._pending):
+            data = array.array(_TYPES[kind][0], values)
+            if _SWAP:
+                data.byteswap()
+            raw = data.tobytes()
+            parts.append(raw)
+            parts.append(b'\0' * _pad(len(raw)))
+        valid = [t for t in times if t == t]
+        t_min, t_max = (min(valid), max(valid)) if valid else (math.nan, math.nan)
+        length = _BLOCK.size + sum(len(p) for p in parts)
+        parts[0] = _BLOCK.pack(_BLOCK_MAGIC, n, len(enums), length, t_min, t_max)
+        offset = self._file.tell()
+        self._file.write(b''.join(parts))
+        self._index.append((offset, n, t_min, t_max))
+        self.rows += n
+        self._new_enums = {}
+        self._pending = [[] for _ in self.columns]
+
+    def flush(self, force: bool = False) -> None:
+        """Blok dolduysa, bekleme süresi aştıysa ya da force ise yaz; işletim sistemine aktar"""
+        if self.pending and (force or time.monotonic() - self._pending_since >= self.block_interval):
+            self.write_block()
+        self._file.flush()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        """Kalan satırları yaz, dizini ve son işaretini ekle"""
+        if self._file.closed:
+            return
+        self.write_block()
+        offset = self._file.tell()
+        parts = [_INDEX.pack(_INDEX_MAGIC, len(self._index))]
+        parts.extend(_INDEX_ENTRY.pack(o, n, 0, t0, t1) for o, n, t0, t1 in self._index)
+        parts.append(_TRAILER.pack(offset, END))
+        self._file.write(b''.join(parts))
+        self._file.close()
+
+
+class ColumnarLogReader:
+    """Sütunlu uçuş kaydını bellek eşlemeli okur; blok dizini ile zamana göre dilimler.
+
+    Sıkıştırılmış kayıt (.flog.gz) diske açılmadan bellekte açılarak okunur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        if is_compressed(path):
+            self._mm = read_log_bytes(path)
+        else:
+            self._file = open(path, 'rb')
+            size = os.fstat(self._file.fileno()).st_size
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        mm = self._mm
+        if mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Sütunlu kayıt değil: {path}")
+        (header_len,) = struct.unpack_from('<I', mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(bytes(mm[start:start + header_len]).decode('utf-8'))
+        self.columns = [(c['name'], c['type'], c['csv']) for c in self.header['columns']]
+        self._column_index = {c[0]: i for i, c in enumerate(self.columns)}
+        self._data_start = start + header_len + _pad(start + header_len)
+        self.enums: Dict[str, List[str]] = {n: [''] for n, t, _ in self.columns if t == 'enum'}
+        self.recovered = False  # Dizin yoktu, bloklar taranarak bulundu
+        self.blocks: List[Tuple[int, int, float, float]] = self._read_index()
+        self.total_rows = sum(b[1] for b in self.blocks)
+
+    def _read_index(self) -> List[Tuple[int, int, float, float]]:
+        mm = self._mm
+        size = len(mm)
+        blocks = []
+        if size >= self._data_start + _TRAILER.size:
+            offset, end = _TRAILER.unpack_from(mm, size - _TRAILER.size)
+            if end == END and self._data_start <= offset < size:
+                magic, count = _INDEX.unpack_from(mm, offset)
+                if magic == _INDEX_MAGIC:
+                    pos = offset + _INDEX.size
+                    for _ in range(count):
+                        o, n, _, t0, t1 = _INDEX_ENTRY.unpack_from(mm, pos)
+                        blocks.append((o, n, t0, t1))
+                        pos += _INDEX_ENTRY.size
+                    for o, *_ in blocks:
+                        self._load_enums(o)
+                    return blocks
+        # Dizin yok: tamamı yazılmış blokları sırayla tara (yarım kalan son blok atlanır)
+        self.recovered = True
+        pos = self._data_start
+        while pos + _BLOCK.size <= size:
+            magic, n, _, length, t0, t1 = _BLOCK.unpack_from(mm, pos)
+            if magic != _BLOCK_MAGIC or pos + length > size or length < self._block_size(n):
+                break
+            self._load_enums(pos)
+            blocks.append((pos, n, t0, t1))
+            pos += length
+        return blocks
+
+    def _block_size(self, rows: int) -> int:
+        return _BLOCK.size + sum(rows * _TYPES[t][1] + _pad(rows * _TYPES[t][1]) for _, t, _ in self.columns)
+
+    def _load_enums(self, offset: int) -> None:
+        _, _, enum_len, _, _, _ = _BLOCK.unpack_from(self._mm, offset)
+        if enum_len:
+            start = offset + _BLOCK.size
+            for name, values in json.loads(bytes(self._mm[start:start + enum_len]).decode('utf-8')).items():
+                self.enums[name].extend(values)
+
+    def _column_offset(self, block_offset: int, column: int) -> Tuple[int, int]:
+        """Blok içinde sütun dizisinin başlangıcı ve satır sayısı"""
+        _, n, enum_len, _, _, _ = _BLOCK.unpack_from(self._mm, block_offset)
+        pos = block_offset + _BLOCK.size + enum_len + _pad(enum_len)
+        for _, kind, _ in self.columns[:column]:
+            size = n * _TYPES[kind][1]
+            pos += size + _pad(size)
+        return pos, n
+
+    def __len__(self) -> int:
+        return self.total_rows
+
+    def time_range(self) -> Tuple[float, float]:
+        valid = [b for b in self.blocks if b[2] == b[2]]
+        if not valid:
+            return math.nan, math.nan
+        return min(b[2] for b in valid), max(b[3] for b in valid)
+
+    def blocks_between(self, t0: Optional[float] = None, t1: Optional[float] = None) -> List[int]:
+        """[t0, t1] aralığıyla kesişen blokların sırası (dizinden, veri okunmadan)"""
+        return [i for i, (_, _, lo, hi) in enumerate(self.blocks)
+                if lo != lo or ((t0 is None or hi >= t0) and (t1 is None or lo <= t1))]
+
+    def column(self, name: str, block: Optional[int] = None) -> array.array:
+        """Sütunun tüm değerleri (ya da tek bloğu) numpy'sız, array.array olarak"""
+        column = self._column_index[name]
+        kind = self.columns[column][1]
+        out = array.array(_TYPES[kind][0])
+        for i in (range(len(self.blocks)) if block is None else (block,)):
+            pos, n = self._column_offset(self.blocks[i][0], column)
+            out.frombytes(self._mm[pos:pos + n * _TYPES[kind][1]])
+        if _SWAP:
+            out.byteswap()
+        return out
+
+    def read(self, columns: Optional[Sequence[str]] = None, t0: Optional[float] = None,
+             t1: Optional[float] = None) -> Dict[str, Any]:
+        """Zaman aralığındaki satırlar: sütun adı -> numpy dizisi.
+
+        Bloklar eşlenmiş dosyadan doğrudan okunur, sonuç ise kopyadır: okuyucu
+        kapatıldıktan sonra da geçerlidir ve close() eşlemeyi bırakabilir.
+        """
+        if np is None:
+            raise ImportError("Zaman dilimleme için numpy gerekli")
+        names = list(columns or [c[0] for c in self.columns])
+        if 'time' not in names:
+            names.insert(0, 'time')
+        parts: Dict[str, List[Any]] = {name: [] for name in names}
+        for i in self.blocks_between(t0, t1):
+            for name in names:
+                column = self._column_index[name]
+                kind = self.columns[column][1]
+                pos, n = self._column_offset(self.blocks[i][0], column)
+                parts[name].append(np.frombuffer(self._mm, dtype='<' + _TYPES[kind][0], count=n, offset=pos))
+        # concatenate zaten kopyalar; tek blokta görünüm mmap'e bağlı kalmasın diye kopyalanır
+        result = {name: (np.concatenate(chunks) if len(chunks) != 1 else chunks[0].copy()) if chunks
+                  else np.empty(0, dtype='<' + _TYPES[self.columns[self._column_index[name]][1]][0])
+                  for name, chunks in parts.items()}
+        times = result['time']
+        mask = np.ones(len(times), dtype=bool)
+        if t0 is not None:
+            mask &= times >= t0
+        if t1 is not None:
+            mask &= times <= t1
+        if not mask.all():
+            result = {name: values[mask] for name, values in result.items()}
+        return result
+
+    def decode_enum(self, name: str, codes: Iterable[int]) -> List[str]:
+        table = self.enums[name]
+        return [table[c] for c in codes]
+
+    def rows(self, t0: Optional[float] = None, t1: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Zaman aralığındaki satırlar sütun adı -> değer sözlüğü olarak (enum'lar metin)"""
+        names = [c[0] for c in self.columns]
+        for i in self.blocks_between(t0, t1):
+            values = [self.column(name, i) for name in names]
+            tables = [self.enums.get(name) for name in names]
+            times = values[0]
+            start, stop = 0, len(times)
+            if (t0 is not None or t1 is not None) and all(a <= b for a, b in zip(times, times[1:])):
+                start = bisect.bisect_left(times, t0) if t0 is not None else 0
+                stop = bisect.bisect_right(times, t1) if t1 is not None else stop
+            for r in range(start, stop):
+                t = times[r]
+                if (t0 is not None and t < t0) or (t1 is not None and t > t1):
+                    continue
+                yield {name: (table[col[r]] if table is not None else col[r])
+                       for name, col, table in zip(names, values, tables)}
+
+    def csv_rows(self) -> 'CsvRowView':
+        """LogReplayThread için CSV başlıklı, tembel satır görünümü"""
+        return CsvRowView(self)
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class CsvRowView(SequenceABC):
+    """Sütunlar bir kez yüklenir, satır sözlüğü erişildiğinde kurulur (NaN -> '')"""
+
+    def __init__(self, reader: ColumnarLogReader):
+        self._headers = [c[2] for c in reader.columns]
+        self._values = [reader.column(c[0]) for c in reader.columns]
+        self._tables = [reader.enums.get(c[0]) for c in reader.columns]
+
+    def __len__(self) -> int:
+        return len(self._values[0]) if self._values else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = {}
+        for header, values, table in zip(self._headers, self._values, self._tables):
+            value = values[index]
+            row[header] = table[value] if table is not None else ('' if value != value else value)
+        return row
+
+
+def _exact_float32(value: float) -> bool:
+    return value != value or struct.unpack('<f', struct.pack('<f', value))[0] == value
+
+
+def convert_csv(csv_path: str, out_path: Optional[str] = None, block_rows: int = 4096) -> Dict[str, Any]:
+    """DataLogger CSV'sini sütunlu kayda kayıpsız çevir ve geri okuyarak doğrula.
+
+    Her hücre değer olarak korunur: float32'ye sığmayan sütunlar float64'e,
+    sayı olmayan metin içeren sütunlar enum'a yükseltilir; boş hücre NaN olur.
+    """
+    out_path = out_path or os.path.splitext(strip_compression(csv_path))[0] + '.flog'
+    with open_log(csv_path, 'rt', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader)
+        rows = [row + [''] * (len(headers) - len(row)) for row in reader if row]
+    defaults = {h: (n, t) for n, t, h in DEFAULT_COLUMNS}
+    columns = []
+    for i, header in enumerate(headers):
+        name, kind = defaults.get(header, (header.strip().lower().replace(' ', '_'), 'f4'))
+        cells = [row[i] for row in rows]
+        if kind != 'enum':
+            numbers = [_to_float(c) for c in cells]
+            if any(n != n and c.strip() not in ('', 'nan') for n, c in zip(numbers, cells)):
+                kind = 'enum'
+            elif kind == 'f4' and not all(_exact_float32(n) for n in numbers):
+                kind = 'f8'
+        columns.append((name, kind, header))
+    if columns[0][1] != 'f8':
+        raise ValueError(f"İlk sütun sayısal zaman olmalı: {headers[0]}")
+    writer = ColumnarLogWriter(out_path, columns, block_rows=block_rows)
+    writer.append_many(rows)
+    writer.close()
+
+    # Doğrulama: her hücre aynı değere dönmeli
+    check = ColumnarLogReader(out_path)
+    try:
+        view = check.csv_rows()
+        if len(view) != len(rows):
+            raise ValueError(f"Satır sayısı uyuşmuyor: {len(view)} != {len(rows)}")
+        for r, row in enumerate(rows):
+            decoded = view[r]
+            for (name, kind, header), cell in zip(columns, row):
+                value = decoded[header]
+                if kind == 'enum':
+                    ok = value == cell
+                elif cell.strip() in ('', 'nan'):
+                    ok = value == ''
+                else:
+                    ok = value == float(cell)
+                if not ok:
+                    raise ValueError(f"Satır {r + 1}, {header}: {cell!r} -> {value!r}")
+    finally:
+        check.close()
+    return {'path': out_path, 'rows': len(rows), 'columns': {n: t for n, t, _ in columns},
+            'csv_bytes': os.path.getsize(csv_path), 'bytes': os.path.getsize(out_path)}
+
+
+def is_columnar_log(path: str) -> bool:
+    try:
+        with open_log(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except (OSError, EOFError):
+        return False
@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from pymavlink import mavutil
+
+from core.link_stats import LatencyHistogram
+
+RESULT_TIMEOUT = -1    # Tüm denemelerde ACK gelmedi
+RESULT_CANCELLED = -2  # Bağlantı kapandı / kuyruk temizlendi
+
+RESULT_NAMES = {
+    mavutil.mavlink.MAV_RESULT_ACCEPTED: 'KABUL',
+    mavutil.mavlink.MAV_RESULT_TEMPORARILY_REJECTED: 'GEÇİCİ RED',
+    mavutil.mavlink.MAV_RESULT_DENIED: 'RED',
+    mavutil.mavlink.MAV_RESULT_UNSUPPORTED: 'DESTEKLENMİYOR',
+    mavutil.mavlink.MAV_RESULT_FAILED: 'BAŞARISIZ',
+    mavutil.mavlink.MAV_RESULT_IN_PROGRESS: 'SÜRÜYOR',
+    RESULT_TIMEOUT: 'ZAMAN AŞIMI',
+    RESULT_CANCELLED: 'İPTAL',
+}
+
+
+class CommandFuture:
+    """Kuyruğa alınmış COMMAND_LONG'un sonucu.
+
+    Sonuç MAVLink thread'inde yazılır; done() / wait() her thread'den güvenle
+    çağrılabilir. Geri çağrılar MAVLink thread'inde çalışır; sonuçtan sonra
+    eklenen geri çağrı ekleyen thread'de hemen çağrılır.
+    """
+
+    def __init__(self, command: int, params: List[float], name: str, timeout: float, retries: int):
+        self.command = command
+        self.params = params
+        self.name = name or str(command)
+        self.timeout = timeout
+        self.retries = retries
+        self.result: Optional[int] = None
+        self.latency: Optional[float] = None  # Son gönderim -> ACK (s)
+        self.attempts = 0
+        self.submitted = time.monotonic()
+        self._last_sent = 0.0
+        self._deadline = 0.0
+        self._event = threading.Event()
+        self._lock = threading.Lock()  # Sonuç yazımı ile geri çağrı eklemeyi sıralar
+        self._callbacks: List[Callable[['CommandFuture'], None]] = []
+
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sonuç gelene kadar bekle (arayüz thread'inden çağırmayın)"""
+        return self._event.wait(timeout)
+
+    @property
+    def accepted(self) -> bool:
+        return self.result == mavutil.mavlink.MAV_RESULT_ACCEPTED
+
+    @property
+    def result_name(self) -> str:
+        return RESULT_NAMES.get(self.result, str(self.result))
+
+    def add_done_callback(self, callback: Callable[['CommandFuture'], None]) -> None:
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _set_result(self, result: int, latency: Optional[float]) -> None:
+        with self._lock:
+            self.result = result
+            self.latency = latency
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"[COMMAND] Geri çağrı hatası ({self.name}): {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'command': self.command,
+            'result': self.result,
+            'result_name': self.result_name,
+            'accepted': self.accepted,
+            'attempts': self.attempts,
+            'latency_ms': self.latency * 1000.0 if self.latency is not None else None,
+        }
+
+
+class CommandQueue:
+    """COMMAND_LONG gönderim kuyruğu.
+
+    submit() herhangi bir thread'den çağrılır ve hemen döner; gönderim, yeniden
+    deneme (confirmation alanı artırılarak) ve COMMAND_ACK eşleştirmesi MAVLink
+    thread'inde service() / handle_ack() ile yapılır. ACK'ler komut kimliğiyle
+    eşleştiği için aynı komut kimliğinden aynı anda yalnızca biri uçuştadır.
+    """
+
+    DEFAULT_TIMEOUT = 1.0   # Deneme başına ACK bekleme süresi (s)
+    DEFAULT_RETRIES = 3     # İlk gönderimden sonra en fazla yeniden deneme
+
+    def __init__(self, on_result: Optional[Callable[[CommandFuture], None]] = None):
+        self._lock = threading.Lock()
+        self._queued: Deque[CommandFuture] = deque()
+        self._in_flight: Dict[int, CommandFuture] = {}
+        self.on_result = on_result
+        self.latency = LatencyHistogram()
+        self.stats = {'submitted': 0, 'sent': 0, 'retries': 0, 'accepted': 0,
+                      'rejected': 0, 'timeouts': 0, 'cancelled': 0}
+
+    def submit(self, command: int, *params: float, name: str = '',
+               timeout: Optional[float] = None, retries: Optional[int] = None) -> CommandFuture:
+        """Komutu kuyruğa al (7 parametreye sıfırla tamamlanır)"""
+        padded = [float(p) for p in params[:7]] + [0.0] * (7 - min(len(params), 7))
+        future = CommandFuture(command, padded, name,
+                               self.DEFAULT_TIMEOUT if timeout is None else timeout,
+                               self.DEFAULT_RETRIES if retries is None else retries)
+        with self._lock:
+            self._queued.append(future)
+            self.stats['submitted'] += 1
+        return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queued) + len(self._in_flight)
+
+    def time_until_next(self, now: float) -> float:
+        """Bir sonraki gönderim/zaman aşımı kontrolüne kalan süre"""
+        with self._lock:
+            if self._queued:
+                return 0.0
+            if not self._in_flight:
+                return float('inf')
+            return max(0.0, min(f._deadline for f in self._in_flight.values()) - now)
+
+    def service(self, mav, target_system: int, target_component: int, now: Optional[float] = None) -> int:
+        """Zaman aşımına uğrayanları yeniden gönder, sıradakileri başlat"""
+        now = time.monotonic() if now is None else now
+        finished: List[CommandFuture] = []
+        to_send: List[CommandFuture] = []
+        with self._lock:
+            for command, future in list(self._in_flight.items()):
+                if now < future._deadline:
+                    continue
+                if future.attempts > future.retries:
+                    del self._in_flight[command]
+                    self.stats['timeouts'] += 1
+                    finished.append(future)
+                else:
+                    self.stats['retries'] += 1
+                    to_send.append(future)
+            # FIFO; aynı komut kimliği uçuştaysa sırada bekler
+            waiting: Deque[CommandFuture] = deque()
+            while self._queued:
+                future = self._queued.popleft()
+                if future.command in self._in_flight:
+                    waiting.append(future)
+                    continue
+                self._in_flight[future.command] = future
+                to_send.append(future)
+            self._queued = waiting
+
+        for future in to_send:
+            confirmation = min(future.attempts, 255)
+            mav.command_long_send(target_system, target_component, future.command,
+                                  confirmation, *future.params)
+            future.attempts += 1
+            future._last_sent = now
+            future._deadline = now + future.timeout
+            self.stats['sent'] += 1
+        for future in finished:
+            self._finish(future, RESULT_TIMEOUT, None)
+        return len(to_send)
+
+    def handle_ack(self, msg, now: Optional[float] = None) -> bool:
+        """COMMAND_ACK'i uçuştaki komutla eşleştir; eşleşirse True döner"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            future = self._in_flight.get(msg.command)
+            if future is None:
+                return False
+            if msg.result == mavutil.mavlink.MAV_RESULT_IN_PROGRESS:
+                # Uzun süren komut: yeniden göndermeden beklemeye devam et
+                future._deadline = now + future.timeout
+                return True
+            del self._in_flight[msg.command]
+        latency = now - future._last_sent
+        self.latency.add(latency)
+        self.stats['accepted' if msg.result == mavutil.mavlink.MAV_RESULT_ACCEPTED else 'rejected'] += 1
+        self._finish(future, msg.result, latency)
+        return True
+
+    def cancel_all(self) -> None:
+        """Bağlantı kapanınca bekleyen tüm komutları iptal et"""
+        with self._lock:
+            futures = list(self._queued) + list(self._in_flight.values())
+            self._queued.clear()
+            self._in_flight.clear()
+            self.stats['cancelled'] += len(futures)
+        for future in futures:
+            self._finish(future, RESULT_CANCELLED, None)
+
+    def _finish(self, future: CommandFuture, result: int, latency: Optional[float]) -> None:
+        future._set_result(result, latency)
+        if self.on_result:
+            try:
+                self.on_result(future)
+            except Exception as e:
+                print(f"[COMMAND] Sonuç bildirimi hatası: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['pending'] = self.pending()
+        stats['latency'] = self.latency.summary()
+        return stats
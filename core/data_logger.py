@@ -1,87 +1,446 @@
 from datetime import datetime
+import atexit
 import csv
+import io
 import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from core.columnar_log import ColumnarLogWriter
+from core.log_files import COMPRESSORS, disk_size, open_log
+from core.log_journal import LogJournal
+
+CSV_HEADERS = [
+    "Timestamp", "Latitude", "Longitude", "Altitude", "Ground Speed",
+    "Vertical Speed", "Heading", "Roll", "Pitch", "Yaw",
+    "Battery Voltage", "Battery Current", "Battery Remaining", "RSSI",
+    "Ping", "Data Loss", "GPS Fix Type", "GPS Satellites",
+    "System Status", "Flight Mode",
+    "Vehicle Time (ms)", "Receive Time", "Source"
+]
+# CSV sütunlarına karşılık gelen telemetri anahtarları (Timestamp hariç)
+CSV_FIELDS = (
+    "lat", "lon", "alt", "groundspeed", "verticalspeed", "heading", "roll", "pitch", "yaw",
+    "voltage", "current", "battery", "rssi", "ping", "data_loss", "gps_fix", "satellites",
+    "system_status", "flight_mode",
+    "time_boot_ms", "rx_time", "source",  # Araç zamanı, GCS monotonik alım zamanı, satırı üreten mesaj
+)
+
+# Kuyruk kaydı: (tür, eklenme zamanı perf_counter, içerik); tür 'row' ya da 'line'
+_Record = Tuple[str, float, Any]
+
 
 class DataLogger:
-    def __init__(self):
+    """CSV telemetri ve sistem günlüğü kaydı.
+
+    log_data / log_* çağrıları yalnızca satırı sınırlı kuyruğa ekler; biçimlendirme,
+    yazma, flush ve fsync arka plandaki yazıcı thread'inde toplu yapılır (yavaş SD
+    kart/USB diskte arayüz ve MAVLink thread'i beklemez). Kuyruk dolarsa telemetri
+    satırları düşürülür ve sayılır, sistem günlüğü satırları her zaman kabul edilir.
+    Hata kayıtları yazıcıyı hemen uyandırır ve fsync yaptırır. stop_logging() ve
+    normal çıkış (atexit) kuyruktaki her şeyi yazıp diske zorlar.
+
+    log_format='columnar' telemetriyi CSV yerine tipli sütun bloklarına (.flog,
+    bkz. core.columnar_log) yazar; sistem günlüğü her iki durumda da metindir.
+
+    compress='gzip' iki dosyayı da yazarken akış halinde sıkıştırır (.gz); her
+    flush senkron sıkıştırma noktasıdır, yarım kalan dosya o noktaya kadar okunur.
+    rotate_bytes (diskteki boyut) ya da rotate_interval (s) aşılınca yazıcı thread'i
+    dosyaları kapatıp sıradaki parçayı (flight_log_<zaman>_002.csv ...) açar.
+
+    journal=True (yalnızca CSV) her yazma turunu CRC'li, commit işaretli segmentlere
+    ekler (bkz. core.log_journal). Oturum sürerken CSV/.log dosyaları yoktur; parça
+    kapanınca (durdurma/döndürme) journal mühürlenir ve dosyalar arka plan
+    thread'inde oluşturulur (wait_finished() bekler). Çökmeden sonra
+    log_journal.recover_journals() son segmenti onarıp oturumu kurtarır.
+    """
+
+    FLUSH_INTERVAL = 0.25       # Toplu yazma + flush aralığı (s)
+    FSYNC_INTERVAL = 2.0        # Diske zorla yazma aralığı (s); None kapatır
+    MAX_PENDING = 20000         # Bekleyen kayıt sınırı (aşınca telemetri satırları düşürülür)
+
+    def __init__(self, flush_interval: Optional[float] = None, fsync_interval: Optional[float] = FSYNC_INTERVAL,
+                 fsync_on_error: bool = True, directory: str = '', log_format: str = 'csv',
+                 compress: Optional[str] = None, rotate_bytes: Optional[int] = None,
+                 rotate_interval: Optional[float] = None, journal: bool = False):
+        if compress is not None and compress not in COMPRESSORS:
+            raise ValueError(f"Desteklenmeyen sıkıştırma: {compress}")
+        if journal and log_format == 'columnar':
+            raise ValueError("Sütunlu kayıt kendi blok taramasıyla kurtarılır; journal yalnızca CSV içindir")
         self.log_file = None
         self.start_time = None
+        self._start_monotonic = 0.0
         self.system_log_file = None
         self.system_log_filename = None
-        
+        self.filename = None
+        self.directory = directory
+        self.log_format = log_format
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.fsync_interval = fsync_interval
+        self.fsync_on_error = fsync_on_error
+        self.compress = compress
+        self.rotate_bytes = rotate_bytes
+        self.rotate_interval = rotate_interval
+        self.journal = journal
+        self._journal_buffer: Optional[io.StringIO] = None  # Journal modunda CSV satırlarının biçimlendiği tampon
+        self.files: List[str] = []  # Bu oturumda açılan telemetri/günlük dosyaları
+        self._base = None
+        self._part = 0
+        self._part_started = 0.0
+        # log_data MAVLink thread'inden, start/stop arayüzden çağrılır
+        self._lock = threading.Lock()
+        self._queue: Deque[_Record] = deque()
+        self._wake = threading.Event()
+        self._urgent = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._csv = None
+        self._last_fsync = 0.0
+        self._drained = threading.Condition()
+        self._finishing: List[threading.Thread] = []  # CSV/.log aktarımı süren journal'lar
+        self._finishing_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.stats: Dict[str, Any] = {
+            'rows': 0, 'lines': 0, 'batches': 0, 'dropped': 0, 'dropped_lines': 0, 'max_pending': 0,
+            'flushes': 0, 'fsyncs': 0, 'errors': 0, 'write_time': 0.0,
+            'latency_sum': 0.0, 'latency_max': 0.0,  # Kuyruğa ekleme -> dosyaya yazma (s)
+            'rotations': 0,
+        }
+
     def start_logging(self):
+        with self._lock:
+            return self._start_logging()
+
+    def _start_logging(self):
         if not self.log_file:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"flight_log_{timestamp}.csv"
-            self.log_file = open(filename, "w", newline='')
             self.start_time = datetime.now()
-            # System log file
-            self.system_log_filename = f"flight_log_{timestamp}.log"
-            self.system_log_file = open(self.system_log_filename, "a", encoding="utf-8")
+            self._start_monotonic = time.monotonic()
+            self._base = os.path.join(self.directory, f"flight_log_{timestamp}")
+            self._part = 1
+            self.files = []
+            self._open_files()
+            self.reset_stats()
+            self._queue.clear()
+            self._running = True
+            self._last_fsync = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name='DataLogger', daemon=True)
+            self._thread.start()
+            atexit.register(self._stop_at_exit)
+            return True
+        return False
+
+    def _open_files(self) -> None:
+        """Sıradaki parçanın telemetri ve sistem günlüğü dosyalarını aç"""
+        suffix = f"_{self._part:03d}" if self._part > 1 else ""
+        ext = COMPRESSORS.get(self.compress, '')
+        # System log file
+        self.system_log_filename = f"{self._base}{suffix}.log{ext}"
+        if self.journal:
+            self.filename = f"{self._base}{suffix}.csv{ext}"
+            self._journal_buffer = io.StringIO()
+            self._csv = csv.writer(self._journal_buffer)
+            self._csv.writerow(CSV_HEADERS)
+            # Telemetri ve sistem günlüğü aynı segmentlere yazılır
+            self.log_file = self.system_log_file = LogJournal(
+                self.filename, self.system_log_filename, self._journal_buffer.getvalue(), compress=self.compress)
+        elif self.log_format == 'columnar':
+            self.filename = f"{self._base}{suffix}.flog{ext}"
+            self.log_file = ColumnarLogWriter(self.filename, start_time=self.start_time, compress=self.compress)
+            self.system_log_file = open_log(self.system_log_filename, "at", compress=self.compress)
+        else:
+            self.filename = f"{self._base}{suffix}.csv{ext}"
+            self.log_file = open_log(self.filename, "wt", compress=self.compress, encoding=None, newline='')
+            self.system_log_file = open_log(self.system_log_filename, "at", compress=self.compress)
             # Write CSV header
-            headers = [
-                "Timestamp", "Latitude", "Longitude", "Altitude", "Ground Speed",
-                "Vertical Speed", "Heading", "Roll", "Pitch", "Yaw",
-                "Battery Voltage", "Battery Current", "Battery Remaining", "RSSI",
-                "Ping", "Data Loss", "GPS Fix Type", "GPS Satellites",
-                "System Status", "Flight Mode"
-            ]
-            writer = csv.writer(self.log_file)
-            writer.writerow(headers)
+            self._csv = csv.writer(self.log_file)
+            self._csv.writerow(CSV_HEADERS)
+        self.files.extend((self.filename, self.system_log_filename))
+        self._part_started = time.monotonic()
+
+    def _rotate_due(self, now: float) -> bool:
+        if self.rotate_interval is not None and now - self._part_started >= self.rotate_interval:
             return True
+        if self.rotate_bytes is not None:
+            if self._journal_buffer is not None:
+                return self.log_file.bytes >= self.rotate_bytes
+            try:
+                return disk_size(self.log_file) + disk_size(self.system_log_file) >= self.rotate_bytes
+            except (OSError, ValueError):
+                return False
         return False
-        
+
+    def _rotate(self) -> None:
+        """Yazıcı thread'inde: sıradaki parçayı aç, mevcut parçayı kapatıp diske zorla"""
+        old = ((self.log_file, self.filename), (self.system_log_file, self.system_log_filename))
+        try:
+            self._part += 1
+            self._open_files()
+        except OSError as e:
+            self._part -= 1
+            self.stats['errors'] += 1
+            print(f"[LOG] Yeni parça açılamadı, mevcut dosyaya devam: {e}")
+            return
+        self._close_files(old)
+        self.stats['rotations'] += 1
+        print(f"[LOG] Yeni parça: {self.filename}")
+
+    def _close_files(self, files, background: bool = True) -> None:
+        """(dosya, yol) çiftlerini kapatıp diske zorla.
+
+        Kapanışta yazılan son baytlar (sütunlu kaydın son bloğu ve dizini, gzip
+        sonu) ancak close() ile oluşur; bu yüzden fsync kapatmadan sonra yola
+        yapılır. Journal close() içinde mühürlenip zorlanır, CSV/.log aktarımı arka
+        planda yapılır.
+        """
+        closed = set()
+        for f, path in files:
+            if f is None or id(f) in closed:  # Journal modunda iki dosya aynı nesne
+                continue
+            closed.add(id(f))
+            try:
+                f.close()
+                if isinstance(f, LogJournal):
+                    self._finish_journal(f, background)
+                else:
+                    self._fsync_path(path)
+            except (OSError, ValueError) as e:
+                self.stats['errors'] += 1
+                print(f"[LOG] Parça kapatma hatası: {e}")
+
+    def _fsync_path(self, path: str) -> None:
+        fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            os.fsync(fd)
+            self.stats['fsyncs'] += 1
+        finally:
+            os.close(fd)
+
+    def _finish_journal(self, journal: LogJournal, background: bool) -> None:
+        if background:
+            thread = threading.Thread(target=self._run_finish, args=(journal,), name='LogJournal')
+            try:
+                thread.start()
+            except RuntimeError:  # Yorumlayıcı kapanıyor: aynı thread'de aktar
+                pass
+            else:
+                with self._finishing_lock:
+                    self._finishing.append(thread)
+                return
+        self._run_finish(journal)
+
+    @staticmethod
+    def _run_finish(journal: LogJournal) -> None:
+        try:
+            info = journal.finish()
+            print(f"[LOG] Journal aktarıldı: {info['csv']} ({info['rows']} satır)")
+        except (OSError, ValueError) as e:
+            # Journal diskte kalır, sonraki açılışta recover_journals() aktarır
+            print(f"[LOG] Journal aktarılamadı ({journal.directory}): {e}")
+
+    def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """Arka planda CSV/.log aktarımı süren journal'lar bitene kadar bekle"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._finishing_lock:
+            threads = list(self._finishing)
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        with self._finishing_lock:
+            self._finishing = [t for t in self._finishing if t.is_alive()]
+            return not self._finishing
+
     def log_data(self, telemetry_data):
+        with self._lock:
+            self._log_data(telemetry_data)
+
+    def _log_data(self, telemetry_data):
         if self.log_file and self.start_time is not None:
-            timestamp = (datetime.now() - self.start_time).total_seconds()
-            
-            # Prepare data row
-            data = [
-                f"{timestamp:.3f}",
-                telemetry_data.get("lat", ""),
-                telemetry_data.get("lon", ""),
-                telemetry_data.get("alt", ""),
-                telemetry_data.get("groundspeed", ""),
-                telemetry_data.get("verticalspeed", ""),
-                telemetry_data.get("heading", ""),
-                telemetry_data.get("roll", ""),
-                telemetry_data.get("pitch", ""),
-                telemetry_data.get("yaw", ""),
-                telemetry_data.get("voltage", ""),
-                telemetry_data.get("current", ""),
-                telemetry_data.get("battery", ""),
-                telemetry_data.get("rssi", ""),
-                telemetry_data.get("ping", ""),
-                telemetry_data.get("data_loss", ""),
-                telemetry_data.get("gps_fix", ""),
-                telemetry_data.get("satellites", ""),
-                telemetry_data.get("system_status", ""),
-                telemetry_data.get("flight_mode", "")
-            ]
-            
-            writer = csv.writer(self.log_file)
-            writer.writerow(data)
-            
+            if len(self._queue) >= self.MAX_PENDING:
+                self.stats['dropped'] += 1
+                return
+            # Timestamp: kayıt başından beri monotonik süre (örnekte alım zamanı varsa o an)
+            get = telemetry_data.get
+            received = get("rx_time")
+            timestamp = (received if isinstance(received, float) else time.monotonic()) - self._start_monotonic
+            # Satır değerleri burada alınır (sözlük sonradan değişebilir), biçimlendirme yazıcıda
+            row: List[Any] = [timestamp]
+            row.extend(get(field, "") for field in CSV_FIELDS)
+            self._queue.append(('row', time.perf_counter(), row))
+
     def log_system(self, message):
         self._write_system_log("SYSTEM", message)
     def log_error(self, message):
-        self._write_system_log("ERROR", message)
+        self._write_system_log("ERROR", message, urgent=self.fsync_on_error)
     def log_action(self, message):
         self._write_system_log("ACTION", message)
-    def _write_system_log(self, level, message):
+    def _write_system_log(self, level, message, urgent=False):
+        with self._lock:
+            self._queue_system_log(level, message, urgent)
+
+    def _queue_system_log(self, level, message, urgent):
         if self.system_log_file:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.system_log_file.write(f"[{timestamp}] [{level}] {message}\n")
-            self.system_log_file.flush()
-    
+            self._queue.append(('line', time.perf_counter(), f"[{timestamp}] [{level}] {message}\n"))
+            if urgent:
+                # Kritik olay: beklemeden yaz ve diske zorla
+                self._urgent = True
+                self._wake.set()
+
+    def _run(self) -> None:
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        try:
+            self._write_pending()
+        finally:
+            # Yazma hatasında da flush() bekleyenleri uyandır
+            with self._drained:
+                self._drained.notify_all()
+
+    def _write_pending(self) -> None:
+        pending = len(self._queue)
+        if pending > self.stats['max_pending']:
+            self.stats['max_pending'] = pending
+        urgent, self._urgent = self._urgent, False
+        if pending:
+            t0 = time.perf_counter()
+            rows: List[List[Any]] = []
+            lines: List[str] = []
+            queued_sum = 0.0
+            oldest = None
+            for _ in range(pending):
+                kind, queued_at, item = self._queue.popleft()
+                if oldest is None:
+                    oldest = queued_at
+                queued_sum += queued_at
+                if kind == 'row':
+                    rows.append(item)
+                else:
+                    lines.append(item)
+            try:
+                if self._journal_buffer is not None:
+                    # Tek commit: yarım kalan tur kurtarmada bütünüyle atılır
+                    buffer = self._journal_buffer
+                    buffer.seek(0)
+                    buffer.truncate()
+                    for row in rows:
+                        row[0] = f"{row[0]:.3f}"
+                    self._csv.writerows(rows)
+                    self.log_file.append(buffer.getvalue(), len(rows), ''.join(lines), len(lines))
+                elif rows and self._csv is None:
+                    self.log_file.append_many(rows)
+                elif rows:
+                    for row in rows:
+                        row[0] = f"{row[0]:.3f}"
+                    self._csv.writerows(rows)
+                    self.log_file.flush()
+                if lines and self._journal_buffer is None:
+                    self.system_log_file.write(''.join(lines))
+                    self.system_log_file.flush()
+            except (OSError, ValueError) as e:
+                # Tur kısmen yazılmış olabilir; yeniden denemek satırları çoğaltır, kayıp sayılır
+                self.stats['errors'] += 1
+                self.stats['dropped'] += len(rows)
+                self.stats['dropped_lines'] += len(lines)
+                print(f"[LOG] Yazma hatası, {len(rows)} satır ve {len(lines)} günlük satırı kaybedildi: {e}")
+            else:
+                done = time.perf_counter()
+                self.stats['rows'] += len(rows)
+                self.stats['lines'] += len(lines)
+                self.stats['batches'] += 1
+                self.stats['flushes'] += 1
+                self.stats['write_time'] += done - t0
+                # Her kaydın kuyrukta bekleme + yazma süresi
+                self.stats['latency_sum'] += done * pending - queued_sum
+                self.stats['latency_max'] = max(self.stats['latency_max'], done - oldest)
+        if self._csv is None and self.log_file is not None:
+            try:
+                # Sütunlu kayıt: blok dolunca/bekleme süresi aşınca, kritik olayda hemen yazılır
+                self.log_file.flush(force=urgent)
+            except (OSError, ValueError) as e:
+                self.stats['errors'] += 1
+                print(f"[LOG] Yazma hatası: {e}")
+        now = time.monotonic()
+        if self._rotate_due(now):
+            self._rotate()  # Kapatılan parça diske zorlanır
+            self._last_fsync = now
+        due = self.fsync_interval is not None and now - self._last_fsync >= self.fsync_interval
+        if urgent or due:
+            self._fsync()
+            self._last_fsync = now
+
+    def _fsync(self) -> None:
+        files = (self.log_file,) if self.system_log_file is self.log_file else (self.log_file, self.system_log_file)
+        for f in files:
+            try:
+                os.fsync(f.fileno())
+                self.stats['fsyncs'] += 1
+            except (OSError, ValueError, AttributeError):
+                self.stats['errors'] += 1
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Kuyruktakiler yazılıp diske zorlanana kadar bekle (kritik olaylardan sonra)"""
+        if not self._running:
+            return not self._queue
+        with self._drained:
+            self._urgent = True
+            self._wake.set()
+            return self._drained.wait_for(lambda: not self._queue and not self._urgent, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Kuyruk derinliği, yazılan/düşen satırlar ve kuyruğa ekleme -> yazma gecikmesi"""
+        stats = dict(self.stats)
+        written = stats['rows'] + stats['lines']
+        stats['pending'] = len(self._queue)
+        stats['latency_mean_ms'] = stats.pop('latency_sum') / written * 1000.0 if written else 0.0
+        stats['latency_max_ms'] = stats.pop('latency_max') * 1000.0
+        stats['path'] = self.filename
+        stats['files'] = list(self.files)
+        return stats
+
     def stop_logging(self):
+        with self._lock:
+            return self._stop_logging()
+
+    def _stop_at_exit(self) -> None:
+        # Çıkışta aktarım beklenir (yorumlayıcı arka plan thread'ini yarıda kesebilir)
+        with self._lock:
+            self._stop_logging(background=False)
+        self.wait_finished()
+
+    def _stop_logging(self, background: bool = True):
         if self.log_file:
-            self.log_file.close()
+            atexit.unregister(self._stop_at_exit)
+            # Kapatmada veri kaybı yok: yazıcı kuyruğu boşaltır, sonra diske zorlanır
+            self._running = False
+            self._wake.set()
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                thread.join(timeout=10.0)
+                if thread.is_alive():
+                    print(f"[LOG] Yazıcı zamanında bitmedi, {len(self._queue)} kayıt bekliyor")
+            stats = self.get_stats()
+            print(f"[LOG] Kapatıldı: {stats['rows']} satır, {stats['lines']} günlük satırı, "
+                  f"{stats['dropped']} düşen, en fazla {stats['max_pending']} bekleyen, "
+                  f"gecikme ort. {stats['latency_mean_ms']:.1f} ms")
+            self._close_files(((self.log_file, self.filename),
+                               (self.system_log_file, self.system_log_filename)), background)
             self.log_file = None
+            self.system_log_file = None
+            self.system_log_filename = None
+            self._csv = None
+            self._journal_buffer = None
         if self.system_log_file:
-            self.system_log_file.close()
+            self._close_files(((self.system_log_file, self.system_log_filename),))
             self.system_log_file = None
             self.system_log_filename = None
         self.start_time = None
         return True
-        return False 
\ No newline at end of file
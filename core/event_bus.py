@@ -0,0 +1,240 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Süreç genelinde ana thread (arayüz olay döngüsü) yürütücüsü: fn(callback, args).
+# Qt arayüzü ui/qt_bridge.install_qt_executor() ile kurar; headless modda yoktur.
+_main_executor: Optional[Callable[[Callable, Tuple], None]] = None
+
+
+def set_main_executor(executor: Optional[Callable[[Callable, Tuple], None]]) -> None:
+    global _main_executor
+    _main_executor = executor
+
+
+def main_executor() -> Optional[Callable[[Callable, Tuple], None]]:
+    return _main_executor
+
+
+class Subscription:
+    """Tek abone: 'sync' yayınlayan thread'de, 'async' kendi thread'inde,
+    'main' ana thread yürütücüsünde (yoksa sync) çağrılır."""
+
+    def __init__(self, topic: str, callback: Callable, mode: str, queue_size: int):
+        self.topic = topic
+        self.callback = callback
+        self.mode = mode
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: deque = deque()
+        self._queue_size = queue_size
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if mode == 'async':
+            self._thread = threading.Thread(target=self._run, name=f'Bus-{topic}', daemon=True)
+            self._thread.start()
+
+    def matches(self, topic: str) -> bool:
+        if self.topic == '*':
+            return True
+        if self.topic.endswith('.*'):
+            return topic.startswith(self.topic[:-1])
+        return self.topic == topic
+
+    def deliver(self, topic: str, args: Tuple) -> None:
+        if self.mode == 'async':
+            with self._cond:
+                if len(self._queue) >= self._queue_size:
+                    self._queue.popleft()  # Yavaş abone yayıncıyı bekletmez: en eski olay düşer
+                    self.dropped += 1
+                self._queue.append((topic, args))
+                self._cond.notify()
+            return
+        executor = _main_executor if self.mode == 'main' else None
+        if executor is not None:
+            executor(self._call, (topic, args))
+        else:
+            self._call(topic, args)
+
+    def _call(self, topic: str, args: Tuple) -> None:
+        if self._closed:
+            return
+        try:
+            if self.topic == topic:
+                self.callback(*args)
+            else:
+                self.callback(topic, *args)  # Joker abonelik konu adını da alır
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"[BUS] Abone hatası ({topic}): {e}")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                topic, args = self._queue.popleft()
+            self._call(topic, args)
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+
+
+class EventBus:
+    """Qt'siz konu tabanlı olay yolu.
+
+    publish() eşleşen abonelere anında dağıtır; abonelik listesi yazarken
+    kopyalanır (copy-on-write), yayın yolunda kilit tutulmaz. Joker
+    abonelikler ('*', 'mavlink.*') konu adını ilk argüman olarak alır.
+    """
+
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        # (aboneler, konu -> eşleşen aboneler önbelleği); tek atamayla birlikte değişir
+        self._state: Tuple[Tuple[Subscription, ...], Dict[str, Tuple[Subscription, ...]]] = ((), {})
+        self._lock = threading.Lock()
+        self.stats = {'published': 0, 'unrouted': 0}
+
+    def subscribe(self, topic: str, callback: Callable, mode: str = 'sync') -> Subscription:
+        if mode not in ('sync', 'async', 'main'):
+            raise ValueError(f"Geçersiz abonelik modu: {mode}")
+        sub = Subscription(topic, callback, mode, self.queue_size)
+        with self._lock:
+            self._state = (self._state[0] + (sub,), {})
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._state = (tuple(s for s in self._state[0] if s is not sub), {})
+        sub.close()
+
+    def subscribers(self, topic: str) -> Tuple[Subscription, ...]:
+        subs, routes = self._state
+        route = routes.get(topic)
+        if route is None:
+            route = routes[topic] = tuple(s for s in subs if s.matches(topic))
+        return route
+
+    def publish(self, topic: str, *args: Any) -> None:
+        self.stats['published'] += 1
+        route = self.subscribers(topic)
+        if not route:
+            self.stats['unrouted'] += 1
+            return
+        for sub in route:
+            sub.deliver(topic, args)
+
+    def close(self) -> None:
+        """Async abone thread'lerini durdur"""
+        with self._lock:
+            subs, self._state = self._state[0], ((), {})
+        for sub in subs:
+            sub.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['subscribers'] = [{'topic': s.topic, 'mode': s.mode, 'delivered': s.delivered,
+                                 'dropped': s.dropped, 'errors': s.errors, 'pending': s.pending()}
+                                for s in self._state[0]]
+        return stats
+
+
+class BoundSignal:
+    """Nesneye bağlı sinyal; pyqtSignal'in connect/disconnect/emit arayüzü"""
+
+    def __init__(self, owner, name: str):
+        self._owner = owner
+        self.topic = owner.bus_prefix + name
+        self._subs: List[Subscription] = []
+
+    def connect(self, slot: Callable, mode: str = 'main') -> Subscription:
+        """Varsayılan 'main': arayüz varsa slot ana thread'de çalışır (Qt AutoConnection gibi)"""
+        sub = self._owner.bus.subscribe(self.topic, slot, mode)
+        self._subs.append(sub)
+        return sub
+
+    def disconnect(self, slot: Optional[Callable] = None) -> None:
+        for sub in list(self._subs):
+            if slot is None or sub.callback == slot:
+                self._owner.bus.unsubscribe(sub)
+                self._subs.remove(sub)
+
+    def emit(self, *args: Any) -> None:
+        self._owner.bus.publish(self.topic, *args)
+
+
+class Signal:
+    """pyqtSignal yerine sınıf düzeyinde tanımlanan olay; türler yalnızca belgeleme içindir"""
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = ''
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        bound = obj.__dict__.get(self.name)
+        if bound is None:
+            bound = obj.__dict__[self.name] = BoundSignal(obj, self.name)
+        return bound
+
+
+class Worker:
+    """QThread yerine geçen düz Python thread tabanı (start/isRunning/wait/quit/terminate).
+
+    Alt sınıf run()'ı tanımlar; sinyaller (Signal) nesnenin bus'ına yayınlanır.
+    Aynı bus paylaşılacaksa bus_prefix ile konular ayrıştırılır ('mavlink.').
+    """
+
+    def __init__(self, parent=None, bus: Optional[EventBus] = None, bus_prefix: str = ''):
+        self.bus = bus if bus is not None else EventBus()
+        self.bus_prefix = bus_prefix
+        self._thread: Optional[threading.Thread] = None
+
+    def run(self) -> None:
+        pass
+
+    def start(self) -> None:
+        if self.isRunning():
+            return
+        self._thread = threading.Thread(target=self.run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def isRunning(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, msecs: Optional[int] = None) -> bool:
+        """Thread bitene kadar bekle; QThread gibi milisaniye alır, bittiyse True"""
+        thread = self._thread
+        if thread is None or thread is threading.current_thread():
+            return True
+        thread.join(None if msecs is None else msecs / 1000.0)
+        return not thread.is_alive()
+
+    def quit(self) -> None:
+        stop = getattr(self, 'stop', None)
+        if stop is not None:
+            stop()
+
+    def terminate(self) -> None:
+        """Python thread'i zorla durdurulamaz; stop() istenir ve thread kendi döngüsünden çıkar"""
+        self.quit()
+
+    @staticmethod
+    def msleep(msecs: int) -> None:
+        time.sleep(msecs / 1000.0)
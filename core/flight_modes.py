@@ -0,0 +1,64 @@
+"""ArduPilot custom_mode tabloları (araç tipine göre önceden hesaplanmış)."""
+from typing import Dict, Optional
+
+# ArduPlane (QuadPlane modları dahil)
+PLANE_MODES: Dict[int, str] = {
+    0: 'MANUAL', 1: 'CIRCLE', 2: 'STABILIZE', 3: 'TRAINING', 4: 'ACRO', 5: 'FLY_BY_WIRE_A',
+    6: 'FLY_BY_WIRE_B', 7: 'CRUISE', 8: 'AUTOTUNE', 10: 'AUTO', 11: 'RTL', 12: 'LOITER',
+    14: 'TAKEOFF', 15: 'AVOID_ADSB', 16: 'GUIDED', 17: 'INITIALISING', 18: 'QSTABILIZE',
+    19: 'QHOVER', 20: 'QLOITER', 21: 'QLAND', 22: 'QRTL', 23: 'QAUTOTUNE', 24: 'QACRO'
+}
+
+# ArduCopter
+COPTER_MODES: Dict[int, str] = {
+    0: 'STABILIZE', 1: 'ACRO', 2: 'ALT_HOLD', 3: 'AUTO', 4: 'GUIDED', 5: 'LOITER', 6: 'RTL',
+    7: 'CIRCLE', 9: 'LAND', 11: 'DRIFT', 13: 'SPORT', 14: 'FLIP', 15: 'AUTOTUNE',
+    16: 'POSHOLD', 17: 'BRAKE', 18: 'THROW', 19: 'AVOID_ADSB', 20: 'GUIDED_NOGPS',
+    21: 'SMART_RTL', 22: 'FLOWHOLD', 23: 'FOLLOW', 24: 'ZIGZAG', 25: 'SYSTEMID',
+    26: 'AUTOROTATE', 27: 'AUTO_RTL'
+}
+
+# ArduRover / Boat
+ROVER_MODES: Dict[int, str] = {
+    0: 'MANUAL', 1: 'ACRO', 3: 'STEERING', 4: 'HOLD', 5: 'LOITER', 6: 'FOLLOW',
+    7: 'SIMPLE', 10: 'AUTO', 11: 'RTL', 12: 'SMART_RTL', 15: 'GUIDED', 16: 'INITIALISING'
+}
+
+# MAV_TYPE -> mod tablosu
+_COPTER_TYPES = {2, 3, 4, 13, 14, 15, 29}       # QUADROTOR, COAXIAL, HELICOPTER, HEXA, OCTO, TRI, DODECA
+_ROVER_TYPES = {10, 11}                          # GROUND_ROVER, SURFACE_BOAT
+
+MODE_TABLES: Dict[str, Dict[int, str]] = {
+    'plane': PLANE_MODES,
+    'copter': COPTER_MODES,
+    'rover': ROVER_MODES,
+}
+
+# İsimden custom_mode'a ters tablolar (set_mode için)
+MODE_NUMBERS: Dict[str, Dict[str, int]] = {
+    family: {name: number for number, name in table.items()}
+    for family, table in MODE_TABLES.items()
+}
+
+DEFAULT_FAMILY = 'plane'  # Proje sabit kanat için, tip bilinmiyorsa ArduPlane varsay
+
+
+def vehicle_family(mav_type: Optional[int]) -> str:
+    """HEARTBEAT.type değerinden mod tablosu ailesini bul"""
+    if mav_type in _COPTER_TYPES:
+        return 'copter'
+    if mav_type in _ROVER_TYPES:
+        return 'rover'
+    return DEFAULT_FAMILY
+
+
+def mode_name(family: str, custom_mode: Optional[int]) -> str:
+    """custom_mode numarasını mod adına çevir"""
+    if custom_mode is None:
+        return 'UNKNOWN'
+    return MODE_TABLES.get(family, PLANE_MODES).get(custom_mode, f'CUSTOM({custom_mode})')
+
+
+def mode_number(family: str, name: str) -> Optional[int]:
+    """Mod adını custom_mode numarasına çevir (bilinmiyorsa None)"""
+    return MODE_NUMBERS.get(family, MODE_NUMBERS[DEFAULT_FAMILY]).get((name or '').upper())
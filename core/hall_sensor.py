@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (monotonic zaman, hall değeri, manyetik alan değeri)
+HallSample = Tuple[float, int, int]
+
+
+def parse_hall_line(line: str) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """'HALL:123,MAG:456' satırını (hall, mag) olarak çöz; tanınmazsa None"""
+    hall = mag = None
+    for part in line.strip().split(','):
+        key, _, value = part.partition(':')
+        try:
+            if key.strip() == 'HALL':
+                hall = int(value)
+            elif key.strip() == 'MAG':
+                mag = int(value)
+        except ValueError:
+            return None
+    if hall is None and mag is None:
+        return None
+    return hall, mag
+
+
+class HallSensorService:
+    """Hall effect sensörü okuyucu: kendi thread'i, zaman damgalı halka tampon ve kenar algılama.
+
+    Seri port yalnızca okuyucu thread'inde okunur; arayüz latest()/samples() ile
+    bloklanmadan son değerlere erişir. Eşik geçişleri histerezis ve debounce
+    süresiyle doğrulanır; eşik altına iniş (mıknatıs uzaklaştı) 'falling' kenarıdır
+    ve arm() sonrası doğrulanan ilk düşen kenar released olayını set eder. Sensör
+    kurulurken zaten düşükse (ya da kurulduktan sonraki ilk örnek düşükse) bırakma
+    hemen doğrulanır; bu durumda kenar sözlüğünde 'initial' True'dur.
+    """
+
+    BUFFER_SIZE = 2048
+    READ_TIMEOUT = 0.05  # Okuyucu thread'in stop kontrolü için en uzun bloklanma (s)
+
+    def __init__(self, threshold: int = 100, hysteresis: int = 5, debounce: float = 0.05,
+                 buffer_size: int = BUFFER_SIZE, open_serial: Callable[..., Any] = None):
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.debounce = debounce
+        self._open_serial = open_serial or self._default_open
+        self._samples: deque = deque(maxlen=buffer_size)
+        self._edges: deque = deque(maxlen=64)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._port = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.port_name: Optional[str] = None
+        self.baudrate = 9600
+        # Kenar algılama durumu: 'high' (mıknatıs var), 'low' veya henüz bilinmiyor
+        self.state: Optional[str] = None
+        self._candidate: Optional[str] = None
+        self._candidate_since = 0.0
+        self._armed_at: Optional[float] = None
+        self.released = threading.Event()
+        self.release_edge: Optional[Dict[str, Any]] = None
+        self.stats = {'samples': 0, 'parse_errors': 0, 'read_errors': 0, 'edges': 0, 'glitches': 0}
+
+    @staticmethod
+    def _default_open(port_name: str, baudrate: int):
+        import serial
+        return serial.Serial(port_name, baudrate, timeout=HallSensorService.READ_TIMEOUT)
+
+    @property
+    def connected(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def connect(self, port_name: str, baudrate: int = 9600) -> None:
+        """Portu aç ve okuyucu thread'i başlat; port açılamazsa istisna yükselir"""
+        self.disconnect()
+        port = self._open_serial(port_name, baudrate)
+        self._port = port
+        self.port_name = port_name
+        self.baudrate = baudrate
+        self.state = self._candidate = None  # Yeni port: başlangıç durumu yeniden öğrenilir
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(port,), name='HallSensor', daemon=True)
+        self._thread.start()
+
+    def disconnect(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1.0)
+        port, self._port = self._port, None
+        if port is not None:
+            try:
+                port.close()
+            except Exception:
+                pass
+        self.port_name = None
+
+    def _run(self, port) -> None:
+        pending = b''
+        while not self._stop.is_set():
+            try:
+                data = port.read(max(1, getattr(port, 'in_waiting', 0)))
+            except Exception as e:
+                if not self._stop.is_set():
+                    self.stats['read_errors'] += 1
+                    print(f"[HALL] Okuma hatası, okuyucu durdu: {e}")
+                return
+            if not data:
+                continue
+            now = time.monotonic()  # Satırlar aynı okumada geldiyse aynı zamanı paylaşır
+            pending += data
+            *lines, pending = pending.split(b'\n')
+            for line in lines:
+                self.feed(line.decode('utf-8', errors='replace'), now)
+            if len(pending) > 256:
+                pending = b''  # Satır sonu gelmeyen çöp
+
+    def feed(self, line: str, now: Optional[float] = None) -> Optional[HallSample]:
+        """Tek sensör satırını işle (okuyucu thread'i ya da testler çağırır)"""
+        parsed = parse_hall_line(line)
+        if parsed is None:
+            if line.strip():
+                self.stats['parse_errors'] += 1
+            return None
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            last = self._samples[-1] if self._samples else (0.0, 0, 0)
+            hall = parsed[0] if parsed[0] is not None else last[1]
+            mag = parsed[1] if parsed[1] is not None else last[2]
+            sample = (now, hall, mag)
+            self._samples.append(sample)
+            self.stats['samples'] += 1
+            edge = self._detect(now, hall) if parsed[0] is not None else None
+        if edge is not None:
+            for listener in list(self._listeners):
+                try:
+                    listener(edge)
+                except Exception as e:
+                    print(f"[HALL] Kenar dinleyici hatası: {e}")
+        return sample
+
+    def _detect(self, now: float, value: int) -> Optional[Dict[str, Any]]:
+        """Histerezisli eşik + debounce; doğrulanan geçişte kenar sözlüğü döndür"""
+        if value < self.threshold - self.hysteresis:
+            level = 'low'
+        elif value > self.threshold + self.hysteresis:
+            level = 'high'
+        else:
+            return None  # Ölü bant: mevcut durum korunur
+        if self.state is None:
+            self.state = level  # İlk örnek başlangıç durumudur, kenar değil
+            if level == 'low' and self._armed_at is not None and not self.released.is_set():
+                return self._release(self._level_edge(now, value), now)
+            return None
+        if level == self.state:
+            if self._candidate is not None:
+                self.stats['glitches'] += 1
+            self._candidate = None
+            return None
+        if self._candidate != level:
+            self._candidate = level
+            self._candidate_since = now
+        if now - self._candidate_since < self.debounce:
+            return None
+        self.state, self._candidate = level, None
+        edge = {
+            'direction': 'falling' if level == 'low' else 'rising',
+            'time': self._candidate_since,  # Geçişin başladığı örnek
+            'confirmed_at': now,
+            'value': value,
+            'threshold': self.threshold,
+        }
+        self._edges.append(edge)
+        self.stats['edges'] += 1
+        # Kurulmadan önce başlayıp sonra doğrulanan geçiş de bırakmadır
+        if (edge['direction'] == 'falling' and self._armed_at is not None
+                and now >= self._armed_at and not self.released.is_set()):
+            self._release(edge, now)
+        return edge
+
+    def _level_edge(self, now: float, value: int) -> Dict[str, Any]:
+        """Geçiş olmadan düşük seviyede bulunan sensör için bırakma kaydı"""
+        return {'direction': 'falling', 'time': now, 'confirmed_at': now, 'value': value,
+                'threshold': self.threshold, 'initial': True}
+
+    def _release(self, edge: Dict[str, Any], now: float) -> Dict[str, Any]:
+        edge['latency_ms'] = (now - self._armed_at) * 1000.0
+        self.release_edge = edge
+        self.released.set()
+        return edge
+
+    def arm(self, now: Optional[float] = None) -> None:
+        """Yük bırakma doğrulamasını başlat: sensör zaten düşükse hemen, değilse ilk düşen kenarda"""
+        with self._lock:
+            self._armed_at = time.monotonic() if now is None else now
+            self.release_edge = None
+            self.released.clear()
+            if self.state == 'low' and self._candidate is None:
+                self._release(self._level_edge(self._armed_at, self._samples[-1][1]), self._armed_at)
+
+    def disarm(self) -> None:
+        with self._lock:
+            self._armed_at = None
+
+    def wait_for_release(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """arm() sonrası düşen kenarı bekle; zaman aşımında None"""
+        if self.released.wait(timeout):
+            return self.release_edge
+        return None
+
+    def add_edge_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Doğrulanan her kenarda okuyucu thread'inden çağrılır"""
+        self._listeners.append(callback)
+
+    def latest(self) -> Dict[str, Any]:
+        """Son örnek; arayüz için bloklanmaz"""
+        with self._lock:
+            if not self._samples:
+                return {'hall_effect': 0, 'magnetic_field': 0}
+            _, hall, mag = self._samples[-1]
+        return {'hall_effect': hall, 'magnetic_field': mag}
+
+    def latest_value(self) -> Optional[int]:
+        with self._lock:
+            return self._samples[-1][1] if self._samples else None
+
+    def samples(self, since: Optional[float] = None) -> List[HallSample]:
+        with self._lock:
+            if since is None:
+                return list(self._samples)
+            return [s for s in self._samples if s[0] >= since]
+
+    def edges(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._edges)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['buffered'] = len(self._samples)
+        stats['connected'] = self.connected
+        stats['state'] = self.state
+        return stats
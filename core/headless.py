@@ -0,0 +1,133 @@
+import json
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from core.data_logger import DataLogger
+from core.log_journal import recover_journals
+from core.mavlink_thread import MAVLinkThread
+from core.telemetry_recorder import TelemetryRecorder
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """'host:port' ya da ':port' -> (host, port)"""
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class TelemetryServer:
+    """Birleştirilmiş telemetri çerçevelerini UDP üzerinden JSON satırı olarak yayınlar"""
+
+    def __init__(self, address: Tuple[str, int]):
+        self.address = address
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.stats = {'frames': 0, 'bytes': 0, 'errors': 0}
+
+    def send(self, frame: Dict[str, Any]) -> None:
+        data = json.dumps(frame, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+        try:
+            self.sock.sendto(data, self.address)
+            self.stats['frames'] += 1
+            self.stats['bytes'] += len(data)
+        except OSError:
+            self.stats['errors'] += 1
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class HeadlessGCS:
+    """Ekransız çalışma: bağlan, kaydet, telemetriyi yayınla.
+
+    Çekirdek olay yoluna abone olur; ağ yayını 'async' abone olduğundan yavaş bir
+    alıcı MAVLink thread'ini bekletmez. Çerçeveler tüketildikçe onaylanır (backlog).
+    """
+
+    def __init__(self, thread: Optional[MAVLinkThread] = None, log_csv: bool = False,
+                 serve: Optional[Tuple[str, int]] = None, log_format: str = 'csv',
+                 compress: Optional[str] = None, rotate_bytes: Optional[int] = None,
+                 rotate_interval: Optional[float] = None, journal: bool = False):
+        self.thread = thread or MAVLinkThread()
+        self.logger = DataLogger(log_format=log_format, compress=compress, rotate_bytes=rotate_bytes,
+                                 rotate_interval=rotate_interval, journal=journal) if log_csv else None
+        self.recorder = TelemetryRecorder(self.thread, self.logger) if self.logger is not None else None
+        self.server = TelemetryServer(serve) if serve else None
+        self.frames = 0
+        self.last_frame: Dict[str, Any] = {}
+        self._stop = threading.Event()
+
+        t = self.thread
+        t.telemetry_frame.connect(self._on_frame, mode='async')
+        t.error_occurred.connect(lambda msg: print(f"[HEADLESS] Hata: {msg}"), mode='sync')
+        t.link_state.connect(lambda state, detail: print(f"[HEADLESS] Bağlantı: {state} {detail}"), mode='sync')
+        t.emergency_triggered.connect(self._on_emergency, mode='sync')
+        if self.logger is not None:
+            self.recorder.attach()
+
+    def _on_frame(self, frame: Dict[str, Any]) -> None:
+        try:
+            self.frames += 1
+            for channel, values in frame.items():
+                if isinstance(values, dict):
+                    self.last_frame.setdefault(channel, {}).update(values)
+            if self.server is not None:
+                self.server.send(frame)
+        finally:
+            self.thread.mark_frame_consumed(frame.get('seq', 0))
+
+    def _on_emergency(self, data: Dict[str, Any]) -> None:
+        for condition in data.get('conditions', []):
+            print(f"[HEADLESS] ACİL DURUM ({condition['severity']}): {condition['message']}")
+        for condition in data.get('cleared', []):
+            print(f"[HEADLESS] Acil durum sona erdi: {condition['type']}")
+
+    def start(self, link: Optional[str], baud: int = 57600, auto_reconnect: bool = True) -> bool:
+        """Bağlantıyı aç ve MAVLink thread'ini başlat; link None/'auto' ise portlar taranır"""
+        self.thread.auto_reconnect = auto_reconnect
+        if self.logger is not None:
+            if self.logger.journal:
+                recover_journals(self.logger.directory)  # Önceki çalıştırmadan yarım kalan oturumlar
+            self.logger.start_logging()
+        if link in (None, 'auto') or not baud:
+            self.thread.connect_auto(None if link in (None, 'auto') else link, baud or None)
+        elif not self.thread.connect(link, baud):
+            return False
+        self.thread.start()
+        return True
+
+    def status(self) -> str:
+        telemetry = self.last_frame.get('telemetry', {})
+        position = self.last_frame.get('position', {})
+        link = self.thread.get_link_stats()
+        status = (f"bağlı={self.thread.is_connected} çerçeve={self.frames} "
+                  f"mod={telemetry.get('mode', '-')} irtifa={position.get('alt', telemetry.get('alt', '-'))} "
+                  f"batarya={telemetry.get('battery', '-')} kayıp={link.get('loss_percent', 0)}")
+        if self.logger is not None:
+            log = self.logger.get_stats()
+            status += (f" kayıt_kuyruğu={log['pending']} kayıt_gecikme={log['latency_mean_ms']:.1f}ms"
+                       f" düşen_satır={log['dropped']}")
+        return status
+
+    def run(self, duration: Optional[float] = None, report_interval: float = 5.0) -> None:
+        """duration dolana ya da stop() çağrılana kadar çalış, aralıklarla durum yazdır"""
+        end = None if duration is None else time.monotonic() + duration
+        next_report = time.monotonic() + report_interval
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if end is not None and now >= end:
+                break
+            if report_interval > 0 and now >= next_report:
+                print(f"[HEADLESS] {self.status()}")
+                next_report = now + report_interval
+            self._stop.wait(min(0.5, report_interval) if report_interval > 0 else 0.5)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.thread.stop()
+        self.thread.wait(2000)
+        self.thread.bus.close()
+        if self.logger is not None:
+            self.logger.stop_logging()
+        if self.server is not None:
+            self.server.close()
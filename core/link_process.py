@@ -0,0 +1,430 @@
+import math
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymavlink import mavutil
+
+# Ortak bellek başlığı: yazma sırası, zil bayrağı, süreç durumu ve çocuk süreç sayaçları
+_HEADER = struct.Struct('<QIIQQQQQQ')
+_HEADER_FIELDS = tuple((struct.calcsize('<' + _HEADER.format[1:1 + i]), '<' + _HEADER.format[1 + i])
+                       for i in range(len(_HEADER.format) - 1))
+_HEADER_SIZE = 128
+_SLOT_HEADER = struct.Struct('<QdH')   # kayıt sırası (+1), alım zamanı (time.time), uzunluk
+_SLOT_DATA = 280                        # En uzun MAVLink2 paketi (imzalı)
+_SLOT_SIZE = 304
+
+STATE_STARTING, STATE_RUNNING, STATE_FAILED, STATE_STOPPED = range(4)
+
+# Paylaşılan son-değer snapshot'ı alanları (float64)
+SNAPSHOT_FIELDS = (
+    'time', 'roll', 'pitch', 'yaw', 'lat', 'lon', 'alt', 'relative_alt', 'heading',
+    'groundspeed', 'airspeed', 'climb', 'throttle', 'voltage', 'current', 'battery',
+    'gps_fix', 'satellites', 'rssi', 'base_mode', 'custom_mode',
+)
+_FIELD_INDEX = {name: i for i, name in enumerate(SNAPSHOT_FIELDS)}
+
+# mesaj tipi -> (alan, mesaj özniteliği, ölçek); ölçek None ise radyandan dereceye
+_SNAPSHOT_MAP = {
+    'ATTITUDE': (('roll', 'roll', None), ('pitch', 'pitch', None), ('yaw', 'yaw', None)),
+    'GLOBAL_POSITION_INT': (('lat', 'lat', 1e-7), ('lon', 'lon', 1e-7), ('alt', 'alt', 1e-3),
+                            ('relative_alt', 'relative_alt', 1e-3), ('heading', 'hdg', 1e-2)),
+    'VFR_HUD': (('airspeed', 'airspeed', 1.0), ('groundspeed', 'groundspeed', 1.0),
+                ('climb', 'climb', 1.0), ('throttle', 'throttle', 1.0)),
+    'SYS_STATUS': (('voltage', 'voltage_battery', 1e-3), ('current', 'current_battery', 1e-2),
+                   ('battery', 'battery_remaining', 1.0)),
+    'GPS_RAW_INT': (('gps_fix', 'fix_type', 1.0), ('satellites', 'satellites_visible', 1.0)),
+    'RADIO_STATUS': (('rssi', 'rssi', 1.0),),
+}
+
+# Seyreltme açıkken ebeveyne en fazla telemetry_hz hızında iletilen yüksek hızlı tipler;
+# diğer tüm mesajlar (ACK, görev, parametre, heartbeat...) her zaman iletilir
+DECIMATED_TYPES = frozenset(('ATTITUDE', 'ATTITUDE_QUATERNION', 'GLOBAL_POSITION_INT', 'LOCAL_POSITION_NED',
+                             'VFR_HUD', 'GPS_RAW_INT', 'SYS_STATUS', 'RAW_IMU', 'SCALED_IMU2', 'SCALED_PRESSURE',
+                             'SERVO_OUTPUT_RAW', 'RC_CHANNELS', 'NAV_CONTROLLER_OUTPUT', 'VIBRATION',
+                             'AHRS', 'AHRS2', 'SIMSTATE', 'HWSTATUS', 'MEMINFO', 'POWER_STATUS'))
+
+
+class SharedRing:
+    """Sabit boyutlu paket halkası (tek yazar: I/O süreci, tek okur: MAVLink thread'i).
+
+    Yazar önce kayıt sırasını geçersiz kılar (0), kaydı doldurur ve sırayı en son
+    yazar; okur sırayı veriden önce ve sonra kontrol eder, yazar üzerine yazmaya
+    başladıysa ya da yazdıysa kayıt düşmüş sayılır. Okur
+    yetişemezse en eski kayıtlar atlanır ve 'overruns' sayacı artar.
+    """
+
+    def __init__(self, name: Optional[str] = None, slots: int = 8192):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + slots * _SLOT_SIZE)
+            self.owner = True
+            self.buf = self.shm.buf
+            self.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+            self.buf = self.shm.buf
+        self.name = self.shm.name
+        self.slots = (len(self.buf) - _HEADER_SIZE) // _SLOT_SIZE
+        self.read_seq = 0
+        self.overruns = 0
+
+    # Başlık alanları: 0 write_seq, 1 bell, 2 state, 3.. çocuk sayaçları
+    COUNTERS = ('rx_packets', 'rx_bytes', 'bad_data', 'dropped', 'forwarded', 'decimated')
+
+    def header(self) -> Tuple[int, ...]:
+        return _HEADER.unpack_from(self.buf, 0)
+
+    def set_header(self, index: int, value: int) -> None:
+        offset, fmt = _HEADER_FIELDS[index]
+        struct.pack_into(fmt, self.buf, offset, value)
+
+    def write_seq(self) -> int:
+        return struct.unpack_from('<Q', self.buf, 0)[0]
+
+    def append(self, data: bytes, timestamp: float, seq: int) -> None:
+        """Yazar: seq numaralı kaydı yaz (çağıran seq'i artırır ve başlığa işler)"""
+        offset = _HEADER_SIZE + (seq % self.slots) * _SLOT_SIZE
+        n = min(len(data), _SLOT_DATA)
+        start = offset + _SLOT_HEADER.size
+        struct.pack_into('<Q', self.buf, offset, 0)  # Yazma sürüyor: okur bu kaydı atlar
+        self.buf[start:start + n] = data[:n]
+        struct.pack_into('<dH', self.buf, offset + 8, timestamp, n)
+        struct.pack_into('<Q', self.buf, offset, seq + 1)
+
+    def read(self, limit: int = 1 << 30) -> List[Tuple[float, bytes]]:
+        """Okur: son okumadan bu yana yazılan kayıtlar (en fazla limit bayt)"""
+        head = self.write_seq()
+        if head - self.read_seq > self.slots:
+            self.overruns += head - self.slots - self.read_seq
+            self.read_seq = head - self.slots
+        records = []
+        size = 0
+        buf = self.buf
+        while self.read_seq < head and size < limit:
+            seq = self.read_seq
+            offset = _HEADER_SIZE + (seq % self.slots) * _SLOT_SIZE
+            self.read_seq += 1
+            marker, timestamp, n = _SLOT_HEADER.unpack_from(buf, offset)
+            if marker != seq + 1:
+                self.overruns += 1
+                continue
+            start = offset + _SLOT_HEADER.size
+            data = bytes(buf[start:start + n])
+            if struct.unpack_from('<Q', buf, offset)[0] != seq + 1:
+                self.overruns += 1  # Okurken üzerine yazıldı
+                continue
+            records.append((timestamp, data))
+            size += n
+        return records
+
+    def backlog(self) -> int:
+        return self.write_seq() - self.read_seq
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedSnapshot:
+    """Son telemetri değerleri (float64 dizisi) için seqlock korumalı ortak bellek"""
+
+    def __init__(self, name: Optional[str] = None):
+        size = 8 * (1 + len(SNAPSHOT_FIELDS))
+        self._values = struct.Struct(f'<{len(SNAPSHOT_FIELDS)}d')
+        self._local = [math.nan] * len(SNAPSHOT_FIELDS)
+        self._version = 0
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+            struct.pack_into('<Q', self.shm.buf, 0, 0)
+            self._values.pack_into(self.shm.buf, 8, *self._local)  # NaN: henüz gelmedi
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.shm.name
+
+    def write(self, updates: Dict[int, float]) -> None:
+        """Yazar: alan indeksi -> değer güncellemelerini tek seferde yayınla"""
+        for index, value in updates.items():
+            self._local[index] = value
+        buf = self.shm.buf
+        self._version += 1
+        struct.pack_into('<Q', buf, 0, self._version * 2 - 1)  # Tek: yazma sürüyor
+        self._values.pack_into(buf, 8, *self._local)
+        struct.pack_into('<Q', buf, 0, self._version * 2)
+
+    def read(self) -> Dict[str, float]:
+        """Okur: tutarlı bir kopya (gelmemiş alanlar dahil edilmez)"""
+        buf = self.shm.buf
+        for _ in range(100):
+            before = struct.unpack_from('<Q', buf, 0)[0]
+            if before & 1:
+                continue
+            values = self._values.unpack_from(buf, 8)
+            if struct.unpack_from('<Q', buf, 0)[0] == before:
+                return {name: v for name, v in zip(SNAPSHOT_FIELDS, values) if not math.isnan(v)}
+        return {}
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _snapshot_updates(msg, updates: Dict[int, float]) -> None:
+    mapping = _SNAPSHOT_MAP.get(msg.get_type())
+    if mapping is None:
+        if msg.get_type() == 'HEARTBEAT' and msg.type != mavutil.mavlink.MAV_TYPE_GCS:
+            updates[_FIELD_INDEX['base_mode']] = float(msg.base_mode)
+            updates[_FIELD_INDEX['custom_mode']] = float(msg.custom_mode)
+        return
+    for field, attr, scale in mapping:
+        value = getattr(msg, attr, None)
+        if value is None:
+            continue
+        updates[_FIELD_INDEX[field]] = math.degrees(value) if scale is None else value * scale
+
+
+def link_process_main(device: str, baud: int, ring_name: str, snapshot_name: str,
+                      commands, bell, tlog_path: Optional[str], telemetry_hz: float) -> None:
+    """Çocuk süreç: bağlantı G/Ç, çözme, ham kayıt ve ortak belleğe yayın"""
+    from core.link_reader import LinkReader
+    from core.link_stats import LinkStats
+    from core.mavlink_decode import select_decoder
+    from core.tlog_writer import TlogWriter
+
+    ring = SharedRing(ring_name)
+    snapshot = SharedSnapshot(snapshot_name)
+    try:
+        conn = mavutil.mavlink_connection(device, baud=baud, autoreconnect=False)
+        conn.mav.robust_parsing = True
+    except Exception as e:
+        ring.set_header(2, STATE_FAILED)
+        bell.send_bytes(b'E' + str(e).encode('utf-8', errors='replace'))
+        ring.close()
+        snapshot.close()
+        return
+    tlog = None
+    if tlog_path:
+        tlog = TlogWriter(tlog_path)
+        try:
+            tlog.start()
+            print(f"[TLOG] Kayıt (G/Ç süreci): {tlog_path}")
+        except OSError as e:
+            print(f"[TLOG] Tlog kaydı başlatılamadı: {e}")
+            tlog = None
+    reader = LinkReader()
+    reader.extra_fds = [commands.fileno()]
+    reader.decoder = select_decoder()
+    stats = LinkStats()
+    interval = 1.0 / telemetry_hz if telemetry_hz > 0 else 0.0
+    last_forward: Dict[Tuple[int, str], float] = {}
+    seq = 0
+    counters = [0] * len(SharedRing.COUNTERS)
+    ring.set_header(2, STATE_RUNNING)
+    bell.send_bytes(b'R')
+    running = True
+    try:
+        while running:
+            if reader.wait(conn, 0.2):
+                messages = reader.read_batch(conn)
+                now = time.time()
+                updates: Dict[int, float] = {}
+                forwarded = 0
+                for msg in messages:
+                    msg_type = msg.get_type()
+                    if msg_type == 'BAD_DATA':
+                        counters[2] += 1
+                        continue
+                    buf = msg.get_msgbuf()
+                    counters[0] += 1
+                    counters[1] += len(buf)
+                    _snapshot_updates(msg, updates)
+                    if interval and msg_type in DECIMATED_TYPES:
+                        key = (msg.get_srcSystem(), msg_type)
+                        if now - last_forward.get(key, 0.0) < interval:
+                            counters[5] += 1
+                            continue
+                        last_forward[key] = now
+                    ring.append(buf, now, seq)
+                    seq += 1
+                    forwarded += 1
+                if messages:
+                    stats.record_batch(messages, 0.0)
+                    counters[3] = stats.dropped
+                    if tlog is not None:
+                        tlog.record(messages, now)
+                if updates:
+                    updates[0] = now
+                    snapshot.write(updates)
+                if forwarded:
+                    counters[4] += forwarded
+                    ring.set_header(0, seq)
+                for i, value in enumerate(counters):
+                    ring.set_header(3 + i, value)
+                if forwarded and ring.header()[1] == 0:
+                    ring.set_header(1, 1)
+                    bell.send_bytes(b'')  # Zil: okur bekliyorsa uyanır
+            while commands.poll():
+                op, arg = commands.recv()
+                if op == 'write':
+                    conn.write(arg)
+                elif op == 'baud':
+                    conn.set_baudrate(arg)
+                elif op == 'stop':
+                    running = False
+                    break
+    except (OSError, EOFError) as e:
+        try:
+            bell.send_bytes(b'E' + str(e).encode('utf-8', errors='replace'))
+        except OSError:
+            pass
+    finally:
+        ring.set_header(2, STATE_STOPPED)
+        if tlog is not None:
+            tlog.stop()
+        try:
+            conn.close()
+        except Exception:
+            pass
+        reader.close()
+        ring.close()
+        snapshot.close()
+
+
+class ProcessLinkConnection(mavutil.mavfile):
+    """Bağlantı G/Ç'sini ayrı süreçte çalıştıran pymavlink bağlantısı.
+
+    Seri/UDP okuma, çözme ve .tlog kaydı çocuk süreçte yapılır; ana süreçteki
+    GIL yükü (harita, HUD) portun okunmasını geciktirmez. Paketler ortak bellekteki
+    halkadan recv() ile alınır, böylece MAVLinkThread'in okuma/dağıtım yolu aynen
+    çalışır; giden paketler pipe ile çocuk sürece gönderilir. telemetry_hz > 0 ise
+    yüksek hızlı telemetri ebeveyne seyreltilerek iletilir (tam hız snapshot'ta).
+    """
+
+    START_TIMEOUT = 15.0
+
+    def __init__(self, device: str, baud: int = 57600, tlog_path: Optional[str] = None,
+                 telemetry_hz: float = 0.0, slots: int = 8192):
+        self.ring = SharedRing(slots=slots)
+        self.snapshot = SharedSnapshot()
+        self.telemetry_hz = telemetry_hz
+        self.tlog_path = tlog_path
+        self.error: Optional[str] = None
+        ctx = multiprocessing.get_context('spawn')  # Ebeveyn çok thread'li: fork güvenli değil
+        cmd_r, self._commands = ctx.Pipe(duplex=False)
+        self._bell, bell_w = ctx.Pipe(duplex=False)
+        self._write_lock = threading.Lock()
+        self.process = ctx.Process(target=link_process_main, name=f'MAVLinkIO-{device}',
+                                   args=(device, baud, self.ring.name, self.snapshot.name,
+                                         cmd_r, bell_w, tlog_path, telemetry_hz), daemon=True)
+        try:
+            self.process.start()
+        except Exception:
+            self._release()
+            raise
+        cmd_r.close()
+        bell_w.close()
+        mavutil.mavfile.__init__(self, None, device, source_system=255, source_component=0)
+        self.fd = self._bell.fileno()
+        self.device = device
+        self.baud = baud
+        deadline = time.monotonic() + self.START_TIMEOUT
+        while self.ring.header()[2] == STATE_STARTING and time.monotonic() < deadline:
+            if not self.process.is_alive():
+                break
+            self._drain_bell(0.05)
+        if self.ring.header()[2] != STATE_RUNNING:
+            self._drain_bell(0.0)
+            error = self.error or 'Bağlantı süreci başlatılamadı'
+            self.close()
+            raise OSError(error)
+
+    def _drain_bell(self, timeout: float = 0.0) -> None:
+        try:
+            if not self._bell.poll(timeout):
+                return
+            while self._bell.poll():
+                data = self._bell.recv_bytes()
+                if data[:1] == b'E':
+                    self.error = data[1:].decode('utf-8', errors='replace')
+        except (EOFError, OSError):
+            pass
+
+    def recv(self, n=None):
+        """Halkadaki yeni paketleri ham bayt olarak döndür"""
+        self.ring.set_header(1, 0)  # Zil bayrağını indir: sonraki yazmada tekrar çalınır
+        self._drain_bell()
+        data = b''.join(record[1] for record in self.ring.read(n or 1 << 16))
+        if not data and not self.process.is_alive():
+            raise OSError(self.error or 'Bağlantı süreci sonlandı')
+        return data
+
+    def select(self, timeout):
+        if self.ring.backlog() > 0:
+            return True
+        self._drain_bell(timeout)
+        return self.ring.backlog() > 0
+
+    def write(self, buf):
+        with self._write_lock:
+            try:
+                self._commands.send(('write', bytes(buf)))
+            except (OSError, BrokenPipeError) as e:
+                raise OSError(f"Bağlantı süreci yanıt vermiyor: {e}")
+
+    def set_baudrate(self, baudrate):
+        with self._write_lock:
+            self._commands.send(('baud', baudrate))
+        self.baud = baudrate
+
+    def close(self):
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        try:
+            with self._write_lock:
+                self._commands.send(('stop', None))
+        except (OSError, BrokenPipeError):
+            pass
+        process.join(2.0)
+        if process.is_alive():
+            process.terminate()
+            process.join(1.0)
+        self._release()
+
+    def _release(self) -> None:
+        for pipe in (self._commands, self._bell):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        self.ring.close()
+        self.snapshot.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Çocuk süreç sayaçları ve halka durumu"""
+        if self.ring.buf is None:
+            return {}
+        header = self.ring.header()
+        stats = dict(zip(SharedRing.COUNTERS, header[3:]))
+        stats['ring_overruns'] = self.ring.overruns
+        stats['ring_backlog'] = self.ring.backlog()
+        stats['ring_slots'] = self.ring.slots
+        stats['state'] = ('starting', 'running', 'failed', 'stopped')[header[2]]
+        stats['telemetry_hz'] = self.telemetry_hz
+        total = stats['rx_packets'] + stats['dropped']
+        stats['loss_percent'] = stats['dropped'] / total * 100.0 if total else 0.0
+        return stats
@@ -0,0 +1,253 @@
+import os
+import select
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+from core.mavlink_decode import make_parser
+
+
+class LinkReader:
+    """MAVLink bağlantısı için olay güdümlü okuyucu.
+
+    Seri/UDP/TCP dosya tanımlayıcısı üzerinde select() ile bloklanır, uyandırma
+    soketi sayesinde kapatma sırasında beklemeden çıkar ve her okumada gelen
+    tüm tam paketleri tek seferde çözer.
+    """
+
+    READ_CHUNK = 4096          # Tek okumada istenecek en fazla bayt
+    MAX_READS_PER_BATCH = 64   # Bir batch içinde art arda yapılacak en fazla okuma
+
+    def __init__(self):
+        # os.pipe() Windows'ta select() ile kullanılamaz, socketpair her iki platformda çalışır
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._pending = b''  # Seri port fallback'inde bekleme sırasında okunan bayt
+        self.last_decode_time = 0.0  # Son batch'in parse_buffer içinde geçirdiği süre (s)
+        self.ready_time = 0.0  # Verinin hazır olduğu görülen an (perf_counter, select dönüşü)
+        self.extra_fds: List[int] = []  # Birlikte beklenecek ek tanımlayıcılar (yönlendirici uçları)
+        self.decoder = 'pymavlink'  # Çözücü (bkz. core.mavlink_decode.select_decoder)
+        self._parser_mav = None
+        self._parse = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Ölçüm sayaçlarını sıfırla"""
+        self.stats: Dict[str, Any] = {
+            'wakeups': 0,        # Bekleme çağrısından dönüş sayısı
+            'idle_wakeups': 0,   # Veri olmadan (timeout/uyandırma) dönüşler
+            'batches': 0,        # En az bir paket içeren batch sayısı
+            'packets': 0,
+            'bytes': 0,
+            'max_batch': 0,
+            'latency_sum': 0.0,  # Okuma -> işleme bitişi toplam gecikme (s)
+            'latency_max': 0.0,
+            'cpu_time': 0.0,     # Okuma thread'inin harcadığı CPU süresi (s)
+            'wall_time': 0.0,
+        }
+        self._cpu_start = None
+        self._wall_start = None
+
+    def wakeup(self) -> None:
+        """Bekleyen wait() çağrısını hemen döndür (kapatma / yeni iş için)"""
+        try:
+            self._wake_w.send(b'\x00')
+        except (BlockingIOError, OSError):
+            pass  # Tampon zaten dolu, okuyucu zaten uyanacak
+
+    def close(self) -> None:
+        """Uyandırma soketlerini kapat"""
+        for sock in (self._wake_r, self._wake_w):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while self._wake_r.recv(256):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    @staticmethod
+    def _selectable_fd(connection) -> Optional[int]:
+        fd = getattr(connection, 'fd', None)
+        if fd is None:
+            return None
+        # Windows'ta select() yalnızca soketleri destekler
+        if os.name == 'nt' and not isinstance(getattr(connection, 'port', None), socket.socket):
+            return None
+        return fd
+
+    def wait(self, connection, timeout: float) -> bool:
+        """Bağlantıda okunacak veri olana, uyandırılana ya da timeout dolana kadar bekle.
+
+        Okunacak veri varsa True döner; verinin hazır olduğu an ready_time'a yazılır
+        (okuma ve çözme süresi paket gecikmesine dahil olsun diye).
+        """
+        self.tick()
+        self.stats['wakeups'] += 1
+        if self._pending:
+            return True  # ready_time ilk bayt okunduğunda alındı
+
+        # Dosya tabanlı bağlantı (tlog oynatma): bir sonraki paketin zamanına kadar bekle
+        time_until_ready = getattr(connection, 'time_until_ready', None)
+        if time_until_ready is not None:
+            delay = time_until_ready()
+            if delay <= 0:
+                self.ready_time = time.perf_counter()
+                return True
+            try:
+                select.select([self._wake_r], [], [], min(timeout, delay))
+            except (OSError, ValueError):
+                pass
+            self.ready_time = time.perf_counter()
+            self._drain_wakeup()
+            if time_until_ready() <= 0:
+                return True
+            self.stats['idle_wakeups'] += 1
+            return False
+
+        fd = self._selectable_fd(connection)
+        if fd is not None:
+            extra = self.extra_fds
+            try:
+                readable, _, _ = select.select([fd, self._wake_r, *extra], [], [], timeout)
+            except (OSError, ValueError):
+                # Port kapatılmış olabilir, çağıran tarafa bırak
+                return False
+            self.ready_time = time.perf_counter()
+            if self._wake_r in readable:
+                self._drain_wakeup()
+            if fd in readable:
+                return True
+            if not extra or not any(f in readable for f in extra):
+                self.stats['idle_wakeups'] += 1
+            return False
+
+        # Seçilemeyen tanımlayıcı (Windows seri port): kısa timeout ile bloklayan okuma
+        port = getattr(connection, 'port', None)
+        if port is not None and hasattr(port, 'read') and hasattr(port, 'timeout'):
+            try:
+                if port.in_waiting:
+                    self.ready_time = time.perf_counter()
+                    return True
+                old_timeout = port.timeout
+                port.timeout = timeout
+                try:
+                    first = port.read(1)
+                finally:
+                    port.timeout = old_timeout
+                self.ready_time = time.perf_counter()
+            except Exception:
+                return False
+            self._drain_wakeup()
+            if first:
+                self._pending = first
+                return True
+            self.stats['idle_wakeups'] += 1
+            return False
+
+        # Son çare: uyandırma soketini bekle
+        try:
+            select.select([self._wake_r], [], [], min(timeout, 0.05))
+        except (OSError, ValueError):
+            pass
+        self.ready_time = time.perf_counter()
+        self._drain_wakeup()
+        return True
+
+    def idle(self, timeout: float) -> None:
+        """Bağlantı yokken yalnızca uyandırma soketini bekle"""
+        try:
+            select.select([self._wake_r], [], [], timeout)
+        except (OSError, ValueError):
+            time.sleep(timeout)
+        self._drain_wakeup()
+
+    def cancel_wait(self, connection) -> None:
+        """Seri port fallback'inde bloklanmış okumayı iptal et"""
+        self.wakeup()
+        port = getattr(connection, 'port', None)
+        if port is not None and self._selectable_fd(connection) is None and hasattr(port, 'cancel_read'):
+            try:
+                port.cancel_read()
+            except Exception:
+                pass
+
+    def _parser(self, mav):
+        """mav nesnesine bağlı çözücü; protokol sürümü değişince pymavlink mav'ı yeniler"""
+        if mav is not self._parser_mav:
+            self._parse = make_parser(self.decoder, mav)
+            self._parser_mav = mav
+        return self._parse
+
+    def read_batch(self, connection) -> List[Any]:
+        """Bağlantıdaki tüm hazır baytları oku ve çözülen mesajların listesini döndür"""
+        messages: List[Any] = []
+        nbytes = 0
+        decode_time = 0.0
+        for _ in range(self.MAX_READS_PER_BATCH):
+            if self._pending:
+                data, self._pending = self._pending, b''
+                extra = connection.recv(self.READ_CHUNK)
+                if extra:
+                    data += extra
+            else:
+                data = connection.recv(self.READ_CHUNK)
+            if not data:
+                break
+            nbytes += len(data)
+            if getattr(connection, 'first_byte', False):
+                connection.auto_mavlink_version(data)
+            if getattr(connection, 'logfile_raw', None):
+                connection.logfile_raw.write(data)
+            parse = self._parser(connection.mav)
+            t0 = time.perf_counter()
+            parsed = parse(data)
+            decode_time += time.perf_counter() - t0
+            if parsed:
+                messages.extend(parsed)
+
+        for msg in messages:
+            # recv_msg() ile aynı durum güncellemesi (target_system, sequence sayaçları vb.)
+            connection.post_message(msg)
+
+        self.last_decode_time = decode_time
+        self.stats['bytes'] += nbytes
+        if messages:
+            self.stats['batches'] += 1
+            self.stats['packets'] += len(messages)
+            if len(messages) > self.stats['max_batch']:
+                self.stats['max_batch'] = len(messages)
+        return messages
+
+    def record_latency(self, rx_time: float, count: int = 1) -> None:
+        """Verinin hazır olduğu andan (perf_counter, bkz. ready_time) işleme bitişine kadar geçen süreyi kaydet"""
+        latency = time.perf_counter() - rx_time
+        self.stats['latency_sum'] += latency * count
+        if latency > self.stats['latency_max']:
+            self.stats['latency_max'] = latency
+
+    def tick(self) -> None:
+        """Okuma thread'inin CPU ve duvar saati ölçümünü güncelle"""
+        now_cpu = time.thread_time()
+        now_wall = time.perf_counter()
+        if self._cpu_start is None:
+            self._cpu_start = now_cpu
+            self._wall_start = now_wall
+            return
+        self.stats['cpu_time'] = now_cpu - self._cpu_start
+        self.stats['wall_time'] = now_wall - self._wall_start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Boşta CPU kullanımı ve paket gecikmesi dahil özet istatistikler"""
+        s = dict(self.stats)
+        packets = s['packets']
+        s['avg_batch'] = packets / s['batches'] if s['batches'] else 0.0
+        s['latency_avg_ms'] = (s['latency_sum'] / packets) * 1000.0 if packets else 0.0
+        s['latency_max_ms'] = s['latency_max'] * 1000.0
+        s['cpu_percent'] = (s['cpu_time'] / s['wall_time']) * 100.0 if s['wall_time'] > 0 else 0.0
+        return s
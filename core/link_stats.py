@@ -0,0 +1,190 @@
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """Sabit (logaritmik) kovalı gecikme histogramı. Değerler saniye cinsinden eklenir."""
+
+    # Kova üst sınırları (mikrosaniye); son kova sonsuz
+    BOUNDS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        us = seconds * 1e6
+        self.buckets[bisect.bisect_left(self.BOUNDS_US, us)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def mean_us(self) -> float:
+        return (self.total / self.count) * 1e6 if self.count else 0.0
+
+    def percentile_us(self, p: float) -> float:
+        """Yaklaşık yüzdelik (kova üst sınırı olarak)"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return float(self.BOUNDS_US[i]) if i < len(self.BOUNDS_US) else self.max * 1e6
+        return self.max * 1e6
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_us': self.mean_us(),
+            'p50_us': self.percentile_us(50),
+            'p95_us': self.percentile_us(95),
+            'max_us': self.max * 1e6,
+        }
+
+
+class MessageTypeStats:
+    """Tek bir mesaj tipi için sayaçlar"""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.count = 0
+        self.bytes = 0
+        self.decode = LatencyHistogram()
+        self.handler = LatencyHistogram()
+        self.rate_hz = 0.0
+        self.bytes_per_s = 0.0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._window_bytes = 0
+
+    def add(self, nbytes: int, now: float) -> None:
+        self.count += 1
+        self.bytes += nbytes
+        self._window_count += 1
+        self._window_bytes += nbytes
+        self._roll(now)
+
+    def _roll(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.rate_hz = self._window_count / elapsed
+            self.bytes_per_s = self._window_bytes / elapsed
+            self._window_start = now
+            self._window_count = 0
+            self._window_bytes = 0
+
+    def current_rate(self, now: float) -> Tuple[float, float]:
+        """Akış durduysa hızı sıfıra çek"""
+        if now - self._window_start > 2 * self.window:
+            return 0.0, 0.0
+        return self.rate_hz, self.bytes_per_s
+
+
+class LinkStats:
+    """MAVLink bağlantısı için mesaj tipi bazında canlı istatistikler.
+
+    MAVLink thread'i yazar, arayüz thread'i snapshot() ile okur.
+    """
+
+    def __init__(self, window: float = 1.0):
+        self.window = window
+        self._types: Dict[str, MessageTypeStats] = {}
+        self._last_seq: Dict[Tuple[int, int], int] = {}
+        self.received = 0
+        self.dropped = 0
+        self.dropped_by_source: Dict[Tuple[int, int], int] = {}
+        self.bad_data = 0
+        self.ping_ms: Optional[float] = None
+        self.radio: Dict[str, int] = {}
+        self.started = time.monotonic()
+
+    def reset(self) -> None:
+        self.__init__(self.window)
+
+    def _type(self, msg_type: str) -> MessageTypeStats:
+        stats = self._types.get(msg_type)
+        if stats is None:
+            stats = self._types[msg_type] = MessageTypeStats(self.window)
+        return stats
+
+    def record_batch(self, messages: List[Any], decode_seconds: float) -> None:
+        """Bir okuma batch'indeki mesajları say; çözme süresi mesajlara eşit paylaştırılır"""
+        if not messages:
+            return
+        now = time.monotonic()
+        per_msg = decode_seconds / len(messages)
+        for msg in messages:
+            msg_type = msg.get_type()
+            if msg_type == 'BAD_DATA':
+                self.bad_data += 1
+                continue
+            stats = self._type(msg_type)
+            stats.add(len(msg.get_msgbuf()), now)
+            stats.decode.add(per_msg)
+            self._check_sequence(msg)
+            self.received += 1
+
+    def record_handler(self, msg_type: str, seconds: float) -> None:
+        """Mesajın işleyicilerde geçirdiği süre"""
+        self._type(msg_type).handler.add(seconds)
+
+    def _check_sequence(self, msg) -> None:
+        """MAVLink sequence boşluklarından kayıp paket say (kaynak sysid/compid bazında)"""
+        source = (msg.get_srcSystem(), msg.get_srcComponent())
+        seq = msg.get_seq()
+        last = self._last_seq.get(source)
+        self._last_seq[source] = seq
+        if last is None:
+            return
+        gap = (seq - last - 1) % 256
+        if gap and gap < 128:  # Büyük sıçramalar genelde yeniden başlatmadır
+            self.dropped += gap
+            self.dropped_by_source[source] = self.dropped_by_source.get(source, 0) + gap
+
+    def record_radio(self, msg) -> None:
+        """RADIO_STATUS: telemetri modemi tarafındaki sinyal ve hata sayaçları"""
+        self.radio = {
+            'rssi': msg.rssi,
+            'remrssi': msg.remrssi,
+            'rxerrors': msg.rxerrors,
+            'fixed': msg.fixed,
+            'txbuf': msg.txbuf,
+        }
+
+    @property
+    def loss_percent(self) -> float:
+        total = self.received + self.dropped
+        return (self.dropped / total) * 100.0 if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Arayüz/API için özet: mesaj tipi bazında hız, bant genişliği ve gecikmeler"""
+        now = time.monotonic()
+        types = {}
+        for msg_type, stats in list(self._types.items()):
+            rate, bps = stats.current_rate(now)
+            types[msg_type] = {
+                'count': stats.count,
+                'bytes': stats.bytes,
+                'rate_hz': rate,
+                'bytes_per_s': bps,
+                'decode': stats.decode.summary(),
+                'handler': stats.handler.summary(),
+            }
+        return {
+            'types': types,
+            'received': self.received,
+            'dropped': self.dropped,
+            'dropped_by_source': dict(self.dropped_by_source),
+            'bad_data': self.bad_data,
+            'loss_percent': self.loss_percent,
+            'bytes_per_s': sum(t['bytes_per_s'] for t in types.values()),
+            'ping_ms': self.ping_ms,
+            'radio': dict(self.radio),
+            'uptime': now - self.started,
+        }
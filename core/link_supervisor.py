@@ -0,0 +1,277 @@
+import random
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from pymavlink import mavutil
+
+# Telemetri radyoları ve USB için olasılık sırasına göre baud hızları
+DEFAULT_BAUDS: Tuple[int, ...] = (57600, 115200, 921600, 460800, 230400, 38400, 19200, 9600)
+
+_GARBAGE = object()  # Bayt geliyor ama geçerli paket çıkmıyor: yanlış baud
+
+
+def is_vehicle_heartbeat(msg) -> bool:
+    """GCS ve geçersiz otopilot (kamera, companion vb.) heartbeat'leri araç değildir"""
+    return (msg.get_type() == 'HEARTBEAT' and msg.type != mavutil.mavlink.MAV_TYPE_GCS
+            and msg.autopilot != mavutil.mavlink.MAV_AUTOPILOT_INVALID)
+
+
+def serial_ports() -> List[str]:
+    """Sistemdeki seri portlar; USB/ACM (Pixhawk, SiK radyo) önce"""
+    try:
+        from serial.tools import list_ports
+    except ImportError:
+        return []
+    ports = list(list_ports.comports())
+    ports.sort(key=lambda p: (p.vid is None, p.device))
+    return [p.device for p in ports]
+
+
+def is_serial_device(device: str) -> bool:
+    """pymavlink bağlantı dizesi değilse (udpin:, tcp: ...) seri port kabul edilir"""
+    return ':' not in device
+
+
+class Backoff:
+    """Yeniden bağlanma için üstel bekleme (sarsıntılı)"""
+
+    def __init__(self, initial: float = 0.5, maximum: float = 10.0, factor: float = 2.0, jitter: float = 0.1):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        delay = min(self.maximum, self.initial * (self.factor ** self.attempts))
+        self.attempts += 1
+        return delay * (1.0 + random.uniform(-self.jitter, self.jitter))
+
+    def reset(self) -> None:
+        self.attempts = 0
+
+
+class ProbeResult:
+    """Heartbeat alınan aday: açık bağlantı tekrar açılmadan MAVLinkThread'e devredilir"""
+
+    def __init__(self, device: str, baud: int, connection, heartbeat, elapsed: float):
+        self.device = device
+        self.baud = baud
+        self.connection = connection
+        self.heartbeat = heartbeat
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return f"{self.device} @ {self.baud} ({self.elapsed:.2f} s)"
+
+
+class PortProber:
+    """Aday portları paralel (port başına bir thread) tarayan heartbeat algılayıcı.
+
+    Aynı port aynı anda tek baud'da açılabildiği için baud hızları port
+    thread'inde sırayla denenir; port yeniden açılmaz, yalnızca baud değiştirilir.
+    Çöp bayt gelip geçerli paket çıkmıyorsa baud hemen değiştirilir; geçerli
+    paket varsa heartbeat için bir süre daha beklenir.
+    """
+
+    HEARTBEAT_WINDOW = 1.3   # Geçerli paket alınan baud'da heartbeat bekleme süresi (s)
+    GARBAGE_WINDOW = 0.3     # Yalnızca çöp bayt gelirse baud değiştirme süresi (s)
+    SILENT_WINDOW = 1.1      # Hiç bayt gelmeyen baud'da bekleme süresi (s)
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, open_connection: Callable[[str, int], Any] = None):
+        self._open_connection = open_connection or self._default_open
+
+    @staticmethod
+    def _default_open(device: str, baud: int):
+        return mavutil.mavlink_connection(device, baud=baud, autoreconnect=False)
+
+    def _listen(self, conn, stop: threading.Event, deadline: float):
+        """Tek baud'da dinle: heartbeat mesajını, yanlış baud ise _GARBAGE, sessizse None döndür"""
+        start = time.monotonic()
+        got_bytes = False
+        got_packet = False
+        while not stop.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                return None
+            elapsed = now - start
+            if got_packet:
+                if elapsed > self.HEARTBEAT_WINDOW:
+                    return None
+            elif got_bytes and elapsed > self.GARBAGE_WINDOW:
+                return _GARBAGE
+            elif elapsed > self.SILENT_WINDOW:
+                return None
+            msg = conn.recv_msg()
+            if msg is None:
+                if getattr(conn.mav, 'buf_len', lambda: 0)():
+                    got_bytes = True
+                time.sleep(self.POLL_INTERVAL)
+                continue
+            if msg.get_type() == 'BAD_DATA':
+                got_bytes = True
+                continue
+            got_packet = True
+            if is_vehicle_heartbeat(msg):
+                return msg
+        return None
+
+    def probe(self, device: str, bauds: Sequence[int], stop: threading.Event,
+              deadline: float) -> Optional[ProbeResult]:
+        """Portu aç, baud'ları sırayla dene; heartbeat bulunursa bağlantı açık döner"""
+        start = time.monotonic()
+        conn = None
+        try:
+            for baud in bauds:
+                if stop.is_set() or time.monotonic() >= deadline:
+                    break
+                if conn is None:
+                    conn = self._open_connection(device, baud)
+                elif hasattr(conn, 'set_baudrate'):
+                    conn.set_baudrate(baud)
+                    port = getattr(conn, 'port', None)
+                    if hasattr(port, 'reset_input_buffer'):
+                        port.reset_input_buffer()  # Eski baud'dan kalan baytları at
+                else:
+                    break  # Ağ bağlantısı: baud anlamsız
+                result = self._listen(conn, stop, deadline)
+                if result is not None and result is not _GARBAGE:
+                    if stop.is_set():
+                        break  # Başka port kazandı
+                    found = ProbeResult(device, baud, conn, result, time.monotonic() - start)
+                    conn = None
+                    return found
+        except Exception:
+            pass  # Port meşgul / yok
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        return None
+
+    def detect(self, candidates: Sequence[Tuple[str, Sequence[int]]], timeout: float = 10.0,
+               stop: Optional[threading.Event] = None) -> Optional[ProbeResult]:
+        """Adayları paralel tara; ilk heartbeat bulunan adayı döndür (diğerleri kapatılır)"""
+        if not candidates:
+            return None
+        done = threading.Event()
+        lock = threading.Lock()
+        winner: List[ProbeResult] = []
+        deadline = time.monotonic() + timeout
+
+        def worker(device: str, bauds: Sequence[int]) -> None:
+            result = self.probe(device, bauds, done, deadline)
+            if result is None:
+                return
+            with lock:
+                if winner:
+                    try:
+                        result.connection.close()
+                    except Exception:
+                        pass
+                    return
+                winner.append(result)
+            done.set()
+
+        threads = [threading.Thread(target=worker, args=candidate, name=f'Probe-{candidate[0]}', daemon=True)
+                   for candidate in candidates]
+        for thread in threads:
+            thread.start()
+        while not done.is_set() and any(t.is_alive() for t in threads):
+            if stop is not None and stop.is_set():
+                break
+            done.wait(0.05)
+        done.set()  # Kalan port thread'leri kendi bağlantılarını kapatıp çıkar
+        with lock:
+            return winner[0] if winner else None
+
+
+class LinkSupervisor:
+    """Bağlantı gözetmeni: otomatik algılama ve kopunca üstel beklemeyle yeniden bağlanma.
+
+    Durum MAVLink thread'inde tutulur; detect() bağlantı yokken o thread'de
+    çalışır ve stop olayı ile kesilebilir. Son çalışan port/baud ilk sırada denenir.
+    """
+
+    DETECT_TIMEOUT = 6.0
+
+    def __init__(self, prober: Optional[PortProber] = None, list_ports: Callable[[], List[str]] = serial_ports):
+        self.prober = prober or PortProber()
+        self.list_ports = list_ports
+        self.backoff = Backoff()
+        self.enabled = False       # Kopunca yeniden bağlan / otomatik algıla
+        self.device: Optional[str] = None  # Sabit port (None: tüm seri portlar)
+        self.baud: Optional[int] = None    # Sabit baud (None: tüm baud'lar)
+        self.last_good: Optional[Tuple[str, int]] = None
+        self.bauds: Tuple[int, ...] = DEFAULT_BAUDS
+        self._next_attempt = 0.0
+        self.stop_event = threading.Event()
+        self.stats = {'attempts': 0, 'failures': 0, 'reconnects': 0, 'last_detect_time': 0.0}
+
+    def arm(self, device: Optional[str] = None, baud: Optional[int] = None) -> None:
+        """Gözetimi aç; device/baud verilmezse otomatik algılanır"""
+        self.device = device
+        self.baud = baud
+        self.enabled = True
+        self.stop_event.clear()
+        self.backoff.reset()
+        self._next_attempt = 0.0
+
+    def disarm(self) -> None:
+        self.enabled = False
+        self.stop_event.set()
+
+    def remember(self, device: str, baud: int) -> None:
+        self.last_good = (device, baud)
+
+    def candidates(self) -> List[Tuple[str, Sequence[int]]]:
+        """(port, baud sırası) listesi; son çalışan kombinasyon önce"""
+        if self.device is not None and not is_serial_device(self.device):
+            return [(self.device, (self.baud or 0,))]
+        devices = [self.device] if self.device is not None else self.list_ports()
+        if self.last_good is not None and self.device is None and self.last_good[0] in devices:
+            devices.remove(self.last_good[0])
+            devices.insert(0, self.last_good[0])
+        result = []
+        for device in devices:
+            if self.baud is not None:
+                bauds: Tuple[int, ...] = (self.baud,)
+            else:
+                bauds = self.bauds
+                if self.last_good is not None and self.last_good[0] == device:
+                    bauds = (self.last_good[1],) + tuple(b for b in bauds if b != self.last_good[1])
+            result.append((device, bauds))
+        return result
+
+    def time_until_attempt(self, now: Optional[float] = None) -> float:
+        if not self.enabled:
+            return float('inf')
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._next_attempt - now)
+
+    def attempt(self) -> Optional[ProbeResult]:
+        """Tek algılama turu; başarısızsa bir sonraki deneme üstel beklemeyle ertelenir"""
+        self.stats['attempts'] += 1
+        start = time.monotonic()
+        result = self.prober.detect(self.candidates(), self.DETECT_TIMEOUT, self.stop_event)
+        if result is None:
+            self.stats['failures'] += 1
+            self._next_attempt = time.monotonic() + self.backoff.next_delay()
+            return None
+        self.stats['last_detect_time'] = time.monotonic() - start
+        return result
+
+    def connected(self, device: str, baud: int) -> None:
+        if self.last_good is not None:
+            self.stats['reconnects'] += 1
+        self.remember(device, baud)
+        self.backoff.reset()
+
+    def lost(self) -> None:
+        """Bağlantı koptu: ilk deneme hemen, sonrakiler üstel beklemeyle"""
+        self.backoff.reset()
+        self._next_attempt = 0.0
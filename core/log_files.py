@@ -0,0 +1,75 @@
+import gzip
+import io
+import os
+from typing import IO, Optional
+
+# Akışlı sıkıştırma: kayıtlar yazılırken sıkıştırılır, okurken açılarak okunur (diske açılmaz)
+COMPRESSORS = {'gzip': '.gz'}
+COMPRESS_LEVEL = 6          # 9'a göre çok daha hızlı, boyut farkı küçük
+_GZIP_MAGIC = b'\x1f\x8b'
+_CHUNK = 1 << 20
+
+
+def is_compressed(path: str) -> bool:
+    """Dosya gzip akışı mı (uzantıya değil içeriğe bakılır)"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(2) == _GZIP_MAGIC
+    except OSError:
+        return False
+
+
+def strip_compression(path: str) -> str:
+    """'kayit.csv.gz' -> 'kayit.csv'"""
+    for suffix in COMPRESSORS.values():
+        if path.lower().endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+
+def open_log(path: str, mode: str = 'rt', compress: Optional[str] = None,
+             encoding: Optional[str] = 'utf-8', errors: Optional[str] = None,
+             newline: Optional[str] = None) -> IO:
+    """Kayıt dosyasını aç; sıkıştırılmışsa akış halinde açıp/sıkıştırarak.
+
+    Okumada sıkıştırma içerikten anlaşılır; yazmada compress ya da '.gz' uzantısı
+    belirler. Metin kipinde encoding/errors/newline open() ile aynı anlamdadır.
+    """
+    binary = 'b' in mode
+    if 'r' in mode:
+        gz = is_compressed(path)
+    else:
+        gz = compress == 'gzip' or (compress is None and path.lower().endswith('.gz'))
+    if not gz:
+        if binary:
+            return open(path, mode)
+        return open(path, mode, encoding=encoding, errors=errors, newline=newline)
+    raw = gzip.open(path, mode.replace('t', '').replace('b', '') + 'b', compresslevel=COMPRESS_LEVEL)
+    if binary:
+        return raw
+    return io.TextIOWrapper(raw, encoding=encoding, errors=errors, newline=newline)
+
+
+def read_log_bytes(path: str) -> bytes:
+    """Dosyanın tamamı (sıkıştırılmışsa açılmış hali) bellekte.
+
+    Yarım kalmış gzip akışında (kayıt sırasında çökme) okunabilen kısım döner.
+    """
+    with open_log(path, 'rb') as f:
+        if not isinstance(f, gzip.GzipFile):
+            return f.read()
+        out = bytearray()
+        try:
+            while True:
+                chunk = f.read1(_CHUNK)  # Akış kesilirse o ana kadar açılanlar kaybolmaz
+                if not chunk:
+                    break
+                out += chunk
+        except (EOFError, gzip.BadGzipFile) as e:
+            print(f"[LOG] Sıkıştırılmış kayıt yarım kalmış, {len(out)} bayt okunabildi: {e}")
+        return bytes(out)
+
+
+def disk_size(f) -> int:
+    """Açık kayıt dosyasının diskteki (sıkıştırılmış) boyutu"""
+    return os.fstat(f.fileno()).st_size
@@ -0,0 +1,334 @@
+import glob
+import json
+import os
+import shutil
+import struct
+import time
+import zlib
+from datetime import datetime
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from core.log_files import open_log
+
+# Günlüklü (journal) kayıt: telemetri CSV metni ve sistem günlüğü satırları önce
+# '<csv yolu>.journal/' dizinindeki yalnızca-eklenen segmentlere yazılır.
+#   segment: SEGMENT_MAGIC, u32 json uzunluğu, oturum başlığı JSON'u, kayıtlar
+#   kayıt:   u8 tür, u32 uzunluk, u32 crc32 (tür + veri), veri
+# Her yazma turu ROWS/LINES kayıtlarından sonra bir COMMIT ile biter; son COMMIT'ten
+# sonrası (yarım tur) kurtarmada atılır. Segment SEGMENT_BYTES'ı aşınca diske
+# zorlanıp kapatılır, bu yüzden kurtarmada yalnızca son segment taranıp onarılır.
+# Temiz kapanışta ve kurtarmada segmentler CSV/.log dosyalarına aktarılır, oturum
+# log_index.jsonl dizinine eklenir ve journal dizini silinir.
+# Açık journal dizinindeki kilit dosyası (PID içerir) yazan süreç boyunca kilitli
+# tutulur; kurtarma kilidi alamadığı journal'ı (başka bir GCS'in canlı oturumu) atlar.
+SEGMENT_MAGIC = b'GCSJNL1\n'
+SEGMENT_BYTES = 1 << 20
+INDEX_NAME = 'log_index.jsonl'
+LOCK_NAME = 'lock'
+_RECORD = struct.Struct('<BII')
+_COMMIT = struct.Struct('<QQ')  # Toplam satır, toplam günlük satırı
+ROWS, LINES, COMMIT, SEAL = 1, 2, 3, 4
+
+
+def _record(kind: int, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(bytes((kind,))))
+    return _RECORD.pack(kind, len(payload), crc) + payload
+
+
+def _acquire_lock(directory: str) -> Optional[IO]:
+    """Journal dizininin kilidini al; başka bir süreç (ya da açık LogJournal) tutuyorsa None"""
+    f = open(os.path.join(directory, LOCK_NAME), 'a+b')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()).encode('ascii'))
+    f.flush()
+    return f
+
+
+def _remove_journal(directory: str, lock: IO) -> None:
+    """Segmentleri kilit altında sil, sonra kilidi bırakıp dizini kaldır"""
+    for path in _segments(directory):
+        os.remove(path)
+    lock.close()  # Segmentsiz dizini kurtarma zaten atlar
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _segment_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"{number:06d}.seg")
+
+
+def _read_header(data: bytes) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Segment başlığı ve kayıtların başladığı ofset; geçersizse (None, 0)"""
+    start = len(SEGMENT_MAGIC) + 4
+    if data[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC or len(data) < start:
+        return None, 0
+    (length,) = struct.unpack_from('<I', data, len(SEGMENT_MAGIC))
+    try:
+        return json.loads(data[start:start + length].decode('utf-8')), start + length
+    except ValueError:
+        return None, 0
+
+
+def scan_segment(data: bytes, start: int) -> Tuple[int, List[Tuple[int, bytes]], bool]:
+    """Kayıtları CRC ile doğrulayarak tara.
+
+    (son COMMIT/SEAL sonrası ofset, o noktaya kadarki kayıtlar, SEAL görüldü mü) döner;
+    bozuk ya da yarım kayıtta tarama durur.
+    """
+    pos = committed = start
+    records: List[Tuple[int, bytes]] = []
+    kept = 0
+    sealed = False
+    size = len(data)
+    while pos + _RECORD.size <= size:
+        kind, length, crc = _RECORD.unpack_from(data, pos)
+        end = pos + _RECORD.size + length
+        if end > size:
+            break
+        payload = data[pos + _RECORD.size:end]
+        if kind not in (ROWS, LINES, COMMIT, SEAL) or zlib.crc32(payload, zlib.crc32(bytes((kind,)))) != crc:
+            break
+        records.append((kind, payload))
+        pos = end
+        if kind in (COMMIT, SEAL):
+            committed = pos
+            kept = len(records)
+            sealed = sealed or kind == SEAL
+    return committed, records[:kept], sealed
+
+
+class LogJournal:
+    """CSV telemetri ve sistem günlüğü için yalnızca-eklenen, CRC'li segment günlüğü.
+
+    DataLogger'ın yazıcı thread'i her turda append() çağırır; satırlar ve günlük
+    satırları tek commit olarak eklenir. close() yalnızca mühür kaydını yazıp diske
+    zorlar (hızlı); finish() segmentleri hedef dosyalara aktarır, oturumu dizine
+    ekler ve journal'ı siler. Oturum sürerken CSV/.log dosyaları yoktur, veri
+    yalnızca segmentlerdedir. Dizin kilidi finish() bitene kadar tutulur.
+    """
+
+    def __init__(self, csv_path: str, log_path: str, csv_header: str, compress: Optional[str] = None,
+                 segment_bytes: int = SEGMENT_BYTES):
+        self.csv_path = csv_path
+        self.log_path = log_path
+        self.directory = csv_path + '.journal'
+        self.segment_bytes = segment_bytes
+        self.header = {
+            'version': 1,
+            'csv': os.path.basename(csv_path),
+            'log': os.path.basename(log_path),
+            'csv_header': csv_header,
+            'compress': compress,
+            'started': datetime.now().isoformat(),
+        }
+        self.rows = 0
+        self.lines = 0
+        self.bytes = 0       # Tüm segmentlere yazılan toplam bayt
+        self.segments = 0
+        self.closed = False
+        self.finished = False
+        self._file = None
+        os.makedirs(self.directory)
+        # Kilit ilk segmentten önce alınır: segmenti olan journal'ın kilidi hep tutulmuştur
+        self._lock = _acquire_lock(self.directory)
+        if self._lock is None:
+            raise OSError(f"Journal başka bir süreç tarafından kullanılıyor: {self.directory}")
+        self._open_segment()
+
+    def _open_segment(self) -> None:
+        self.segments += 1
+        header = json.dumps(dict(self.header, segment=self.segments)).encode('utf-8')
+        self._file = open(_segment_path(self.directory, self.segments), 'wb')
+        data = SEGMENT_MAGIC + struct.pack('<I', len(header)) + header
+        self._file.write(data)
+        self._segment_size = len(data)
+        self.bytes += len(data)
+
+    def append(self, rows_text: str, rows: int, lines_text: str, lines: int) -> None:
+        """Bir yazma turunu commit ile ekle ve işletim sistemine aktar"""
+        self.rows += rows
+        self.lines += lines
+        parts = []
+        if rows_text:
+            parts.append(_record(ROWS, rows_text.encode('utf-8')))
+        if lines_text:
+            parts.append(_record(LINES, lines_text.encode('utf-8')))
+        parts.append(_record(COMMIT, _COMMIT.pack(self.rows, self.lines)))
+        data = b''.join(parts)
+        self._file.write(data)
+        self._file.flush()
+        self._segment_size += len(data)
+        self.bytes += len(data)
+        if self._segment_size >= self.segment_bytes:
+            # Dolan segment kalıcı hale getirilir; kurtarma yalnızca son segmenti onarır
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._open_segment()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        """Mühür kaydını yazıp diske zorla; aktarım finish() ile yapılır"""
+        if self.closed:
+            return
+        self.closed = True
+        self._file.write(_record(SEAL, _COMMIT.pack(self.rows, self.lines)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def finish(self) -> Dict[str, Any]:
+        """Hedef CSV/.log dosyalarına aktar, dizine ekle, segmentleri sil ve kilidi bırak"""
+        self.close()
+        try:
+            info = materialize(self.directory)
+            info['recovered'] = False
+            append_index(os.path.dirname(self.csv_path), info)
+        except (OSError, ValueError):
+            self._lock.close()  # Journal diskte kalır, recover_journals() aktarabilsin
+            raise
+        _remove_journal(self.directory, self._lock)
+        self.finished = True
+        return info
+
+
+def _segments(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, '*.seg')))
+
+
+def materialize(directory: str) -> Dict[str, Any]:
+    """Segmentlerdeki onaylanmış kayıtları CSV ve .log dosyalarına yaz"""
+    segments = _segments(directory)
+    header = None
+    rows = lines = 0
+    sealed = False
+    csv_file = log_file = None
+    base = os.path.dirname(directory)
+    try:
+        for path in segments:
+            with open(path, 'rb') as f:
+                data = f.read()
+            seg_header, start = _read_header(data)
+            if seg_header is None:
+                continue
+            if header is None:
+                header = seg_header
+                compress = header.get('compress')
+                csv_file = open_log(os.path.join(base, header['csv']), 'wt', compress=compress, newline='')
+                log_file = open_log(os.path.join(base, header['log']), 'wt', compress=compress)
+                csv_file.write(header['csv_header'])
+            _, records, seg_sealed = scan_segment(data, start)
+            sealed = sealed or seg_sealed
+            for kind, payload in records:
+                if kind == ROWS:
+                    csv_file.write(payload.decode('utf-8'))
+                elif kind == LINES:
+                    log_file.write(payload.decode('utf-8'))
+                else:
+                    rows, lines = _COMMIT.unpack(payload)
+    finally:
+        for f in (csv_file, log_file):
+            if f is not None:
+                f.close()
+    if header is None:
+        raise ValueError(f"Geçerli journal segmenti yok: {directory}")
+    return {'csv': os.path.join(base, header['csv']), 'log': os.path.join(base, header['log']),
+            'started': header['started'], 'closed': datetime.now().isoformat(),
+            'rows': rows, 'lines': lines, 'segments': len(segments), 'sealed': sealed}
+
+
+def append_index(directory: str, entry: Dict[str, Any]) -> None:
+    """Oturumu log dizinine (log_index.jsonl) ekle"""
+    with open(os.path.join(directory, INDEX_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_index(directory: str = '') -> List[Dict[str, Any]]:
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # Yarım yazılmış son satır
+    return entries
+
+
+def repair_last_segment(directory: str) -> Dict[str, Any]:
+    """Son segmenti son commit'e kadar kırp (önceki segmentler kapanırken diske zorlanmıştı)"""
+    segments = _segments(directory)
+    if not segments:
+        return {'segment': None, 'truncated_bytes': 0}
+    path = segments[-1]
+    with open(path, 'rb') as f:
+        data = f.read()
+    header, start = _read_header(data)
+    if header is None:
+        # Başlığı bile yazılamamış segment: içinde onaylanmış veri yok
+        os.remove(path)
+        return {'segment': os.path.basename(path), 'truncated_bytes': len(data)}
+    committed, _, _ = scan_segment(data, start)
+    if committed < len(data):
+        with open(path, 'r+b') as f:
+            f.truncate(committed)
+            os.fsync(f.fileno())
+    return {'segment': os.path.basename(path), 'truncated_bytes': len(data) - committed}
+
+
+def recover_journals(directory: str = '') -> List[Dict[str, Any]]:
+    """Önceki çalıştırmadan kalan (kapanmamış) journal'ları onar, dosyalara aktar ve dizine ekle"""
+    recovered = []
+    for journal in sorted(glob.glob(os.path.join(directory, '*.journal'))):
+        # Segmentsiz dizin: henüz açılmakta olan (kilidi alınmadan önceki an) ya da boş journal
+        if not os.path.isdir(journal) or not _segments(journal):
+            continue
+        lock = _acquire_lock(journal)
+        if lock is None:
+            print(f"[LOG] Journal kullanımda, atlandı: {journal}")
+            continue
+        if not _segments(journal):
+            lock.close()  # Kilidi beklerken sahibi aktarıp segmentleri sildi
+            continue
+        t0 = time.perf_counter()
+        try:
+            repair = repair_last_segment(journal)
+            repair_ms = (time.perf_counter() - t0) * 1000.0
+            info = materialize(journal)
+        except (OSError, ValueError) as e:
+            lock.close()
+            print(f"[LOG] Journal kurtarılamadı ({journal}): {e}")
+            continue
+        info.update(recovered=True, truncated_bytes=repair['truncated_bytes'], repair_ms=round(repair_ms, 3))
+        if not info['sealed']:
+            with open_log(info['log'], 'at') as f:
+                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [SYSTEM] Oturum çökme sonrası "
+                        f"kurtarıldı: {info['rows']} satır, {repair['truncated_bytes']} bayt yarım kayıt atıldı\n")
+        append_index(directory, info)
+        _remove_journal(journal, lock)
+        print(f"[LOG] Kurtarıldı: {info['csv']} ({info['rows']} satır, onarım {repair_ms:.1f} ms)")
+        recovered.append(info)
+    return recovered
@@ -1,12 +1,14 @@
 import csv
 import time
-from PyQt6.QtCore import QThread, pyqtSignal
+from core.columnar_log import ColumnarLogReader, is_columnar_log
+from core.event_bus import Signal, Worker
+from core.log_files import open_log
 
-class LogReplayThread(QThread):
-    telemetry_updated = pyqtSignal(dict)
-    position_updated = pyqtSignal(float, float, float)  # lat, lon, heading
-    seek_updated = pyqtSignal(int)
-    finished = pyqtSignal()
+class LogReplayThread(Worker):
+    telemetry_updated = Signal(dict)
+    position_updated = Signal(float, float, float)  # lat, lon, heading
+    seek_updated = Signal(int)
+    finished = Signal()
 
     def __init__(self, log_path, speed=1.0, parent=None):
         super().__init__(parent)
@@ -21,16 +23,29 @@ class LogReplayThread(QThread):
         self._load_log()
 
     def _load_log(self):
+        if is_columnar_log(self.log_path):
+            # Sütunlu kayıt: sütunlar toplu okunur, satır sözlükleri erişildikçe kurulur
+            try:
+                reader = ColumnarLogReader(self.log_path)
+                try:
+                    self._rows = reader.csv_rows()
+                finally:
+                    reader.close()
+                print(f"[LogReplayThread] Loaded {len(self._rows)} log entries from {self.log_path} (columnar)")
+            except Exception as e:
+                print(f'[LogReplayThread] Log dosyası okunamıyor: {e}')
+                self._rows = []
+        else:
+            self._load_csv()
+        self._check_rows()
+
+    def _load_csv(self):
         try:
-            with open(self.log_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self._rows = list(reader)
+            self._rows = self._read_csv('utf-8')
             print(f"[LogReplayThread] Loaded {len(self._rows)} log entries from {self.log_path}")
         except UnicodeDecodeError:
             try:
-                with open(self.log_path, 'r', encoding='latin1') as f:
-                    reader = csv.DictReader(f)
-                    self._rows = list(reader)
+                self._rows = self._read_csv('latin1')
                 print(f"[LogReplayThread] Loaded {len(self._rows)} log entries from {self.log_path} (latin1 encoding)")
             except Exception as e:
                 print(f'[LogReplayThread] Log dosyası okunamıyor: {e}')
@@ -38,7 +53,18 @@ class LogReplayThread(QThread):
         except Exception as e:
             print(f'[LogReplayThread] Log dosyası okunamıyor: {e}')
             self._rows = []
-        
+
+    def _read_csv(self, encoding):
+        # .gz kayıtlar akış halinde açılır; yarım kalmış sıkıştırılmış kayıtta okunabilen satırlar alınır
+        rows = []
+        with open_log(self.log_path, 'rt', encoding=encoding) as f:
+            try:
+                rows.extend(csv.DictReader(f))
+            except EOFError as e:
+                print(f"[LogReplayThread] Sıkıştırılmış kayıt yarım kalmış, {len(rows)} satır okundu: {e}")
+        return rows
+
+    def _check_rows(self):
         # Check if log file is empty or has no data rows
         if len(self._rows) == 0:
             print(f"[LogReplayThread] WARNING: Log file is empty or has no data rows: {self.log_path}")
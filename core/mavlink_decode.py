@@ -0,0 +1,208 @@
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+# Tercih sırası: ölçümde eşitlik olursa öndeki seçilir
+DECODERS = ('native', 'framed', 'pymavlink')
+# Referans çözücüyü bu oranda geçmeyen aday seçilmez (ölçüm gürültüsü)
+MIN_SPEEDUP = 1.05
+
+_active: Optional[str] = None
+_selection: Dict[str, Any] = {}
+
+
+class FramedParser:
+    """Paket sınırlarını doğrudan bulup her paketi mav.decode() ile çözen ayrıştırıcı.
+
+    pymavlink'in parse_buffer'ı her paket için parse_char/bytes_needed üzerinden
+    tampon dilimler; burada tampon bir kez taranır. Bozuk önek ve CRC hatalarında
+    pymavlink'in robust_parsing davranışı (BAD_DATA mesajları) aynen korunur.
+    """
+
+    def __init__(self, mav):
+        self.mav = mav
+        self.module = sys.modules[type(mav).__module__]
+        m = self.module
+        self._v1, self._v2 = m.PROTOCOL_MARKER_V1, m.PROTOCOL_MARKER_V2
+        self._v1_overhead = m.HEADER_LEN_V1 + 2
+        self._v2_overhead = m.HEADER_LEN_V2 + 2
+        self._signature_len = m.MAVLINK_SIGNATURE_BLOCK_LEN
+        self._signed = m.MAVLINK_IFLAG_SIGNED
+        # pymavlink tamponunda kalan yarım paket (bağlantı testi recv_match ile okunmuş olabilir)
+        self.buf = bytearray(mav.buf[mav.buf_index:])
+        mav.buf = bytearray()
+        mav.buf_index = 0
+        mav.expected_length = m.HEADER_LEN_V1 + 2
+
+    def parse_buffer(self, data) -> List[Any]:
+        m = self.module
+        mav = self.mav
+        buf = self.buf
+        buf.extend(data)
+        mav.total_bytes_received += len(data)
+        decode = mav.decode
+        v1, v2 = self._v1, self._v2
+        messages = []
+        pos = 0
+        n = len(buf)
+        while pos < n:
+            magic = buf[pos]
+            if magic == v2:
+                if n - pos < 3:
+                    break
+                flags = buf[pos + 2]
+                length = buf[pos + 1] + self._v2_overhead
+                if flags & self._signed:
+                    length += self._signature_len
+            elif magic == v1:
+                if n - pos < 3:
+                    break
+                flags = 0
+                length = buf[pos + 1] + self._v1_overhead
+            else:
+                end = pos + 1
+                while end < n and buf[end] != v1 and buf[end] != v2:
+                    end += 1
+                messages.append(m.MAVLink_bad_data(buf[pos:end], "Bad prefix"))
+                mav.total_receive_errors += 1
+                pos = end
+                continue
+            if n - pos < length:
+                break
+            frame = buf[pos:pos + length]
+            pos += length
+            try:
+                if flags & ~self._signed:
+                    raise m.MAVError("invalid incompat_flags 0x%x 0x%x %u" % (flags, magic, length))
+                messages.append(decode(frame))
+            except m.MAVError as reason:
+                messages.append(m.MAVLink_bad_data(frame, reason.message))
+                mav.total_receive_errors += 1
+        if pos:
+            del buf[:pos]
+        mav.total_packets_received += len(messages)
+        return messages
+
+
+def native_available() -> bool:
+    """pymavlink C ayrıştırıcısı (mavnative) kurulu ve bu sürümde destekleniyor mu"""
+    try:
+        from pymavlink import mavnative  # noqa: F401
+    except ImportError:
+        return False
+    return hasattr(mavlink2.MAVLink, '_MAVLink__parse_char_native')
+
+
+def crc_backend() -> str:
+    """pymavlink'in kullandığı CRC gerçeklemesi: 'fastcrc' (C) ya da 'python'"""
+    return 'fastcrc' if getattr(mavlink2, 'mcrf4xx', None) is not None else 'python'
+
+
+def available_decoders() -> List[str]:
+    return [name for name in DECODERS if name != 'native' or native_available()]
+
+
+def make_parser(name: str, mav) -> Callable[[Any], Optional[List[Any]]]:
+    """mav için çözücü fonksiyonu: bayt -> mesaj listesi (boş ya da None olabilir)"""
+    if name == 'framed' and mav.robust_parsing:
+        return FramedParser(mav).parse_buffer
+    if name == 'native' and native_available():
+        from pymavlink import mavnative
+        module = sys.modules[type(mav).__module__]
+        mav.native = mavnative.NativeConnection(module.MAVLink_message, module.mavlink_map)
+    return mav.parse_buffer
+
+
+def sample_stream(count: int = 2000, garbage_every: int = 250) -> bytes:
+    """Tipik telemetri karışımından kayıt benzeri bayt akışı (aralarda bozuk bayt ve CRC hatası)"""
+    mav = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+    builders = (
+        lambda i: mavlink2.MAVLink_attitude_message(i * 10, 0.1, -0.05, 1.5, 0.01, 0.02, 0.03),
+        lambda i: mavlink2.MAVLink_attitude_message(i * 10 + 5, 0.11, -0.04, 1.51, 0.01, 0.02, 0.03),
+        lambda i: mavlink2.MAVLink_global_position_int_message(i * 10, 400000000 + i, 290000000 + i,
+                                                               100000, 50000, 120, -30, 5, 9000),
+        lambda i: mavlink2.MAVLink_vfr_hud_message(18.0, 17.5, 90, 45, 100.0, 0.5),
+        lambda i: mavlink2.MAVLink_gps_raw_int_message(i * 1000, 3, 400000000, 290000000, 100000,
+                                                       120, 150, 1750, 9000, 12),
+        lambda i: mavlink2.MAVLink_sys_status_message(0, 0, 0, 500, 12400, 1500, 80, 0, 0, 0, 0, 0, 0),
+        lambda i: mavlink2.MAVLink_heartbeat_message(1, 3, 81, 10, 4, 3),
+    )
+    out = bytearray()
+    for i in range(count):
+        buf = bytearray(builders[i % len(builders)](i).pack(mav))
+        mav.seq = (mav.seq + 1) % 256
+        if garbage_every and i % garbage_every == garbage_every - 1:
+            out += b'\x00\x17garbage'
+            buf[-1] ^= 0xFF  # CRC hatası: BAD_DATA olarak dönmeli
+        out += buf
+    return bytes(out)
+
+
+def _run(name: str, data: bytes, chunk: int) -> List[Any]:
+    mav = mavlink2.MAVLink(None)
+    mav.robust_parsing = True
+    parse = make_parser(name, mav)
+    messages: List[Any] = []
+    for i in range(0, len(data), chunk):
+        parsed = parse(data[i:i + chunk])
+        if parsed:
+            messages.extend(parsed)
+    return messages
+
+
+def benchmark(data: bytes, decoders: Optional[Iterable[str]] = None, chunk: int = 4096,
+              repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Her çözücüyü aynı akışta çalıştır: msg/s, MB/s ve referansla (pymavlink) birebir eşleşme"""
+    names = [n for n in (decoders or available_decoders()) if n in available_decoders()]
+    reference = [(msg.get_type(), bytes(msg.get_msgbuf())) for msg in _run('pymavlink', data, chunk)]
+    results = {}
+    for name in names:
+        best = None
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            messages = _run(name, data, chunk)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        decoded = [(msg.get_type(), bytes(msg.get_msgbuf())) for msg in messages]
+        results[name] = {
+            'messages': len(messages),
+            'bad_data': sum(1 for t, _ in decoded if t == 'BAD_DATA'),
+            'seconds': best,
+            'msgs_per_s': len(messages) / best if best else 0.0,
+            'mb_per_s': len(data) / best / 1e6 if best else 0.0,
+            'matches_reference': decoded == reference,
+        }
+    return results
+
+
+def select_decoder(force: Optional[str] = None) -> str:
+    """En hızlı doğru çözücüyü seç (süreç başına bir kez ölçülür) ve başlangıçta bildir"""
+    global _active, _selection
+    if force is not None:
+        _active = force if force in available_decoders() else 'pymavlink'
+        _selection = {'decoder': _active, 'forced': True, 'crc': crc_backend()}
+        return _active
+    if _active is not None:
+        return _active
+    results = benchmark(sample_stream(), repeat=2)
+    baseline = results['pymavlink']['msgs_per_s']
+    choice = 'pymavlink'
+    for name in DECODERS:
+        result = results.get(name)
+        if result and result['matches_reference'] and result['msgs_per_s'] >= baseline * MIN_SPEEDUP:
+            if choice == 'pymavlink' or result['msgs_per_s'] > results[choice]['msgs_per_s']:
+                choice = name
+    _active = choice
+    _selection = {'decoder': choice, 'forced': False, 'crc': crc_backend(), 'native': native_available(),
+                  'msgs_per_s': {name: round(r['msgs_per_s']) for name, r in results.items()}}
+    rates = ', '.join(f"{name} {r['msgs_per_s']:.0f}" for name, r in results.items())
+    print(f"[DECODE] Aktif çözücü: {choice} ({rates} msg/s), CRC: {crc_backend()}, "
+          f"C ayrıştırıcı: {'var' if native_available() else 'yok'}")
+    return choice
+
+
+def get_selection() -> Dict[str, Any]:
+    """Seçilen çözücü ve başlangıç ölçümü (seçim yapılmadıysa boş)"""
+    return dict(_selection)
@@ -0,0 +1,156 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymavlink import mavutil
+
+from core.link_stats import LatencyHistogram
+
+
+class RouterEndpoint:
+    """Yönlendiricinin bir ucu (ör. Mission Planner için udpout:127.0.0.1:14550)"""
+
+    # Boyutsuz recv() TCP uçlarında mav.bytes_needed() kadar (uçta çözücü beslenmediği için 8 bayt) okur
+    READ_SIZE = 65536
+
+    def __init__(self, spec: str, connection):
+        self.spec = spec
+        self.connection = connection
+        self.stats = {'rx_datagrams': 0, 'rx_bytes': 0, 'tx_bytes': 0, 'tx_errors': 0}
+
+    def fileno(self) -> Optional[int]:
+        return getattr(self.connection, 'fd', None)
+
+    def write(self, data: bytes) -> None:
+        try:
+            self.connection.write(data)
+            self.stats['tx_bytes'] += len(data)
+        except Exception:
+            # udpin ucu henüz kimseden paket almadıysa hedef adres yok; bağlantı kopmuş olabilir
+            self.stats['tx_errors'] += 1
+
+    def read(self) -> bytes:
+        try:
+            data = self.connection.recv(self.READ_SIZE)
+        except Exception:
+            return b''
+        if data:
+            self.stats['rx_datagrams'] += 1
+            self.stats['rx_bytes'] += len(data)
+        return data or b''
+
+    def close(self) -> None:
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+
+class MavlinkRouter:
+    """Araç bağlantısı ile ek uçlar arasında MAVLink yönlendirici.
+
+    Araçtan gelen paketlerin ham baytları (çözücünün zaten sakladığı
+    get_msgbuf()) uçlara yeniden çözülmeden/kodlanmadan yazılır. Uçlardan
+    gelen baytlar hiç çözülmeden araca ve diğer uçlara iletilir. Uç listesi
+    kopyala-değiştir tuple'ıdır; MAVLink thread'i kilitsiz okur.
+    """
+
+    READS_PER_SERVICE = 32  # Uç başına tek turda en fazla okuma
+
+    def __init__(self, open_connection: Callable[[str], Any] = None):
+        self._lock = threading.Lock()
+        self._endpoints: Tuple[RouterEndpoint, ...] = ()
+        self._open_connection = open_connection or self._default_open
+        self.latency = LatencyHistogram()  # Araçtan okuma -> uçlara yazma
+        self.reset_stats()
+
+    @staticmethod
+    def _default_open(spec: str):
+        return mavutil.mavlink_connection(spec, autoreconnect=True)
+
+    def reset_stats(self) -> None:
+        self.stats = {'to_endpoints_packets': 0, 'to_endpoints_bytes': 0,
+                      'to_vehicle_bytes': 0, 'to_vehicle_errors': 0}
+        self.latency = LatencyHistogram()
+        self._started = time.monotonic()
+
+    # --- Uç yönetimi (herhangi bir thread) ---
+
+    def add_endpoint(self, spec: str) -> RouterEndpoint:
+        """Uç aç (udpin:/udpout:/tcp:/tcpin: pymavlink bağlantı dizesi); hata varsa istisna fırlatır"""
+        with self._lock:
+            for endpoint in self._endpoints:
+                if endpoint.spec == spec:
+                    return endpoint
+            endpoint = RouterEndpoint(spec, self._open_connection(spec))
+            self._endpoints = self._endpoints + (endpoint,)
+            return endpoint
+
+    def remove_endpoint(self, spec: str) -> bool:
+        with self._lock:
+            removed = [e for e in self._endpoints if e.spec == spec]
+            self._endpoints = tuple(e for e in self._endpoints if e.spec != spec)
+        for endpoint in removed:
+            endpoint.close()
+        return bool(removed)
+
+    def close(self) -> None:
+        with self._lock:
+            endpoints, self._endpoints = self._endpoints, ()
+        for endpoint in endpoints:
+            endpoint.close()
+
+    @property
+    def endpoints(self) -> Tuple[RouterEndpoint, ...]:
+        return self._endpoints
+
+    def fds(self) -> List[int]:
+        """select() ile beklenecek uç tanımlayıcıları"""
+        return [fd for fd in (e.fileno() for e in self._endpoints) if fd is not None]
+
+    # --- Yönlendirme (MAVLink thread'i) ---
+
+    def forward_from_vehicle(self, messages, rx_time: Optional[float] = None) -> None:
+        """Araçtan okunan batch'in ham paketlerini tüm uçlara yaz"""
+        endpoints = self._endpoints
+        if not endpoints or not messages:
+            return
+        packets = [msg.get_msgbuf() for msg in messages if msg.get_type() != 'BAD_DATA']
+        if not packets:
+            return
+        data = b''.join(packets)  # Uç başına tek yazma
+        for endpoint in endpoints:
+            endpoint.write(data)
+        self.stats['to_endpoints_packets'] += len(packets)
+        self.stats['to_endpoints_bytes'] += len(data)
+        if rx_time is not None:
+            self.latency.add(time.perf_counter() - rx_time)
+
+    def service(self, write_vehicle: Callable[[bytes], None]) -> int:
+        """Uçlardan gelen baytları araca ve diğer uçlara ilet; okunan bayt sayısını döndürür"""
+        endpoints = self._endpoints
+        total = 0
+        for source in endpoints:
+            for _ in range(self.READS_PER_SERVICE):
+                data = source.read()
+                if not data:
+                    break
+                total += len(data)
+                try:
+                    write_vehicle(data)
+                    self.stats['to_vehicle_bytes'] += len(data)
+                except Exception:
+                    self.stats['to_vehicle_errors'] += 1
+                for endpoint in endpoints:
+                    if endpoint is not source:
+                        endpoint.write(data)
+        return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        stats = dict(self.stats)
+        stats['to_endpoints_bytes_per_s'] = stats['to_endpoints_bytes'] / elapsed
+        stats['to_vehicle_bytes_per_s'] = stats['to_vehicle_bytes'] / elapsed
+        stats['latency'] = self.latency.summary()
+        stats['endpoints'] = [dict(e.stats, spec=e.spec) for e in self._endpoints]
+        return stats
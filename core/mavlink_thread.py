@@ -3,24 +3,108 @@ import time
 import threading
 from typing import Optional, Dict, Any, List
 from pymavlink import mavutil
-from PyQt6.QtCore import QThread, pyqtSignal
-import serial  # Hall effect sensörü için
-
-class MAVLinkThread(QThread):
-    telemetry_received = pyqtSignal(dict)
-    attitude_received = pyqtSignal(dict)
-    position_received = pyqtSignal(dict)
-    error_occurred = pyqtSignal(str)
-    emergency_triggered = pyqtSignal(dict)
-    payload_status_changed = pyqtSignal(dict)
-    mission_completed = pyqtSignal()  # Görev tamamlama sinyali
+from core.event_bus import EventBus, Signal, Worker
+
+from core.link_reader import LinkReader
+from core.mavlink_decode import select_decoder
+from core.link_stats import LinkStats
+from core.telemetry_snapshot import TelemetrySnapshot, TelemetryPublisher
+from core.message_dispatcher import MessageDispatcher
+from core.stream_rates import StreamRateManager
+from core.command_queue import CommandQueue, CommandFuture, RESULT_CANCELLED
+from core.mavlink_router import MavlinkRouter
+from core.tlog_writer import TlogWriter, default_tlog_path
+from core.tlog_replay import TlogReplayConnection
+from core.link_process import ProcessLinkConnection
+from core.link_supervisor import LinkSupervisor, is_serial_device, is_vehicle_heartbeat
+from core.hall_sensor import HallSensorService
+from core.rule_engine import RuleEngine, above, battery_rule, below
+from core.mission_transfer import MissionTransfer, MissionUpload, MissionDownload, MissionSync, waypoints_to_items
+from core.param_cache import ParamManager, relay_instances, battery_low_percent
+from core.vehicle_state import VehicleRegistry, VehicleState
+from core.flight_modes import mode_number
+
+class MAVLinkThread(Worker):
+    telemetry_received = Signal(dict)
+    attitude_received = Signal(dict)
+    position_received = Signal(dict)
+    error_occurred = Signal(str)
+    emergency_triggered = Signal(dict)
+    payload_status_changed = Signal(dict)
+    mission_completed = Signal()  # Görev tamamlama sinyali
+    telemetry_frame = Signal(dict)  # Birleştirilmiş telemetri çerçevesi (sabit hızda)
+    message_received = Signal(str, dict)  # forward_to_gui ile abone olunan ham mesajlar
+    command_result = Signal(dict)  # Komut sonucu: name, result_name, accepted, latency_ms, attempts
+    mission_transfer_progress = Signal(str, int, int)  # yön ('upload'/'download'), tamamlanan, toplam
+    mission_transfer_finished = Signal(dict)  # MissionTransfer.result(): success, error, count, elapsed
+    param_progress = Signal(int, int)  # Parametre indirme: alınan, toplam
+    params_updated = Signal(dict)  # ParamManager olayı: source ('cache'/'vehicle'), count, changed, verified
+    vehicles_changed = Signal(list)  # Bağlantıdaki araçların sysid listesi
+    active_vehicle_changed = Signal(int)  # Komutların hedeflendiği aracın sysid'si
+    replay_finished = Signal(dict)  # Tlog oynatma bitti: paket, süre, paket/s, alım istatistikleri
+    link_state = Signal(str, str)  # Gözetmen durumu ('searching', 'connected', 'lost') ve ayrıntı
+    hall_edge = Signal(dict)  # Hall sensör eşik geçişi (debounce'lu): direction, time, value, latency_ms
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, bus: Optional[EventBus] = None, bus_prefix: str = ''):
+        # Sinyaller düz Python olay yoluna yayınlanır; arayüz ui/qt_bridge ile abone olur
+        super().__init__(bus=bus, bus_prefix=bus_prefix)
         self.running = True
         self.connection = None
         self._connection_lock = threading.Lock()  # Thread güvenliği için
         
+        # Alım motoru: 'event' = select() ile bloklanan batch okuma, 'poll' = eski recv_match döngüsü
+        # (iki mod karşılaştırmalı ölçüm için tutuluyor, bkz. get_rx_stats)
+        self.rx_mode = 'event'
+        self.rx_wait_timeout = 0.5  # Veri yokken en fazla bekleme süresi (timeout kontrolü için)
+        self._link_reader = LinkReader()
+        # Kurulu pymavlink'te en hızlı doğru çözücü (ilk kullanımda ölçülür ve bildirilir)
+        self._link_reader.decoder = select_decoder()
+        # İşlenmekte olan batch'in alım anı (time.monotonic); aboneler satır zamanı olarak kullanır
+        self.rx_time: Optional[float] = None
+        
+        # Mesaj tipi bazında hız/bant genişliği/gecikme sayaçları ve TIMESYNC ile ping ölçümü
+        self.link_stats = LinkStats()
+        self.timesync_interval = 1.0  # saniye
+        self._next_timesync = 0.0
+        self._timesync_sent_ns = None
+        
+        # Alınan her paketin ham kaydı (.tlog); bağlanınca otomatik başlar
+        self.tlog_enabled = True
+        self.tlog_directory = ''
+        self.tlog: Optional[TlogWriter] = None
+        self.replay = False  # Bağlantı bir .tlog oynatması mı (giden istekler gönderilmez)
+        
+        # İsteğe bağlı: port G/Ç, çözme ve .tlog kaydı ayrı süreçte, paketler ortak bellek halkasından
+        self.link_process = False
+        self.link_process_rate = 0.0  # >0 ise yüksek hızlı telemetri ana sürece bu hızda (Hz) iletilir
+        
+        # Kopunca üstel beklemeyle yeniden bağlanma ve paralel port/baud algılama
+        self.supervisor = LinkSupervisor()
+        self.auto_reconnect = True
+        
+        # Ek uçlara (Mission Planner, SITL araçları vb.) ham paket yönlendirme
+        self.router = MavlinkRouter()
+        
+        # Mesaj bazında yayın hızları (abonelere ve arayüz taleplerine göre)
+        self.stream_rates = StreamRateManager()
+        self.stream_reassert_gap = 3.0  # Bu kadar heartbeat gelmezse hızları yeniden gönder (s)
+        
+        # Giden komut kuyruğu (COMMAND_ACK eşleştirme, yeniden deneme, gecikme ölçümü)
+        self.commands = CommandQueue(on_result=self._on_command_result)
+        
+        # Görev aktarımı (yükleme/indirme) MAVLink thread'inde yürütülür
+        self._mission_transfer: Optional[MissionTransfer] = None
+        self._pending_transfer: Optional[MissionTransfer] = None
+        self.last_mission_transfer: Optional[Dict[str, Any]] = None
+        
+        # Araç parametreleri (diskte önbellek, bağlanınca doğrulama / arka planda indirme)
+        self.params = ParamManager()
+        self._params_pending = False
+        
+        # Son-değer telemetri snapshot'ı ve sabit hızlı arayüz yayını
+        self.telemetry_snapshot = TelemetrySnapshot()
+        self.telemetry_publisher = TelemetryPublisher(self.telemetry_snapshot, rate_hz=20.0)
+        
         # Spam önleme için önceki hataları takip et
         self.previous_errors = {}  # {error_message: last_time}
         self.error_cooldown = 30  # 30 saniye bekleme süresi
@@ -33,37 +117,123 @@ class MAVLinkThread(QThread):
             'gps_fix': 3,            # 4'ten 3'e düşürüldü (daha esnek)
             'rssi': -95              # -90'dan -95'e düşürüldü
         }
+        # Eşikler üzerinde histerezis ve debounce'lu kurallar; yalnızca bağlı alanlar değişince değerlendirilir
+        self.emergency_rules = self._build_emergency_rules()
         
         self.payload_release_pin = 0  # GPIO pin for payload release
         self.home_position = None
         # Elektromıknatıslar için relay indexleri (AUX OUT 1 -> 0, AUX OUT 2 -> 1 varsayılan)
         self.magnet1_relay_index = 0
         self.magnet2_relay_index = 1
+        self._relay_indices_from_user = False  # Elle ayarlandıysa araç parametreleri ezmez
 
-        # Hall effect sensörü için
-        self.hall_serial_port = None  # serial.Serial nesnesi
-        self.hall_port_name = None    # Port adı (ör: 'COM6')
-        self.hall_baudrate = 9600
-        self._hall_lock = threading.Lock()  # Hall sensör için thread güvenliği
-        self.hall_effect_value = 0
-        self.magnetic_field_value = 0
+        # Hall effect sensörü: kendi okuyucu thread'i ve halka tamponu var, arayüz bloklanmaz
+        self.hall = HallSensorService()
+        self.hall.add_edge_listener(self.hall_edge.emit)
         
-        # Son konum (otomatik irtifa için)
-        self.last_lat = None
-        self.last_lon = None
+        # Araç bazında durum (sysid -> VehicleState). armed, last_mode, last_lat/lon,
+        # vehicle_type ve mode_family aktif aracın değerleridir (bkz. özellikler)
+        self.vehicles = VehicleRegistry()
         
         # Bağlantı durumu
         self.is_connected = False
-        self.last_heartbeat = None
+        self.last_heartbeat = None  # Herhangi bir araçtan son heartbeat
         self.connection_timeout = 10  # saniye (5'ten 10'a çıkarıldı)
-        self.armed = False  # <-- ARM durumu
-        self.last_mode = None  # <-- MODU KAYDET
         
+        # Mesaj tipi -> işleyici tablosu
+        self.dispatcher = MessageDispatcher(on_error=self._on_dispatch_error,
+                                            on_timing=self.link_stats.record_handler)
+        self._gui_forwarded = set()
+        self._register_default_handlers()
+        self._update_subscribed_streams()
+        
+    @property
+    def vehicle(self) -> VehicleState:
+        """Komutların hedeflendiği aktif araç"""
+        return self.vehicles.active
+
+    @property
+    def armed(self) -> bool:
+        return self.vehicles.active.armed
+
+    @armed.setter
+    def armed(self, value: bool) -> None:
+        self.vehicles.active.armed = value
+
+    @property
+    def last_mode(self) -> Optional[str]:
+        return self.vehicles.active.last_mode
+
+    @last_mode.setter
+    def last_mode(self, value: Optional[str]) -> None:
+        self.vehicles.active.last_mode = value
+
+    @property
+    def last_lat(self) -> Optional[float]:
+        return self.vehicles.active.last_lat
+
+    @last_lat.setter
+    def last_lat(self, value: Optional[float]) -> None:
+        self.vehicles.active.last_lat = value
+
+    @property
+    def last_lon(self) -> Optional[float]:
+        return self.vehicles.active.last_lon
+
+    @last_lon.setter
+    def last_lon(self, value: Optional[float]) -> None:
+        self.vehicles.active.last_lon = value
+
+    @property
+    def vehicle_type(self):
+        return self.vehicles.active.vehicle_type
+
+    @property
+    def mode_family(self) -> str:
+        return self.vehicles.active.mode_family
+
+    def select_vehicle(self, sysid: int) -> bool:
+        """Komut hedefini ve arayüz telemetrisini başka bir araca çevir"""
+        if self.vehicles.get(sysid) is None:
+            self._emit_error(f"Araç seçme hatası: sysid {sysid} bulunamadı.")
+            return False
+        if self.vehicles.active_sysid == sysid:
+            return True
+        if (self._mission_transfer is not None and self._mission_transfer.active) or self._pending_transfer is not None:
+            self._emit_error("Araç seçme hatası: Devam eden görev aktarımı var.")
+            return False
+        with self._connection_lock:
+            vehicle = self.vehicles.select(sysid)
+            self._apply_target(vehicle)
+        self.emergency_rules.reset()  # Kurallar yeni aracın değerleriyle yeniden kurulur
+        # Yeni aracın son değerleriyle arayüzü hemen güncelle
+        for channel in vehicle.snapshot.CHANNELS:
+            values = vehicle.snapshot.get(channel)
+            if values:
+                self._publish(channel, values)
+        self.stream_rates.invalidate()
+        self._params_pending = True
+        print(f"[VEHICLE] Aktif araç: sysid {sysid}")
+        self.active_vehicle_changed.emit(sysid)
+        self._link_reader.wakeup()
+        return True
+
+    def _apply_target(self, vehicle: VehicleState) -> None:
+        """Bağlantının komut hedefini araca ayarla (bağlantı kilidi tutulurken çağrılır)"""
+        if self.connection:
+            self.connection.target_system = vehicle.sysid
+            self.connection.target_component = vehicle.compid
+
+    def get_vehicles(self) -> List[Dict[str, Any]]:
+        """Tüm araçların özeti (sysid, mod, ARM, konum, aktif mi)"""
+        return self.vehicles.summaries()
+
     def set_magnet_relay_indices(self, magnet1_index: int, magnet2_index: int) -> None:
         """Elektromıknatısların bağlı olduğu AUX relay indexlerini ayarla."""
         try:
             self.magnet1_relay_index = int(magnet1_index)
             self.magnet2_relay_index = int(magnet2_index)
+            self._relay_indices_from_user = True
         except Exception:
             # Geçersiz girişte varsayılanlara dön
             self.magnet1_relay_index = 0
@@ -83,6 +253,82 @@ class MAVLinkThread(QThread):
         
     def connect(self, port='COM3', baud=57600) -> bool:
         """MAVLink bağlantısını kur"""
+        if not self._open_link(lambda: self._make_connection(port, baud)):
+            return False
+        if self.auto_reconnect:
+            # Seri bağlantı kopunca tüm portlar taranır (USB yeniden takılınca ad değişebilir)
+            self.supervisor.arm(None if is_serial_device(port) else port)
+            self.supervisor.connected(port, baud)
+        return True
+
+    def connect_auto(self, port: Optional[str] = None, baud: Optional[int] = None) -> None:
+        """Arka planda bağlan: portlar/baud'lar paralel taranır, ilk heartbeat'e kilitlenilir.
+
+        Sonuç link_state sinyaliyle bildirilir; port/baud verilirse yalnızca o denenir.
+        """
+        self.supervisor.arm(port, baud)
+        self._link_reader.wakeup()
+
+    def disconnect_link(self) -> None:
+        """Bağlantıyı kapat ve yeniden bağlanmayı durdur (thread çalışmaya devam eder).
+
+        stop()'tan farkı: okuma döngüsü ve yönlendirici uçları yaşar; sonraki
+        connect()/connect_auto() aynı thread'le devam eder.
+        """
+        self.supervisor.disarm()
+        self.is_connected = False
+        self._link_reader.cancel_wait(self.connection)
+        self.commands.cancel_all()
+        if self._mission_transfer is not None and self._mission_transfer.active:
+            self._mission_transfer.cancel()
+        with self._connection_lock:
+            if self.connection:
+                try:
+                    self.connection.close()
+                except Exception:
+                    pass
+                self.connection = None
+                self.replay = False
+        self.stop_tlog()
+
+    def connect_replay(self, path: str, speed: float = 1.0) -> bool:
+        """.tlog kaydını canlı bağlantıyla aynı okuma/çözme/dağıtım yolundan oynat.
+
+        speed: 1.0 gerçek zaman, N kat hız için N, 0 ise olabildiğince hızlı.
+        """
+        self.supervisor.disarm()
+        return self._open_link(lambda: TlogReplayConnection(path, speed))
+
+    def set_replay_speed(self, speed: float) -> None:
+        conn = self.connection
+        if isinstance(conn, TlogReplayConnection):
+            conn.set_speed(speed)
+            self._link_reader.wakeup()
+
+    def set_replay_paused(self, paused: bool) -> None:
+        conn = self.connection
+        if isinstance(conn, TlogReplayConnection):
+            conn.set_paused(paused)
+            self._link_reader.wakeup()
+
+    def stop_replay(self) -> None:
+        """Oynatmayı bitir; thread sonraki canlı bağlantı için çalışmaya devam eder"""
+        conn = self.connection
+        if isinstance(conn, TlogReplayConnection):
+            conn.stop()
+            self._link_reader.wakeup()
+
+    def _make_connection(self, device: str, baud: int, opened=None):
+        """Canlı bağlantıyı aç; link_process açıksa G/Ç ayrı süreçte yürütülür"""
+        if not self.link_process:
+            return opened if opened is not None else mavutil.mavlink_connection(device, baud=baud)
+        if opened is not None:
+            opened.close()  # Algılamada açılan port çocuk sürece bırakılır
+        tlog_path = default_tlog_path(self.tlog_directory) if self.tlog_enabled else None
+        return ProcessLinkConnection(device, baud, tlog_path=tlog_path, telemetry_hz=self.link_process_rate)
+
+    def _open_link(self, factory, heartbeat=None) -> bool:
+        """factory ile açılan bağlantıyı devral; heartbeat verilirse (algılamada alınmış) beklenmez"""
         try:
             with self._connection_lock:
                 if self.connection:
@@ -91,16 +337,34 @@ class MAVLinkThread(QThread):
                     except:
                         pass  # Bağlantı zaten kapalı olabilir
                     
-                self.connection = mavutil.mavlink_connection(port, baud=baud)
+                self.connection = factory()
+                self.replay = isinstance(self.connection, TlogReplayConnection)
                 self.is_connected = True
+                if heartbeat is None:
+                    self.vehicles.clear()
+                    self.emergency_rules.reset()
+                # Yeniden bağlanmada aktif araç seçimi korunur
                 self.last_heartbeat = time.time()
                 
                 # Bağlantıyı test et
-                if not self._test_connection():
+                if not self._test_connection(heartbeat):
                     self.is_connected = False
+                    if isinstance(self.connection, ProcessLinkConnection):
+                        self.connection.close()  # Çocuk süreç ve ortak bellek serbest bırakılır
                     self.connection = None
                     self._emit_error("Bağlantı testi başarısız")
                     return False
+                self.telemetry_publisher.reset()
+                self.link_stats.reset()
+                self.router.reset_stats()
+                in_process = isinstance(self.connection, ProcessLinkConnection)
+                if self.tlog_enabled and not self.replay and not in_process and self.tlog is None:
+                    self.start_tlog()  # Yeniden bağlanmada aynı dosyaya devam edilir
+                self._timesync_sent_ns = None
+                self.stream_rates.invalidate()
+                self._params_pending = True
+                # Boşta bekleyen okuma döngüsünü yeni bağlantı için uyandır
+                self._link_reader.wakeup()
                 return True
                 
         except Exception as e:
@@ -109,17 +373,28 @@ class MAVLinkThread(QThread):
             self._emit_error(f"Bağlantı hatası: {e}")
             return False
             
-    def _test_connection(self) -> bool:
+    def _test_connection(self, heartbeat=None) -> bool:
         """Bağlantıyı test et"""
         try:
             if not self.connection:
                 return False
+            if self.replay:
+                # Oynatmada heartbeat beklenmez (dosya gerçek zamanlı akar, ilk paketler kaybolurdu);
+                # araç, heartbeat normal dağıtım yolundan geldiğinde eklenir
+                return True
+            if heartbeat is not None:
+                self.vehicles.add(heartbeat.get_srcSystem(), heartbeat.get_srcComponent())
+                self._apply_target(self.vehicles.active)
+                return True
                 
             # Heartbeat mesajını bekle
             start_time = time.time()
             while time.time() - start_time < 5:  # 5 saniye timeout (3'ten 5'e çıkarıldı)
                 msg = self.connection.recv_match(type='HEARTBEAT', timeout=1)
                 if msg:
+                    if is_vehicle_heartbeat(msg):
+                        vehicle = self.vehicles.add(msg.get_srcSystem(), msg.get_srcComponent())
+                        self._apply_target(vehicle)
                     return True
             return False
             
@@ -139,363 +414,218 @@ class MAVLinkThread(QThread):
             'alt': alt
         }
         
+    def _build_emergency_rules(self) -> RuleEngine:
+        """Acil durum kuralları; eşikler emergency_thresholds'tan her değerlendirmede okunur"""
+        t = self.emergency_thresholds
+        return RuleEngine([
+            battery_rule('battery_percent', lambda: t['battery_percent'],
+                         message='Düşük batarya seviyesi: %{battery}', on_delay=2.0),
+            above('temperature', 'temperature', lambda: t['temperature'], hysteresis=5,
+                  message='Yüksek sıcaklık: {temperature}°C', on_delay=2.0),
+            below('gps', 'gps_fix', lambda: t['gps_fix'], severity='critical',
+                  message='GPS sinyali zayıf: {gps_fix}', on_delay=1.0, off_delay=1.0),
+            below('rssi', 'rssi', lambda: t['rssi'], hysteresis=3,
+                  message='Zayıf haberleşme sinyali: {rssi}dBm', on_delay=3.0),
+        ])
+
     def check_emergency_conditions(self, telemetry: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Acil durum koşullarını kontrol et"""
-        emergency_conditions = []
-        
-        # Battery check - USB bağlantısı için daha esnek
-        battery_percent = telemetry.get('battery', 0)
-        voltage = telemetry.get('voltage', 0)
-        
-        # USB bağlantısında batarya verisi olmayabilir, bu durumda kontrol etme
-        if not (battery_percent == 0 and voltage == 0):
-            if battery_percent < self.emergency_thresholds['battery_percent']:
-                emergency_conditions.append({
-                    'type': 'battery_percent',
-                    'severity': 'warning',
-                    'message': f'Düşük batarya seviyesi: %{battery_percent}'
-                })
-            
-        # Temperature check - daha esnek
-        temperature = telemetry.get('temperature', 0)
-        if temperature > self.emergency_thresholds['temperature']:
-            emergency_conditions.append({
-                'type': 'temperature',
-                'severity': 'warning',
-                'message': f'Yüksek sıcaklık: {temperature}°C'
-            })
-            
-        # GPS check - daha esnek
-        gps_fix = telemetry.get('gps_fix', 0)
-        if gps_fix < self.emergency_thresholds['gps_fix']:
-            emergency_conditions.append({
-                'type': 'gps',
-                'severity': 'critical',
-                'message': f'GPS sinyali zayıf: {gps_fix}'
-            })
-            
-        # RSSI check - daha esnek
-        rssi = telemetry.get('rssi', 0)
-        if rssi < self.emergency_thresholds['rssi']:
-            emergency_conditions.append({
-                'type': 'rssi',
-                'severity': 'warning',
-                'message': f'Zayıf haberleşme sinyali: {rssi}dBm'
-            })
-            
-        return emergency_conditions
+        """Örneği kural motoruna ver; durumu değişen (aktifleşen/temizlenen) koşulları döndür"""
+        return self.emergency_rules.update(telemetry)
+
+    def _emit_emergency(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        self.emergency_triggered.emit({'conditions': [e for e in events if e['active']],
+                                       'cleared': [e for e in events if not e['active']]})
+
+    def get_rule_stats(self) -> Dict[str, Any]:
+        """Kural motoru sayaçları ve kural başına değerlendirme maliyeti (µs)"""
+        return self.emergency_rules.get_stats()
         
-    def release_payload(self) -> bool:
-        """Yük bırakma komutu gönder (relay off)."""
+    def send_command(self, command: int, *params: float, name: str = '',
+                     timeout: Optional[float] = None, retries: Optional[int] = None) -> Optional[CommandFuture]:
+        """COMMAND_LONG'u kuyruğa al ve hemen dön.
+
+        Gönderim, yeniden deneme ve COMMAND_ACK eşleştirmesi MAVLink thread'inde yapılır;
+        sonuç dönen CommandFuture'a ve command_result sinyaline yazılır. Bağlantı yoksa None.
+        """
+        if not self.connection or not self.is_connected:
+            self._emit_error(f"{name or command} hatası: Bağlantı aktif değil.")
+            return None
+        future = self.commands.submit(command, *params, name=name, timeout=timeout, retries=retries)
+        self._link_reader.wakeup()
+        return future
+
+    def get_command_stats(self) -> Dict[str, Any]:
+        """Gönderilen/kabul edilen/zaman aşımına uğrayan komutlar ve ACK gecikmesi"""
+        return self.commands.get_stats()
+
+    def _on_command_result(self, future: CommandFuture) -> None:
+        result = future.to_dict()
+        if not future.accepted:
+            self._emit_error(f"{future.name} komutu sonuçlanmadı: {future.result_name}")
+        self.command_result.emit(result)
+
+    def _service_commands(self) -> None:
+        """Komut kuyruğunu gönder / yeniden dene (MAVLink thread'i)"""
+        if not self.commands.pending():
+            return
         with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Yük bırakma hatası: Bağlantı aktif değil.")
+            conn = self.connection
+            if not conn:
+                return
+            self.commands.service(conn.mav, conn.target_system, conn.target_component)
+
+    def get_param(self, name: str, default: Optional[float] = None) -> Optional[float]:
+        """Parametre değeri (önbellekten veya araçtan son alınan)"""
+        return self.params.get(name, default)
+
+    def get_params(self) -> Dict[str, float]:
+        return self.params.snapshot()
+
+    def refresh_params(self) -> bool:
+        """Önbelleği yok sayıp tüm parametreleri araçtan yeniden indir"""
+        with self._connection_lock:
+            conn = self.connection
+            if not conn or not self.is_connected or not conn.target_system:
+                self._emit_error("Parametre indirme hatası: Bağlantı aktif değil.")
                 return False
-                
-        try:
-            # Varsayılan olarak Magnet1'i kapat
-            return self.deactivate_magnet1()
-        except Exception as e:
-            self._emit_error(f"Yük bırakma hatası: {e}")
-            return False
+            if self.params.sysid != conn.target_system:
+                self._params_pending = True  # Önce bu aracın önbelleği yüklensin
+            else:
+                self.params.refresh(conn.mav)
+        self._link_reader.wakeup()
+        return True
+
+    def _service_params(self) -> None:
+        """Bağlanınca önbelleği yükle, _HASH_CHECK / indirme zaman aşımlarını yürüt"""
+        if not self._params_pending and not self.params.busy:
+            return
+        with self._connection_lock:
+            conn = self.connection
+            if not conn or not conn.target_system:
+                return  # Araç heartbeat'i bekleniyor
+            if self._params_pending:
+                self._params_pending = False
+                event = self.params.start(conn.mav, conn.target_system, conn.target_component)
+            else:
+                event = self.params.service(conn.mav)
+        if event:
+            self._on_params_event(event)
+
+    def _on_params_event(self, event: Dict[str, Any]) -> None:
+        if event['error']:
+            self._emit_error(f"Parametre indirme başarısız: {event['error']}")
+        else:
+            print(f"[PARAM] {event['source']}: {event['count']} parametre, "
+                  f"{len(event['changed'])} değişen, {event['elapsed']:.1f} s")
+        if event['changed']:
+            self._apply_vehicle_params()
+        self.params_updated.emit(event)
+
+    def _apply_vehicle_params(self) -> None:
+        """Relay indexlerini ve batarya failsafe eşiğini araç parametrelerinden al"""
+        params = self.params.snapshot()
+        if not self._relay_indices_from_user:
+            relays = relay_instances(params)
+            if len(relays) >= 1:
+                self.magnet1_relay_index = relays[0]
+            if len(relays) >= 2:
+                self.magnet2_relay_index = relays[1]
+        low_percent = battery_low_percent(params)
+        if low_percent is not None:
+            self.emergency_thresholds['battery_percent'] = low_percent
+
+    def release_payload(self) -> bool:
+        """Yük bırakma komutu gönder (relay off)."""
+        # Varsayılan olarak Magnet1'i kapat
+        return self.deactivate_magnet1()
     
     def activate_magnet1(self) -> bool:
         """Elektromıknatıs 1'i aktifleştir (Main Out 1)"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Elektromıknatıs 1 hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_SET_RELAY,
-                    0,  # Confirmation
-                    self.magnet1_relay_index,  # Relay number (Main Out 1)
-                    1,  # State (1 = on)
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Elektromıknatıs 1 aktifleştirme hatası: {e}")
-            return False
+        return self._set_relay("Elektromıknatıs 1 aktif", self.magnet1_relay_index, 1)
     
     def deactivate_magnet1(self) -> bool:
         """Elektromıknatıs 1'i deaktifleştir (Main Out 1)"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Elektromıknatıs 1 hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_SET_RELAY,
-                    0,  # Confirmation
-                    self.magnet1_relay_index,  # Relay number (Main Out 1)
-                    0,  # State (0 = off)
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Elektromıknatıs 1 deaktifleştirme hatası: {e}")
-            return False
+        return self._set_relay("Elektromıknatıs 1 pasif", self.magnet1_relay_index, 0)
     
     def activate_magnet2(self) -> bool:
         """Elektromıknatıs 2'yi aktifleştir (Main Out 2)"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Elektromıknatıs 2 hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_SET_RELAY,
-                    0,  # Confirmation
-                    self.magnet2_relay_index,  # Relay number (Main Out 2)
-                    1,  # State (1 = on)
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Elektromıknatıs 2 aktifleştirme hatası: {e}")
-            return False
+        return self._set_relay("Elektromıknatıs 2 aktif", self.magnet2_relay_index, 1)
     
     def deactivate_magnet2(self) -> bool:
         """Elektromıknatıs 2'yi deaktifleştir (Main Out 2)"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Elektromıknatıs 2 hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_SET_RELAY,
-                    0,  # Confirmation
-                    self.magnet2_relay_index,  # Relay number (Main Out 2)
-                    0,  # State (0 = off)
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Elektromıknatıs 2 deaktifleştirme hatası: {e}")
-            return False
+        return self._set_relay("Elektromıknatıs 2 pasif", self.magnet2_relay_index, 0)
+
+    def _set_relay(self, name: str, relay_index: int, state: int) -> bool:
+        # Mıknatıs komutları kısa timeout ile hızlı onaylanır
+        future = self.send_command(mavutil.mavlink.MAV_CMD_DO_SET_RELAY, relay_index, state,
+                                   name=name, timeout=0.5)
+        return future is not None
             
     def return_to_home(self) -> bool:
         """Eve dönüş komutu gönder"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Eve dönüş komutu hatası: Bağlantı aktif değil.")
-                return False
-                
         if not self.home_position:
             self._emit_error("Ev konumu ayarlanmamış")
             return False
-            
-        try:
-            # Send RTL command
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH,
-                    0,  # Confirmation
-                    0, 0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Eve dönüş komutu hatası: {e}")
-            return False
+        future = self.send_command(mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH, name="Eve dönüş")
+        return future is not None
 
     def set_mode(self, mode_name: str) -> bool:
-        """Uçuş modunu ayarla (ArduPlane custom mode)."""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Mod değiştirme hatası: Bağlantı aktif değil.")
-                return False
-
-        # ArduPlane için custom_mode eşlemesi
-        mode_map = {
-            'MANUAL': 0,
-            'CIRCLE': 1,
-            'STABILIZE': 2,
-            'TRAINING': 3,
-            'ACRO': 4,
-            'FLY_BY_WIRE_A': 5,
-            'FLY_BY_WIRE_B': 6,
-            'CRUISE': 7,
-            'AUTOTUNE': 8,
-            'AUTO': 10,
-            'RTL': 11,
-            'LOITER': 12,
-            'TAKEOFF': 14,
-            'GUIDED': 16,
-        }
+        """Uçuş modunu ayarla (araç tipine göre ArduPilot custom mode, MAV_CMD_DO_SET_MODE ile)."""
+        return self._send_mode(mode_name) is not None
 
+    def _send_mode(self, mode_name: str) -> Optional[CommandFuture]:
+        # Araç tipine göre önceden hesaplanmış custom_mode tablosu
         mode_name = (mode_name or '').upper()
-        if mode_name not in mode_map:
+        custom_mode = mode_number(self.mode_family, mode_name)
+        if custom_mode is None:
             self._emit_error(f"Bilinmeyen mod: {mode_name}")
-            return False
-
-        try:
-            if hasattr(self.connection, 'mav'):
-                # set_mode_send(base_mode, custom_mode) için target_system gerekir
-                self.connection.mav.set_mode_send(
-                    self.connection.target_system,
-                    1,  # MAV_MODE_FLAG_CUSTOM_MODE yerine 1 kullan
-                    mode_map[mode_name]
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Mod değiştirme hatası: {e}")
-            return False
+            return None
+        return self.send_command(
+            mavutil.mavlink.MAV_CMD_DO_SET_MODE,
+            mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,
+            custom_mode,
+            name=f"Mod {mode_name}", timeout=0.5)
             
     def switch_to_manual(self) -> bool:
         """Manuel moda geçiş komutu gönder"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Manuel moda geçiş hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            # Send manual mode command
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_SET_MODE,
-                    0,  # Confirmation
-                    mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED,  # Mode
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Manuel moda geçiş hatası: {e}")
-            return False
+        return self.set_mode('MANUAL')
             
     def land(self) -> bool:
-        """Acil iniş komutu gönder"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Acil iniş hatası: Bağlantı aktif değil.")
-                return False
-                
-        return self._send_land_command(self.connection)
-        
-    def _send_land_command(self, conn) -> bool:
         """İniş komutu gönder"""
-        try:
-            if hasattr(conn, 'mav'):
-                conn.mav.command_long_send(
-                    conn.target_system,
-                    conn.target_component,
-                    mavutil.mavlink.MAV_CMD_NAV_LAND,
-                    0,  # Confirmation
-                    0, 0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"İniş komutu hatası: {e}")
-            return False
+        future = self.send_command(mavutil.mavlink.MAV_CMD_NAV_LAND, name="İniş")
+        return future is not None
             
     def cut_motors(self) -> bool:
-        """Motor kesme komutu gönder"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Motor kesme hatası: Bağlantı aktif değil.")
-                return False
-                
-        return self._send_cut_motors_command(self.connection)
-        
-    def _send_cut_motors_command(self, conn) -> bool:
-        """Motor kesme komutu gönder"""
-        try:
-            # Disarm command
-            if hasattr(conn, 'mav'):
-                conn.mav.command_long_send(
-                    conn.target_system,
-                    conn.target_component,
-                    mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,
-                    0,  # Confirmation
-                    0,  # Disarm
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Motor kesme komutu hatası: {e}")
-            return False
+        """Motor kesme komutu gönder (disarm)"""
+        future = self.send_command(mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 0,
+                                   name="Motor kesme", timeout=0.5)
+        return future is not None
             
     def connect_hall_sensor(self, port_name: str, baudrate: int = 9600) -> bool:
-        """Hall Effect sensörü için seri port bağlantısını kur"""
+        """Hall Effect sensörü için seri portu aç ve okuyucu thread'i başlat"""
         try:
-            with self._hall_lock:
-                if self.hall_serial_port:
-                    try:
-                        self.hall_serial_port.close()
-                    except:
-                        pass
-                
-                self.hall_serial_port = serial.Serial(port_name, baudrate, timeout=1)
-                self.hall_port_name = port_name
-                self.hall_baudrate = baudrate
-                print(f"[HALL] Sensör bağlandı: {port_name}")
-                return True
-                
+            self.hall.connect(port_name, baudrate)
+            print(f"[HALL] Sensör bağlandı: {port_name}")
+            return True
         except Exception as e:
             self._emit_error(f"Hall Effect sensör bağlantı hatası: {e}")
             return False
     
     def read_hall_sensor_data(self) -> Dict[str, Any]:
-        """Hall Effect sensör verilerini oku"""
-        try:
-            with self._hall_lock:
-                if not self.hall_serial_port or not self.hall_serial_port.is_open:
-                    return {'hall_effect': 0, 'magnetic_field': 0}
-                
-                # Sensörden veri oku
-                if self.hall_serial_port.in_waiting > 0:
-                    line = self.hall_serial_port.readline().decode('utf-8').strip()
-                    if line:
-                        # Sensör verisi formatı: "HALL:123,MAG:456" gibi
-                        try:
-                            parts = line.split(',')
-                            for part in parts:
-                                if part.startswith('HALL:'):
-                                    self.hall_effect_value = int(part.split(':')[1])
-                                elif part.startswith('MAG:'):
-                                    self.magnetic_field_value = int(part.split(':')[1])
-                        except:
-                            pass
-                
-                return {
-                    'hall_effect': self.hall_effect_value,
-                    'magnetic_field': self.magnetic_field_value
-                }
-                
-        except Exception as e:
-            self._emit_error(f"Hall Effect sensör okuma hatası: {e}")
-            return {'hall_effect': 0, 'magnetic_field': 0}
+        """Hall Effect sensörünün son örneği (seri port okunmaz, bloklanmaz)"""
+        return self.hall.latest()
+    
+    def read_hall_effect_value(self) -> Optional[int]:
+        """Son Hall değeri; sensör bağlı değilse ya da örnek yoksa None"""
+        if not self.hall.connected:
+            return None
+        return self.hall.latest_value()
     
     def disconnect_hall_sensor(self) -> None:
         """Hall Effect sensör bağlantısını kes"""
-        with self._hall_lock:
-            if self.hall_serial_port:
-                try:
-                    self.hall_serial_port.close()
-                except:
-                    pass
-                self.hall_serial_port = None
-                self.hall_port_name = None
+        self.hall.disconnect()
             
     def goto_altitude(self, target_alt: float) -> bool:
         """Belirli irtifaya git komutu"""
@@ -528,255 +658,134 @@ class MAVLinkThread(QThread):
             self._emit_error(f"İrtifa komutu hatası: {e}")
             return False
             
-    def upload_mission(self, waypoints: List[Dict[str, Any]]) -> bool:
-        """Görev yükle"""
+    def start_mission_transfer(self, transfer: MissionTransfer) -> bool:
+        """Görev aktarımını MAVLink thread'inde başlatılmak üzere kuyruğa al (hemen döner)"""
+        if not self.connection or not self.is_connected:
+            self._emit_error("Görev aktarım hatası: Bağlantı aktif değil.")
+            return False
+        if (self._mission_transfer is not None and self._mission_transfer.active) or self._pending_transfer is not None:
+            self._emit_error("Görev aktarım hatası: Devam eden bir aktarım var.")
+            return False
+        self._pending_transfer = transfer
+        self._link_reader.wakeup()
+        return True
+
+    def cancel_mission_transfer(self) -> None:
+        """Devam eden görev aktarımını iptal et"""
+        self._pending_transfer = None
+        transfer = self._mission_transfer
+        if transfer is not None and transfer.active:
+            with self._connection_lock:
+                transfer.cancel(self.connection.mav if self.connection else None)
+            self._link_reader.wakeup()
+
+    def _transfer_wait(self, now: float) -> float:
+        if self._pending_transfer is not None:
+            return 0.0
+        transfer = self._mission_transfer
+        return transfer.time_until_deadline(now) if transfer is not None else float('inf')
+
+    def _service_mission_transfer(self) -> None:
+        """Bekleyen aktarımı başlat, zaman aşımında yeniden gönder, biteni bildir"""
+        transfer = self._mission_transfer
+        if self._pending_transfer is None and transfer is None:
+            return
         with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Görev yükleme hatası: Bağlantı aktif değil.")
+            conn = self.connection
+            if not conn:
+                return
+            if self._pending_transfer is not None and not (transfer is not None and transfer.active):
+                if not conn.target_system:
+                    return  # Araç heartbeat'i bekleniyor
+                transfer, self._pending_transfer = self._pending_transfer, None
+                self._mission_transfer = transfer
+                transfer.start(conn.mav, conn.target_system, conn.target_component)
+                self.mission_transfer_progress.emit(transfer.direction, 0, transfer.total)
+            elif transfer is not None and transfer.active:
+                transfer.service(conn.mav)
+        self._finish_mission_transfer()
+
+    def _finish_mission_transfer(self) -> None:
+        transfer = self._mission_transfer
+        if transfer is None or transfer.state not in ('done', 'failed'):
+            return
+        result = transfer.result()
+        self.last_mission_transfer = result
+        self._mission_transfer = None
+        if result['success']:
+            action = f" ({result['action']})" if result.get('action') else ""
+            print(f"[MISSION] {result['direction']}{action}: {result['count']} öğe, {result['elapsed']:.2f} s, "
+                  f"{result['retries_total']} yeniden gönderim")
+        else:
+            self._emit_error(f"Görev aktarımı başarısız ({result['direction']}): {result['error']}")
+        self.mission_transfer_finished.emit(result)
+
+    def upload_mission(self, waypoints: List[Dict[str, Any]], sync: bool = True) -> bool:
+        """Görev yükle (MissionPlanner waypoint listesi). Sonuç mission_transfer_finished ile gelir.
+
+        sync=True: önce araçtaki görev indirilip karşılaştırılır, yalnızca farklıysa yüklenir.
+        """
+        for i, wp in enumerate(waypoints):
+            if wp.get('command', 16) == mavutil.mavlink.MAV_CMD_DO_SET_RELAY:
+                continue  # DO_SET_RELAY komutları için koordinat kontrolü yapma
+            lat = wp.get('lat', 0)
+            lon = wp.get('lon', 0)
+            alt = wp.get('alt', 0)
+            if not (-90.1 <= lat <= 90.1) or not (-180.1 <= lon <= 180.1):
+                self._emit_error(f"Geçersiz waypoint koordinatları: {i}")
                 return False
-                
-        try:
-            # Mission clear
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.mission_clear_all_send(
-                    self.connection.target_system,
-                    self.connection.target_component
-                )
-                
-                # Waypoint'leri yükle
-                for i, wp in enumerate(waypoints):
-                    lat = wp.get('lat', 0)
-                    lon = wp.get('lon', 0)
-                    alt = wp.get('alt', 0)
-                    command = wp.get('command', 16)  # MAV_CMD_NAV_WAYPOINT varsayılan
-                    param1 = wp.get('param1', 0)
-                    param2 = wp.get('param2', 0)
-                    param3 = wp.get('param3', 0)
-                    param4 = wp.get('param4', 0)
-                    
-                    # DO_SET_RELAY komutları için koordinat kontrolü yapma
-                    if command == 181:  # MAV_CMD_DO_SET_RELAY
-                        # MAVLink mission item gönder
-                        self.connection.mav.mission_item_send(
-                            self.connection.target_system,
-                            self.connection.target_component,
-                            int(i),  # Sequence - integer olarak cast et
-                            mavutil.mavlink.MAV_FRAME_MISSION,
-                            command,  # MAV_CMD_DO_SET_RELAY
-                            0, 0,  # Current, autocontinue
-                            param1, param2, param3, param4,  # Param 1-4
-                            0,  # Altitude (relay için kullanılmaz)
-                            0, 0,  # X, Y (relay için kullanılmaz)
-                            0, 0  # Lat, Lon (relay için kullanılmaz)
-                        )
-                    else:
-                        # Normal waypoint komutları için koordinat doğrulaması
-                        if not (-90.1 <= lat <= 90.1) or not (-180.1 <= lon <= 180.1):
-                            self._emit_error(f"Geçersiz waypoint koordinatları: {i}")
-                            return False
-                            
-                        # İrtifa doğrulaması - daha esnek
-                        if alt < -50 or alt > 3000:  # 3000m maksimum
-                            self._emit_error(f"Geçersiz waypoint irtifası: {i}")
-                            return False
-                            
-                        # MAVLink mission item gönder
-                        self.connection.mav.mission_item_send(
-                            self.connection.target_system,
-                            self.connection.target_component,
-                            int(i),  # Sequence - integer olarak cast et
-                            mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT,
-                            command,  # Command
-                            0, 0,  # Current, autocontinue
-                            param1, param2, param3, param4,  # Param 1-4
-                            alt,  # Altitude
-                            0, 0,  # X, Y
-                            lat, lon  # Lat, Lon
-                        )
-                    
-                    # Her waypoint için ACK bekle
-                    ack_received = False
-                    start_time = time.time()
-                    while time.time() - start_time < 2.0:  # 2 saniye timeout
-                        try:
-                            msg = self.connection.recv_match(type='MISSION_ACK', timeout=0.1)
-                            if msg and msg.seq == i:
-                                ack_received = True
-                                break
-                        except:
-                            pass
-                    
-                    if not ack_received:
-                        self._emit_error(f"Waypoint {i} ACK alınamadı")
-                        return False
-                    
-                # Mission count gönder
-                self.connection.mav.mission_count_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    int(len(waypoints))  # Integer olarak cast et
-                )
-                
-                # Mission count ACK bekle
-                count_ack_received = False
-                start_time = time.time()
-                while time.time() - start_time < 3.0:  # 3 saniye timeout
-                    try:
-                        msg = self.connection.recv_match(type='MISSION_ACK', timeout=0.1)
-                        if msg and msg.type == mavutil.mavlink.MAV_MISSION_ACCEPTED:
-                            count_ack_received = True
-                            break
-                    except:
-                        pass
-                
-                if not count_ack_received:
-                    self._emit_error("Mission count ACK alınamadı")
-                    return False
-                
-            return True
-        except Exception as e:
-            self._emit_error(f"Görev yükleme hatası: {e}")
-            return False
+            # İrtifa doğrulaması - daha esnek
+            if alt < -50 or alt > 3000:  # 3000m maksimum
+                self._emit_error(f"Geçersiz waypoint irtifası: {i}")
+                return False
+        return self._start_upload(waypoints_to_items(waypoints, self.home_position), sync)
 
-    def upload_mission_raw(self, items: List[Dict[str, Any]]) -> bool:
+    def upload_mission_raw(self, items: List[Dict[str, Any]], sync: bool = True) -> bool:
         """
         QGC WPL formatından gelen ham mission item'ları aynen Pixhawk'a yaz.
         items: dict list with keys: seq,current,frame,command,param1..4,x,y,z,autocontinue
+        Sonuç mission_transfer_finished sinyaliyle gelir.
         """
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Görev yükleme hatası: Bağlantı aktif değil.")
-                return False
-
-        try:
-            if not hasattr(self.connection, 'mav'):
-                self._emit_error("MAV nesnesi yok")
-                return False
-
-            # Mission clear
-            self.connection.mav.mission_clear_all_send(
-                self.connection.target_system,
-                self.connection.target_component
-            )
-
-            # Mission count
-            self.connection.mav.mission_count_send(
-                self.connection.target_system,
-                self.connection.target_component,
-                int(len(items))
-            )
-
-            # Gönderim
-            for it in items:
-                seq = int(it.get('seq', 0))
-                current = int(it.get('current', 0))
-                frame = int(it.get('frame', mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT))
-                command = int(it.get('command', 16))
-                p1 = float(it.get('param1', 0))
-                p2 = float(it.get('param2', 0))
-                p3 = float(it.get('param3', 0))
-                p4 = float(it.get('param4', 0))
-                x = float(it.get('x', 0))
-                y = float(it.get('y', 0))
-                z = float(it.get('z', 0))
-                autocont = int(it.get('autocontinue', 1))
-
-                self.connection.mav.mission_item_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    seq,
-                    frame,
-                    command,
-                    current,
-                    autocont,
-                    p1, p2, p3, p4,
-                    x, y, z
-                )
+        return self._start_upload(items, sync)
 
-            # Basit ACK bekleme
-            start_time = time.time()
-            while time.time() - start_time < 3.0:
-                try:
-                    msg = self.connection.recv_match(type='MISSION_ACK', timeout=0.1)
-                    if msg and msg.type == mavutil.mavlink.MAV_MISSION_ACCEPTED:
-                        return True
-                except:
-                    pass
+    def _start_upload(self, items: List[Dict[str, Any]], sync: bool) -> bool:
+        transfer = MissionSync(items) if sync else MissionUpload(items)
+        return self.start_mission_transfer(transfer)
 
-            self._emit_error("Ham mission ACK alınamadı")
-            return False
-        except Exception as e:
-            self._emit_error(f"Ham görev yükleme hatası: {e}")
-            return False
+    def download_mission(self) -> bool:
+        """Araçtaki görevi indir; öğeler ve özet mission_transfer_finished sonucunda ('items', 'hash') gelir"""
+        return self.start_mission_transfer(MissionDownload())
             
     def start_mission(self) -> bool:
-        """Görev başlat - önce AUTO moda geç, sonra MISSION_START gönder"""
-        with self._connection_lock:
+        """Görev başlat - önce AUTO moda geç, mod komutu sonuçlanınca MISSION_START gönder"""
+        mode = self._send_mode('AUTO')
+        if mode is None:
             if not self.connection or not self.is_connected:
-                self._emit_error("Görev başlatma hatası: Bağlantı aktif değil.")
                 return False
-                
-        try:
-            # Önce AUTO moda geç
-            if not self.set_mode('AUTO'):
-                self._emit_error("UYARI: AUTO moda geçilemedi, yine de görevi başlatmayı deneyeceğim.")
-                
-            # MISSION_START komutu gönder
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_MISSION_START,
-                    0,  # Confirmation
-                    0, 0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Görev başlatma hatası: {e}")
-            return False
+            self._emit_error("UYARI: AUTO moda geçilemedi, yine de görevi başlatmayı deneyeceğim.")
+            return self.send_command(mavutil.mavlink.MAV_CMD_MISSION_START, name="Görev başlatma") is not None
+
+        def start_after_mode(future: CommandFuture) -> None:
+            # MAVLink thread'inde, mod ACK'i (ya da zaman aşımı) sonrası
+            if future.result == RESULT_CANCELLED:
+                return  # Bağlantı kapandı
+            if not future.accepted:
+                self._emit_error(f"UYARI: AUTO moda geçilemedi ({future.result_name}), "
+                                 "yine de görevi başlatmayı deneyeceğim.")
+            self.send_command(mavutil.mavlink.MAV_CMD_MISSION_START, name="Görev başlatma")
+
+        mode.add_done_callback(start_after_mode)
+        return True
             
     def pause_mission(self) -> bool:
         """Görev duraklat"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Görev duraklatma hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_PAUSE_CONTINUE,
-                    0,  # Confirmation
-                    1,  # Pause
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Görev duraklatma hatası: {e}")
-            return False
+        future = self.send_command(mavutil.mavlink.MAV_CMD_DO_PAUSE_CONTINUE, 1, name="Görev duraklatma")
+        return future is not None
 
     def resume_mission(self) -> bool:
         """Görevi devam ettir"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("Görev devam ettirme hatası: Bağlantı aktif değil.")
-                return False
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_DO_PAUSE_CONTINUE,
-                    0,
-                    0,  # Continue
-                    0, 0, 0, 0, 0, 0
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"Görev devam ettirme hatası: {e}")
-            return False
+        future = self.send_command(mavutil.mavlink.MAV_CMD_DO_PAUSE_CONTINUE, 0, name="Görev devam ettirme")
+        return future is not None
             
     def abort_mission(self) -> bool:
         """Görev iptal et"""
@@ -865,14 +874,7 @@ class MAVLinkThread(QThread):
         try:
             # Arm command
             if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,
-                    0,  # Confirmation
-                    1,  # Arm
-                    0, 0, 0, 0, 0, 0  # Unused parameters
-                )
+                self.send_command(mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 1, name="Arm")
                 
                 # Sabit kanat için TAKEOFF waypoint'i oluştur ve gönder
                 # Bu waypoint görev listesine eklenir ve AUTO modda çalıştırılır
@@ -897,27 +899,6 @@ class MAVLinkThread(QThread):
             self._emit_error(f"Arm/Takeoff hatası: {e}")
             return False
             
-    def land(self) -> bool:
-        """İniş komutu gönder"""
-        with self._connection_lock:
-            if not self.connection or not self.is_connected:
-                self._emit_error("İniş hatası: Bağlantı aktif değil.")
-                return False
-                
-        try:
-            if hasattr(self.connection, 'mav'):
-                self.connection.mav.command_long_send(
-                    self.connection.target_system,
-                    self.connection.target_component,
-                    mavutil.mavlink.MAV_CMD_NAV_LAND,
-                    0,  # Confirmation
-                    0, 0, 0, 0, 0, 0, 0  # Unused parameters
-                )
-            return True
-        except Exception as e:
-            self._emit_error(f"İniş hatası: {e}")
-            return False
-            
     def handle_automatic_action(self, action: str) -> None:
         """Otomatik aksiyon işle"""
         if action == "RTL":
@@ -929,6 +910,189 @@ class MAVLinkThread(QThread):
         else:
             self._emit_error(f"Bilinmeyen otomatik aksiyon: {action}")
             
+    def set_telemetry_publish_rate(self, rate_hz: float) -> None:
+        """Arayüze telemetri yayın hızını ayarla (Hz). 0 = her mesajı ayrı sinyal olarak gönder"""
+        self.telemetry_publisher.set_rate(rate_hz)
+        self._link_reader.wakeup()
+
+    def mark_frame_consumed(self, seq: int) -> None:
+        """Arayüz bir telemetri çerçevesini işlediğinde çağırır (backlog takibi)"""
+        self.telemetry_publisher.mark_consumed(seq)
+
+    def get_telemetry_stats(self) -> Dict[str, Any]:
+        """Yayın hızı, backlog ve birleştirilen ara örnek sayıları"""
+        return self.telemetry_publisher.get_stats()
+
+    def _publish(self, channel: str, data: Dict[str, Any]) -> None:
+        """Telemetri verisini snapshot'a yaz; birleştirme kapalıysa doğrudan sinyal gönder"""
+        self._emit_emergency(self.check_emergency_conditions(data))
+        if self.telemetry_publisher.enabled:
+            self.telemetry_snapshot.update(channel, data)
+            return
+        self.telemetry_snapshot.notify(channel, data)
+        if channel == 'attitude':
+            self.attitude_received.emit(data)
+        elif channel == 'position':
+            self.position_received.emit(data)
+        else:
+            self.telemetry_received.emit(data)
+
+    def _publish_vehicle(self, vehicle: VehicleState, channel: str, data: Dict[str, Any]) -> None:
+        """Aracın kendi snapshot'ını güncelle; aktif araçsa arayüze de yayınla"""
+        vehicle.snapshot.update(channel, data)
+        if vehicle is self.vehicles.active:
+            self._publish(channel, data)
+
+    def _flush_telemetry(self) -> None:
+        """Yayın zamanı geldiyse birleştirilmiş çerçeveyi arayüze gönder"""
+        result = self.telemetry_publisher.poll(time.monotonic())
+        if result is not None:
+            self.telemetry_frame.emit(result[1])
+
+    def _rx_timeout(self) -> float:
+        """Bir sonraki telemetri yayınına, komut, görev ve parametre aktarımı zaman aşımına göre okuma bekleme süresi"""
+        now = time.monotonic()
+        return min(self.rx_wait_timeout,
+                   self.telemetry_publisher.time_until_next(now),
+                   self.commands.time_until_next(now),
+                   self._transfer_wait(now),
+                   self.emergency_rules.time_until_next(now),
+                   0.0 if self._params_pending else self.params.time_until_next(now))
+
+    def set_rx_mode(self, mode: str) -> None:
+        """Alım motorunu seç ('event' veya 'poll') ve ölçüm sayaçlarını sıfırla"""
+        if mode not in ('event', 'poll'):
+            raise ValueError(f"Geçersiz alım modu: {mode}")
+        self.rx_mode = mode
+        self._link_reader.reset_stats()
+        self._link_reader.wakeup()
+
+    def get_rx_stats(self) -> Dict[str, Any]:
+        """Alım döngüsü ölçümleri: CPU kullanımı, batch boyutu ve paket başı gecikme"""
+        stats = self._link_reader.get_stats()
+        stats['mode'] = self.rx_mode
+        stats['decoder'] = self._link_reader.decoder
+        return stats
+
+    def get_link_stats(self) -> Dict[str, Any]:
+        """Mesaj tipi bazında hız (Hz), bayt/s, çözme ve işleyici süreleri, kayıp paket ve ping"""
+        stats = self.link_stats.snapshot()
+        stats['rx'] = self._link_reader.get_stats()
+        stats['router'] = self.router.get_stats()
+        conn = self.connection
+        if isinstance(conn, ProcessLinkConnection):
+            process = stats['process'] = conn.get_stats()
+            if process and conn.telemetry_hz > 0:
+                # Seyreltilen paketler ana süreçte sequence boşluğu gibi görünür; kayıp çocuk süreçte sayılır
+                stats['dropped'] = process['dropped']
+                stats['loss_percent'] = process['loss_percent']
+        return stats
+
+    def get_shared_snapshot(self) -> Dict[str, float]:
+        """G/Ç sürecinin ortak bellekteki son telemetri değerleri (tam hız); süreç modu kapalıysa boş"""
+        conn = self.connection
+        if isinstance(conn, ProcessLinkConnection) and conn.process is not None:
+            return conn.snapshot.read()
+        return {}
+
+    def start_tlog(self, path: Optional[str] = None) -> Optional[str]:
+        """Ham .tlog kaydını başlat (açık kayıt varsa kapatılır); dosya yolunu döndürür"""
+        self.stop_tlog()
+        writer = TlogWriter(path or default_tlog_path(self.tlog_directory))
+        try:
+            writer.start()
+        except OSError as e:
+            self._emit_error(f"Tlog kaydı başlatılamadı: {e}")
+            return None
+        self.tlog = writer
+        print(f"[TLOG] Kayıt: {writer.path}")
+        return writer.path
+
+    def stop_tlog(self) -> None:
+        writer, self.tlog = self.tlog, None
+        if writer is not None:
+            writer.stop()
+            stats = writer.get_stats()
+            print(f"[TLOG] Kapatıldı: {stats['packets']} paket, {stats['bytes']} bayt, "
+                  f"{stats['dropped_batches']} düşen batch")
+
+    def get_tlog_stats(self) -> Optional[Dict[str, Any]]:
+        """Kayıt sayaçları (paket, bayt, bekleyen batch, fsync); kayıt yoksa None"""
+        writer = self.tlog
+        return writer.get_stats() if writer is not None else None
+
+    def add_router_endpoint(self, spec: str) -> bool:
+        """Yönlendirici ucu ekle (ör. 'udpout:127.0.0.1:14550', 'udpin:0.0.0.0:14551', 'tcpin:0.0.0.0:5770')"""
+        try:
+            self.router.add_endpoint(spec)
+        except Exception as e:
+            self._emit_error(f"Yönlendirici ucu açılamadı ({spec}): {e}")
+            return False
+        self._link_reader.wakeup()  # Yeni ucu select() kümesine al
+        return True
+
+    def remove_router_endpoint(self, spec: str) -> bool:
+        removed = self.router.remove_endpoint(spec)
+        self._link_reader.wakeup()
+        return removed
+
+    def get_router_stats(self) -> Dict[str, Any]:
+        """Yönlendirici uç sayaçları, iletilen bayt/s ve araç -> uç ek gecikmesi"""
+        return self.router.get_stats()
+
+    def _service_router(self) -> None:
+        """Uçlardan gelen baytları çözmeden araca ve diğer uçlara ilet"""
+        if self.router.endpoints:
+            self.router.service(self._write_vehicle)
+
+    def _write_vehicle(self, data: bytes) -> None:
+        with self._connection_lock:
+            if self.connection:
+                self.connection.write(data)
+
+    def _send_timesync(self) -> None:
+        """Ping ölçümü için periyodik TIMESYNC isteği gönder (tc1=0)"""
+        now = time.monotonic()
+        if now < self._next_timesync:
+            return
+        self._next_timesync = now + self.timesync_interval
+        sent_ns = time.monotonic_ns()
+        with self._connection_lock:
+            if not self.connection:
+                return
+            self.connection.mav.timesync_send(0, sent_ns)
+        self._timesync_sent_ns = sent_ns
+
+    def request_stream_rate(self, owner: str, msg_type: str, hz: float) -> None:
+        """Arayüz bileşeni için mesaj hızı talep et (en yüksek talep uygulanır)"""
+        self.stream_rates.request(owner, msg_type, hz)
+        self._link_reader.wakeup()
+
+    def release_stream_rates(self, owner: str) -> None:
+        """Bileşenin hız taleplerini kaldır (ör. HUD gizlendiğinde)"""
+        self.stream_rates.release(owner)
+        self._link_reader.wakeup()
+
+    def set_stream_rate(self, msg_type: str, hz: float) -> None:
+        """Mesajın taban hızını ayarla (abonelik varsayılanını ezer)"""
+        self.stream_rates.set_base_rate(msg_type, hz)
+        self._link_reader.wakeup()
+
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """Kullanılan yöntem (SET_MESSAGE_INTERVAL / REQUEST_DATA_STREAM) ve istenen hızlar"""
+        return self.stream_rates.get_stats()
+
+    def _update_subscribed_streams(self) -> None:
+        self.stream_rates.set_subscribed(self.dispatcher.subscribed_types())
+
+    def _service_stream_rates(self) -> None:
+        """Bekleyen hız değişikliklerini araca gönder (araç heartbeat'i alındıktan sonra)"""
+        with self._connection_lock:
+            conn = self.connection
+            if not conn or not conn.target_system:
+                return
+            self.stream_rates.service(conn.mav, conn.target_system, conn.target_component)
+
     def run(self):
         """Ana thread döngüsü"""
         while self.running:
@@ -940,144 +1104,411 @@ class MAVLinkThread(QThread):
                     self.last_heartbeat = None
                 if not hasattr(self, 'armed'):
                     self.armed = False
-                with self._connection_lock:
-                    if not self.connection or not self.is_connected:
-                        time.sleep(1)
-                        continue
-                        
+                # Referansı yerel al; kilit yalnızca bağlantı kurulurken/kapatılırken gerekir
+                conn = self.connection
+                if not conn or not self.is_connected:
+                    if self.supervisor.enabled:
+                        self._supervise()
+                    else:
+                        self._link_reader.idle(1.0)
+                    continue
+                    
                 # Mesajları oku
                 try:
-                    msg = self.connection.recv_match(blocking=False, timeout=0.1)
+                    if self.rx_mode == 'poll':
+                        self._receive_poll(conn)
+                    else:
+                        self._receive_batch(conn)
                 except Exception as ser_e:
+                    if not self.running:
+                        break
+                    if self.connection is not conn:
+                        continue  # Bağlantı okurken kapatıldı/değiştirildi (disconnect_link)
+                    if isinstance(ser_e, OSError) and self.supervisor.enabled and not self.replay:
+                        # Port kayboldu (USB çıkarıldı): beklemeden yeniden bağlanmaya geç
+                        self._link_lost(f"Seri okuma hatası: {ser_e}")
+                        continue
                     # Seri port hatalarını bastırıp bildir, döngüye devam et
                     self._emit_error(f"Seri okuma hatası: {ser_e}")
                     time.sleep(0.2)
                     continue
-                if msg:
-                    self._process_message(msg)
+                    
+                self._service_router()
+                self._flush_telemetry()
+                self._emit_emergency(self.emergency_rules.poll())
+                if self.replay:
+                    # Kayıttaki araca istek gönderilmez; dosya bitince oynatmayı kapat
+                    if conn.finished:
+                        self._finish_replay(conn)
+                    continue
+                self._send_timesync()
+                self._service_stream_rates()
+                self._service_commands()
+                self._service_mission_transfer()
+                self._service_params()
                     
                 # Bağlantı timeout kontrolü
                 if self.last_heartbeat and time.time() - self.last_heartbeat > self.connection_timeout:
-                    self.is_connected = False
-                    self._emit_error("Bağlantı timeout")
+                    self._link_lost("Bağlantı timeout")
                     
             except Exception as e:
                 self._emit_error(f"Thread hatası: {e}")
                 time.sleep(1)
+
+    def _link_lost(self, reason: str) -> None:
+        """Bağlantı koptu: bekleyen işleri iptal et, gözetmen açıksa portu bırakıp yeniden bağlan"""
+        self.is_connected = False
+        self._emit_error(reason)
+        self.commands.cancel_all()
+        if self._mission_transfer is not None and self._mission_transfer.active:
+            self._mission_transfer.cancel()
+        if not self.supervisor.enabled:
+            return
+        with self._connection_lock:
+            if self.connection:
+                try:
+                    self.connection.close()
+                except Exception:
+                    pass
+                self.connection = None
+        self.supervisor.lost()
+        print(f"[LINK] Bağlantı koptu ({reason}), yeniden bağlanılıyor")
+        self.link_state.emit('lost', reason)
+
+    def _supervise(self) -> None:
+        """Bağlantı yokken: zamanı geldiyse portları tara ve ilk heartbeat'e kilitlen"""
+        delay = self.supervisor.time_until_attempt()
+        if delay > 0:
+            self._link_reader.idle(min(delay, 1.0))
+            return
+        self.link_state.emit('searching', '')
+        result = self.supervisor.attempt()
+        if result is None:
+            return
+        if not self.running or not self.supervisor.enabled:
+            result.connection.close()  # Tarama sırasında durduruldu
+            return
+        if self._open_link(lambda: self._make_connection(result.device, result.baud, result.connection),
+                           result.heartbeat):
+            self.supervisor.connected(result.device, result.baud)
+            detail = f"{result.device} @ {result.baud}"
+            print(f"[LINK] Bağlandı: {detail} (algılama {result.elapsed:.2f} s)")
+            self.link_state.emit('connected', detail)
+
+    def _finish_replay(self, conn) -> None:
+        """Oynatma bitti: alım/çözme/dağıtım ölçümlerini bildir"""
+        self.is_connected = False
+        result = conn.get_stats()
+        result['path'] = conn.path
+        result['rx'] = self._link_reader.get_stats()
+        result['link'] = self.link_stats.snapshot()
+        print(f"[REPLAY] {conn.path}: {result['packets']} paket, {result['elapsed']:.2f} s, "
+              f"{result['packets_per_s']:.0f} paket/s")
+        with self._connection_lock:
+            if self.connection is conn:
+                conn.close()
+                self.connection = None
+                self.replay = False
+        self.replay_finished.emit(result)
+
+    def _receive_batch(self, conn) -> None:
+        """Port okunabilir olana kadar bloklan, gelen tüm paketleri tek batch'te işle"""
+        self._link_reader.extra_fds = self.router.fds() if self.router.endpoints else []
+        if not self._link_reader.wait(conn, self._rx_timeout()):
+            return
+        # Alım anı select dönüşüdür: okuma ve çözme süresi de gecikmeye dahil
+        rx_time = self._link_reader.ready_time
+        self.rx_time = time.monotonic() - (time.perf_counter() - rx_time)
+        messages = self._link_reader.read_batch(conn)
+        # Yönlendirme çözümlemeden önce: uçlara eklenen gecikme en az olsun
+        self.router.forward_from_vehicle(messages, rx_time)
+        tlog = self.tlog
+        if tlog is not None:
+            tlog.record(messages)
+        self.link_stats.record_batch(messages, self._link_reader.last_decode_time)
+        for msg in messages:
+            self._process_message(msg)
+            self._link_reader.record_latency(rx_time)
+
+    def _receive_poll(self, conn) -> None:
+        """Eski bloklamayan okuma döngüsü (karşılaştırmalı ölçüm için)"""
+        reader = self._link_reader
+        reader.tick()
+        reader.stats['wakeups'] += 1
+        # Bloklamayan okumada bekleme yok: paket çağrıdan önce gelmişti, alım anı t0 sayılır
+        t0 = rx_time = time.perf_counter()
+        self.rx_time = time.monotonic()
+        with self._connection_lock:
+            msg = conn.recv_match(blocking=False, timeout=0.1)
+        if not msg:
+            reader.stats['idle_wakeups'] += 1
+            return
+        # recv_match okuma ve çözmeyi birlikte yapar; süre üst sınır olarak kaydedilir
+        decoded = time.perf_counter()
+        self.router.forward_from_vehicle([msg], rx_time)
+        tlog = self.tlog
+        if tlog is not None:
+            tlog.record([msg])
+        self.link_stats.record_batch([msg], decoded - t0)
+        reader.stats['batches'] += 1
+        reader.stats['packets'] += 1
+        reader.stats['bytes'] += len(msg.get_msgbuf())
+        reader.stats['max_batch'] = max(reader.stats['max_batch'], 1)
+        self._process_message(msg)
+        reader.record_latency(rx_time)
                 
+    def subscribe(self, msg_type: str, handler) -> None:
+        """Mesaj tipine işleyici ekle ('*' = tüm mesajlar).
+
+        İşleyici MAVLink thread'inde mesaj nesnesiyle çağrılır; arayüz nesnelerine
+        doğrudan dokunmamalıdır (bunun için forward_to_gui kullanın).
+        """
+        self.dispatcher.subscribe(msg_type, handler)
+        self._update_subscribed_streams()
+        self._link_reader.wakeup()
+
+    def unsubscribe(self, msg_type: str, handler) -> None:
+        """İşleyiciyi kaldır; abonesi kalmayan mesajın yayını kapatılır"""
+        self.dispatcher.unsubscribe(msg_type, handler)
+        self._update_subscribed_streams()
+        self._link_reader.wakeup()
+
+    def forward_to_gui(self, msg_type: str) -> None:
+        """Mesaj tipini message_received sinyaliyle arayüz thread'ine ilet"""
+        if msg_type not in self._gui_forwarded:
+            self._gui_forwarded.add(msg_type)
+            self.dispatcher.subscribe(msg_type, self._emit_message_to_gui)
+            self._update_subscribed_streams()
+            self._link_reader.wakeup()
+
+    def _emit_message_to_gui(self, msg) -> None:
+        self.message_received.emit(msg.get_type(), msg.to_dict())
+
+    def _on_dispatch_error(self, msg_type: str, handler, error: Exception) -> None:
+        self._emit_error(f"Mesaj işleme hatası ({msg_type}): {error}")
+
+    def _register_default_handlers(self) -> None:
+        """Thread'in kendi telemetri işleyicilerini dağıtıcıya kaydet"""
+        self.dispatcher.subscribe('HEARTBEAT', self._on_heartbeat)
+        self.dispatcher.subscribe('GPS_RAW_INT', self._on_gps_raw_int)
+        self.dispatcher.subscribe('ATTITUDE', self._on_attitude)
+        self.dispatcher.subscribe('VFR_HUD', self._on_vfr_hud)
+        self.dispatcher.subscribe('SYS_STATUS', self._on_sys_status)
+        self.dispatcher.subscribe('MISSION_ITEM_REACHED', self._on_mission_item_reached)
+        self.dispatcher.subscribe('MISSION_ACK', self._on_mission_ack)
+        self.dispatcher.subscribe('MISSION_REQUEST_INT', self._on_mission_request_int)
+        self.dispatcher.subscribe('MISSION_REQUEST', self._on_mission_request)
+        self.dispatcher.subscribe('MISSION_COUNT', self._on_mission_count)
+        self.dispatcher.subscribe('MISSION_ITEM_INT', self._on_mission_item_int)
+        self.dispatcher.subscribe('RADIO_STATUS', self._on_radio_status)
+        self.dispatcher.subscribe('TIMESYNC', self._on_timesync)
+        self.dispatcher.subscribe('COMMAND_ACK', self._on_command_ack)
+        self.dispatcher.subscribe('PARAM_VALUE', self._on_param_value)
+
     def _process_message(self, msg) -> None:
-        """MAVLink mesajını işle"""
+        """MAVLink mesajını abonelerine dağıt (tek sözlük araması)"""
         try:
-            msg_type = msg.get_type()
-            
-            if msg_type == 'HEARTBEAT':
-                self.last_heartbeat = time.time()
-                # ARM durumu güncelle
-                base_mode = getattr(msg, 'base_mode', 0)
-                self.armed = bool(base_mode & mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED)
-                # Uçuş modu çözümü
-                custom_mode = getattr(msg, 'custom_mode', None)
-                mode_str = None
-                if custom_mode is not None:
-                    # ArduPilot/ArduPlane modları
-                    mode_map = {
-                        0: 'MANUAL', 1: 'CIRCLE', 2: 'STABILIZE', 3: 'TRAINING', 4: 'ACRO', 5: 'FLY_BY_WIRE_A',
-                        6: 'FLY_BY_WIRE_B', 7: 'CRUISE', 8: 'AUTOTUNE', 10: 'AUTO', 11: 'RTL', 12: 'LOITER',
-                        14: 'TAKEOFF', 15: 'AVOID_ADSB', 16: 'GUIDED', 17: 'INITIALISING', 18: 'QSTABILIZE',
-                        19: 'QHOVER', 20: 'QLOITER', 21: 'QLAND', 22: 'QRTL', 23: 'QAUTOTUNE', 24: 'QACRO'
-                    }
-                    mode_str = mode_map.get(custom_mode, f'CUSTOM({custom_mode})')
-                else:
-                    mode_str = 'UNKNOWN'
-                self.last_mode = mode_str  # <-- MODU KAYDET
-                # Telemetriye ilet
-                self.telemetry_received.emit({'armed': self.armed, 'mode': mode_str})
-                
-            elif msg_type == 'GPS_RAW_INT':
-                # GPS verisi
-                lat = msg.lat / 1e7
-                lon = msg.lon / 1e7
-                alt = msg.alt / 1000.0
-                
-                position_data = {
-                    'lat': lat,
-                    'lon': lon,
-                    'alt': alt,
-                    'heading': getattr(msg, 'hdg', 0) / 100.0,
-                    'groundspeed': getattr(msg, 'vel', 0) / 100.0,
-                    'gps_fix': msg.fix_type,
-                    'satellites': msg.satellites_visible
-                }
-                
-                self.last_lat = lat
-                self.last_lon = lon
-                self.position_received.emit(position_data)
-                
-            elif msg_type == 'ATTITUDE':
-                # Attitude verisi
-                attitude_data = {
-                    'roll': math.degrees(msg.roll),
-                    'pitch': math.degrees(msg.pitch),
-                    'yaw': math.degrees(msg.yaw),
-                    'roll_rate': math.degrees(msg.rollspeed),
-                    'pitch_rate': math.degrees(msg.pitchspeed),
-                    'yaw_rate': math.degrees(msg.yawspeed)
-                }
-                self.attitude_received.emit(attitude_data)
-                
-            elif msg_type == 'VFR_HUD':
-                # Telemetri verisi
-                telemetry_data = {
-                    'alt': msg.alt,
-                    'speed': msg.airspeed,
-                    'groundspeed': msg.groundspeed,
-                    'heading': msg.heading,
-                    'throttle': msg.throttle,
-                    'climb': msg.climb,
-                    'armed': self.armed,
-                    'mode': getattr(self, 'last_mode', 'UNKNOWN')
-                }
-                # Acil durum kontrolü
-                emergency_conditions = self.check_emergency_conditions(telemetry_data)
-                if emergency_conditions:
-                    self.emergency_triggered.emit({'conditions': emergency_conditions})
-                self.telemetry_received.emit(telemetry_data)
-                
-            elif msg_type == 'SYS_STATUS':
-                # Sistem durumu
-                system_data = {
-                    'voltage': msg.voltage_battery / 1000.0,
-                    'current': msg.current_battery / 100.0,
-                    'battery': msg.battery_remaining,
-                    'temperature': getattr(msg, 'temperature', 25),
-                    'mode': getattr(self, 'last_mode', 'UNKNOWN')
-                }
-                self.telemetry_received.emit(system_data)
-            
-            elif msg_type == 'MISSION_ITEM_REACHED':
-                # Waypoint'e ulaşıldı
-                waypoint_index = msg.seq
-                self.telemetry_received.emit({'waypoint_reached': waypoint_index})
-                
-            elif msg_type == 'MISSION_ACK':
-                # Görev tamamlandı
-                if msg.type == mavutil.mavlink.MAV_MISSION_ACCEPTED:
-                    self.mission_completed.emit()
-                    self.telemetry_received.emit({'mission_completed': True})
-                
-            elif msg_type == 'RADIO_STATUS':
-                # RSSI verisi
-                rssi = getattr(msg, 'rssi', None)
-                print(f"[MAVLINK] RADIO_STATUS geldi, rssi: {rssi}")
-                if rssi is not None:
-                    self.telemetry_received.emit({'rssi': rssi})
-                
+            self.dispatcher.dispatch(msg)
         except Exception as e:
             self._emit_error(f"Mesaj işleme hatası: {e}")
+
+    def _on_heartbeat(self, msg) -> None:
+        if not is_vehicle_heartbeat(msg):
+            return
+        now = time.time()
+        vehicle = self.vehicles.get(msg.get_srcSystem())
+        if vehicle is None:
+            vehicle = self.vehicles.add(msg.get_srcSystem(), msg.get_srcComponent())
+            print(f"[VEHICLE] Yeni araç: sysid {vehicle.sysid}, compid {vehicle.compid}")
+            if vehicle is self.vehicles.active:
+                with self._connection_lock:
+                    self._apply_target(vehicle)
+            self.vehicles_changed.emit(self.vehicles.sysids())
+        active = vehicle is self.vehicles.active
+        if active and vehicle.last_heartbeat and now - vehicle.last_heartbeat > self.stream_reassert_gap:
+            # Bağlantı kesintisi veya otopilot yeniden başlatması: hızları yeniden iste
+            self.stream_rates.invalidate()
+            self._params_pending = True  # Parametreler değişmiş olabilir: yeniden doğrula
+        self.last_heartbeat = now
+        # ARM durumu ve uçuş modu (araç tipine göre önceden hesaplanmış tablo)
+        mode_str = vehicle.update_heartbeat(msg, now)
+        self._publish_vehicle(vehicle, 'telemetry', {'armed': vehicle.armed, 'mode': mode_str})
+
+    def _on_gps_raw_int(self, msg) -> None:
+        vehicle = self.vehicles.get(msg.get_srcSystem())
+        if vehicle is None:
+            return
+        # GPS verisi
+        lat = msg.lat / 1e7
+        lon = msg.lon / 1e7
+        alt = msg.alt / 1000.0
+        
+        position_data = {
+            'lat': lat,
+            'lon': lon,
+            'alt': alt,
+            'heading': msg.cog / 100.0,
+            'groundspeed': msg.vel / 100.0,
+            'gps_fix': msg.fix_type,
+            'satellites': msg.satellites_visible
+        }
+        
+        vehicle.last_lat = lat
+        vehicle.last_lon = lon
+        self._publish_vehicle(vehicle, 'position', position_data)
+
+    def _on_attitude(self, msg) -> None:
+        vehicle = self.vehicles.get(msg.get_srcSystem())
+        if vehicle is None:
+            return
+        # Attitude verisi
+        attitude_data = {
+            'roll': math.degrees(msg.roll),
+            'pitch': math.degrees(msg.pitch),
+            'yaw': math.degrees(msg.yaw),
+            'roll_rate': math.degrees(msg.rollspeed),
+            'pitch_rate': math.degrees(msg.pitchspeed),
+            'yaw_rate': math.degrees(msg.yawspeed)
+        }
+        self._publish_vehicle(vehicle, 'attitude', attitude_data)
+
+    def _on_vfr_hud(self, msg) -> None:
+        vehicle = self.vehicles.get(msg.get_srcSystem())
+        if vehicle is None:
+            return
+        # Telemetri verisi
+        telemetry_data = {
+            'alt': msg.alt,
+            'speed': msg.airspeed,
+            'groundspeed': msg.groundspeed,
+            'heading': msg.heading,
+            'throttle': msg.throttle,
+            'climb': msg.climb,
+            'armed': vehicle.armed,
+            'mode': vehicle.last_mode or 'UNKNOWN'
+        }
+        self._publish_vehicle(vehicle, 'telemetry', telemetry_data)
+
+    def _on_sys_status(self, msg) -> None:
+        vehicle = self.vehicles.get(msg.get_srcSystem())
+        if vehicle is None:
+            return
+        # Sistem durumu
+        system_data = {
+            'voltage': msg.voltage_battery / 1000.0,
+            'current': msg.current_battery / 100.0,
+            'battery': msg.battery_remaining,
+            'temperature': getattr(msg, 'temperature', 25),
+            'mode': vehicle.last_mode or 'UNKNOWN'
+        }
+        self._publish_vehicle(vehicle, 'telemetry', system_data)
+
+    def _on_mission_item_reached(self, msg) -> None:
+        vehicle = self.vehicles.get(msg.get_srcSystem())
+        if vehicle is None:
+            return
+        # Waypoint'e ulaşıldı
+        self._publish_vehicle(vehicle, 'telemetry', {'waypoint_reached': msg.seq})
+
+    def _from_active(self, msg) -> bool:
+        """Protokol yanıtı (görev, parametre, ACK) komut hedefi olan araçtan mı?"""
+        return msg.get_srcSystem() == self.vehicles.active.sysid
+
+    def _on_mission_ack(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        transfer = self._mission_transfer
+        if transfer is not None and transfer.active:
+            self._feed_mission_transfer('handle_ack', msg)
+            return
+        # Görev tamamlandı
+        if msg.type == mavutil.mavlink.MAV_MISSION_ACCEPTED:
+            self.mission_completed.emit()
+            self._publish('telemetry', {'mission_completed': True})
+
+    def _on_mission_request_int(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        self._feed_mission_transfer('handle_request', msg, use_int=True)
+
+    def _on_mission_request(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        # Eski MISSION_REQUEST'e MISSION_ITEM ile yanıt ver
+        self._feed_mission_transfer('handle_request', msg, use_int=False)
+
+    def _on_mission_count(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        self._feed_mission_transfer('handle_count', msg)
+
+    def _on_mission_item_int(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        self._feed_mission_transfer('handle_item', msg)
+
+    def _feed_mission_transfer(self, handler: str, msg, **kwargs) -> None:
+        """Görev mesajını aktif aktarıma ilet; ilerlemeyi ve bitişi bildir"""
+        transfer = self._mission_transfer
+        if transfer is None or not transfer.active:
+            return
+        with self._connection_lock:
+            if not self.connection:
+                return
+            changed = getattr(transfer, handler)(msg, self.connection.mav, **kwargs)
+        if changed:
+            # Senkronizasyonda o anki aşamanın (indirme/yükleme) ilerlemesi
+            phase = getattr(transfer, 'current', transfer)
+            done, total = transfer.progress()
+            self.mission_transfer_progress.emit(phase.direction, done, total)
+        self._finish_mission_transfer()
+
+    def _on_radio_status(self, msg) -> None:
+        # RSSI verisi
+        rssi = msg.rssi
+        self.link_stats.record_radio(msg)
+        self._publish('telemetry', {'rssi': rssi})
+
+    def _on_command_ack(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        if not self.commands.handle_ack(msg):
+            self.stream_rates.handle_ack(msg)
+
+    def _on_param_value(self, msg) -> None:
+        if not self._from_active(msg):
+            return
+        with self._connection_lock:
+            conn = self.connection
+            if not conn:
+                return
+            event = self.params.handle_value(msg, conn.mav)
+        download = self.params.download
+        if self.params.state == 'download' and download is not None:
+            received, total = download.progress()
+            if received % 25 == 0 or received == total:
+                self.param_progress.emit(received, total)
+        if event:
+            self._on_params_event(event)
+
+    def _on_timesync(self, msg) -> None:
+        # Yalnızca kendi isteğimize verilen yanıtı al (tc1 != 0, ts1 bizim gönderdiğimiz zaman)
+        if msg.tc1 == 0 or msg.ts1 != self._timesync_sent_ns:
+            return
+        self.link_stats.ping_ms = (time.monotonic_ns() - msg.ts1) / 1e6
+        self._timesync_sent_ns = None
             
     def stop(self):
         """Thread'i durdur"""
         self.running = False
+        self.supervisor.disarm()
+        # select() içinde bekleyen okuma döngüsünü hemen uyandır
+        self._link_reader.cancel_wait(self.connection)
+        self.commands.cancel_all()
+        self.router.close()
+        self.stop_tlog()
+        if self._mission_transfer is not None and self._mission_transfer.active:
+            self._mission_transfer.cancel()
         
         # Bağlantıları kapat
         with self._connection_lock:
@@ -1088,12 +1519,6 @@ class MAVLinkThread(QThread):
                     pass
                 self.connection = None
                 
-        with self._hall_lock:
-            if self.hall_serial_port:
-                try:
-                    self.hall_serial_port.close()
-                except:
-                    pass
-                self.hall_serial_port = None
+        self.hall.disconnect()
                 
         self.is_connected = False 
\ No newline at end of file
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+Handler = Callable[[Any], None]
+
+
+class MessageDispatcher:
+    """MAVLink mesaj tipine göre abonelik tabanlı dağıtıcı.
+
+    Dağıtım tek bir sözlük araması ile yapılır; hiçbir abonesi olmayan mesaj
+    tipleri alan çıkarımı yapılmadan atlanır. Abonelik tabloları kopyala-yaz
+    (copy-on-write) tuple'lar olduğu için okuma tarafında kilit gerekmez.
+    """
+
+    WILDCARD = '*'
+
+    def __init__(self, on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+                 on_timing: Optional[Callable[[str, float], None]] = None):
+        self._handlers: Dict[str, Tuple[Handler, ...]] = {}
+        self._wildcard: Tuple[Handler, ...] = ()
+        self._lock = threading.Lock()  # Yalnızca abone ekleme/çıkarma için
+        self.on_error = on_error
+        self.on_timing = on_timing  # (msg_type, saniye) - mesajın tüm işleyicilerde geçirdiği süre
+        self.dispatched = 0
+        self.skipped = 0
+
+    def subscribe(self, msg_type: str, handler: Handler) -> Handler:
+        """Mesaj tipine işleyici ekle. '*' tüm mesajları alır. İşleyici MAVLink thread'inde çalışır."""
+        with self._lock:
+            if msg_type == self.WILDCARD:
+                if handler not in self._wildcard:
+                    self._wildcard = self._wildcard + (handler,)
+                return handler
+            current = self._handlers.get(msg_type, ())
+            if handler not in current:
+                self._handlers = {**self._handlers, msg_type: current + (handler,)}
+        return handler
+
+    def unsubscribe(self, msg_type: str, handler: Handler) -> None:
+        """İşleyiciyi kaldır"""
+        with self._lock:
+            if msg_type == self.WILDCARD:
+                self._wildcard = tuple(h for h in self._wildcard if h != handler)
+                return
+            current = self._handlers.get(msg_type, ())
+            remaining = tuple(h for h in current if h != handler)
+            handlers = dict(self._handlers)
+            if remaining:
+                handlers[msg_type] = remaining
+            else:
+                handlers.pop(msg_type, None)
+            self._handlers = handlers
+
+    def is_subscribed(self, msg_type: str) -> bool:
+        return msg_type in self._handlers or bool(self._wildcard)
+
+    def subscribed_types(self) -> Set[str]:
+        """En az bir işleyicisi olan mesaj tipleri (joker hariç)"""
+        return set(self._handlers)
+
+    def dispatch(self, msg) -> bool:
+        """Mesajı abonelerine dağıt. Abonesi yoksa False döner."""
+        msg_type = msg.get_type()
+        handlers = self._handlers.get(msg_type)
+        wildcard = self._wildcard
+        if not handlers and not wildcard:
+            self.skipped += 1
+            return False
+        self.dispatched += 1
+        on_timing = self.on_timing
+        t0 = time.perf_counter() if on_timing else 0.0
+        if handlers:
+            for handler in handlers:
+                self._call(handler, msg_type, msg)
+        for handler in wildcard:
+            self._call(handler, msg_type, msg)
+        if on_timing:
+            on_timing(msg_type, time.perf_counter() - t0)
+        return True
+
+    def _call(self, handler: Handler, msg_type: str, msg) -> None:
+        try:
+            handler(msg)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(msg_type, handler, e)
+            else:
+                print(f"[DISPATCH] {msg_type} işleyici hatası: {e}")
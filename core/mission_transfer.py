@@ -0,0 +1,565 @@
+import hashlib
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+from pymavlink import mavutil
+
+MISSION_TYPE = mavutil.mavlink.MAV_MISSION_TYPE_MISSION
+
+MISSION_RESULT_NAMES = {
+    mavutil.mavlink.MAV_MISSION_ACCEPTED: 'KABUL',
+    mavutil.mavlink.MAV_MISSION_ERROR: 'HATA',
+    mavutil.mavlink.MAV_MISSION_UNSUPPORTED_FRAME: 'DESTEKLENMEYEN FRAME',
+    mavutil.mavlink.MAV_MISSION_UNSUPPORTED: 'DESTEKLENMİYOR',
+    mavutil.mavlink.MAV_MISSION_NO_SPACE: 'YER YOK',
+    mavutil.mavlink.MAV_MISSION_INVALID: 'GEÇERSİZ',
+    mavutil.mavlink.MAV_MISSION_INVALID_SEQUENCE: 'GEÇERSİZ SIRA',
+    mavutil.mavlink.MAV_MISSION_DENIED: 'RED',
+    mavutil.mavlink.MAV_MISSION_OPERATION_CANCELLED: 'İPTAL',
+}
+
+def make_item(seq: int, command: int, x: float = 0.0, y: float = 0.0, z: float = 0.0,
+              frame: int = mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT,
+              param1: float = 0.0, param2: float = 0.0, param3: float = 0.0, param4: float = 0.0,
+              current: int = 0, autocontinue: int = 1) -> Dict[str, Any]:
+    """Kanonik görev öğesi (x/y derece, z metre)"""
+    return {
+        'seq': int(seq), 'frame': int(frame), 'command': int(command),
+        'current': int(current), 'autocontinue': int(autocontinue),
+        'param1': float(param1), 'param2': float(param2), 'param3': float(param3), 'param4': float(param4),
+        'x': float(x), 'y': float(y), 'z': float(z),
+    }
+
+
+def normalize_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """QGC WPL / ham sözlükleri kanonik öğelere çevir ve sırayı 0..N-1 yap"""
+    ordered = sorted(items, key=lambda it: int(it.get('seq', 0)))
+    return [
+        make_item(i, it.get('command', mavutil.mavlink.MAV_CMD_NAV_WAYPOINT),
+                  it.get('x', 0), it.get('y', 0), it.get('z', 0),
+                  it.get('frame', mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT),
+                  it.get('param1', 0), it.get('param2', 0), it.get('param3', 0), it.get('param4', 0),
+                  it.get('current', 0), it.get('autocontinue', 1))
+        for i, it in enumerate(ordered)
+    ]
+
+
+def waypoints_to_items(waypoints: List[Dict[str, Any]], home: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """MissionPlanner waypoint listesini görev öğelerine çevir.
+
+    ArduPilot'ta 0. öğe ev konumudur ve araç tarafından ezilir; ilk waypoint'in
+    kaybolmaması için başa ev öğesi eklenir.
+    """
+    if home is None:
+        first = next((wp for wp in waypoints if wp.get('lat') is not None), {})
+        home = {'lat': first.get('lat', 0.0), 'lon': first.get('lon', 0.0), 'alt': 0.0}
+    items = [make_item(0, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT, home['lat'], home['lon'], home.get('alt', 0.0),
+                       frame=mavutil.mavlink.MAV_FRAME_GLOBAL)]
+    for wp in waypoints:
+        command = int(wp.get('command', mavutil.mavlink.MAV_CMD_NAV_WAYPOINT))
+        params = (wp.get('param1', 0), wp.get('param2', 0), wp.get('param3', 0), wp.get('param4', 0))
+        if command == mavutil.mavlink.MAV_CMD_DO_SET_RELAY:
+            items.append(make_item(len(items), command, frame=mavutil.mavlink.MAV_FRAME_MISSION,
+                                   param1=params[0], param2=params[1]))
+        else:
+            items.append(make_item(len(items), command, wp.get('lat', 0), wp.get('lon', 0), wp.get('alt', 0),
+                                   param1=params[0], param2=params[1], param3=params[2], param4=params[3]))
+    return items
+
+
+def _is_global(frame: int) -> bool:
+    return frame not in (mavutil.mavlink.MAV_FRAME_MISSION, mavutil.mavlink.MAV_FRAME_LOCAL_NED,
+                         mavutil.mavlink.MAV_FRAME_LOCAL_ENU, mavutil.mavlink.MAV_FRAME_BODY_NED)
+
+
+# *_INT frame'leri araçtan farklı dönebilir; karşılaştırmada eşdeğer frame kullanılır
+_FRAME_ALIASES = {
+    mavutil.mavlink.MAV_FRAME_GLOBAL_INT: mavutil.mavlink.MAV_FRAME_GLOBAL,
+    mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT: mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT,
+    mavutil.mavlink.MAV_FRAME_GLOBAL_TERRAIN_ALT_INT: mavutil.mavlink.MAV_FRAME_GLOBAL_TERRAIN_ALT,
+}
+
+
+_c = mavutil.mavlink
+# Otopilotun sakladığı alanlar (ArduPilot AP_Mission): komut -> (parametreler, konum var mı).
+# Parametre ('i', n) tam sayı olarak saklanır, ('f', n) float. Saklanmayan parametreler,
+# autocontinue ve konumsuz komutların frame'i araçtan farklı (0 / GLOBAL) döner.
+_STORED_FIELDS = {
+    _c.MAV_CMD_NAV_WAYPOINT: ((('i', 1),), True),
+    _c.MAV_CMD_NAV_LOITER_UNLIM: ((('f', 3),), True),
+    _c.MAV_CMD_NAV_LOITER_TURNS: ((('i', 1), ('f', 3)), True),
+    _c.MAV_CMD_NAV_LOITER_TIME: ((('i', 1), ('f', 3)), True),
+    _c.MAV_CMD_NAV_RETURN_TO_LAUNCH: ((), False),
+    _c.MAV_CMD_NAV_LAND: ((('f', 1),), True),
+    _c.MAV_CMD_NAV_TAKEOFF: ((('f', 1),), True),
+    _c.MAV_CMD_CONDITION_DELAY: ((('i', 1),), False),
+    _c.MAV_CMD_CONDITION_YAW: ((('f', 1), ('f', 2), ('f', 3), ('f', 4)), False),
+    _c.MAV_CMD_DO_JUMP: ((('i', 1), ('i', 2)), False),
+    _c.MAV_CMD_DO_CHANGE_SPEED: ((('i', 1), ('f', 2), ('f', 3)), False),
+    _c.MAV_CMD_DO_SET_HOME: ((('i', 1),), True),
+    _c.MAV_CMD_DO_SET_RELAY: ((('i', 1), ('i', 2)), False),
+    _c.MAV_CMD_DO_REPEAT_RELAY: ((('i', 1), ('i', 2), ('f', 3)), False),
+    _c.MAV_CMD_DO_SET_SERVO: ((('i', 1), ('i', 2)), False),
+    _c.MAV_CMD_DO_REPEAT_SERVO: ((('i', 1), ('i', 2), ('i', 3), ('f', 4)), False),
+    _c.MAV_CMD_DO_SET_ROI: ((), True),
+}
+_ALL_PARAMS = (('f', 1), ('f', 2), ('f', 3), ('f', 4))
+
+
+def _stored_fields(command: int):
+    """Tabloda olmayan komutlar: tüm parametreler; konum yalnızca NAV komutlarında"""
+    return _STORED_FIELDS.get(command, (_ALL_PARAMS, command < _c.MAV_CMD_NAV_LAST))
+
+
+def canonical_item(item: Dict[str, Any]) -> bytes:
+    """Öğenin otopilotta saklanan hali (float32 / 1e7 int); 'current', 'seq' ve autocontinue hariç.
+
+    Araç öğeleri birebir geri okumaz: yalnızca komutun sakladığı parametreler ve
+    konumlu komutlarda frame/x/y/z karşılaştırılır.
+    """
+    params, located = _stored_fields(item['command'])
+    fmt = ['<H']
+    values: List[Any] = [item['command']]
+    for kind, index in params:
+        value = item[f'param{index}']
+        if kind == 'i':
+            fmt.append('i')
+            values.append(int(round(value)))
+        else:
+            fmt.append('f')
+            values.append(value)
+    if located:
+        frame = _FRAME_ALIASES.get(item['frame'], item['frame'])
+        if _is_global(frame):
+            x, y = int(round(item['x'] * 1e7)), int(round(item['y'] * 1e7))
+        else:
+            x, y = int(round(item['x'])), int(round(item['y']))
+        fmt.append('Biif')
+        values.extend((frame, x, y, item['z']))
+    return struct.pack(''.join(fmt), *values)
+
+
+def mission_hash(items: List[Dict[str, Any]]) -> str:
+    """Görevin kanonik özeti. 0. öğe (ev konumu) araç tarafından ezildiği için dahil edilmez."""
+    digest = hashlib.sha1(struct.pack('<I', len(items)))
+    for item in items[1:]:
+        digest.update(canonical_item(item))
+    return digest.hexdigest()
+
+
+def plan_sync(local: List[Dict[str, Any]], remote: List[Dict[str, Any]]):
+    """Yerel ve araçtaki görevi karşılaştır: ('skip', None), ('partial', ilk_fark) veya ('full', None)"""
+    if mission_hash(local) == mission_hash(remote):
+        return 'skip', None
+    if len(local) == len(remote) and len(local) > 1:
+        for seq in range(1, len(local)):
+            if canonical_item(local[seq]) != canonical_item(remote[seq]):
+                return 'partial', seq
+    return 'full', None
+
+
+def item_from_msg(msg) -> Dict[str, Any]:
+    """MISSION_ITEM_INT mesajını kanonik öğeye çevir"""
+    if _is_global(_FRAME_ALIASES.get(msg.frame, msg.frame)):
+        x, y = msg.x / 1e7, msg.y / 1e7
+    else:
+        x, y = float(msg.x), float(msg.y)
+    return make_item(msg.seq, msg.command, x, y, msg.z, msg.frame,
+                     msg.param1, msg.param2, msg.param3, msg.param4, msg.current, msg.autocontinue)
+
+
+def send_item(mav, target_system: int, target_component: int, item: Dict[str, Any], use_int: bool = True) -> None:
+    """Öğeyi MISSION_ITEM_INT (veya eski MISSION_ITEM) olarak gönder"""
+    if use_int:
+        if _is_global(item['frame']):
+            x, y = int(round(item['x'] * 1e7)), int(round(item['y'] * 1e7))
+        else:
+            x, y = int(round(item['x'])), int(round(item['y']))
+        mav.mission_item_int_send(
+            target_system, target_component, item['seq'], item['frame'], item['command'],
+            item['current'], item['autocontinue'],
+            item['param1'], item['param2'], item['param3'], item['param4'],
+            x, y, item['z'], MISSION_TYPE)
+    else:
+        mav.mission_item_send(
+            target_system, target_component, item['seq'], item['frame'], item['command'],
+            item['current'], item['autocontinue'],
+            item['param1'], item['param2'], item['param3'], item['param4'],
+            item['x'], item['y'], item['z'], MISSION_TYPE)
+
+
+class MissionTransfer:
+    """Görev aktarımlarının ortak durumu (ilerleme, süre, sonuç).
+
+    MAVLink thread'i gelen görev mesajlarını handle_* metotlarına iletir ve
+    zaman aşımı kontrolü için service() çağırır. handle_* metotları ilerleme
+    değiştiyse True döner. Alt sınıflar aktarımı start(mav, target_system,
+    target_component, now) ile başlatır.
+    """
+
+    direction = ''
+
+    def __init__(self, timeout: float, max_retries: int):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retries = 0
+        self.retries_total = 0
+        self.total = 0
+        self.state = 'idle'   # idle -> active -> done | failed
+        self.error = ''
+        self.started = None
+        self.finished = None
+        self.deadline = 0.0
+        self.target_system = 0
+        self.target_component = 0
+
+    @property
+    def active(self) -> bool:
+        return self.state == 'active'
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def progress(self):
+        """(tamamlanan, toplam)"""
+        return 0, self.total
+
+    def time_until_deadline(self, now: float) -> float:
+        return max(0.0, self.deadline - now) if self.active else float('inf')
+
+    def _begin(self, target_system: int, target_component: int) -> None:
+        self.target_system = target_system
+        self.target_component = target_component
+        self.state = 'active'
+        if self.started is None:
+            self.started = time.monotonic()
+
+    def _touch(self, now: float) -> None:
+        self.deadline = now + self.timeout
+        self.retries = 0
+
+    def _timed_out(self, now: float) -> bool:
+        """Zaman aşımı kontrolü; deneme hakkı bittiyse aktarımı bitirir. Yeniden gönderim gerekiyorsa True"""
+        if not self.active or now < self.deadline:
+            return False
+        if self.retries >= self.max_retries:
+            self._finish(False, 'Zaman aşımı')
+            return False
+        self.retries += 1
+        self.retries_total += 1
+        self.deadline = now + self.timeout
+        return True
+
+    def _finish(self, success: bool, error: str = '') -> None:
+        self.state = 'done' if success else 'failed'
+        self.error = error
+        self.finished = time.monotonic()
+
+    def service(self, mav, now: Optional[float] = None) -> None:
+        """Zaman aşımında son istekleri tekrarla"""
+
+    def handle_request(self, msg, mav, use_int: bool = True, now: Optional[float] = None) -> bool:
+        return False
+
+    def handle_count(self, msg, mav, now: Optional[float] = None) -> bool:
+        return False
+
+    def handle_item(self, msg, mav, now: Optional[float] = None) -> bool:
+        return False
+
+    def handle_ack(self, msg, mav=None, now: Optional[float] = None) -> bool:
+        return False
+
+    def cancel(self, mav=None) -> None:
+        if not self.active:
+            return
+        if mav is not None:
+            mav.mission_ack_send(self.target_system, self.target_component,
+                                 mavutil.mavlink.MAV_MISSION_OPERATION_CANCELLED, MISSION_TYPE)
+        self._finish(False, 'İptal edildi')
+
+    def result(self) -> Dict[str, Any]:
+        done, total = self.progress()
+        return {
+            'direction': self.direction,
+            'success': self.state == 'done',
+            'error': self.error,
+            'count': total,
+            'transferred': done,
+            'elapsed': self.elapsed,
+            'retries_total': self.retries_total,
+        }
+
+
+class MissionUpload(MissionTransfer):
+    """MISSION_COUNT -> MISSION_REQUEST_INT -> MISSION_ITEM_INT -> MISSION_ACK durum makinesi.
+
+    Araç her öğeyi kendisi ister; sıra dışı ve tekrarlanan istekler aynı öğe
+    yeniden gönderilerek yanıtlanır. İstek gelmezse son gönderilen mesaj
+    (MISSION_COUNT veya son öğe) tekrarlanır. partial_from verilirse yalnızca
+    o sıradan sonuna kadarki öğeler MISSION_WRITE_PARTIAL_LIST ile yazılır.
+    """
+
+    direction = 'upload'
+
+    def __init__(self, items: List[Dict[str, Any]], timeout: float = 1.5, max_retries: int = 5,
+                 partial_from: Optional[int] = None):
+        super().__init__(timeout, max_retries)
+        self.items = normalize_items(items)
+        self.partial_from = partial_from
+        self.first = partial_from or 0
+        self.total = len(self.items) - self.first
+        self.sent = set()          # En az bir kez gönderilen öğe sıraları
+        self.last_requested = None
+        self.use_int = True
+
+    def progress(self):
+        return len(self.sent), self.total
+
+    def _announce(self, mav) -> None:
+        if self.partial_from is None:
+            mav.mission_count_send(self.target_system, self.target_component, len(self.items), MISSION_TYPE)
+        else:
+            mav.mission_write_partial_list_send(self.target_system, self.target_component,
+                                                self.first, len(self.items) - 1, MISSION_TYPE)
+
+    def start(self, mav, target_system: int, target_component: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._begin(target_system, target_component)
+        self._announce(mav)
+        self._touch(now)
+
+    def handle_request(self, msg, mav, use_int: bool = True, now: Optional[float] = None) -> bool:
+        """MISSION_REQUEST(_INT) geldi: istenen öğeyi gönder"""
+        if not self.active or getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return False
+        now = time.monotonic() if now is None else now
+        seq = msg.seq
+        if not self.first <= seq < len(self.items):
+            return False
+        self.use_int = use_int
+        send_item(mav, self.target_system, self.target_component, self.items[seq], use_int)
+        self.last_requested = seq
+        self._touch(now)
+        is_new = seq not in self.sent
+        self.sent.add(seq)
+        return is_new
+
+    def handle_ack(self, msg, mav=None, now: Optional[float] = None) -> bool:
+        """MISSION_ACK geldi: aktarım bittiyse True"""
+        if not self.active or getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return False
+        if msg.type == mavutil.mavlink.MAV_MISSION_ACCEPTED:
+            if len(self.sent) < self.total:
+                # Bazı öğeler istenmeden ACK geldi (ör. eski bir aktarımın ACK'i); yok say
+                return False
+            self._finish(True)
+        else:
+            self._finish(False, MISSION_RESULT_NAMES.get(msg.type, str(msg.type)))
+        return True
+
+    def service(self, mav, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if not self._timed_out(now):
+            return
+        if self.last_requested is None:
+            self._announce(mav)
+        else:
+            send_item(mav, self.target_system, self.target_component, self.items[self.last_requested], self.use_int)
+
+
+class MissionDownload(MissionTransfer):
+    """MISSION_REQUEST_LIST -> MISSION_COUNT -> MISSION_REQUEST_INT (x window) -> MISSION_ACK.
+
+    Öğeler tek tek beklenmeden pencere boyu kadar ardışık istenir; her gelen
+    öğe pencereye yeni bir istek ekler. Zaman aşımında yalnızca eksik
+    öğeler yeniden istenir.
+    """
+
+    direction = 'download'
+    WINDOW = 6  # Aynı anda yanıt beklenen en fazla istek
+
+    def __init__(self, timeout: float = 1.5, max_retries: int = 5, window: Optional[int] = None):
+        super().__init__(timeout, max_retries)
+        self.window = window or self.WINDOW
+        self.items: Dict[int, Dict[str, Any]] = {}
+        self.count_known = False
+        self._next = 0
+        self._outstanding = set()
+
+    def progress(self):
+        return len(self.items), self.total
+
+    def start(self, mav, target_system: int, target_component: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._begin(target_system, target_component)
+        mav.mission_request_list_send(target_system, target_component, MISSION_TYPE)
+        self._touch(now)
+
+    def _request(self, mav, seq: int) -> None:
+        mav.mission_request_int_send(self.target_system, self.target_component, seq, MISSION_TYPE)
+
+    def _fill(self, mav) -> None:
+        while len(self._outstanding) < self.window and self._next < self.total:
+            if self._next not in self.items:
+                self._request(mav, self._next)
+                self._outstanding.add(self._next)
+            self._next += 1
+
+    def _complete(self, mav) -> None:
+        mav.mission_ack_send(self.target_system, self.target_component,
+                             mavutil.mavlink.MAV_MISSION_ACCEPTED, MISSION_TYPE)
+        self._finish(True)
+
+    def handle_count(self, msg, mav, now: Optional[float] = None) -> bool:
+        if not self.active or self.count_known or getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return False
+        now = time.monotonic() if now is None else now
+        self.count_known = True
+        self.total = msg.count
+        self._touch(now)
+        if self.total == 0:
+            self._complete(mav)
+        else:
+            self._fill(mav)
+        return True
+
+    def handle_item(self, msg, mav, now: Optional[float] = None) -> bool:
+        if not self.active or not self.count_known or getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return False
+        seq = msg.seq
+        if not 0 <= seq < self.total or seq in self.items:
+            return False  # Tekrarlanan yanıt
+        now = time.monotonic() if now is None else now
+        self.items[seq] = item_from_msg(msg)
+        self._outstanding.discard(seq)
+        self._touch(now)
+        if len(self.items) == self.total:
+            self._complete(mav)
+        else:
+            self._fill(mav)
+        return True
+
+    def handle_ack(self, msg, mav=None, now: Optional[float] = None) -> bool:
+        # İndirme sırasında araç yalnızca hata durumunda ACK gönderir
+        if not self.active or msg.type == mavutil.mavlink.MAV_MISSION_ACCEPTED:
+            return False
+        self._finish(False, MISSION_RESULT_NAMES.get(msg.type, str(msg.type)))
+        return True
+
+    def service(self, mav, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if not self._timed_out(now):
+            return
+        if not self.count_known:
+            mav.mission_request_list_send(self.target_system, self.target_component, MISSION_TYPE)
+            return
+        for seq in sorted(self._outstanding):
+            self._request(mav, seq)
+
+    def mission(self) -> List[Dict[str, Any]]:
+        return [self.items[seq] for seq in range(self.total) if seq in self.items]
+
+    def result(self) -> Dict[str, Any]:
+        result = super().result()
+        result['items'] = self.mission()
+        result['hash'] = mission_hash(result['items']) if self.state == 'done' else ''
+        return result
+
+
+class MissionSync(MissionTransfer):
+    """Araçtaki görevi indir, kanonik özetle karşılaştır ve yalnızca gerekeni yükle.
+
+    Özetler aynıysa yükleme atlanır; öğe sayısı aynı ama içerik farklıysa ilk
+    farklı öğeden sonrası kısmi yazılır; aksi halde tam yükleme yapılır.
+    """
+
+    direction = 'sync'
+
+    def __init__(self, items: List[Dict[str, Any]], timeout: float = 1.5, max_retries: int = 5):
+        super().__init__(timeout, max_retries)
+        self.local = normalize_items(items)
+        self.total = len(self.local)
+        self.download = MissionDownload(timeout, max_retries)
+        self.upload: Optional[MissionUpload] = None
+        self.action = ''  # 'skip', 'partial', 'full'
+        self.partial_from = None
+
+    @property
+    def current(self) -> MissionTransfer:
+        return self.upload if self.upload is not None else self.download
+
+    def progress(self):
+        return self.current.progress()
+
+    def time_until_deadline(self, now: float) -> float:
+        return self.current.time_until_deadline(now) if self.active else float('inf')
+
+    def start(self, mav, target_system: int, target_component: int, now: Optional[float] = None) -> None:
+        self._begin(target_system, target_component)
+        self.download.start(mav, target_system, target_component, now)
+
+    def _advance(self, mav, now: Optional[float]) -> None:
+        if not self.active:
+            return
+        if self.upload is None:
+            if self.download.active:
+                return
+            if self.download.state == 'done':
+                self.action, self.partial_from = plan_sync(self.local, self.download.mission())
+            else:
+                # Araçtaki görev okunamadı: güvenli taraf, tam yükleme
+                print(f"[MISSION] Görev indirilemedi ({self.download.error}), tam yükleme yapılıyor")
+                self.action = 'full'
+            if self.action == 'skip':
+                self._finish(True)
+                return
+            self.upload = MissionUpload(self.local, self.timeout, self.max_retries,
+                                        partial_from=self.partial_from)
+            self.upload.start(mav, self.target_system, self.target_component, now)
+        elif not self.upload.active:
+            self._finish(self.upload.state == 'done', self.upload.error)
+
+    def _delegate(self, handler: str, msg, mav, now: Optional[float], **kwargs) -> bool:
+        if not self.active:
+            return False
+        changed = getattr(self.current, handler)(msg, mav, now=now, **kwargs)
+        self._advance(mav, now)
+        return changed
+
+    def handle_request(self, msg, mav, use_int: bool = True, now: Optional[float] = None) -> bool:
+        return self._delegate('handle_request', msg, mav, now, use_int=use_int)
+
+    def handle_count(self, msg, mav, now: Optional[float] = None) -> bool:
+        return self._delegate('handle_count', msg, mav, now)
+
+    def handle_item(self, msg, mav, now: Optional[float] = None) -> bool:
+        return self._delegate('handle_item', msg, mav, now)
+
+    def handle_ack(self, msg, mav=None, now: Optional[float] = None) -> bool:
+        return self._delegate('handle_ack', msg, mav, now)
+
+    def service(self, mav, now: Optional[float] = None) -> None:
+        if not self.active:
+            return
+        self.current.service(mav, now)
+        self._advance(mav, now)
+
+    def cancel(self, mav=None) -> None:
+        if self.active:
+            self.current.cancel(mav)
+        super().cancel(None)
+
+    def result(self) -> Dict[str, Any]:
+        result = super().result()
+        result['action'] = self.action
+        result['partial_from'] = self.partial_from
+        result['download_elapsed'] = self.download.elapsed
+        result['uploaded'] = self.upload.progress()[0] if self.upload is not None else 0
+        result['retries_total'] = self.download.retries_total + (self.upload.retries_total if self.upload else 0)
+        result['hash'] = mission_hash(self.local)
+        return result
@@ -0,0 +1,385 @@
+import glob
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+HASH_CHECK_ID = '_HASH_CHECK'
+UNKNOWN_INDEX = 65535  # İsimle okunan (listede olmayan) PARAM_VALUE yanıtları
+# Uygulama dizinindeki önbellek (çalışma dizininden bağımsız; main.py'nin yanı)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'param_cache')
+
+
+def _param_id(msg) -> str:
+    name = msg.param_id
+    if isinstance(name, bytes):
+        name = name.decode('ascii', errors='ignore')
+    return name.rstrip('\x00')
+
+
+def crc32part(data: bytes, crc: int) -> int:
+    """PX4/NuttX crc32part: zlib ile aynı tablo, ama başta/sonda bit tersleme yok"""
+    return zlib.crc32(data, crc ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+
+def param_set_hash(params: List[Tuple[str, float]]) -> int:
+    """İndeks sırasındaki (isim, değer) listesinin PX4 param_hash_check() özeti.
+
+    Her parametre için isim ve değerin ham 4 baytı crc32part ile eklenir (PX4
+    INT32 değerleri float alanında ham bit olarak gönderir, '<f' aynı baytları
+    verir). PX4 uçucu (volatile) parametreleri özete katmaz; listede onlar da
+    varsa özet tutmaz ve tam indirme yapılır.
+    """
+    crc = 0
+    for name, value in params:
+        crc = crc32part(name.encode('ascii'), crc)
+        crc = crc32part(struct.pack('<f', value), crc)
+    return crc
+
+
+def hash_from_value(value: float) -> int:
+    """_HASH_CHECK PARAM_VALUE'sundaki float alanın ham 32 bitini özete çevir"""
+    return struct.unpack('<I', struct.pack('<f', value))[0]
+
+
+class ParamCache:
+    """Parametre setlerinin diskteki önbelleği.
+
+    Her set sys<sysid>_<hash>.json dosyasında tutulur; aynı sysid'li farklı
+    gövdeler (test günlerinde sık olur) birbirini ezmez.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, sysid: int, set_hash: int) -> str:
+        return os.path.join(self.directory, f"sys{sysid}_{set_hash:08x}.json")
+
+    def save(self, sysid: int, params: List[Tuple[str, float, int]], set_hash: Optional[int] = None) -> int:
+        """İndeks sırasındaki (isim, değer, tip) listesini kaydet; özet döner.
+
+        Araç _HASH_CHECK bildiriyorsa (PX4) dosya o özetle anahtarlanır, yoksa
+        listeden hesaplanan özet kullanılır.
+        """
+        if set_hash is None:
+            set_hash = param_set_hash([(name, value) for name, value, _ in params])
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(sysid, set_hash)
+        data = {
+            'sysid': sysid,
+            'hash': set_hash,
+            'saved_at': time.time(),
+            'params': [[name, value, ptype] for name, value, ptype in params],
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)  # Yarım yazılmış dosya bırakma
+        return set_hash
+
+    def load(self, sysid: int, set_hash: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Özet verilirse o seti, verilmezse sysid için en son kaydedileni yükle"""
+        if set_hash is not None:
+            paths = [self._path(sysid, set_hash)]
+        else:
+            paths = sorted(glob.glob(os.path.join(self.directory, f"sys{sysid}_*.json")),
+                           key=os.path.getmtime, reverse=True)
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                data['params'] = [tuple(p) for p in data['params']]
+                return data
+            except (OSError, ValueError, KeyError):
+                continue
+        return None
+
+
+class ParamDownload:
+    """PARAM_REQUEST_LIST ile tam parametre indirme.
+
+    Akış durduğunda (timeout) baştan başlamak yerine eksik indeksler
+    PARAM_REQUEST_READ ile toplu halde yeniden istenir.
+    """
+
+    BULK = 16  # Bir turda yeniden istenecek en fazla eksik indeks
+
+    def __init__(self, timeout: float = 1.0, max_retries: int = 10):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retries = 0
+        self.re_requested = 0
+        self.count: Optional[int] = None
+        self.by_index: Dict[int, Tuple[str, float, int]] = {}
+        self.state = 'idle'  # idle -> active -> done | failed
+        self.error = ''
+        self.started = None
+        self.finished = None
+        self.deadline = 0.0
+        self.target_system = 0
+        self.target_component = 0
+
+    @property
+    def active(self) -> bool:
+        return self.state == 'active'
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def progress(self):
+        return len(self.by_index), self.count or 0
+
+    def time_until_deadline(self, now: float) -> float:
+        return max(0.0, self.deadline - now) if self.active else float('inf')
+
+    def start(self, mav, target_system: int, target_component: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.target_system = target_system
+        self.target_component = target_component
+        self.state = 'active'
+        self.started = time.monotonic()
+        mav.param_request_list_send(target_system, target_component)
+        self.deadline = now + self.timeout
+
+    def handle_value(self, msg, now: Optional[float] = None) -> bool:
+        """PARAM_VALUE geldi; yeni indeks eklendiyse True"""
+        if not self.active:
+            return False
+        index = msg.param_index
+        if index == UNKNOWN_INDEX or msg.param_count <= 0:
+            return False
+        now = time.monotonic() if now is None else now
+        self.count = msg.param_count
+        self.deadline = now + self.timeout
+        if index in self.by_index or index >= self.count:
+            return False
+        self.by_index[index] = (_param_id(msg), float(msg.param_value), msg.param_type)
+        self.retries = 0
+        if len(self.by_index) >= self.count:
+            self._finish(True)
+        return True
+
+    def missing(self) -> List[int]:
+        if self.count is None:
+            return []
+        return [i for i in range(self.count) if i not in self.by_index]
+
+    def service(self, mav, now: Optional[float] = None) -> None:
+        """Akış durduysa eksikleri toplu iste"""
+        now = time.monotonic() if now is None else now
+        if not self.active or now < self.deadline:
+            return
+        if self.retries >= self.max_retries:
+            self._finish(False, 'Zaman aşımı')
+            return
+        self.retries += 1
+        self.deadline = now + self.timeout
+        if self.count is None:
+            mav.param_request_list_send(self.target_system, self.target_component)
+            return
+        for index in self.missing()[:self.BULK]:
+            mav.param_request_read_send(self.target_system, self.target_component, b'', index)
+            self.re_requested += 1
+
+    def _finish(self, success: bool, error: str = '') -> None:
+        self.state = 'done' if success else 'failed'
+        self.error = error
+        self.finished = time.monotonic()
+
+    def params(self) -> List[Tuple[str, float, int]]:
+        """İndeks sırasındaki (isim, değer, tip) listesi"""
+        return [self.by_index[i] for i in sorted(self.by_index)]
+
+
+class ParamManager:
+    """Araç parametreleri: önbellek, _HASH_CHECK doğrulaması ve arka planda indirme.
+
+    Bağlanınca sysid için önbellekteki set hemen kullanıma sunulur. Araç
+    _HASH_CHECK'i yanıtlarsa (PX4) ve özet önbellekteki bir setle eşleşirse
+    indirme yapılmaz. Yanıt gelmezse (ArduPilot _HASH_CHECK desteklemez) tam
+    liste arka planda indirilir ve yalnızca değişen parametreler bildirilir.
+    Olaylar sözlük olarak döner: source, count, changed, verified, elapsed, error.
+    """
+
+    HASH_TIMEOUT = 1.5  # _HASH_CHECK yanıtı bekleme süresi (s)
+
+    def __init__(self, cache: Optional[ParamCache] = None, timeout: float = 1.0):
+        self.cache = cache or ParamCache()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.values: Dict[str, float] = {}
+        self.types: Dict[str, int] = {}
+        self.source: Optional[str] = None  # 'cache' / 'vehicle'
+        self.state = 'idle'  # idle -> hash_check -> download -> ready
+        self.sysid = 0
+        self.vehicle_hash: Optional[int] = None
+        self.cached_hash: Optional[int] = None
+        self.download: Optional[ParamDownload] = None
+        self._deadline = 0.0
+        self._target_component = 0
+
+    @property
+    def busy(self) -> bool:
+        return self.state in ('hash_check', 'download')
+
+    def get(self, name: str, default: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            return self.values.get(name, default)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.values)
+
+    def time_until_next(self, now: float) -> float:
+        if self.state == 'hash_check':
+            return max(0.0, self._deadline - now)
+        if self.state == 'download' and self.download is not None:
+            return self.download.time_until_deadline(now)
+        return float('inf')
+
+    def start(self, mav, target_system: int, target_component: int,
+              now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Önbelleği yükle ve doğrulamayı başlat; önbellek varsa 'cache' olayı döner"""
+        now = time.monotonic() if now is None else now
+        self.sysid = target_system
+        self._target_component = target_component
+        self.vehicle_hash = None
+        self.cached_hash = None
+        event = None
+        data = self.cache.load(target_system)
+        if data is not None:
+            self.cached_hash = data['hash']
+            self._replace(data['params'])
+            self.source = 'cache'
+            event = self._event('cache', list(self.values), verified=False)
+        mav.param_request_read_send(target_system, target_component, HASH_CHECK_ID.encode('ascii'), -1)
+        self.state = 'hash_check'
+        self._deadline = now + self.HASH_TIMEOUT
+        return event
+
+    def refresh(self, mav, now: Optional[float] = None) -> None:
+        """Önbellekten bağımsız tam indirme başlat"""
+        self._start_download(mav, now)
+
+    def _start_download(self, mav, now: Optional[float] = None) -> None:
+        self.download = ParamDownload(timeout=self.timeout)
+        self.download.start(mav, self.sysid, self._target_component, now)
+        self.state = 'download'
+
+    def handle_value(self, msg, mav, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """PARAM_VALUE işle; bildirilecek bir değişiklik varsa olay döner"""
+        name = _param_id(msg)
+        if name == HASH_CHECK_ID:
+            self.vehicle_hash = hash_from_value(msg.param_value)
+            if self.state == 'hash_check':
+                return self._on_hash(mav, now)
+            return None
+        if self.state == 'download' and self.download is not None:
+            self.download.handle_value(msg, now)
+            if self.download.state == 'done':
+                return self._finish_download()
+            if msg.param_index != UNKNOWN_INDEX:
+                return None
+        # Tekil güncelleme (PARAM_SET yanıtı veya başka bir GCS'nin değişikliği)
+        value = float(msg.param_value)
+        with self._lock:
+            if self.values.get(name) == value:
+                return None
+            self.values[name] = value
+            self.types[name] = msg.param_type
+        return self._event('vehicle', [name], verified=True)
+
+    def _on_hash(self, mav, now: Optional[float]) -> Optional[Dict[str, Any]]:
+        if self.vehicle_hash == self.cached_hash:
+            self.state = 'ready'
+            return self._event('cache', [], verified=True)
+        data = self.cache.load(self.sysid, self.vehicle_hash)
+        if data is None:
+            self._start_download(mav, now)
+            return None
+        # Aynı sysid'li başka bir gövdenin kayıtlı seti
+        self.cached_hash = data['hash']
+        changed = self._replace(data['params'])
+        self.source = 'cache'
+        self.state = 'ready'
+        return self._event('cache', changed, verified=True)
+
+    def service(self, mav, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = time.monotonic() if now is None else now
+        if self.state == 'hash_check' and now >= self._deadline:
+            # _HASH_CHECK yanıtsız (ArduPilot): önbellek kullanımdayken arka planda indir
+            self._start_download(mav, now)
+            return None
+        if self.state == 'download' and self.download is not None:
+            self.download.service(mav, now)
+            if self.download.state == 'failed':
+                self.state = 'ready' if self.values else 'idle'
+                event = self._event('vehicle', [], verified=False)
+                event['error'] = self.download.error
+                return event
+        return None
+
+    def _finish_download(self) -> Dict[str, Any]:
+        params = self.download.params()
+        changed = self._replace(params)
+        self.state = 'ready'
+        self.source = 'vehicle'
+        try:
+            self.cached_hash = self.cache.save(self.sysid, params, self.vehicle_hash)
+        except OSError as e:
+            print(f"[PARAM] Önbellek yazılamadı: {e}")
+        return self._event('vehicle', changed, verified=True)
+
+    def _replace(self, params: List[Tuple[str, float, int]]) -> List[str]:
+        """Tüm seti değiştir; değeri değişen/eklenen/silinen isimleri döndür"""
+        new_values = {name: float(value) for name, value, _ in params}
+        with self._lock:
+            old_values = self.values
+            changed = [name for name, value in new_values.items() if old_values.get(name) != value]
+            changed += [name for name in old_values if name not in new_values]
+            self.values = new_values
+            self.types = {name: ptype for name, _, ptype in params}
+        return changed
+
+    def _event(self, source: str, changed: List[str], verified: bool) -> Dict[str, Any]:
+        download = self.download
+        return {
+            'source': source,
+            'sysid': self.sysid,
+            'count': len(self.values),
+            'changed': changed,
+            'verified': verified,
+            'hash': self.cached_hash,
+            'elapsed': download.elapsed if download is not None and source == 'vehicle' else 0.0,
+            're_requested': download.re_requested if download is not None else 0,
+            'error': '',
+        }
+
+
+def relay_instances(params: Dict[str, float]) -> List[int]:
+    """Araçta röle olarak yapılandırılmış DO_SET_RELAY instance'ları (sıralı)"""
+    # ArduPilot 4.5+: RELAYn_FUNCTION = 1 (Relay)
+    instances = [n - 1 for n in range(1, 17) if params.get(f'RELAY{n}_FUNCTION') == 1]
+    if instances:
+        return instances
+    # Eski sürümler: RELAY_PIN, RELAY_PIN2.. (-1 = kullanılmıyor)
+    pins = ['RELAY_PIN'] + [f'RELAY_PIN{n}' for n in range(2, 7)]
+    return [i for i, name in enumerate(pins) if params.get(name, -1) >= 0]
+
+
+def battery_low_percent(params: Dict[str, float]) -> Optional[float]:
+    """Aracın düşük batarya failsafe eşiği (% kalan); tanımlı değilse None"""
+    capacity = params.get('BATT_CAPACITY', 0)
+    low_mah = params.get('BATT_LOW_MAH', 0)
+    if capacity > 0 and low_mah > 0:
+        return round(100.0 * low_mah / capacity, 1)
+    low_thr = params.get('BAT_LOW_THR')  # PX4: kalan oran (0-1)
+    if low_thr is not None and 0 < low_thr < 1:
+        return round(100.0 * low_thr, 1)
+    return None
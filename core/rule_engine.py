@@ -0,0 +1,223 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+Limit = Union[float, Callable[[], float]]
+
+_MISSING = object()
+
+
+class Rule:
+    """Bildirimsel telemetri kuralı.
+
+    fields: kuralın bağlı olduğu snapshot alanları; kural yalnızca bunlardan biri
+    değişince ve hepsi en az bir kez geldiyse değerlendirilir. trip/clear alan
+    değerlerini sırayla (pozisyonel) alır; clear verilmezse 'not trip' kullanılır,
+    verilirse aradaki bant histerezistir. on_delay/off_delay: koşulun durum
+    değiştirmeden önce kesintisiz sürmesi gereken süre (debounce, s).
+    """
+
+    def __init__(self, name: str, fields: Sequence[str], trip: Callable[..., bool],
+                 clear: Optional[Callable[..., bool]] = None, message: str = '',
+                 severity: str = 'warning', on_delay: float = 0.0, off_delay: float = 0.0):
+        self.name = name
+        self.fields = tuple(fields)
+        self.trip = trip
+        self.clear = clear or (lambda *values: not trip(*values))
+        self.message = message  # str.format şablonu, alan adlarıyla: 'Düşük batarya: %{battery}'
+        self.severity = severity
+        self.on_delay = on_delay
+        self.off_delay = off_delay
+        self.active = False
+        self.pending: Optional[bool] = None  # Debounce süresi dolmayı bekleyen hedef durum
+        self.pending_since = 0.0
+        self.stats = {'evaluations': 0, 'total_ns': 0, 'max_ns': 0, 'trips': 0, 'clears': 0}
+
+    def reset(self) -> None:
+        self.active = False
+        self.pending = None
+
+    def delay(self, target: bool) -> float:
+        return self.on_delay if target else self.off_delay
+
+
+def _limit(value: Limit) -> Callable[[], float]:
+    return value if callable(value) else (lambda: value)
+
+
+def below(name: str, field: str, limit: Limit, hysteresis: float = 0.0, **kwargs) -> Rule:
+    """field < limit olunca tetiklenen, limit + hysteresis'e çıkınca temizlenen kural"""
+    get = _limit(limit)
+    return Rule(name, (field,), lambda v: v < get(), lambda v: v >= get() + hysteresis, **kwargs)
+
+
+def above(name: str, field: str, limit: Limit, hysteresis: float = 0.0, **kwargs) -> Rule:
+    """field > limit olunca tetiklenen, limit - hysteresis'e inince temizlenen kural"""
+    get = _limit(limit)
+    return Rule(name, (field,), lambda v: v > get(), lambda v: v <= get() - hysteresis, **kwargs)
+
+
+def battery_rule(name: str, limit: Limit, hysteresis: float = 3.0, **kwargs) -> Rule:
+    """Batarya yüzdesi limit altına inince tetiklenen kural (battery, voltage alanları).
+
+    USB bağlantısında batarya verisi olmayabilir (0/0) ve -1 aracın bilmediğini
+    gösterir; ikisinde de kural tetiklenmez, etkinse temizlenir.
+    """
+    get = _limit(limit)
+
+    def unknown(b, v) -> bool:
+        return b < 0 or (b == 0 and v == 0)
+
+    return Rule(name, ('battery', 'voltage'),
+                trip=lambda b, v: not unknown(b, v) and b < get(),
+                clear=lambda b, v: unknown(b, v) or b >= get() + hysteresis, **kwargs)
+
+
+class RuleEngine:
+    """Artımlı kural motoru: yalnızca değişen alanlara bağlı kurallar yeniden değerlendirilir.
+
+    update() telemetri örneğini son değerlerle birleştirir ve durum değiştiren
+    kuralların olaylarını döndürür; debounce süresi dolan kurallar poll() ile
+    (örnek gelmese de) sonuçlanır. Tek thread'den kullanılır.
+    """
+
+    def __init__(self, rules: Sequence[Rule] = ()):
+        self.rules: Dict[str, Rule] = {}
+        self._by_field: Dict[str, List[Rule]] = {}
+        self._values: Dict[str, Any] = {}
+        self._timers: List[Rule] = []
+        self.stats = {'updates': 0, 'changed_fields': 0, 'unchanged_fields': 0, 'evaluations': 0}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: Rule) -> None:
+        if rule.name in self.rules:
+            self.remove(rule.name)
+        self.rules[rule.name] = rule
+        for field in rule.fields:
+            self._by_field.setdefault(field, []).append(rule)
+
+    def remove(self, name: str) -> None:
+        rule = self.rules.pop(name, None)
+        if rule is None:
+            return
+        for field in rule.fields:
+            self._by_field[field].remove(rule)
+        if rule in self._timers:
+            self._timers.remove(rule)
+
+    def update(self, data: Dict[str, Any], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Örneği işle; aktifleşen/temizlenen kuralların olay listesini döndür"""
+        self.stats['updates'] += 1
+        dirty: List[Rule] = []
+        values = self._values
+        by_field = self._by_field
+        for key, value in data.items():
+            rules = by_field.get(key)
+            if not rules:
+                continue
+            if values.get(key, _MISSING) == value:
+                self.stats['unchanged_fields'] += 1
+                continue
+            values[key] = value
+            self.stats['changed_fields'] += 1
+            for rule in rules:
+                if rule not in dirty:
+                    dirty.append(rule)
+        if not dirty and not self._timers:
+            return []
+        now = time.monotonic() if now is None else now
+        events: List[Dict[str, Any]] = []
+        for rule in dirty:
+            self._evaluate(rule, now, events)
+        if self._timers:
+            self._expire(now, events)
+        return events
+
+    def poll(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Debounce süresi dolan kuralları sonuçlandır"""
+        if not self._timers:
+            return []
+        events: List[Dict[str, Any]] = []
+        self._expire(time.monotonic() if now is None else now, events)
+        return events
+
+    def time_until_next(self, now: float) -> float:
+        """En yakın debounce bitişine kalan süre (okuma döngüsünün bekleme süresi için)"""
+        if not self._timers:
+            return float('inf')
+        return max(0.0, min(r.pending_since + r.delay(r.pending) for r in self._timers) - now)
+
+    def _evaluate(self, rule: Rule, now: float, events: List[Dict[str, Any]]) -> None:
+        values = self._values
+        args = []
+        for field in rule.fields:
+            value = values.get(field, _MISSING)
+            if value is _MISSING:
+                return  # Bağlı alanların hepsi henüz gelmedi
+            args.append(value)
+        start = time.perf_counter_ns()
+        if rule.active:
+            target = False if rule.clear(*args) else None
+        else:
+            target = True if rule.trip(*args) else None
+        elapsed = time.perf_counter_ns() - start
+        stats = rule.stats
+        stats['evaluations'] += 1
+        stats['total_ns'] += elapsed
+        if elapsed > stats['max_ns']:
+            stats['max_ns'] = elapsed
+        self.stats['evaluations'] += 1
+
+        if target is None:
+            if rule.pending is not None:
+                rule.pending = None  # Süre dolmadan koşul bozuldu
+                self._timers.remove(rule)
+            return
+        if rule.delay(target) <= 0:
+            self._transition(rule, target, now, events)
+        elif rule.pending is None:
+            rule.pending = target
+            rule.pending_since = now
+            self._timers.append(rule)
+
+    def _expire(self, now: float, events: List[Dict[str, Any]]) -> None:
+        for rule in list(self._timers):
+            if now - rule.pending_since >= rule.delay(rule.pending):
+                self._timers.remove(rule)
+                target, rule.pending = rule.pending, None
+                self._transition(rule, target, now, events)
+
+    def _transition(self, rule: Rule, active: bool, now: float, events: List[Dict[str, Any]]) -> None:
+        rule.active = active
+        rule.stats['trips' if active else 'clears'] += 1
+        try:
+            message = rule.message.format(**{f: self._values[f] for f in rule.fields})
+        except (KeyError, ValueError, IndexError):
+            message = rule.message
+        events.append({'type': rule.name, 'severity': rule.severity, 'message': message,
+                       'active': active, 'time': now})
+
+    def active(self) -> List[str]:
+        """Aktif kuralların adları"""
+        return [name for name, rule in self.rules.items() if rule.active]
+
+    def reset(self) -> None:
+        """Son değerleri ve kural durumlarını unut (ör. araç değişti)"""
+        self._values.clear()
+        self._timers.clear()
+        for rule in self.rules.values():
+            rule.reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Motor sayaçları ve kural başına değerlendirme maliyeti"""
+        rules = {}
+        for name, rule in self.rules.items():
+            stats = dict(rule.stats)
+            count = stats['evaluations']
+            stats['mean_us'] = stats['total_ns'] / count / 1000.0 if count else 0.0
+            stats['max_us'] = stats.pop('max_ns') / 1000.0
+            stats['active'] = rule.active
+            rules[name] = stats
+        result = dict(self.stats)
+        result['rules'] = rules
+        return result
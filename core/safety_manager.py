@@ -4,6 +4,8 @@ import requests
 import os
 from typing import Optional, Dict, List, Tuple, Any
 
+from core.rule_engine import RuleEngine, above, battery_rule, below
+
 class SafetyManager:
     def __init__(self, weather_api_key: Optional[str] = None):
         self.geofence = None
@@ -37,6 +39,18 @@ class SafetyManager:
         # Güvenlik durumu geçmişi
         self.safety_history = []
         
+        # Sağlık kuralları: eşikler her değerlendirmede yukarıdaki özelliklerden okunur
+        self.health_rules = RuleEngine([
+            below('GPS', 'gps_fix', lambda: self.critical_gps_fix, severity='critical',
+                  message='Kritik GPS fix: {gps_fix}', on_delay=1.0),
+            battery_rule('BATTERY', lambda: self.critical_battery_threshold,
+                         message='Kritik batarya: %{battery}', on_delay=2.0),
+            above('TEMPERATURE', 'temperature', lambda: self.critical_temperature_threshold, hysteresis=5,
+                  message='Kritik sıcaklık: {temperature}°C', on_delay=2.0),
+            below('RSSI', 'rssi', lambda: self.critical_rssi_threshold, hysteresis=3,
+                  message='Kritik sinyal gücü: {rssi} dBm', on_delay=3.0),
+        ])
+        
     def set_geofence(self, points: List[Tuple[float, float]], max_alt: float) -> None:
         """Güvenli uçuş bölgesini tanımla"""
         if not points or len(points) < 3:
@@ -274,38 +288,18 @@ class SafetyManager:
         return []
         
     def check_health(self, telemetry: Dict[str, Any]) -> bool:
-        """Sistem sağlığını kontrol et"""
+        """Sistem sağlığını kontrol et.
+
+        Örnekte olmayan alanlar son değerini korur; kurallar yalnızca bağlı alanları
+        değişince değerlendirilir ve histerezis bandından çıkmadan temizlenmez.
+        """
         if not telemetry:
             return False
             
-        # GPS kontrolü - daha esnek
-        gps_fix = telemetry.get('gps_fix', 0)
-        if gps_fix < self.critical_gps_fix:
-            self._log_safety_event("GPS", f"Kritik GPS fix: {gps_fix}")
-            return False
-            
-        # Batarya kontrolü - USB bağlantısı için daha esnek
-        battery = telemetry.get('battery', 100)
-        voltage = telemetry.get('voltage', 0)
-        
-        # USB bağlantısında batarya verisi olmayabilir, bu durumda kontrol etme
-        if battery == 0 and voltage == 0:
-            # USB bağlantısı - batarya kontrolünü atla
-            pass
-        elif battery < self.critical_battery_threshold:
-            self._log_safety_event("BATTERY", f"Kritik batarya: %{battery}")
-            return False
-            
-        # Sıcaklık kontrolü - daha esnek
-        temperature = telemetry.get('temperature', 25)
-        if temperature > self.critical_temperature_threshold:
-            self._log_safety_event("TEMPERATURE", f"Kritik sıcaklık: {temperature}°C")
-            return False
-            
-        # RSSI kontrolü - daha esnek
-        rssi = telemetry.get('rssi', -50)
-        if rssi < self.critical_rssi_threshold:
-            self._log_safety_event("RSSI", f"Kritik sinyal gücü: {rssi} dBm")
+        for event in self.health_rules.update(telemetry):
+            if event['active']:
+                self._log_safety_event(event['type'], event['message'])
+        if self.health_rules.active():
             return False
             
         # Bağlantı kaybı kontrolü - daha esnek
@@ -0,0 +1,182 @@
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from pymavlink import mavutil
+
+# ArduPilot'un SRx_* parametreleriyle varsayılan olarak yayınladığı mesajlar ve grupları
+# (REQUEST_DATA_STREAM fallback'i ve kullanılmayan mesajları kapatmak için)
+STREAM_GROUPS: Dict[int, Tuple[str, ...]] = {
+    mavutil.mavlink.MAV_DATA_STREAM_RAW_SENSORS: (
+        'RAW_IMU', 'SCALED_IMU2', 'SCALED_IMU3', 'SCALED_PRESSURE', 'SCALED_PRESSURE2'),
+    mavutil.mavlink.MAV_DATA_STREAM_EXTENDED_STATUS: (
+        'SYS_STATUS', 'POWER_STATUS', 'MEMINFO', 'MISSION_CURRENT', 'GPS_RAW_INT',
+        'GPS_RTK', 'GPS2_RAW', 'NAV_CONTROLLER_OUTPUT', 'FENCE_STATUS'),
+    mavutil.mavlink.MAV_DATA_STREAM_POSITION: ('GLOBAL_POSITION_INT', 'LOCAL_POSITION_NED'),
+    mavutil.mavlink.MAV_DATA_STREAM_RC_CHANNELS: ('SERVO_OUTPUT_RAW', 'RC_CHANNELS'),
+    mavutil.mavlink.MAV_DATA_STREAM_EXTRA1: ('ATTITUDE', 'SIMSTATE', 'AHRS2', 'PID_TUNING'),
+    mavutil.mavlink.MAV_DATA_STREAM_EXTRA2: ('VFR_HUD',),
+    mavutil.mavlink.MAV_DATA_STREAM_EXTRA3: (
+        'AHRS', 'SYSTEM_TIME', 'WIND', 'RANGEFINDER', 'DISTANCE_SENSOR', 'TERRAIN_REPORT',
+        'BATTERY_STATUS', 'VIBRATION', 'EKF_STATUS_REPORT'),
+}
+
+MESSAGE_GROUP: Dict[str, int] = {
+    name: group for group, names in STREAM_GROUPS.items() for name in names
+}
+
+# Abonesi olan mesajlar için taban hızlar (Hz); arayüz talepleri bunları yükseltebilir
+DEFAULT_RATES: Dict[str, float] = {
+    'ATTITUDE': 4.0,
+    'VFR_HUD': 4.0,
+    'GPS_RAW_INT': 2.0,
+    'SYS_STATUS': 1.0,
+}
+DEFAULT_RATE = 1.0
+
+
+class StreamRateManager:
+    """Mesaj bazında yayın hızı yöneticisi.
+
+    İstenen hız = abonelerin taban hızı ile arayüz taleplerinin en büyüğü. Abonesi
+    olmayan yayın mesajları kapatılır. Önce SET_MESSAGE_INTERVAL denenir; araç
+    desteklemiyorsa REQUEST_DATA_STREAM ile grup bazında hız istenir.
+    """
+
+    ACK_TIMEOUT = 3.0        # SET_MESSAGE_INTERVAL için ACK bekleme süresi (s)
+    SENDS_PER_SERVICE = 4    # Tek döngüde gönderilecek en fazla istek (57600 baud'u boğmamak için)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribed: Set[str] = set()
+        self._base: Dict[str, float] = {}
+        self._demands: Dict[str, Dict[str, float]] = {}  # sahip -> {mesaj: Hz}
+        self._applied: Dict[str, float] = {}             # Araca gönderilmiş son hızlar
+        self._applied_groups: Dict[int, int] = {}
+        self.use_message_interval: Optional[bool] = None  # None = henüz bilinmiyor
+        self._probe_deadline: Optional[float] = None
+        self.stats = {'interval_requests': 0, 'stream_requests': 0, 'reasserts': 0}
+
+    # --- İstek tarafı (herhangi bir thread) ---
+
+    def set_subscribed(self, msg_types) -> None:
+        """Dağıtıcıda abonesi olan mesaj tipleri (taban hızlar buradan türetilir)"""
+        with self._lock:
+            self._subscribed = set(msg_types)
+
+    def set_base_rate(self, msg_type: str, hz: float) -> None:
+        with self._lock:
+            self._base[msg_type] = float(hz)
+
+    def request(self, owner: str, msg_type: str, hz: float) -> None:
+        """Bir arayüz bileşeninin hız talebi (ör. HUD görünürken yüksek hızlı ATTITUDE)"""
+        with self._lock:
+            self._demands.setdefault(owner, {})[msg_type] = float(hz)
+
+    def release(self, owner: str) -> None:
+        """Bileşenin tüm taleplerini kaldır"""
+        with self._lock:
+            self._demands.pop(owner, None)
+
+    def invalidate(self) -> None:
+        """Yeni bağlantı / araç yeniden başlatma: tüm hızları yeniden gönder"""
+        with self._lock:
+            self._applied.clear()
+            self._applied_groups.clear()
+            self.use_message_interval = None
+            self._probe_deadline = None
+            self.stats['reasserts'] += 1
+
+    def desired(self) -> Dict[str, float]:
+        """Kontrol edilen her mesaj için istenen hız (0 = kapalı)"""
+        with self._lock:
+            rates = {name: 0.0 for name in MESSAGE_GROUP}
+            for name in self._subscribed:
+                if name not in rates and name not in DEFAULT_RATES:
+                    continue  # Olay mesajları (HEARTBEAT, COMMAND_ACK, ...) hız kontrolüne girmez
+                rates[name] = self._base.get(name, DEFAULT_RATES.get(name, DEFAULT_RATE))
+            for name, hz in self._base.items():
+                rates[name] = max(rates.get(name, 0.0), hz)
+            for demands in self._demands.values():
+                for name, hz in demands.items():
+                    rates[name] = max(rates.get(name, 0.0), hz)
+            return rates
+
+    # --- Gönderim tarafı (MAVLink thread'i) ---
+
+    def pending(self) -> List[Tuple[str, float]]:
+        desired = self.desired()
+        return [(name, hz) for name, hz in desired.items() if self._applied.get(name) != hz]
+
+    def service(self, mav, target_system: int, target_component: int, now: Optional[float] = None) -> int:
+        """Bekleyen hız değişikliklerini araca gönder; gönderilen istek sayısını döndürür"""
+        now = time.monotonic() if now is None else now
+        if self.use_message_interval is None and self._probe_deadline is not None and now > self._probe_deadline:
+            # ACK gelmedi: eski otopilot, grup bazlı isteğe geç
+            print("[STREAM] SET_MESSAGE_INTERVAL yanıtsız, REQUEST_DATA_STREAM kullanılıyor")
+            self._use_data_streams()
+        if self.use_message_interval is False:
+            return self._service_groups(mav, target_system, target_component)
+
+        sent = 0
+        for name, hz in self.pending():
+            msg_id = getattr(mavutil.mavlink, f'MAVLINK_MSG_ID_{name}', None)
+            if msg_id is None:
+                self._applied[name] = hz
+                continue
+            interval_us = 1e6 / hz if hz > 0 else -1  # -1 = yayını kapat
+            mav.command_long_send(
+                target_system, target_component,
+                mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL, 0,
+                msg_id, interval_us, 0, 0, 0, 0, 0)
+            self._applied[name] = hz
+            self.stats['interval_requests'] += 1
+            if self.use_message_interval is None and self._probe_deadline is None:
+                self._probe_deadline = now + self.ACK_TIMEOUT
+            sent += 1
+            if sent >= self.SENDS_PER_SERVICE:
+                break
+        return sent
+
+    def _service_groups(self, mav, target_system: int, target_component: int) -> int:
+        desired = self.desired()
+        group_rates: Dict[int, int] = {}
+        for group, names in STREAM_GROUPS.items():
+            hz = max(desired.get(name, 0.0) for name in names)
+            # Grup hızı tam sayı Hz; 0 < hz < 1 için 1 Hz iste
+            group_rates[group] = max(1, int(round(hz))) if hz > 0 else 0
+        sent = 0
+        for group, rate in group_rates.items():
+            if self._applied_groups.get(group) == rate:
+                continue
+            mav.request_data_stream_send(target_system, target_component, group, rate, 1 if rate else 0)
+            self._applied_groups[group] = rate
+            self.stats['stream_requests'] += 1
+            sent += 1
+            if sent >= self.SENDS_PER_SERVICE:
+                break
+        self._applied = desired
+        return sent
+
+    def _use_data_streams(self) -> None:
+        self.use_message_interval = False
+        self._applied_groups.clear()
+        self._probe_deadline = None
+
+    def handle_ack(self, msg) -> bool:
+        """SET_MESSAGE_INTERVAL için gelen COMMAND_ACK; ilgiliyse True döner"""
+        if msg.command != mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+            return False
+        if msg.result == mavutil.mavlink.MAV_RESULT_ACCEPTED:
+            self.use_message_interval = True
+            self._probe_deadline = None
+        elif msg.result == mavutil.mavlink.MAV_RESULT_UNSUPPORTED:
+            print("[STREAM] SET_MESSAGE_INTERVAL desteklenmiyor, REQUEST_DATA_STREAM kullanılıyor")
+            self._use_data_streams()
+        return True
+
+    def get_stats(self) -> Dict[str, object]:
+        stats = dict(self.stats)
+        stats['method'] = {None: 'probing', True: 'message_interval', False: 'data_stream'}[self.use_message_interval]
+        stats['rates'] = {name: hz for name, hz in self.desired().items() if hz > 0}
+        return stats
@@ -0,0 +1,836 @@
+import math
+import os
+import random
+import select
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+
+from core.flight_modes import mode_name, mode_number, vehicle_family
+from core.mission_transfer import MISSION_TYPE, item_from_msg, make_item, send_item
+from core.param_cache import HASH_CHECK_ID, param_set_hash
+from core.stream_rates import STREAM_GROUPS
+
+# Varsayılan yayınlar (Hz); SR0_* varsayılanlarına yakın
+DEFAULT_STREAMS: Dict[str, float] = {
+    'HEARTBEAT': 1.0,
+    'ATTITUDE': 4.0,
+    'VFR_HUD': 4.0,
+    'GPS_RAW_INT': 2.0,
+    'GLOBAL_POSITION_INT': 4.0,
+    'SYS_STATUS': 1.0,
+    'MISSION_CURRENT': 1.0,
+    'RADIO_STATUS': 1.0,
+}
+
+DEFAULT_PARAMS: Dict[str, float] = {
+    'SYSID_THISMAV': 1.0,
+    'BATT_CAPACITY': 5000.0,
+    'BATT_LOW_MAH': 1000.0,
+    'RELAY1_FUNCTION': 1.0,
+    'RELAY1_PIN': 13.0,
+    'RELAY2_FUNCTION': 1.0,
+    'RELAY2_PIN': 14.0,
+    'WP_RADIUS': 20.0,
+    'TRIM_ARSPD_CM': 1800.0,
+}
+
+_DO_COMMANDS_START = 176  # MAV_CMD_DO_SET_MODE: bu ve sonrası anında uygulanan DO_* komutları
+
+
+def _param_name(value) -> str:
+    if isinstance(value, bytes):
+        value = value.decode('ascii', errors='ignore')
+    return value.rstrip('\x00')
+
+
+class KinematicModel:
+    """Basit araç kinematiği: hedefe dönüş hızı sınırlı yönelme, tırmanma ve daire çizme.
+
+    Konum düz dünya yaklaşımıyla güncellenir; roll koordineli dönüşten,
+    pitch tırmanma açısından hesaplanır.
+    """
+
+    GRAVITY = 9.81
+    EARTH_RADIUS = 6378137.0
+
+    def __init__(self, lat: float, lon: float, alt: float = 0.0, cruise_speed: float = 18.0,
+                 max_climb: float = 3.0, max_turn_rate: float = 20.0, loiter_radius: float = 60.0):
+        self.lat = lat
+        self.lon = lon
+        self.alt = alt  # Eve göre yükseklik (m)
+        self.heading = 0.0
+        self.groundspeed = 0.0
+        self.climb = 0.0
+        self.roll = 0.0
+        self.pitch = 0.0
+        self.turn_rate = 0.0  # deg/s
+        self.cruise_speed = cruise_speed
+        self.max_climb = max_climb
+        self.max_turn_rate = max_turn_rate
+        self.loiter_radius = loiter_radius
+
+    def distance_bearing(self, lat: float, lon: float) -> Tuple[float, float]:
+        """Hedefe uzaklık (m) ve kerteriz (derece)"""
+        dn = math.radians(lat - self.lat) * self.EARTH_RADIUS
+        de = math.radians(lon - self.lon) * self.EARTH_RADIUS * math.cos(math.radians(self.lat))
+        return math.hypot(dn, de), math.degrees(math.atan2(de, dn)) % 360.0
+
+    def step(self, dt: float, target: Optional[Tuple[float, float]], target_alt: float,
+             airborne: bool, hold_position: bool = False) -> None:
+        """dt saniye ilerle. target None ise bulunduğu yerde daire çizer."""
+        if not airborne:
+            self.groundspeed = self.climb = self.roll = self.pitch = self.turn_rate = 0.0
+            return
+        self.climb = max(-self.max_climb, min(self.max_climb, (target_alt - self.alt) * 0.5))
+        self.alt = max(0.0, self.alt + self.climb * dt)
+        # Kalkışta önce güvenli yüksekliğe dikey tırman
+        if hold_position or self.alt < 2.0:
+            self.groundspeed = self.roll = self.turn_rate = 0.0
+            self.pitch = 0.0
+            return
+        self.groundspeed = self.cruise_speed
+        if target is None:
+            turn = math.degrees(self.groundspeed / self.loiter_radius)
+        else:
+            _, bearing = self.distance_bearing(*target)
+            error = (bearing - self.heading + 180.0) % 360.0 - 180.0
+            turn = max(-self.max_turn_rate, min(self.max_turn_rate, error * 0.8))
+        self.turn_rate = turn
+        self.heading = (self.heading + turn * dt) % 360.0
+        self.roll = math.degrees(math.atan(self.groundspeed * math.radians(turn) / self.GRAVITY))
+        self.pitch = math.degrees(math.atan2(self.climb, self.groundspeed))
+        distance = self.groundspeed * dt
+        heading = math.radians(self.heading)
+        self.lat += math.degrees(distance * math.cos(heading) / self.EARTH_RADIUS)
+        self.lon += math.degrees(distance * math.sin(heading) /
+                                 (self.EARTH_RADIUS * math.cos(math.radians(self.lat))))
+
+
+class SyntheticVehicle:
+    """Donanımsız yük/dayanıklılık testi için MAVLink konuşan sentetik araç.
+
+    write ile verilen taşıyıcıya (pty, UDP) ArduPilot gibi yayın yapar;
+    handle_bytes() ile gelen yer istasyonu paketlerini işler. Görev
+    (yükleme/indirme/kısmi yazma), parametre, COMMAND_LONG, SET_MODE, yayın hızı
+    (SET_MESSAGE_INTERVAL / REQUEST_DATA_STREAM) ve TIMESYNC protokollerini yanıtlar.
+    Paket kaybı, bozulma ve radyo tamponu benzeri patlamalar eklenebilir.
+    """
+
+    UPLOAD_RETRY = 0.5      # Görev yüklemede öğe bekleme süresi (s)
+    UPLOAD_MAX_RETRIES = 10
+    PARAMS_PER_STEP = 20    # Liste gönderiminde tek adımda gönderilecek PARAM_VALUE sayısı
+
+    def __init__(self, write: Callable[[bytes], Any], sysid: int = 1, compid: int = 1,
+                 mav_type: int = mavutil.mavlink.MAV_TYPE_FIXED_WING,
+                 home: Tuple[float, float, float] = (40.0, 29.0, 100.0),
+                 streams: Optional[Dict[str, float]] = None, extra_params: int = 0,
+                 loss: float = 0.0, corrupt: float = 0.0,
+                 burst_interval: float = 0.0, burst_length: float = 0.0,
+                 honor_rate_requests: bool = True, message_interval: bool = True,
+                 hash_check: bool = False, airborne: bool = False,
+                 seed: Optional[int] = None, now: Optional[float] = None):
+        self._write = write
+        self.sysid = sysid
+        self.compid = compid
+        self.mav_type = mav_type
+        self.family = vehicle_family(mav_type)
+        self.mav = mavlink.MAVLink(self, srcSystem=sysid, srcComponent=compid)
+        self.mav.robust_parsing = True
+        self.home = home
+        self.model = KinematicModel(home[0], home[1])
+        self.random = random.Random(seed)
+
+        # Hata ekleme
+        self.loss = loss
+        self.corrupt = corrupt
+        self.burst_interval = burst_interval
+        self.burst_length = burst_length
+        self._held: List[bytes] = []
+
+        self.honor_rate_requests = honor_rate_requests
+        self.message_interval = message_interval  # False: SET_MESSAGE_INTERVAL UNSUPPORTED (eski sürüm)
+        self.hash_check = hash_check  # True: PX4 gibi _HASH_CHECK yanıtla
+
+        self.armed = False
+        self.custom_mode = mode_number(self.family, 'LOITER') or 0
+        self.target_alt = 0.0
+        self.landing = False
+        self.relays: Dict[int, int] = {}
+        self.mission: List[Dict[str, Any]] = [make_item(0, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT,
+                                                        home[0], home[1], home[2],
+                                                        frame=mavutil.mavlink.MAV_FRAME_GLOBAL)]
+        self.mission_seq = 0
+        self._upload: Optional[Dict[str, Any]] = None
+
+        self.params: Dict[str, float] = dict(DEFAULT_PARAMS)
+        self.params['SYSID_THISMAV'] = float(sysid)
+        for i in range(extra_params):
+            self.params[f'SIM_PARAM_{i:04d}'] = float(i)
+        self._param_names = list(self.params)
+        self._param_queue: List[int] = []
+
+        now = time.monotonic() if now is None else now
+        self.boot = now
+        self._last_step = now
+        self._next_burst = now + burst_interval if burst_interval > 0 else None
+        self._burst_end: Optional[float] = None
+        self.rates: Dict[str, float] = {}
+        self._due: Dict[str, float] = {}
+        for name, rate in (streams if streams is not None else DEFAULT_STREAMS).items():
+            self.set_rate(name, rate, now)
+        self.rates.setdefault('HEARTBEAT', 1.0)
+        self._due.setdefault('HEARTBEAT', now)
+        self._default_rates = dict(self.rates)
+
+        if airborne:
+            self.armed = True
+            self.model.alt = self.target_alt = 100.0
+
+        self.stats = {'tx_packets': 0, 'tx_bytes': 0, 'dropped': 0, 'corrupted': 0, 'bursts': 0,
+                      'tx_errors': 0, 'rx_packets': 0, 'rx_bad': 0, 'commands': 0,
+                      'missions_uploaded': 0, 'params_sent': 0}
+
+    # --- Çıkış ve hata ekleme ---
+
+    def write(self, buf: bytes) -> None:
+        """pymavlink MAVLink nesnesinin dosya arayüzü: paket başına bir çağrı"""
+        if self.loss and self.random.random() < self.loss:
+            self.stats['dropped'] += 1
+            return
+        if self.corrupt and self.random.random() < self.corrupt:
+            data = bytearray(buf)
+            pos = self.random.randrange(1, len(data))
+            data[pos] ^= 1 << self.random.randrange(8)
+            buf = bytes(data)
+            self.stats['corrupted'] += 1
+        if self._burst_end is not None:
+            self._held.append(buf)  # Radyo tamponu: patlama sonunda tek seferde gönderilir
+            return
+        self._send_raw(buf)
+
+    def _send_raw(self, buf: bytes) -> None:
+        try:
+            self._write(buf)
+        except (BlockingIOError, OSError):
+            self.stats['tx_errors'] += 1  # Okuyan yok / tampon dolu (seri taşma)
+            return
+        self.stats['tx_packets'] += 1
+        self.stats['tx_bytes'] += len(buf)
+
+    def _service_bursts(self, now: float) -> None:
+        if self._burst_end is not None and now >= self._burst_end:
+            held, self._held = self._held, []
+            self._burst_end = None
+            if held:
+                self._send_raw(b''.join(held))
+        if self._next_burst is not None and now >= self._next_burst:
+            self._next_burst = now + self.burst_interval
+            if self.burst_length > 0:
+                self._burst_end = now + self.burst_length
+                self.stats['bursts'] += 1
+
+    # --- Yayın hızları ---
+
+    def set_rate(self, name: str, rate: float, now: Optional[float] = None) -> bool:
+        """Mesajın yayın hızını ayarla (0 kapatır); üretilemeyen mesajda False"""
+        if name not in self._generators():
+            return False
+        now = time.monotonic() if now is None else now
+        if rate > 0:
+            self.rates[name] = rate
+            self._due.setdefault(name, now)
+        else:
+            self.rates.pop(name, None)
+            self._due.pop(name, None)
+        return True
+
+    @classmethod
+    def _generators(cls) -> Dict[str, Callable[['SyntheticVehicle', float], None]]:
+        return {
+            'HEARTBEAT': cls._send_heartbeat,
+            'ATTITUDE': cls._send_attitude,
+            'VFR_HUD': cls._send_vfr_hud,
+            'GPS_RAW_INT': cls._send_gps_raw_int,
+            'GLOBAL_POSITION_INT': cls._send_global_position_int,
+            'SYS_STATUS': cls._send_sys_status,
+            'MISSION_CURRENT': cls._send_mission_current,
+            'RADIO_STATUS': cls._send_radio_status,
+        }
+
+    def time_until_next(self, now: float) -> float:
+        """Bir sonraki yayına / patlama olayına kalan süre (çalıştırıcının select timeout'u)"""
+        deadlines = list(self._due.values())
+        if self._burst_end is not None:
+            deadlines.append(self._burst_end)
+        if self._next_burst is not None:
+            deadlines.append(self._next_burst)
+        if self._param_queue or self._upload:
+            deadlines.append(now + 0.01)
+        return max(0.0, min(deadlines) - now) if deadlines else 1.0
+
+    # --- Simülasyon adımı ---
+
+    @property
+    def mode(self) -> str:
+        return mode_name(self.family, self.custom_mode)
+
+    def step(self, now: Optional[float] = None) -> None:
+        """Modeli ilerlet, zamanı gelen yayınları ve bekleyen yanıtları gönder"""
+        now = time.monotonic() if now is None else now
+        dt = min(max(now - self._last_step, 0.0), 1.0)
+        self._last_step = now
+        self._service_bursts(now)
+        self._navigate(dt)
+        generators = self._generators()
+        for name, rate in list(self.rates.items()):
+            due = self._due.get(name, now)
+            if now < due:
+                continue
+            generators[name](self, now)
+            due += 1.0 / rate
+            self._due[name] = due if due > now else now + 1.0 / rate  # Geride kaldıysa birikmiş yayın yapma
+        self._service_params()
+        self._service_upload(now)
+
+    def _navigation(self) -> Tuple[Optional[Tuple[float, float]], bool]:
+        """(yatay hedef, konumda kal) — mod ve göreve göre"""
+        mode = self.mode
+        if self.landing or mode in ('LAND', 'QLAND'):
+            return None, True
+        if mode in ('RTL', 'QRTL', 'SMART_RTL'):
+            self.target_alt = max(self.target_alt, 50.0)
+            return (self.home[0], self.home[1]), False
+        if mode == 'AUTO' and 0 < self.mission_seq < len(self.mission):
+            item = self.mission[self.mission_seq]
+            if item['command'] == mavutil.mavlink.MAV_CMD_NAV_TAKEOFF:
+                return None, True
+            if item['x'] or item['y']:
+                return (item['x'], item['y']), False
+        return None, False
+
+    def _navigate(self, dt: float) -> None:
+        model = self.model
+        if self.mode == 'AUTO':
+            self._advance_mission()
+        target, hold = self._navigation()
+        landing = self.landing or self.mode in ('LAND', 'QLAND')
+        if landing:
+            self.target_alt = 0.0
+        airborne = self.armed and (model.alt > 0.0 or self.target_alt > 0.0)
+        model.step(dt, target, self.target_alt, airborne, hold)
+        if landing and self.armed and model.alt <= 0.2:
+            model.alt = 0.0
+            self.armed = False  # İnişte otomatik disarm
+            self.landing = False
+
+    def _advance_mission(self) -> None:
+        """AUTO: ulaşılan öğeleri işaretle, DO_* öğelerini anında uygula"""
+        for _ in range(len(self.mission)):
+            if not 0 < self.mission_seq < len(self.mission):
+                return
+            item = self.mission[self.mission_seq]
+            command = item['command']
+            if command == mavutil.mavlink.MAV_CMD_NAV_TAKEOFF:
+                self.target_alt = item['z']
+                if self.model.alt < item['z'] - 1.0:
+                    return
+            elif command == mavutil.mavlink.MAV_CMD_NAV_LAND:
+                self.landing = True
+            elif command == mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH:
+                self.set_mode('RTL')
+            elif command >= _DO_COMMANDS_START:
+                if command == mavutil.mavlink.MAV_CMD_DO_SET_RELAY:
+                    self.relays[int(item['param1'])] = int(item['param2'])
+            else:
+                self.target_alt = item['z']
+                distance, _ = self.model.distance_bearing(item['x'], item['y'])
+                radius = item['param2'] or self.params.get('WP_RADIUS', 20.0)
+                if distance > radius:
+                    return
+            self.mav.mission_item_reached_send(self.mission_seq)
+            if self.mission_seq + 1 >= len(self.mission):
+                self.mission_seq = len(self.mission)  # Görev bitti: son noktada daire çiz
+                return
+            self.mission_seq += 1
+            self.mav.mission_current_send(self.mission_seq)
+
+    def set_mode(self, name: str) -> bool:
+        number = mode_number(self.family, name)
+        if number is None:
+            return False
+        self.custom_mode = number
+        self.landing = False
+        return True
+
+    # --- Yayın mesajları ---
+
+    def _time_boot_ms(self, now: float) -> int:
+        return int((now - self.boot) * 1000) & 0xFFFFFFFF
+
+    def _send_heartbeat(self, now: float) -> None:
+        base_mode = mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED
+        if self.armed:
+            base_mode |= mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED
+        status = mavutil.mavlink.MAV_STATE_ACTIVE if self.armed else mavutil.mavlink.MAV_STATE_STANDBY
+        self.mav.heartbeat_send(self.mav_type, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                                base_mode, self.custom_mode, status)
+
+    def _send_attitude(self, now: float) -> None:
+        m = self.model
+        self.mav.attitude_send(self._time_boot_ms(now), math.radians(m.roll), math.radians(m.pitch),
+                               math.radians(self._wrap180(m.heading)), 0.0, 0.0, math.radians(m.turn_rate))
+
+    @staticmethod
+    def _wrap180(angle: float) -> float:
+        return (angle + 180.0) % 360.0 - 180.0
+
+    def _send_vfr_hud(self, now: float) -> None:
+        m = self.model
+        throttle = int(60 + 10 * m.climb) if m.groundspeed else 0
+        self.mav.vfr_hud_send(m.groundspeed, m.groundspeed, int(m.heading) % 360,
+                              max(0, min(100, throttle)), self.home[2] + m.alt, m.climb)
+
+    def _send_gps_raw_int(self, now: float) -> None:
+        m = self.model
+        self.mav.gps_raw_int_send(int((now - self.boot) * 1e6), 3, int(m.lat * 1e7), int(m.lon * 1e7),
+                                  int((self.home[2] + m.alt) * 1000), 80, 120, int(m.groundspeed * 100),
+                                  int(m.heading * 100) % 36000, 12)
+
+    def _send_global_position_int(self, now: float) -> None:
+        m = self.model
+        heading = math.radians(m.heading)
+        self.mav.global_position_int_send(
+            self._time_boot_ms(now), int(m.lat * 1e7), int(m.lon * 1e7),
+            int((self.home[2] + m.alt) * 1000), int(m.alt * 1000),
+            int(m.groundspeed * math.cos(heading) * 100), int(m.groundspeed * math.sin(heading) * 100),
+            int(-m.climb * 100), int(m.heading * 100) % 36000)
+
+    def _battery(self, now: float) -> Tuple[int, int, int]:
+        """(mV, cA, kalan %) — uçuş süresine göre doğrusal boşalma"""
+        capacity = self.params.get('BATT_CAPACITY', 5000.0) or 5000.0
+        current = 2.0 + (12.0 if self.model.groundspeed else 0.0)
+        used_mah = (now - self.boot) / 3600.0 * 1000.0 * (current if self.armed else 2.0)
+        remaining = max(0.0, 1.0 - used_mah / capacity)
+        return int((10.5 + 2.1 * remaining) * 1000), int(current * 100), int(remaining * 100)
+
+    def _send_sys_status(self, now: float) -> None:
+        voltage, current, remaining = self._battery(now)
+        sensors = (mavutil.mavlink.MAV_SYS_STATUS_SENSOR_3D_GYRO | mavutil.mavlink.MAV_SYS_STATUS_SENSOR_3D_ACCEL
+                   | mavutil.mavlink.MAV_SYS_STATUS_SENSOR_GPS)
+        self.mav.sys_status_send(sensors, sensors, sensors, 250, voltage, current, remaining,
+                                 0, 0, 0, 0, 0, 0)
+
+    def _send_mission_current(self, now: float) -> None:
+        self.mav.mission_current_send(min(self.mission_seq, max(len(self.mission) - 1, 0)))
+
+    def _send_radio_status(self, now: float) -> None:
+        distance, _ = self.model.distance_bearing(self.home[0], self.home[1])
+        rssi = max(0, min(255, int(200 - distance / 20.0)))
+        rxerrors = self.stats['corrupted'] & 0xFFFF
+        self.mav.radio_status_send(rssi, rssi, 100, 40, 40, rxerrors, self.stats['dropped'] & 0xFFFF)
+
+    # --- Gelen paketler ---
+
+    def handle_bytes(self, data: bytes) -> None:
+        messages = self.mav.parse_buffer(data) or []
+        for msg in messages:
+            if msg.get_type() == 'BAD_DATA':
+                self.stats['rx_bad'] += 1
+                continue
+            self.stats['rx_packets'] += 1
+            self.handle_message(msg)
+
+    def _for_us(self, msg) -> bool:
+        target = getattr(msg, 'target_system', 0)
+        return target in (0, self.sysid)
+
+    def handle_message(self, msg) -> None:
+        if not self._for_us(msg):
+            return
+        handler = self._handlers().get(msg.get_type())
+        if handler is not None:
+            handler(self, msg)
+
+    @classmethod
+    def _handlers(cls) -> Dict[str, Callable[['SyntheticVehicle', Any], None]]:
+        return {
+            'COMMAND_LONG': cls._on_command_long,
+            'SET_MODE': cls._on_set_mode,
+            'REQUEST_DATA_STREAM': cls._on_request_data_stream,
+            'TIMESYNC': cls._on_timesync,
+            'MISSION_COUNT': cls._on_mission_count,
+            'MISSION_WRITE_PARTIAL_LIST': cls._on_mission_write_partial_list,
+            'MISSION_ITEM_INT': cls._on_mission_item,
+            'MISSION_ITEM': cls._on_mission_item,
+            'MISSION_REQUEST_LIST': cls._on_mission_request_list,
+            'MISSION_REQUEST_INT': cls._on_mission_request,
+            'MISSION_REQUEST': cls._on_mission_request,
+            'MISSION_CLEAR_ALL': cls._on_mission_clear_all,
+            'MISSION_SET_CURRENT': cls._on_mission_set_current,
+            'PARAM_REQUEST_LIST': cls._on_param_request_list,
+            'PARAM_REQUEST_READ': cls._on_param_request_read,
+            'PARAM_SET': cls._on_param_set,
+        }
+
+    def _ack(self, msg, result: int) -> None:
+        self.mav.command_ack_send(msg.command, result, 0, 0, msg.get_srcSystem(), msg.get_srcComponent())
+
+    def _on_command_long(self, msg) -> None:
+        self.stats['commands'] += 1
+        self._ack(msg, self._execute_command(msg))
+
+    def _execute_command(self, msg) -> int:
+        c = mavutil.mavlink
+        command = msg.command
+        if command == c.MAV_CMD_COMPONENT_ARM_DISARM:
+            self.armed = msg.param1 >= 0.5
+            if not self.armed:
+                self.target_alt = 0.0
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_DO_SET_MODE:
+            if mode_name(self.family, int(msg.param2)).startswith('CUSTOM('):
+                return c.MAV_RESULT_DENIED
+            self.custom_mode = int(msg.param2)
+            self.landing = False
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_NAV_TAKEOFF:
+            if not self.armed:
+                return c.MAV_RESULT_FAILED
+            self.target_alt = msg.param7 or 50.0
+            self.set_mode('TAKEOFF') or self.set_mode('GUIDED')
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_NAV_LAND:
+            self.landing = True
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_NAV_RETURN_TO_LAUNCH:
+            self.set_mode('RTL')
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_MISSION_START:
+            if len(self.mission) < 2:
+                return c.MAV_RESULT_FAILED
+            self.mission_seq = max(1, int(msg.param1))
+            self.set_mode('AUTO')
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_DO_PAUSE_CONTINUE:
+            self.set_mode('AUTO' if msg.param1 >= 0.5 else 'LOITER')
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_DO_SET_RELAY:
+            self.relays[int(msg.param1)] = int(msg.param2)
+            return c.MAV_RESULT_ACCEPTED
+        if command == c.MAV_CMD_SET_MESSAGE_INTERVAL:
+            return self._set_message_interval(int(msg.param1), msg.param2)
+        if command == c.MAV_CMD_REQUEST_MESSAGE:
+            name = self._message_name(int(msg.param1))
+            if name not in self._generators():
+                return c.MAV_RESULT_UNSUPPORTED
+            self._generators()[name](self, time.monotonic())
+            return c.MAV_RESULT_ACCEPTED
+        return c.MAV_RESULT_UNSUPPORTED
+
+    @staticmethod
+    def _message_name(msgid: int) -> Optional[str]:
+        cls = mavlink.mavlink_map.get(msgid)
+        return cls.msgname if cls is not None else None
+
+    def _set_message_interval(self, msgid: int, interval_us: float) -> int:
+        if not self.message_interval:
+            return mavutil.mavlink.MAV_RESULT_UNSUPPORTED
+        name = self._message_name(msgid)
+        if name not in self._generators():
+            return mavutil.mavlink.MAV_RESULT_DENIED
+        if self.honor_rate_requests:
+            if interval_us < 0:
+                rate = 0.0
+            elif interval_us == 0:
+                rate = self._default_rates.get(name, 0.0)
+            else:
+                rate = 1e6 / interval_us
+            self.set_rate(name, rate)
+        return mavutil.mavlink.MAV_RESULT_ACCEPTED
+
+    def _on_set_mode(self, msg) -> None:
+        if not mode_name(self.family, msg.custom_mode).startswith('CUSTOM('):
+            self.custom_mode = msg.custom_mode
+            self.landing = False
+
+    def _on_request_data_stream(self, msg) -> None:
+        if not self.honor_rate_requests:
+            return
+        rate = float(msg.req_message_rate) if msg.start_stop else 0.0
+        if msg.req_stream_id == mavutil.mavlink.MAV_DATA_STREAM_ALL:
+            names = [name for group in STREAM_GROUPS.values() for name in group]
+        else:
+            names = STREAM_GROUPS.get(msg.req_stream_id, ())
+        for name in names:
+            self.set_rate(name, rate)
+
+    def _on_timesync(self, msg) -> None:
+        if msg.tc1 == 0:
+            self.mav.timesync_send(time.monotonic_ns(), msg.ts1)
+
+    # --- Görev protokolü (araç tarafı) ---
+
+    def _on_mission_count(self, msg) -> None:
+        if getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return
+        self._start_upload(msg, 0, msg.count)
+
+    def _on_mission_write_partial_list(self, msg) -> None:
+        if getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return
+        end = msg.end_index if msg.end_index >= 0 else len(self.mission) - 1
+        if not 0 <= msg.start_index <= end < len(self.mission):
+            self.mav.mission_ack_send(msg.get_srcSystem(), msg.get_srcComponent(),
+                                      mavutil.mavlink.MAV_MISSION_ERROR, MISSION_TYPE)
+            return
+        self._start_upload(msg, msg.start_index, end + 1)
+
+    def _start_upload(self, msg, first: int, end: int) -> None:
+        target = (msg.get_srcSystem(), msg.get_srcComponent())
+        if end == 0:
+            self.mission = self.mission[:1]
+            self.mav.mission_ack_send(target[0], target[1], mavutil.mavlink.MAV_MISSION_ACCEPTED, MISSION_TYPE)
+            return
+        self._upload = {'target': target, 'first': first, 'end': end, 'items': {},
+                        'next': first, 'partial': msg.get_type() == 'MISSION_WRITE_PARTIAL_LIST',
+                        'last': time.monotonic(), 'retries': 0}
+        self._request_item()
+
+    def _request_item(self) -> None:
+        upload = self._upload
+        self.mav.mission_request_int_send(upload['target'][0], upload['target'][1], upload['next'], MISSION_TYPE)
+
+    def _on_mission_item(self, msg) -> None:
+        upload = self._upload
+        if upload is None or getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return
+        if msg.seq != upload['next']:
+            self._request_item()  # Sıra dışı / tekrar: beklenen öğeyi yeniden iste
+            return
+        if msg.get_type() == 'MISSION_ITEM_INT':
+            item = item_from_msg(msg)
+        else:
+            item = make_item(msg.seq, msg.command, msg.x, msg.y, msg.z, msg.frame, msg.param1,
+                             msg.param2, msg.param3, msg.param4, msg.current, msg.autocontinue)
+        upload['items'][msg.seq] = item
+        upload['next'] += 1
+        upload['last'] = time.monotonic()
+        upload['retries'] = 0
+        if upload['next'] < upload['end']:
+            self._request_item()
+            return
+        items = [upload['items'][seq] for seq in range(upload['first'], upload['end'])]
+        if upload['partial']:
+            self.mission[upload['first']:upload['end']] = items
+        else:
+            self.mission = items
+            self.mission_seq = min(self.mission_seq, len(items))
+        self._upload = None
+        self.stats['missions_uploaded'] += 1
+        self.mav.mission_ack_send(upload['target'][0], upload['target'][1],
+                                  mavutil.mavlink.MAV_MISSION_ACCEPTED, MISSION_TYPE)
+
+    def _service_upload(self, now: float) -> None:
+        upload = self._upload
+        if upload is None or now - upload['last'] < self.UPLOAD_RETRY:
+            return
+        if upload['retries'] >= self.UPLOAD_MAX_RETRIES:
+            self._upload = None
+            self.mav.mission_ack_send(upload['target'][0], upload['target'][1],
+                                      mavutil.mavlink.MAV_MISSION_OPERATION_CANCELLED, MISSION_TYPE)
+            return
+        upload['retries'] += 1
+        upload['last'] = now
+        self._request_item()
+
+    def _on_mission_request_list(self, msg) -> None:
+        if getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return
+        self.mav.mission_count_send(msg.get_srcSystem(), msg.get_srcComponent(), len(self.mission), MISSION_TYPE)
+
+    def _on_mission_request(self, msg) -> None:
+        if getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return
+        if self._upload is not None:
+            return
+        if not 0 <= msg.seq < len(self.mission):
+            self.mav.mission_ack_send(msg.get_srcSystem(), msg.get_srcComponent(),
+                                      mavutil.mavlink.MAV_MISSION_INVALID_SEQUENCE, MISSION_TYPE)
+            return
+        send_item(self.mav, msg.get_srcSystem(), msg.get_srcComponent(), self.mission[msg.seq],
+                  use_int=msg.get_type() == 'MISSION_REQUEST_INT')
+
+    def _on_mission_clear_all(self, msg) -> None:
+        if getattr(msg, 'mission_type', MISSION_TYPE) != MISSION_TYPE:
+            return
+        self.mission = self.mission[:1]
+        self.mission_seq = 0
+        self.mav.mission_ack_send(msg.get_srcSystem(), msg.get_srcComponent(),
+                                  mavutil.mavlink.MAV_MISSION_ACCEPTED, MISSION_TYPE)
+
+    def _on_mission_set_current(self, msg) -> None:
+        if 0 <= msg.seq < len(self.mission):
+            self.mission_seq = msg.seq
+            self.mav.mission_current_send(msg.seq)
+
+    # --- Parametre protokolü ---
+
+    def _send_param(self, index: int) -> None:
+        name = self._param_names[index]
+        self.mav.param_value_send(name.encode('ascii'), self.params[name],
+                                  mavutil.mavlink.MAV_PARAM_TYPE_REAL32, len(self._param_names), index)
+        self.stats['params_sent'] += 1
+
+    def _on_param_request_list(self, msg) -> None:
+        self._param_queue = list(range(len(self._param_names)))
+
+    def _service_params(self) -> None:
+        """Listeyi birkaç adıma yay (gerçek araçtaki bant genişliği sınırı gibi)"""
+        if not self._param_queue:
+            return
+        batch, self._param_queue = self._param_queue[:self.PARAMS_PER_STEP], self._param_queue[self.PARAMS_PER_STEP:]
+        for index in batch:
+            self._send_param(index)
+
+    def _on_param_request_read(self, msg) -> None:
+        name = _param_name(msg.param_id)
+        if msg.param_index == -1 and name == HASH_CHECK_ID:
+            if self.hash_check:
+                set_hash = param_set_hash([(n, self.params[n]) for n in self._param_names])
+                raw = struct.unpack('<f', struct.pack('<I', set_hash))[0]  # Özetin ham 32 biti
+                self.mav.param_value_send(HASH_CHECK_ID.encode('ascii'), raw,
+                                          mavutil.mavlink.MAV_PARAM_TYPE_UINT32, len(self._param_names), -1)
+            return
+        if 0 <= msg.param_index < len(self._param_names):
+            self._send_param(msg.param_index)
+        elif name in self.params:
+            self._send_param(self._param_names.index(name))
+
+    def _on_param_set(self, msg) -> None:
+        name = _param_name(msg.param_id)
+        if name not in self.params:
+            return
+        self.params[name] = float(msg.param_value)
+        self._send_param(self._param_names.index(name))
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['mode'] = self.mode
+        stats['armed'] = self.armed
+        stats['rates'] = dict(self.rates)
+        return stats
+
+
+_STOP_POLL = 0.1  # stop verildiğinde select() en fazla bu kadar bekler
+
+
+class _FdTransport:
+    """pty ana ucu gibi ham dosya tanımlayıcısı"""
+
+    def __init__(self, fd: int, name: str):
+        self.fd = fd
+        self.name = name
+        os.set_blocking(fd, False)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read(self) -> bytes:
+        try:
+            return os.read(self.fd, 4096)
+        except (BlockingIOError, OSError):
+            return b''
+
+    def write(self, data: bytes) -> None:
+        os.write(self.fd, data)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _MavfileTransport:
+    """pymavlink bağlantısı (udpin/udpout/tcp/tcpin)"""
+
+    def __init__(self, connection, name: str):
+        self.connection = connection
+        self.name = name
+
+    def fileno(self) -> Optional[int]:
+        return getattr(self.connection, 'fd', None)
+
+    def read(self) -> bytes:
+        try:
+            return self.connection.recv() or b''
+        except (BlockingIOError, OSError):
+            return b''
+
+    def write(self, data: bytes) -> None:
+        self.connection.write(data)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def open_transport(spec: str):
+    """'pty' (Linux sanal seri port) ya da pymavlink bağlantı dizesi"""
+    if spec == 'pty':
+        import tty
+        master, slave = os.openpty()
+        tty.setraw(slave)  # Satır disiplini ikili paketleri bozmasın
+        transport = _FdTransport(master, os.ttyname(slave))
+        transport.slave = slave  # Yer istasyonu açana kadar açık tutulur
+        return transport
+    return _MavfileTransport(mavutil.mavlink_connection(spec), spec)
+
+
+def run(vehicle: SyntheticVehicle, transport, duration: Optional[float] = None,
+        report_interval: float = 5.0, stop: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """Taşıyıcıyı select() ile bekleyip araç adımlarını çalıştır; istatistikleri döndür.
+
+    duration dolunca, stop kurulunca ya da taşıyıcı kapatılınca (tanımlayıcı geçersiz) döner.
+    """
+    start = time.monotonic()
+    next_report = start + report_interval
+    fd = transport.fileno()
+    try:
+        while duration is None or time.monotonic() - start < duration:
+            if stop is not None and stop.is_set():
+                break
+            now = time.monotonic()
+            timeout = vehicle.time_until_next(now)
+            if stop is not None:
+                timeout = min(timeout, _STOP_POLL)  # select() stop ile uyandırılamaz
+            if fd is not None:
+                try:
+                    readable, _, _ = select.select([fd], [], [], timeout)
+                except (OSError, ValueError):
+                    break  # Taşıyıcı başka thread'den kapatıldı
+                if readable:
+                    data = transport.read()
+                    while data:
+                        vehicle.handle_bytes(data)
+                        data = transport.read()
+            else:
+                if stop is not None:
+                    stop.wait(timeout)
+                else:
+                    time.sleep(timeout)
+                data = transport.read()
+                if data:
+                    vehicle.handle_bytes(data)
+            now = time.monotonic()
+            vehicle.step(now)
+            if report_interval and now >= next_report:
+                next_report = now + report_interval
+                s = vehicle.stats
+                print(f"[SIM] {vehicle.mode} armed={vehicle.armed} tx={s['tx_packets']} paket "
+                      f"({s['tx_bytes'] / max(now - start, 1e-6):.0f} B/s) rx={s['rx_packets']} "
+                      f"kayıp={s['dropped']} bozuk={s['corrupted']} hata={s['tx_errors']}")
+    except KeyboardInterrupt:
+        pass
+    return vehicle.get_stats()
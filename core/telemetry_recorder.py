@@ -0,0 +1,114 @@
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+from pymavlink import mavutil
+
+# MAV_STATE kodu -> kısa ad ('ACTIVE', 'STANDBY', ...)
+_MAV_STATES = {value: entry.name.replace('MAV_STATE_', '')
+               for value, entry in mavutil.mavlink.enums['MAV_STATE'].items()
+               if entry.name.startswith('MAV_STATE_') and entry.name != 'MAV_STATE_ENUM_END'}
+
+
+class TelemetryRecorder:
+    """MAVLink dağıtım katmanından her örneği kaynak hızında DataLogger'a yazan kaydedici.
+
+    Arayüz çerçevesine (birleştirilmiş, kısmi sözlükler) değil doğrudan mesaj
+    aboneliğine bağlanır: her mesaj kendi alanlarını günceller ve tüm sütunların
+    son değerleriyle bir satır yazılır (geniş, zamana hizalı tablo). Satırda aracın
+    zamanı (time_boot_ms, mesajda varsa), GCS monotonik alım zamanı (mesajın
+    geldiği batch'in select dönüşü, bkz. MAVLinkThread.rx_time) ve satırı üreten
+    mesaj tipi bulunur. Yalnızca thread'in zaten abone olduğu mesajlar
+    dinlenir; araçtan istenen yayınlar değişmez.
+    """
+
+    def __init__(self, thread, logger):
+        self.thread = thread
+        self.logger = logger
+        self.values: Dict[str, Any] = {}
+        self.rows: Dict[str, int] = {}  # Mesaj tipi başına yazılan satır
+        self._handlers: Dict[str, Callable[[Any], None]] = {}
+        self._extractors: Dict[str, Callable[[Any], Optional[Dict[str, Any]]]] = {
+            'ATTITUDE': self._attitude,
+            'GPS_RAW_INT': self._gps_raw_int,
+            'VFR_HUD': self._vfr_hud,
+            'SYS_STATUS': self._sys_status,
+            'HEARTBEAT': self._heartbeat,
+            'RADIO_STATUS': self._radio_status,
+            'TIMESYNC': self._timesync,
+        }
+
+    def attach(self) -> None:
+        """Mesaj tiplerine abone ol (thread'in kendi işleyicilerinden sonra çalışır)"""
+        for msg_type, extract in self._extractors.items():
+            if msg_type not in self._handlers:
+                handler = self._handlers[msg_type] = self._make_handler(msg_type, extract)
+                self.thread.subscribe(msg_type, handler)
+
+    def detach(self) -> None:
+        for msg_type, handler in self._handlers.items():
+            self.thread.unsubscribe(msg_type, handler)
+        self._handlers = {}
+
+    def _make_handler(self, msg_type: str, extract) -> Callable[[Any], None]:
+        def handler(msg) -> None:
+            if not self.logger.log_file:
+                return
+            fields = extract(msg)
+            if fields is None:
+                return
+            values = self.values
+            values.update(fields)
+            values['data_loss'] = self.thread.link_stats.loss_percent
+            values['time_boot_ms'] = getattr(msg, 'time_boot_ms', '')
+            rx_time = self.thread.rx_time
+            values['rx_time'] = time.monotonic() if rx_time is None else rx_time
+            values['source'] = msg_type
+            # log_data satırı hemen kopyalar; sözlük yeniden kullanılabilir
+            self.logger.log_data(values)
+            self.rows[msg_type] = self.rows.get(msg_type, 0) + 1
+        return handler
+
+    def _from_active(self, msg) -> bool:
+        vehicle = self.thread.vehicles.get(msg.get_srcSystem())
+        return vehicle is not None and vehicle is self.thread.vehicles.active
+
+    def _attitude(self, msg) -> Optional[Dict[str, Any]]:
+        if not self._from_active(msg):
+            return None
+        return {'roll': math.degrees(msg.roll), 'pitch': math.degrees(msg.pitch), 'yaw': math.degrees(msg.yaw)}
+
+    def _gps_raw_int(self, msg) -> Optional[Dict[str, Any]]:
+        if not self._from_active(msg):
+            return None
+        return {'lat': msg.lat / 1e7, 'lon': msg.lon / 1e7, 'alt': msg.alt / 1000.0,
+                'groundspeed': msg.vel / 100.0, 'heading': msg.cog / 100.0,
+                'gps_fix': msg.fix_type, 'satellites': msg.satellites_visible}
+
+    def _vfr_hud(self, msg) -> Optional[Dict[str, Any]]:
+        if not self._from_active(msg):
+            return None
+        return {'alt': msg.alt, 'groundspeed': msg.groundspeed, 'heading': msg.heading,
+                'verticalspeed': msg.climb}
+
+    def _sys_status(self, msg) -> Optional[Dict[str, Any]]:
+        if not self._from_active(msg):
+            return None
+        return {'voltage': msg.voltage_battery / 1000.0, 'current': msg.current_battery / 100.0,
+                'battery': msg.battery_remaining}
+
+    def _heartbeat(self, msg) -> Optional[Dict[str, Any]]:
+        if not self._from_active(msg):
+            return None
+        # Mod adı thread'in heartbeat işleyicisinde (araç tipine göre) çözülmüş olur
+        return {'flight_mode': self.thread.vehicles.active.last_mode or 'UNKNOWN',
+                'system_status': _MAV_STATES.get(msg.system_status, str(msg.system_status))}
+
+    def _radio_status(self, msg) -> Optional[Dict[str, Any]]:
+        return {'rssi': msg.rssi}
+
+    def _timesync(self, msg) -> Optional[Dict[str, Any]]:
+        ping = self.thread.link_stats.ping_ms
+        if msg.tc1 == 0 or ping is None:
+            return None  # Araçtan gelen zaman eşleme isteği
+        return {'ping': ping}
@@ -0,0 +1,150 @@
+import threading
+from typing import Any, Callable, Dict, List
+
+
+class TelemetrySnapshot:
+    """Son-değer (latest-value) telemetri anlık görüntüsü.
+
+    MAVLink thread'i her mesajda ilgili kanalı yerinde günceller; arayüz tarafı
+    sabit bir hızda yalnızca son yayından bu yana değişen alanları alır. Aradaki
+    ara örnekler birleştirilir (coalesce) ve sayılır.
+    """
+
+    CHANNELS = ('telemetry', 'attitude', 'position')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[str, Any]] = {ch: {} for ch in self.CHANNELS}
+        self._dirty: Dict[str, Dict[str, Any]] = {ch: {} for ch in self.CHANNELS}
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.stats = {
+            'updates': 0,            # Toplam örnek sayısı
+            'published_frames': 0,   # Arayüze gönderilen çerçeve sayısı
+            'coalesced': 0,          # Yayınlanmadan üzerine yazılan ara değerler
+            'skipped_backlog': 0,    # Arayüz yetişemediği için atlanan yayın turları
+        }
+
+    def add_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Her örnekte (birleştirme öncesi) çağrılacak dinleyici ekle (ör. logger)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def update(self, channel: str, data: Dict[str, Any]) -> None:
+        """Kanalın son değerlerini yerinde güncelle"""
+        with self._lock:
+            values = self._values[channel]
+            dirty = self._dirty[channel]
+            for key, value in data.items():
+                if key in dirty:
+                    self.stats['coalesced'] += 1
+                dirty[key] = value
+                values[key] = value
+            self.stats['updates'] += 1
+        self.notify(channel, data)
+
+    def notify(self, channel: str, data: Dict[str, Any]) -> None:
+        """Örneği dinleyicilere ilet (her örnek kanalı)"""
+        for callback in self._listeners:
+            try:
+                callback(channel, data)
+            except Exception as e:
+                print(f"[SNAPSHOT] Dinleyici hatası: {e}")
+
+    def has_pending(self) -> bool:
+        return any(self._dirty[ch] for ch in self.CHANNELS)
+
+    def take_frame(self) -> Dict[str, Dict[str, Any]]:
+        """Son yayından bu yana değişen alanları kanal bazında döndür ve temizle"""
+        with self._lock:
+            frame = {}
+            for ch in self.CHANNELS:
+                if self._dirty[ch]:
+                    frame[ch] = self._dirty[ch]
+                    self._dirty[ch] = {}
+            if frame:
+                self.stats['published_frames'] += 1
+            return frame
+
+    def get(self, channel: str) -> Dict[str, Any]:
+        """Kanalın tüm son değerlerinin kopyası"""
+        with self._lock:
+            return dict(self._values[channel])
+
+    def clear(self) -> None:
+        with self._lock:
+            for ch in self.CHANNELS:
+                self._values[ch].clear()
+                self._dirty[ch].clear()
+
+
+class TelemetryPublisher:
+    """TelemetrySnapshot'ı sabit hızda arayüze yayınlayan zamanlayıcı.
+
+    Arayüz bir önceki çerçeveyi işlemeden yenisi gönderilmez; böylece Qt kuyruğu
+    büyümez, veriler snapshot içinde birleşmeye devam eder.
+    """
+
+    def __init__(self, snapshot: TelemetrySnapshot, rate_hz: float = 20.0, max_backlog: int = 2):
+        self.snapshot = snapshot
+        self.max_backlog = max_backlog
+        self.published_seq = 0
+        self.consumed_seq = 0
+        self._next_publish = 0.0
+        self.set_rate(rate_hz)
+
+    def set_rate(self, rate_hz: float) -> None:
+        """Yayın hızını ayarla; 0 veya negatif değer birleştirmeyi kapatır"""
+        self.rate_hz = float(rate_hz)
+        self.interval = 1.0 / self.rate_hz if self.rate_hz > 0 else 0.0
+        self._next_publish = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_hz > 0
+
+    @property
+    def backlog(self) -> int:
+        return self.published_seq - self.consumed_seq
+
+    def time_until_next(self, now: float) -> float:
+        """Bir sonraki yayına kalan süre (okuma döngüsünün bekleme süresi için)"""
+        if not self.enabled or not self.snapshot.has_pending():
+            return float('inf')
+        return max(0.0, self._next_publish - now)
+
+    def poll(self, now: float):
+        """Yayın zamanı geldiyse (seq, frame) döndür, aksi halde None"""
+        if not self.enabled or now < self._next_publish:
+            return None
+        if self.backlog >= self.max_backlog:
+            self.snapshot.stats['skipped_backlog'] += 1
+            self._next_publish = now + self.interval
+            return None
+        frame = self.snapshot.take_frame()
+        if not frame:
+            return None
+        self._next_publish = now + self.interval
+        self.published_seq += 1
+        frame['seq'] = self.published_seq
+        return self.published_seq, frame
+
+    def mark_consumed(self, seq: int) -> None:
+        """Arayüz çerçeveyi işlediğinde çağrılır"""
+        if seq > self.consumed_seq:
+            self.consumed_seq = seq
+
+    def reset(self) -> None:
+        self.published_seq = 0
+        self.consumed_seq = 0
+        self._next_publish = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.snapshot.stats)
+        stats['rate_hz'] = self.rate_hz
+        stats['backlog'] = self.backlog
+        stats['published_seq'] = self.published_seq
+        return stats
@@ -0,0 +1,155 @@
+import mmap
+import struct
+import time
+from typing import Iterator, Optional, Tuple
+
+from pymavlink import mavutil
+
+_TIMESTAMP = struct.Struct('>Q')
+_STX_V1 = 0xFE
+_STX_V2 = 0xFD
+
+
+def iter_tlog(data) -> Iterator[Tuple[float, bytes]]:
+    """.tlog içeriğinden (zaman damgası s, ham paket) çiftleri üret.
+
+    Bozuk bölgede bir bayt kaydırarak yeniden eşlenir.
+    """
+    pos = 0
+    end = len(data)
+    while pos + 8 + 2 < end:
+        stx = data[pos + 8]
+        length = data[pos + 9]
+        if stx == _STX_V1:
+            size = length + 8
+        elif stx == _STX_V2 and pos + 10 < end:
+            size = length + 12 + (13 if data[pos + 10] & 0x01 else 0)
+        else:
+            pos += 1
+            continue
+        if pos + 8 + size > end:
+            break  # Yarım kalmış son paket
+        usec = _TIMESTAMP.unpack_from(data, pos)[0]
+        yield usec * 1e-6, data[pos + 8:pos + 8 + size]
+        pos += 8 + size
+
+
+class TlogReplayConnection(mavutil.mavfile):
+    """.tlog dosyasını canlı bağlantı gibi sunan pymavlink bağlantısı.
+
+    recv() zamanı gelmiş paketlerin ham baytlarını döndürür; böylece
+    MAVLinkThread'in LinkReader -> parse_buffer -> dispatch yolu aynen çalışır.
+    speed > 0 ise kayıttaki zamanlamanın N katı hızda, 0 ise olabildiğince hızlı
+    oynatılır. Giden paketler (komutlar, hız istekleri) atılır.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self._file = open(path, 'rb')
+        try:
+            # Uzun uçuş kayıtları belleğe kopyalanmadan okunur
+            data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            data = b''  # Boş dosya
+        self._data = data
+        self._frames = iter_tlog(data)
+        self._next: Optional[Tuple[float, bytes]] = None
+        self.path = path
+        self.file_bytes = len(data)
+        self.speed = float(speed)
+        self.paused = False
+        self.finished = False
+        self.stats = {'packets': 0, 'bytes': 0, 'discarded_writes': 0}
+        self._log_start: Optional[float] = None  # Kayıttaki ilk zaman damgası
+        self._wall_start: Optional[float] = None
+        self.started = None
+        self.ended = None
+        mavutil.mavfile.__init__(self, None, path, source_system=255, source_component=0)
+
+    def _peek(self) -> Optional[Tuple[float, bytes]]:
+        if self._next is None and not self.finished:
+            self._next = next(self._frames, None)
+            if self._next is None:
+                self.finished = True
+                self.ended = time.monotonic()
+        return self._next
+
+    def _due(self, timestamp: float, now: float) -> float:
+        """Paketin oynatılacağı monotonik zaman"""
+        if self._log_start is None:
+            self._log_start = timestamp
+            self._wall_start = now
+            if self.started is None:
+                self.started = now
+        if self.speed <= 0:
+            return now
+        return self._wall_start + (timestamp - self._log_start) / self.speed
+
+    def set_speed(self, speed: float) -> None:
+        """Hızı değiştir; zamanlama o anki konumdan devam eder"""
+        self.speed = float(speed)
+        self._log_start = None  # Bir sonraki pakette yeniden eşle
+
+    def set_paused(self, paused: bool) -> None:
+        self.paused = paused
+        if not paused:
+            self._log_start = None
+
+    def stop(self) -> None:
+        """Oynatmayı sonlandır (okuma thread'i bir sonraki turda bitişi görür)"""
+        if not self.finished:
+            self.finished = True
+            self.ended = time.monotonic()
+
+    def time_until_ready(self) -> float:
+        """Bir sonraki paketin zamanına kalan süre (LinkReader.wait için)"""
+        if self.paused or self.finished:
+            return float('inf')
+        frame = self._peek()
+        if frame is None:
+            return float('inf')
+        now = time.monotonic()
+        return max(0.0, self._due(frame[0], now) - now)
+
+    def recv(self, n=None):
+        """Zamanı gelmiş paketleri en fazla n bayt olacak şekilde döndür"""
+        if self.paused:
+            return b''
+        limit = n or 4096
+        now = time.monotonic()
+        chunks = []
+        size = 0
+        while size < limit:
+            frame = self._peek()
+            if frame is None or self._due(frame[0], now) > now:
+                break
+            self._next = None
+            chunks.append(frame[1])
+            size += len(frame[1])
+            self.stats['packets'] += 1
+        self.stats['bytes'] += size
+        return b''.join(chunks)
+
+    def select(self, timeout):
+        wait = min(timeout, self.time_until_ready())
+        if wait > 0:
+            time.sleep(wait)
+        return not self.finished
+
+    def write(self, buf):
+        self.stats['discarded_writes'] += 1
+
+    def close(self):
+        self.finished = True
+        self._frames = iter(())
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        elapsed = ((self.ended or time.monotonic()) - self.started) if self.started else 0.0
+        stats['elapsed'] = elapsed
+        stats['packets_per_s'] = stats['packets'] / elapsed if elapsed > 0 else 0.0
+        stats['speed'] = self.speed
+        stats['finished'] = self.finished
+        return stats
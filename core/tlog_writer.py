@@ -0,0 +1,128 @@
+import os
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+_TIMESTAMP = struct.Struct('>Q')  # .tlog: paket başına 8 bayt big-endian µs zaman damgası
+
+
+def default_tlog_path(directory: str = '') -> str:
+    """DataLogger ile aynı adlandırma: flight_log_<zaman>.tlog"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(directory, f"flight_log_{timestamp}.tlog")
+
+
+class TlogWriter:
+    """Alınan her MAVLink paketini ham .tlog olarak yazan arka plan thread'i.
+
+    Alım döngüsü record() ile yalnızca batch'i (mesaj listesi ve zaman) deque'ye
+    ekler; deque append/popleft işlemleri kilitsizdir. Paket baytlarının
+    çıkarılması, dosyaya yazma ve periyodik fsync yazıcı thread'inde yapılır.
+    Dosya Mission Planner / pymavlink ile açılabilir ve tekrar oynatılabilir.
+    """
+
+    FLUSH_INTERVAL = 0.2        # Yazıcı thread'inin uyanma aralığı (s)
+    FSYNC_INTERVAL = 2.0        # Diske zorla yazma aralığı (s)
+    MAX_PENDING_BATCHES = 20000  # Disk takılırsa bellek sınırı (aşan batch'ler düşürülür)
+
+    def __init__(self, path: str, fsync_interval: Optional[float] = None):
+        self.path = path
+        self.fsync_interval = self.FSYNC_INTERVAL if fsync_interval is None else fsync_interval
+        self._queue: Deque[Tuple[float, List[Any]]] = deque()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._last_fsync = 0.0
+        self.stats = {'packets': 0, 'bytes': 0, 'batches': 0, 'dropped_batches': 0,
+                      'max_pending': 0, 'fsyncs': 0, 'write_time': 0.0, 'errors': 0}
+
+    def start(self) -> None:
+        self._file = open(self.path, 'ab')
+        self._running = True
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='TlogWriter', daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def record(self, messages: List[Any], timestamp: Optional[float] = None) -> None:
+        """Alınan batch'i kuyruğa ekle (alım döngüsünden çağrılır, dosyaya dokunmaz)"""
+        if not messages or not self._running:
+            return
+        if len(self._queue) >= self.MAX_PENDING_BATCHES:
+            self.stats['dropped_batches'] += 1
+            return
+        self._queue.append((time.time() if timestamp is None else timestamp, messages))
+
+    def _run(self) -> None:
+        while self._running:
+            self._wake.wait(self.FLUSH_INTERVAL)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        pending = len(self._queue)
+        if pending > self.stats['max_pending']:
+            self.stats['max_pending'] = pending
+        if pending:
+            t0 = time.perf_counter()
+            chunks: List[bytes] = []
+            packets = 0
+            for _ in range(pending):
+                timestamp, messages = self._queue.popleft()
+                stamp = _TIMESTAMP.pack(int(timestamp * 1e6))
+                for msg in messages:
+                    if msg.get_type() == 'BAD_DATA':
+                        continue
+                    chunks.append(stamp)
+                    chunks.append(msg.get_msgbuf())
+                    packets += 1
+            data = b''.join(chunks)
+            try:
+                self._file.write(data)
+                self._file.flush()
+            except (OSError, ValueError) as e:
+                self.stats['errors'] += 1
+                print(f"[TLOG] Yazma hatası: {e}")
+                return
+            self.stats['packets'] += packets
+            self.stats['bytes'] += len(data)
+            self.stats['batches'] += pending
+            self.stats['write_time'] += time.perf_counter() - t0
+        now = time.monotonic()
+        if now - self._last_fsync >= self.fsync_interval:
+            self._fsync()
+            self._last_fsync = now
+
+    def _fsync(self) -> None:
+        try:
+            os.fsync(self._file.fileno())
+            self.stats['fsyncs'] += 1
+        except (OSError, ValueError):
+            self.stats['errors'] += 1
+
+    def stop(self) -> None:
+        """Kuyruktakileri yaz, diske zorla yaz ve dosyayı kapat"""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        if self._file is not None:
+            self._fsync()
+            self._file.close()
+            self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['path'] = self.path
+        stats['pending'] = len(self._queue)
+        return stats
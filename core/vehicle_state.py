@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pymavlink import mavutil
+
+from core.telemetry_snapshot import TelemetrySnapshot
+from core.flight_modes import DEFAULT_FAMILY, vehicle_family
+from core.flight_modes import mode_name as custom_mode_name
+
+
+class VehicleState:
+    """Tek bir aracın (sysid) durumu, komut hedefi ve son-değer telemetrisi"""
+
+    def __init__(self, sysid: int, compid: int):
+        self.sysid = sysid
+        self.compid = compid  # Komut hedefi bileşeni (heartbeat gönderen otopilot)
+        self.vehicle_type = None  # HEARTBEAT.type (MAV_TYPE)
+        self.autopilot = None
+        self.mode_family = DEFAULT_FAMILY
+        self.armed = False
+        self.last_mode: Optional[str] = None
+        self.last_lat: Optional[float] = None
+        self.last_lon: Optional[float] = None
+        self.last_heartbeat: Optional[float] = None
+        self.snapshot = TelemetrySnapshot()
+
+    def update_heartbeat(self, msg, now: float) -> str:
+        """HEARTBEAT ile ARM durumu ve uçuş modunu güncelle; mod adını döndür"""
+        self.last_heartbeat = now
+        self.autopilot = msg.autopilot
+        if msg.type != self.vehicle_type:
+            self.vehicle_type = msg.type
+            self.mode_family = vehicle_family(msg.type)
+        self.armed = bool(msg.base_mode & mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED)
+        self.last_mode = custom_mode_name(self.mode_family, msg.custom_mode)
+        return self.last_mode
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Harita/panel için özet (konum, mod, ARM, son heartbeat'ten beri geçen süre)"""
+        now = time.time() if now is None else now
+        position = self.snapshot.get('position')
+        return {
+            'sysid': self.sysid,
+            'compid': self.compid,
+            'mode': self.last_mode or 'UNKNOWN',
+            'armed': self.armed,
+            'lat': position.get('lat'),
+            'lon': position.get('lon'),
+            'alt': position.get('alt'),
+            'heading': position.get('heading', 0),
+            'age': now - self.last_heartbeat if self.last_heartbeat else None,
+        }
+
+
+class VehicleRegistry:
+    """Bağlantı üzerindeki araçlar (sysid -> VehicleState).
+
+    Alım yolunda yalnızca sözlük araması yapılır (get); ekleme kilitle korunur.
+    İlk görülen araç otomatik olarak aktif araç olur. Araç görülmeden önce
+    active, sysid'si 0 olan yer tutucu bir durumdur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vehicles: Dict[int, VehicleState] = {}
+        self._placeholder = VehicleState(0, 0)
+        self.active: VehicleState = self._placeholder
+
+    @property
+    def active_sysid(self) -> Optional[int]:
+        return self.active.sysid if self.active is not self._placeholder else None
+
+    def get(self, sysid: int) -> Optional[VehicleState]:
+        return self._vehicles.get(sysid)
+
+    def add(self, sysid: int, compid: int) -> VehicleState:
+        with self._lock:
+            vehicle = self._vehicles.get(sysid)
+            if vehicle is None:
+                vehicle = VehicleState(sysid, compid)
+                # Kopyala-değiştir: okuyucular kilitsiz get() yapabilsin
+                vehicles = dict(self._vehicles)
+                vehicles[sysid] = vehicle
+                self._vehicles = vehicles
+                if self.active is self._placeholder:
+                    self.active = vehicle
+            return vehicle
+
+    def select(self, sysid: int) -> Optional[VehicleState]:
+        vehicle = self._vehicles.get(sysid)
+        if vehicle is not None:
+            self.active = vehicle
+        return vehicle
+
+    def sysids(self) -> List[int]:
+        return sorted(self._vehicles)
+
+    def __len__(self) -> int:
+        return len(self._vehicles)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        active = self.active
+        result = []
+        for sysid in self.sysids():
+            vehicle = self._vehicles[sysid]
+            summary = vehicle.summary(now)
+            summary['active'] = vehicle is active
+            result.append(summary)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vehicles = {}
+            self._placeholder = VehicleState(0, 0)
+            self.active = self._placeholder
@@ -1,12 +1,11 @@
 import cv2
 import time
-from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtGui import QImage
+from core.event_bus import Signal, Worker
 
-class VideoReplayThread(QThread):
-    frame_ready = pyqtSignal(bytes, int, int)
-    finished = pyqtSignal()
-    error_occurred = pyqtSignal(str)
+class VideoReplayThread(Worker):
+    frame_ready = Signal(bytes, int, int)
+    finished = Signal()
+    error_occurred = Signal(str)
 
     def __init__(self, video_path, speed=1.0, parent=None):
         super().__init__(parent)
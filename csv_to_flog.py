@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+DataLogger CSV kayıtlarını sütunlu ikili kayda (.flog) çevirir ve geri okuyarak doğrular.
+
+Örnekler:
+  python csv_to_flog.py flight_log_20250101_120000.csv
+  python csv_to_flog.py kayit.csv --out kayit.flog --block-rows 8192
+"""
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.columnar_log import convert_csv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CSV -> sütunlu uçuş kaydı (.flog) dönüştürücü')
+    parser.add_argument('files', nargs='+', help='DataLogger CSV dosyaları (.csv ya da akışlı sıkıştırılmış .csv.gz)')
+    parser.add_argument('--out', help='Çıkış dosyası (tek giriş için); varsayılan aynı ad .flog')
+    parser.add_argument('--block-rows', type=int, default=4096, help='Blok başına satır')
+    args = parser.parse_args(argv)
+    if args.out and len(args.files) > 1:
+        parser.error('--out yalnızca tek dosyayla kullanılabilir')
+
+    failed = 0
+    for path in args.files:
+        if not os.path.isfile(path):
+            print(f'CSV dosyası bulunamadı: {path}')
+            failed += 1
+            continue
+        try:
+            result = convert_csv(path, args.out, block_rows=args.block_rows)
+        except (OSError, ValueError) as e:
+            print(f'{path}: dönüştürülemedi: {e}')
+            failed += 1
+            continue
+        ratio = result['bytes'] / result['csv_bytes'] if result['csv_bytes'] else 0.0
+        promoted = [name for name, kind in result['columns'].items() if kind != 'f4']
+        print(f"{path} -> {result['path']}: {result['rows']} satır, "
+              f"{result['csv_bytes']} -> {result['bytes']} bayt ({ratio:.0%}), "
+              f"f8/enum sütunlar: {', '.join(promoted)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Ekransız (Qt'siz) yer istasyonu çekirdeği: companion bilgisayar, CI ölçümleri ve sunucu tarafı röle için.
+
+Örnekler:
+  python headless.py /dev/ttyUSB0 --baud 57600 --log
+  python headless.py auto --serve 127.0.0.1:15000 --forward udpout:10.0.0.5:14550
+  python headless.py udpin:0.0.0.0:14550 --duration 600 --report 10
+
+--serve adresine her telemetri çerçevesi tek satırlık JSON olarak (UDP) gönderilir;
+--forward ham MAVLink paketlerini başka yer istasyonlarına iletir (çift yönlü).
+"""
+import argparse
+import signal
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.headless import HeadlessGCS, parse_address
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ekransız MAVLink yer istasyonu')
+    parser.add_argument('link', nargs='?', default='auto',
+                        help="Seri port, pymavlink bağlantı dizesi (udpin:0.0.0.0:14550) ya da 'auto'")
+    parser.add_argument('--baud', type=int, default=57600, help='Seri baud hızı; 0 otomatik algılar')
+    parser.add_argument('--log', action='store_true', help='CSV telemetri kaydı (flight_log_*.csv)')
+    parser.add_argument('--log-format', choices=['csv', 'columnar'], default='csv',
+                        help='Telemetri kayıt biçimi; columnar tipli sütun blokları (.flog) yazar')
+    parser.add_argument('--compress', choices=['gzip'], help='Kayıtları yazarken akış halinde sıkıştır (.gz)')
+    parser.add_argument('--rotate-mb', type=float, help='Kayıt parçası bu boyutu (MB) aşınca yeni dosyaya geç')
+    parser.add_argument('--rotate-min', type=float, help='Kayıt parçası bu süreyi (dk) aşınca yeni dosyaya geç')
+    parser.add_argument('--journal', action='store_true',
+                        help='Çökmeye dayanıklı kayıt: CRC\'li segmentler, açılışta yarım oturum kurtarılır (yalnızca CSV)')
+    parser.add_argument('--no-tlog', action='store_true', help='Ham .tlog kaydını kapat')
+    parser.add_argument('--tlog-dir', default='', help='.tlog dizini')
+    parser.add_argument('--serve', metavar='HOST:PORT', help='Telemetri çerçevelerini JSON olarak UDP ile yayınla')
+    parser.add_argument('--forward', action='append', metavar='BAĞLANTI',
+                        help='MAVLink yönlendirme ucu (udpout:..., tcpin:...), tekrarlanabilir')
+    parser.add_argument('--rate', type=float, default=10.0, help='Telemetri çerçeve hızı (Hz)')
+    parser.add_argument('--no-reconnect', action='store_true', help='Kopunca yeniden bağlanma')
+    parser.add_argument('--process', action='store_true',
+                        help='Port G/Ç, çözme ve .tlog kaydını ayrı süreçte çalıştır (ortak bellek halkası)')
+    parser.add_argument('--process-rate', type=float, default=0.0,
+                        help='--process ile yüksek hızlı telemetriyi ana sürece bu hızda (Hz) ilet; 0 hepsini iletir')
+    parser.add_argument('--duration', type=float, help='Çalışma süresi (s); verilmezse Ctrl+C ile durur')
+    parser.add_argument('--report', type=float, default=5.0, help='Durum yazdırma aralığı (s), 0 kapatır')
+    args = parser.parse_args(argv)
+
+    gcs = HeadlessGCS(log_csv=args.log, serve=parse_address(args.serve) if args.serve else None,
+                      log_format=args.log_format, compress=args.compress,
+                      rotate_bytes=int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None,
+                      rotate_interval=args.rotate_min * 60.0 if args.rotate_min else None,
+                      journal=args.journal)
+    thread = gcs.thread
+    thread.tlog_enabled = not args.no_tlog
+    thread.tlog_directory = args.tlog_dir
+    thread.telemetry_publisher.set_rate(args.rate)
+    thread.link_process = args.process
+    thread.link_process_rate = args.process_rate
+    for spec in args.forward or []:
+        thread.add_router_endpoint(spec)
+
+    signal.signal(signal.SIGTERM, lambda *_: gcs.stop())
+    if not gcs.start(args.link, args.baud, auto_reconnect=not args.no_reconnect):
+        print(f"[HEADLESS] Bağlantı kurulamadı: {args.link}")
+        gcs.stop()
+        return 1
+    print(f"[HEADLESS] Çalışıyor: {args.link}" + (f", yayın {args.serve}" if args.serve else ''))
+    try:
+        gcs.run(args.duration, args.report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gcs.stop()
+    print(f"[HEADLESS] Bitti: {gcs.frames} çerçeve, {thread.get_link_stats()['received']} paket")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import sys
 import os
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 
 from ui.main_window import LaggerGCS
+from ui.qt_bridge import install_qt_executor
 from ui.theme import apply_theme
 
 os.environ['QT_OPENGL'] = 'software'
@@ -22,6 +24,8 @@ sys.excepthook = log_uncaught_exceptions
 def main():
     """Ana uygulama giriş noktası."""
     app = QApplication(sys.argv)
+    # Çekirdek olay yolu aboneleri (sinyal slotları) arayüz thread'inde çalışsın
+    install_qt_executor(app)
     
     # Uygulama temasını uygula
     apply_theme(app)
@@ -34,4 +38,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == '__main__':  
+    multiprocessing.freeze_support()  # Paketlenmiş uygulamada bağlantı süreci (spawn) için
     main()      
\ No newline at end of file
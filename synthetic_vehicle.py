@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Donanımsız yük ve dayanıklılık testi için sentetik MAVLink aracı.
+
+Örnekler:
+  python synthetic_vehicle.py pty --stream ATTITUDE=100 --stream GPS_RAW_INT=10
+  python synthetic_vehicle.py udpout:127.0.0.1:14550 --loss 0.02 --corrupt 0.001
+  python synthetic_vehicle.py pty --burst 5:0.5 --params 800 --airborne --duration 3600
+
+pty modunda yazdırılan /dev/pts/N yolu GCS'de seri port olarak açılır.
+"""
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from core.synthetic_vehicle import DEFAULT_STREAMS, SyntheticVehicle, open_transport, run
+
+
+def parse_streams(values):
+    streams = dict(DEFAULT_STREAMS)
+    for value in values or []:
+        name, _, rate = value.partition('=')
+        streams[name.strip().upper()] = float(rate)
+    return streams
+
+
+def parse_burst(value):
+    if not value:
+        return 0.0, 0.0
+    interval, _, length = value.partition(':')
+    return float(interval), float(length or 0.5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sentetik MAVLink aracı')
+    parser.add_argument('link', nargs='?', default='pty',
+                        help="'pty' ya da pymavlink bağlantı dizesi (udpout:127.0.0.1:14550, tcpin:0.0.0.0:5760)")
+    parser.add_argument('--sysid', type=int, default=1)
+    parser.add_argument('--compid', type=int, default=1)
+    parser.add_argument('--type', choices=['plane', 'copter', 'rover'], default='plane')
+    parser.add_argument('--home', default='40.0,29.0,100.0', help='enlem,boylam,irtifa')
+    parser.add_argument('--stream', action='append', metavar='MESAJ=HZ',
+                        help='Yayın hızı (ör. ATTITUDE=100); 0 kapatır, tekrarlanabilir')
+    parser.add_argument('--fixed-rates', action='store_true',
+                        help='GCS hız isteklerini (SET_MESSAGE_INTERVAL / REQUEST_DATA_STREAM) yok say')
+    parser.add_argument('--no-message-interval', action='store_true',
+                        help='SET_MESSAGE_INTERVAL UNSUPPORTED döner (REQUEST_DATA_STREAM fallback testi)')
+    parser.add_argument('--hash-check', action='store_true', help='_HASH_CHECK parametresini yanıtla (PX4 gibi)')
+    parser.add_argument('--params', type=int, default=0, help='Eklenecek sahte parametre sayısı')
+    parser.add_argument('--loss', type=float, default=0.0, help='Paket kaybı olasılığı (0-1)')
+    parser.add_argument('--corrupt', type=float, default=0.0, help='Paket bozulma olasılığı (0-1)')
+    parser.add_argument('--burst', metavar='ARALIK:SÜRE',
+                        help='Her ARALIK saniyede SÜRE saniye paketleri tutup tek seferde gönder')
+    parser.add_argument('--airborne', action='store_true', help='ARM edilmiş ve 100 m\'de başla')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--duration', type=float, help='Çalışma süresi (s); verilmezse Ctrl+C ile durur')
+    parser.add_argument('--report', type=float, default=5.0, help='İstatistik yazdırma aralığı (s)')
+    args = parser.parse_args(argv)
+
+    mav_types = {'plane': mavutil.mavlink.MAV_TYPE_FIXED_WING,
+                 'copter': mavutil.mavlink.MAV_TYPE_QUADROTOR,
+                 'rover': mavutil.mavlink.MAV_TYPE_GROUND_ROVER}
+    home = tuple(float(v) for v in args.home.split(','))
+    burst_interval, burst_length = parse_burst(args.burst)
+
+    transport = open_transport(args.link)
+    vehicle = SyntheticVehicle(transport.write, sysid=args.sysid, compid=args.compid,
+                               mav_type=mav_types[args.type], home=home,
+                               streams=parse_streams(args.stream), extra_params=args.params,
+                               loss=args.loss, corrupt=args.corrupt,
+                               burst_interval=burst_interval, burst_length=burst_length,
+                               honor_rate_requests=not args.fixed_rates,
+                               message_interval=not args.no_message_interval,
+                               hash_check=args.hash_check, airborne=args.airborne, seed=args.seed)
+    print(f"[SIM] Araç sysid={args.sysid} ({args.type}) bağlantı: {transport.name}")
+    try:
+        stats = run(vehicle, transport, duration=args.duration, report_interval=args.report)
+    finally:
+        transport.close()
+    print(f"[SIM] Bitti: {stats}")
+
+
+if __name__ == '__main__':
+    main()
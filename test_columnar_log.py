@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Sütunlu ikili uçuş kaydı testleri: zaman dizini, çökme sonrası kurtarma, CSV'den kayıpsız dönüşüm
+"""
+import sys
+import os
+import csv
+import math
+import tempfile
+import unittest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.columnar_log import ColumnarLogReader, ColumnarLogWriter, convert_csv, is_columnar_log
+from core.data_logger import CSV_HEADERS, DataLogger
+from core.log_replay_thread import LogReplayThread
+
+
+def _row(i):
+    return [i * 0.1, 40.0 + i * 1e-7, 29.0, float(i), 1.5, 0.0, 90.0, 0.1, 0.2, 0.3,
+            12.5, 3.0, 80, -60, 20, 0.0, 3, 12, 'ACTIVE', 'AUTO' if i % 2 else 'GUIDED']
+
+
+def test_time_index_and_recovery():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'log.flog')
+        writer = ColumnarLogWriter(path, block_rows=100)
+        writer.append_many(_row(i) for i in range(1000))
+        writer.close()
+        reader = ColumnarLogReader(path)
+        try:
+            assert not reader.recovered and len(reader) == 1000 and len(reader.blocks) == 10
+            assert reader.time_range() == (0.0, 99.9)
+            assert len(reader.blocks_between(25.0, 35.0)) == 2  # Yalnızca örtüşen bloklar
+            rows = list(reader.rows(25.0, 26.0))
+            assert [r['alt'] for r in rows] == [float(i) for i in range(250, 261)]
+            assert rows[0]['lat'] == 40.0 + 250 * 1e-7 and rows[1]['flight_mode'] == 'AUTO'
+        finally:
+            reader.close()
+
+        # Kapanmadan kesilen dosya: dizin yok, tamamlanmış bloklar taranarak kurtarılır
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        reader = ColumnarLogReader(path)
+        try:
+            assert reader.recovered and 0 < len(reader) < 1000 and len(reader) % 100 == 0
+            assert list(reader.column('alt'))[-1] == float(len(reader) - 1)
+        finally:
+            reader.close()
+
+
+def test_read_time_slice_outlives_reader():
+    if np is None:
+        raise unittest.SkipTest("numpy yok")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'log.flog')
+        writer = ColumnarLogWriter(path, block_rows=100)
+        writer.append_many(_row(i) for i in range(1000))
+        writer.close()
+        reader = ColumnarLogReader(path)
+        single = reader.read(['alt'], None, 9.95)  # Tek bloğun tamamı: dilimleme kopyası yok
+        several = reader.read(['alt', 'flight_mode'], 25.0, 45.0)
+        whole = reader.read(['alt'])
+        reader.close()  # Sonuçlar eşlenmiş belleğe bağlı değil
+        assert list(single['alt']) == [float(i) for i in range(100)] and single['time'][-1] == 9.9
+        assert len(several['alt']) == 201 and several['alt'][-1] == 450.0
+        assert reader.decode_enum('flight_mode', several['flight_mode'][:2]) == ['GUIDED', 'AUTO']
+        assert len(whole['alt']) == 1000 and whole['time'][-1] == 99.9
+
+
+def test_convert_csv_lossless():
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'flight.csv')
+        with open(csv_path, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(CSV_HEADERS)
+            for i in range(500):
+                row = _row(i)
+                row[0] = f"{row[0]:.3f}"
+                row[13] = 'N/A' if i == 7 else row[13]  # Sayı olmayan metin -> enum
+                row[15] = '' if i % 3 else 0.25
+                w.writerow(row)
+        result = convert_csv(csv_path, block_rows=64)
+        assert result['rows'] == 500 and result['bytes'] > 0
+        assert result['columns']['lat'] == 'f8' and result['columns']['alt'] == 'f4'
+        assert result['columns']['rssi'] == 'enum' and result['columns']['flight_mode'] == 'enum'
+        assert is_columnar_log(result['path']) and not is_columnar_log(csv_path)
+        reader = ColumnarLogReader(result['path'])
+        try:
+            view = reader.csv_rows()
+            assert view[7]['RSSI'] == 'N/A' and view[8]['RSSI'] == '-60'
+            assert view[1]['Data Loss'] == '' and view[3]['Data Loss'] == 0.25
+            assert view[499]['Timestamp'] == 49.9 and view[499]['Flight Mode'] == 'AUTO'
+            assert math.isnan(reader.column('data_loss')[1])
+        finally:
+            reader.close()
+
+
+def test_data_logger_columnar_backend_and_replay():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(directory=directory, log_format='columnar')
+        assert logger.start_logging()
+        for i in range(3000):
+            logger.log_data({'lat': 40.5, 'alt': i, 'flight_mode': 'RTL', 'system_status': 'ACTIVE'})
+        logger.log_error("KRİTİK HATA")
+        path = logger.filename
+        assert path.endswith('.flog') and logger.stop_logging()
+        assert logger.get_stats()['rows'] == 3000
+        reader = ColumnarLogReader(path)
+        try:
+            assert len(reader) == 3000 and not reader.recovered
+            assert list(reader.column('alt'))[-1] == 2999.0
+            assert reader.decode_enum('flight_mode', reader.column('flight_mode', 0)[:1]) == ['RTL']
+            assert math.isnan(reader.column('voltage')[0])  # Eksik alan boş kalır
+        finally:
+            reader.close()
+        replay = LogReplayThread(path)
+        assert len(replay._rows) == 3000 and replay._rows[10]['Altitude'] == 10.0
+        assert replay._rows[10]['Flight Mode'] == 'RTL' and replay._rows[10]['Battery Voltage'] == ''
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Time index and recovery", test_time_index_and_recovery),
+        ("Read time slice outlives reader", test_read_time_slice_outlives_reader),
+        ("Convert CSV lossless", test_convert_csv_lossless),
+        ("DataLogger columnar backend and replay", test_data_logger_columnar_backend_and_replay),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except unittest.SkipTest as e:
+            print(f"{name}: SKIPPED {e}")
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Komut kuyruğu (COMMAND_ACK eşleştirme, yeniden deneme, zaman aşımı, geri çağrılar, görev başlatma
+zinciri) testleri
+"""
+import sys
+import os
+import threading
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from core.command_queue import CommandQueue, RESULT_TIMEOUT, RESULT_CANCELLED
+
+RELAY = mavutil.mavlink.MAV_CMD_DO_SET_RELAY
+SET_MODE = mavutil.mavlink.MAV_CMD_DO_SET_MODE
+MISSION_START = mavutil.mavlink.MAV_CMD_MISSION_START
+
+
+class FakeMav:
+    def __init__(self):
+        self.sent = []
+
+    def command_long_send(self, target_system, target_component, command, confirmation, *params):
+        self.sent.append((command, confirmation, params))
+
+
+class FakeAck:
+    def __init__(self, command, result=mavutil.mavlink.MAV_RESULT_ACCEPTED):
+        self.command = command
+        self.result = result
+
+
+def test_ack_matches_command():
+    """ACK komut kimliğiyle eşleşmeli ve gecikme kaydedilmeli"""
+    results = []
+    queue = CommandQueue(on_result=results.append)
+    mav = FakeMav()
+    relay = queue.submit(RELAY, 0, 1, name="Mıknatıs")
+    mode = queue.submit(SET_MODE, 1, 10)
+    assert queue.service(mav, 1, 1, now=0.0) == 2
+    assert mav.sent[0] == (RELAY, 0, (0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+    assert queue.handle_ack(FakeAck(SET_MODE), now=0.05)
+    assert mode.accepted and not relay.done()
+    assert abs(mode.latency - 0.05) < 1e-9
+    assert not queue.handle_ack(FakeAck(400), now=0.1)
+    assert results == [mode]
+
+
+def test_retry_increments_confirmation():
+    """ACK gelmezse confirmation artırılarak yeniden gönderilmeli, sonra zaman aşımı"""
+    queue = CommandQueue()
+    mav = FakeMav()
+    future = queue.submit(RELAY, 0, 1, timeout=0.5, retries=2)
+    now = 0.0
+    while not future.done():
+        queue.service(mav, 1, 1, now=now)
+        now += 0.5
+    assert [c for _, c, _ in mav.sent] == [0, 1, 2]
+    assert future.result == RESULT_TIMEOUT
+    assert future.attempts == 3
+    assert queue.stats['timeouts'] == 1
+
+
+def test_same_command_serialized():
+    """Aynı komut kimliği uçuştayken ikincisi sırada beklemeli"""
+    queue = CommandQueue()
+    mav = FakeMav()
+    first = queue.submit(SET_MODE, 1, 10)
+    second = queue.submit(SET_MODE, 1, 11)
+    queue.service(mav, 1, 1, now=0.0)
+    assert len(mav.sent) == 1
+    queue.handle_ack(FakeAck(SET_MODE, mavutil.mavlink.MAV_RESULT_DENIED), now=0.1)
+    assert first.done() and not first.accepted
+    queue.service(mav, 1, 1, now=0.1)
+    assert mav.sent[-1][2][1] == 11.0
+    queue.handle_ack(FakeAck(SET_MODE), now=0.2)
+    assert second.accepted
+
+
+def test_in_progress_and_cancel():
+    """IN_PROGRESS zaman aşımını uzatmalı; cancel_all bekleyenleri iptal etmeli"""
+    queue = CommandQueue()
+    mav = FakeMav()
+    future = queue.submit(RELAY, 0, 1, timeout=1.0)
+    queue.service(mav, 1, 1, now=0.0)
+    queue.handle_ack(FakeAck(RELAY, mavutil.mavlink.MAV_RESULT_IN_PROGRESS), now=0.9)
+    queue.service(mav, 1, 1, now=1.5)
+    assert len(mav.sent) == 1 and not future.done()
+    queue.cancel_all()
+    assert future.result == RESULT_CANCELLED
+    assert queue.pending() == 0
+
+
+class CompletingEvent(threading.Event):
+    """İlk is_set() kontrolünden hemen sonra başka bir thread'den sonucu yazar (yarış penceresi)"""
+
+    def __init__(self, future):
+        super().__init__()
+        self.future = future
+        self.setter = None
+
+    def is_set(self):
+        state = super().is_set()
+        if self.setter is None:
+            self.setter = threading.Thread(target=self.future._set_result,
+                                           args=(mavutil.mavlink.MAV_RESULT_ACCEPTED, 0.0))
+            self.setter.start()
+            self.setter.join(0.2)  # Kilit varsa sonuç yazımı ekleme bitene kadar bekler
+        return state
+
+
+def test_done_callback_added_during_completion():
+    """Sonuç, done kontrolü ile geri çağrı eklenmesi arasında yazılsa da geri çağrı çalışmalı"""
+    queue = CommandQueue()
+    future = queue.submit(RELAY, 0, 1)
+    future._event = CompletingEvent(future)
+    calls = []
+    future.add_done_callback(calls.append)
+    future._event.setter.join(1.0)
+    assert future.accepted and calls == [future]
+    future.add_done_callback(calls.append)  # Sonuçtan sonra eklenen hemen çağrılır
+    assert calls == [future, future]
+
+
+def test_start_mission_waits_for_mode_ack():
+    """MISSION_START, AUTO mod komutu sonuçlanmadan gönderilmemeli"""
+    from core.mavlink_thread import MAVLinkThread
+
+    for mode_result, expect_start in ((mavutil.mavlink.MAV_RESULT_ACCEPTED, True),
+                                      (mavutil.mavlink.MAV_RESULT_DENIED, True),
+                                      (None, False)):
+        thread = MAVLinkThread()
+        thread.connection = types.SimpleNamespace()
+        thread.is_connected = True
+        errors = []
+        thread._emit_error = errors.append
+        mav = FakeMav()
+        try:
+            assert thread.start_mission()
+            thread.commands.service(mav, 1, 1, now=0.0)
+            assert [c for c, _, _ in mav.sent] == [SET_MODE]
+            assert thread.commands.service(mav, 1, 1, now=0.1) == 0  # Mod ACK'i beklenir
+            if mode_result is None:
+                thread.commands.cancel_all()  # Bağlantı kapandı
+            else:
+                thread.commands.handle_ack(FakeAck(SET_MODE, mode_result), now=0.2)
+            thread.commands.service(mav, 1, 1, now=0.2)
+            assert [c for c, _, _ in mav.sent] == ([SET_MODE, MISSION_START] if expect_start else [SET_MODE])
+            assert any('AUTO moda geçilemedi' in e for e in errors) == (mode_result == mavutil.mavlink.MAV_RESULT_DENIED)
+        finally:
+            thread.bus.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("ACK matches command", test_ack_matches_command),
+        ("Retry increments confirmation", test_retry_increments_confirmation),
+        ("Same command serialized", test_same_command_serialized),
+        ("In progress and cancel", test_in_progress_and_cancel),
+        ("Done callback added during completion", test_done_callback_added_during_completion),
+        ("Start mission waits for mode ACK", test_start_mission_waits_for_mode_ack),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
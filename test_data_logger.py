@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Arka planda toplu yazan DataLogger testleri: kapanışta kayıpsızlık, kritik olayda hemen yazma, kuyruk sınırı,
+yazma hatasında kaybın sayılması
+"""
+import sys
+import os
+import csv
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.data_logger import CSV_HEADERS, DataLogger
+
+
+def test_no_loss_on_stop():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(directory=directory)
+        assert logger.start_logging() and not logger.start_logging()
+        for i in range(5000):
+            logger.log_data({'lat': 40.0, 'alt': i, 'flight_mode': 'AUTO'})
+        logger.log_action("Görev başlatıldı")
+        path, log_path = logger.filename, logger.system_log_filename
+        assert logger.stop_logging()
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == CSV_HEADERS and len(rows) == 5001
+        assert rows[-1][3] == '4999' and rows[-1][CSV_HEADERS.index('Flight Mode')] == 'AUTO'
+        with open(log_path, encoding='utf-8') as f:
+            assert f.read().endswith("[ACTION] Görev başlatıldı\n")
+        stats = logger.get_stats()
+        assert stats['rows'] == 5000 and stats['lines'] == 1 and stats['dropped'] == 0
+        assert stats['pending'] == 0 and stats['fsyncs'] >= 2 and stats['latency_max_ms'] >= 0
+        logger.log_data({'alt': 1})  # Kapalıyken yok sayılır
+        assert logger.log_file is None
+
+
+def test_error_written_immediately():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(flush_interval=30.0, directory=directory)
+        logger.start_logging()
+        try:
+            logger.log_data({'alt': 5})
+            logger.log_error("KRİTİK HATA: batarya")
+            deadline = time.monotonic() + 2.0
+            content = ''
+            while 'KRİTİK' not in content and time.monotonic() < deadline:
+                time.sleep(0.02)
+                with open(logger.system_log_filename, encoding='utf-8') as f:
+                    content = f.read()
+            assert "[ERROR] KRİTİK HATA: batarya" in content
+            assert logger.get_stats()['rows'] == 1 and logger.get_stats()['fsyncs'] >= 2
+            logger.log_data({'alt': 6})
+            assert logger.flush() and logger.get_stats()['rows'] == 2
+        finally:
+            logger.stop_logging()
+
+
+def test_bounded_queue_drops_rows_not_log_lines():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(flush_interval=30.0, fsync_interval=None, directory=directory)
+        logger.MAX_PENDING = 10
+        logger.start_logging()
+        for i in range(50):
+            logger.log_data({'alt': i})
+        logger.log_system("kuyruk dolu")
+        assert logger.get_stats()['pending'] == 11 and logger.get_stats()['dropped'] == 40
+        logger.stop_logging()
+        stats = logger.get_stats()
+        assert stats['rows'] == 10 and stats['lines'] == 1 and stats['batches'] == 1
+
+
+class _FullDisk:
+    def writerows(self, rows):
+        raise OSError(28, "No space left on device")
+
+
+def test_write_error_counts_lost_records():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(flush_interval=30.0, directory=directory)
+        logger.start_logging()
+        writer, logger._csv = logger._csv, _FullDisk()
+        for i in range(20):
+            logger.log_data({'alt': i})
+        logger.log_system("yazılamayacak")
+        t0 = time.monotonic()
+        assert logger.flush(timeout=5.0) and time.monotonic() - t0 < 2.0  # Hata turunda da uyandırılır
+        stats = logger.get_stats()
+        assert stats['dropped'] == 20 and stats['dropped_lines'] == 1 and stats['errors'] >= 1
+        assert stats['rows'] == 0 and stats['pending'] == 0
+        logger._csv = writer  # Disk yeniden yazılabilir
+        logger.log_data({'alt': 99})
+        path = logger.filename
+        logger.stop_logging()
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))
+        assert len(rows) == 2 and rows[1][3] == '99' and logger.get_stats()['rows'] == 1
+
+
+if __name__ == '__main__':
+    tests = [
+        ("No loss on stop", test_no_loss_on_stop),
+        ("Error written immediately", test_error_written_immediately),
+        ("Bounded queue drops rows, not log lines", test_bounded_queue_drops_rows_not_log_lines),
+        ("Write error counts lost records", test_write_error_counts_lost_records),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
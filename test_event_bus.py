@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Qt'siz olay yolu (sync/async/main aboneler, Signal/Worker) ve headless çekirdek testleri
+"""
+import sys
+import os
+import json
+import socket
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core import event_bus
+from core.event_bus import EventBus, Signal, Worker
+
+
+class Counter(Worker):
+    ticked = Signal(int)
+    finished = Signal()
+
+    def __init__(self, count, **kwargs):
+        super().__init__(**kwargs)
+        self.count = count
+
+    def run(self):
+        for i in range(self.count):
+            self.ticked.emit(i)
+        self.finished.emit()
+
+
+def test_sync_async_and_wildcard_subscribers():
+    bus = EventBus(queue_size=5)
+    sync_calls, async_calls, wildcard = [], [], []
+    release = threading.Event()
+
+    def slow(value):
+        release.wait(1.0)
+        async_calls.append((value, threading.current_thread().name))
+
+    bus.subscribe('telemetry', sync_calls.append)
+    bus.subscribe('telemetry', slow, mode='async')
+    bus.subscribe('mavlink.*', lambda topic, *args: wildcard.append((topic, args)))
+    for i in range(20):
+        bus.publish('telemetry', i)
+    assert sync_calls == list(range(20))  # Yavaş async abone yayıncıyı bekletmedi
+    bus.publish('mavlink.link_state', 'lost', 'timeout')
+    bus.publish('other')
+    assert wildcard == [('mavlink.link_state', ('lost', 'timeout'))]
+    release.set()
+    time.sleep(0.1)
+    stats = bus.get_stats()
+    async_stats = [s for s in stats['subscribers'] if s['mode'] == 'async'][0]
+    assert async_stats['dropped'] >= 14 and async_stats['delivered'] + async_stats['dropped'] == 20
+    assert async_calls[-1][0] == 19 and async_calls[-1][1].startswith('Bus-')
+    assert stats['unrouted'] == 1
+    bus.close()
+
+
+def test_worker_signals_and_main_executor():
+    posted = []
+    event_bus.set_main_executor(lambda fn, args: posted.append((fn, args)))
+    try:
+        worker = Counter(3)
+        ticks, direct = [], []
+        worker.ticked.connect(ticks.append)  # 'main': ana thread kuyruğuna gider
+        worker.ticked.connect(direct.append, mode='sync')
+        worker.start()
+        assert worker.wait(1000) and not worker.isRunning()
+        assert direct == [0, 1, 2] and ticks == []
+        for fn, args in posted:  # Arayüz olay döngüsünün yaptığı iş
+            fn(*args)
+        assert ticks == [0, 1, 2]
+        worker.ticked.disconnect(direct.append)
+        worker.ticked.emit(9)
+        assert direct == [0, 1, 2]
+    finally:
+        event_bus.set_main_executor(None)
+
+    shared = EventBus()
+    a, b = Counter(1, bus=shared, bus_prefix='a.'), Counter(2, bus=shared, bus_prefix='b.')
+    seen = []
+    shared.subscribe('b.ticked', seen.append)
+    a.run()
+    b.run()
+    assert seen == [0, 1]
+
+
+def test_headless_core_receives_synthetic_vehicle():
+    from core.headless import HeadlessGCS
+    from core.synthetic_vehicle import SyntheticVehicle, open_transport, run
+
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.settimeout(3.0)
+
+    transport = open_transport(f'udpout:127.0.0.1:{port}')
+    vehicle = SyntheticVehicle(transport.write, streams={'ATTITUDE': 20.0, 'SYS_STATUS': 2.0})
+    stop = threading.Event()
+    feeder = threading.Thread(target=run, args=(vehicle, transport),
+                              kwargs={'duration': 6.0, 'report_interval': 0, 'stop': stop}, daemon=True)
+    feeder.start()
+    gcs = HeadlessGCS(serve=listener.getsockname())
+    gcs.thread.tlog_enabled = False
+    gcs.thread.auto_reconnect = False
+    try:
+        assert gcs.start(f'udpin:127.0.0.1:{port}', 57600, auto_reconnect=False)
+        frame = json.loads(listener.recvfrom(65536)[0])
+        assert 'seq' in frame and ('attitude' in frame or 'telemetry' in frame or 'position' in frame)
+        deadline = time.monotonic() + 3.0
+        while gcs.frames < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert gcs.frames >= 5 and gcs.thread.telemetry_publisher.backlog <= 1
+    finally:
+        gcs.stop()
+        stop.set()
+        feeder.join(2.0)  # Taşıyıcı, besleyici select() içindeyken kapatılmaz
+        transport.close()
+        listener.close()
+    assert not feeder.is_alive()
+    assert not gcs.thread.isRunning()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Sync, async and wildcard subscribers", test_sync_async_and_wildcard_subscribers),
+        ("Worker signals and main executor", test_worker_signals_and_main_executor),
+        ("Headless core receives synthetic vehicle", test_headless_core_receives_synthetic_vehicle),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
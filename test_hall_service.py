@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Hall sensör servisi (okuyucu thread, halka tampon, debounce'lu kenar algılama) testleri
+"""
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.hall_sensor import HallSensorService, parse_hall_line
+
+
+class FakeSerial:
+    """Yazılan baytları read() ile parça parça veren seri port"""
+
+    def __init__(self):
+        self.buffer = b''
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def push(self, data: bytes):
+        with self.lock:
+            self.buffer += data
+
+    @property
+    def in_waiting(self):
+        return len(self.buffer)
+
+    def read(self, size=1):
+        if self.closed:
+            raise OSError('Port kapalı')
+        with self.lock:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        if not data:
+            time.sleep(0.005)
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+def test_parse_hall_line():
+    assert parse_hall_line('HALL:123,MAG:456\r') == (123, 456)
+    assert parse_hall_line('HALL:80') == (80, None)
+    assert parse_hall_line('HALL:x,MAG:1') is None
+    assert parse_hall_line('merhaba') is None
+
+
+def test_debounced_edges_and_ring_buffer():
+    service = HallSensorService(threshold=100, hysteresis=5, debounce=0.05, buffer_size=10)
+    edges = []
+    service.add_edge_listener(edges.append)
+    for i in range(5):
+        service.feed('HALL:200,MAG:10', now=i * 0.01)
+    assert service.state == 'high' and not edges
+
+    service.feed('HALL:20', now=0.06)  # Tek örneklik sıçrama: kenar değil
+    service.feed('HALL:200', now=0.07)
+    service.feed('HALL:98', now=0.08)  # Ölü bant
+    assert not edges and service.stats['glitches'] == 1
+
+    service.arm(now=0.09)
+    service.feed('HALL:20', now=0.10)
+    service.feed('HALL:25', now=0.13)
+    assert not service.released.is_set()
+    service.feed('HALL:22', now=0.16)
+    assert len(edges) == 1 and edges[0]['direction'] == 'falling'
+    assert edges[0]['time'] == 0.10 and abs(edges[0]['latency_ms'] - 70.0) < 1e-6
+    assert service.wait_for_release(0) is edges[0]
+
+    assert len(service.samples()) == 10  # Halka tampon taşınca eski örnekler düşer
+    assert service.samples()[-1] == (0.16, 22, 10)  # MAG gelmezse son değer korunur
+    assert [s[0] for s in service.samples(since=0.13)] == [0.13, 0.16]
+    assert service.latest() == {'hall_effect': 22, 'magnetic_field': 10}
+
+
+def test_release_confirmed_when_already_low():
+    service = HallSensorService(threshold=100, debounce=0.05)
+    service.feed('HALL:20', now=0.0)
+    assert service.state == 'low'
+    service.arm(now=1.0)  # Mıknatıs kurulmadan önce uzaklaşmıştı
+    edge = service.wait_for_release(0)
+    assert edge is not None and edge['initial'] and edge['value'] == 20 and edge['latency_ms'] == 0.0
+    assert service.stats['edges'] == 0
+
+    edges = []
+    service = HallSensorService(threshold=100, debounce=0.05)
+    service.add_edge_listener(edges.append)
+    service.arm(now=0.0)  # Henüz örnek yok
+    assert not service.released.is_set()
+    service.feed('HALL:10', now=0.2)  # İlk örnek zaten düşük
+    assert service.released.is_set() and edges == [service.release_edge]
+    assert edges[0]['initial'] and abs(edges[0]['latency_ms'] - 200.0) < 1e-6
+
+    service = HallSensorService(threshold=100, debounce=0.05)
+    service.feed('HALL:200', now=0.0)
+    service.feed('HALL:20', now=0.1)  # Düşüş kurulmadan önce başladı
+    service.arm(now=0.12)
+    assert not service.released.is_set()
+    service.feed('HALL:20', now=0.16)
+    assert service.wait_for_release(0)['time'] == 0.1 and not service.release_edge.get('initial')
+
+
+def test_reader_thread_signals_release():
+    port = FakeSerial()
+    service = HallSensorService(threshold=100, debounce=0.0, open_serial=lambda name, baud: port)
+    service.connect('COM6')
+    try:
+        assert service.connected
+        port.push(b'HALL:300,MAG:1\nHALL:30')
+        time.sleep(0.05)
+        assert service.latest()['hall_effect'] == 300 and service.state == 'high'
+        service.arm()
+        start = time.monotonic()
+        port.push(b'0,MAG:2\nHALL:10,MAG:2\n')
+        edge = service.wait_for_release(1.0)
+        assert edge is not None and edge['value'] == 10
+        assert time.monotonic() - start < 0.2
+        assert service.get_stats()['samples'] == 3
+    finally:
+        service.disconnect()
+    assert port.closed and not service.connected
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Parse hall line", test_parse_hall_line),
+        ("Debounced edges and ring buffer", test_debounced_edges_and_ring_buffer),
+        ("Release confirmed when already low", test_release_confirmed_when_already_low),
+        ("Reader thread signals release", test_reader_thread_signals_release),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
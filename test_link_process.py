@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Ayrı süreçte MAVLink G/Ç: ortak bellek halkası, snapshot ve çocuk süreç bağlantısı testleri
+"""
+import sys
+import os
+import inspect
+import socket
+import threading
+import time
+from unittest import mock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.link_process import SharedRing, SharedSnapshot, SNAPSHOT_FIELDS
+
+
+def test_shared_ring_overrun():
+    writer = SharedRing(slots=8)
+    reader = SharedRing(writer.name)
+    try:
+        assert reader.slots == 8 and reader.read() == []
+        for seq in range(5):
+            writer.append(bytes([seq]) * 10, 100.0 + seq, seq)
+        writer.set_header(0, 5)
+        records = reader.read()
+        assert [r[1][0] for r in records] == [0, 1, 2, 3, 4] and records[2][0] == 102.0
+        for seq in range(5, 25):  # Okur yetişemedi: 8 kayıttan eskisi atlanır
+            writer.append(bytes([seq]), 0.0, seq)
+        writer.set_header(0, 25)
+        records = reader.read()
+        assert [r[1][0] for r in records] == list(range(17, 25))
+        assert reader.overruns == 12 and reader.backlog() == 0
+        writer.set_header(1, 1)
+        writer.set_header(5, 77)
+        assert reader.header()[1] == 1 and reader.header()[5] == 77
+    finally:
+        reader.close()
+        writer.close()
+
+
+class _Paused(Exception):
+    pass
+
+
+def _append_until_header(ring, data, seq):
+    """Yazarı yükü yazdıktan sonra, kayıt başlığını yazmadan durdur (yazma yarıda)"""
+    lines, first = inspect.getsourcelines(SharedRing.append)
+    stop = first + next(i for i, line in enumerate(lines) if "'<dH'" in line)
+
+    def trace_line(frame, event, arg):
+        if event == 'line' and frame.f_lineno == stop:
+            raise _Paused
+        return trace_line
+
+    def trace_call(frame, event, arg):
+        return trace_line if frame.f_code is SharedRing.append.__code__ else None
+
+    previous = sys.gettrace()
+    sys.settrace(trace_call)
+    try:
+        ring.append(data, 0.0, seq)
+    except _Paused:
+        pass
+    finally:
+        sys.settrace(previous)
+
+
+def test_shared_ring_overwrite_during_read():
+    writer = SharedRing(slots=4)
+    reader = SharedRing(writer.name)
+    copy = bytes
+    overwritten = []
+
+    def overwrite_then_copy(view):
+        # Okur 0. kaydın sırasını doğruladı; yazar aynı yuvaya 4. kaydı yazmaya başladı
+        if not overwritten:
+            overwritten.append(True)
+            _append_until_header(writer, b'\x04' * 8, 4)
+        return copy(view)
+
+    try:
+        for seq in range(4):
+            writer.append(bytes([seq]) * 8, float(seq), seq)
+        writer.set_header(0, 4)
+        with mock.patch('core.link_process.bytes', overwrite_then_copy, create=True):
+            records = reader.read()
+        assert overwritten and reader.overruns == 1
+        assert records == [(float(seq), bytes([seq]) * 8) for seq in (1, 2, 3)]
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_shared_snapshot():
+    writer = SharedSnapshot()
+    reader = SharedSnapshot(writer.name)
+    try:
+        assert reader.read() == {}
+        writer.write({SNAPSHOT_FIELDS.index('roll'): 12.5, SNAPSHOT_FIELDS.index('battery'): 80.0})
+        writer.write({SNAPSHOT_FIELDS.index('battery'): 79.0})
+        assert reader.read() == {'roll': 12.5, 'battery': 79.0}
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_mavlink_thread_in_process_mode():
+    from core.mavlink_thread import MAVLinkThread
+    from core.link_process import ProcessLinkConnection
+    from core.synthetic_vehicle import SyntheticVehicle, open_transport, run
+
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    transport = open_transport(f'udpout:127.0.0.1:{port}')
+    vehicle = SyntheticVehicle(transport.write, streams={'ATTITUDE': 50.0, 'SYS_STATUS': 2.0})
+    feeder = threading.Thread(target=run, args=(vehicle, transport),
+                              kwargs={'duration': 5.0, 'report_interval': 0}, daemon=True)
+    feeder.start()
+
+    thread = MAVLinkThread()
+    thread.tlog_enabled = False
+    thread.auto_reconnect = False
+    thread.link_process = True
+    attitudes = []
+    thread.subscribe('ATTITUDE', attitudes.append)
+    try:
+        assert thread.connect(f'udpin:127.0.0.1:{port}', 57600)
+        conn = thread.connection
+        assert isinstance(conn, ProcessLinkConnection) and conn.process.pid != os.getpid()
+        thread.start()
+        deadline = time.monotonic() + 4.0
+        while len(attitudes) < 8 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(attitudes) >= 8, thread.get_link_stats().get('process')
+        snapshot = thread.get_shared_snapshot()
+        assert 'roll' in snapshot and snapshot['battery'] > 0
+        stats = thread.get_link_stats()['process']
+        assert stats['state'] == 'running' and stats['forwarded'] >= 8 and stats['ring_overruns'] == 0
+    finally:
+        thread.stop()
+        thread.wait(2000)
+        thread.bus.close()
+        feeder.join(6.0)
+        transport.close()
+    assert conn.process is None and thread.connection is None
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Shared ring overrun", test_shared_ring_overrun),
+        ("Shared ring overwrite during read", test_shared_ring_overwrite_during_read),
+        ("Shared snapshot", test_shared_snapshot),
+        ("MAVLink thread in process mode", test_mavlink_thread_in_process_mode),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Olay güdümlü MAVLink okuyucu testleri: select ile bekleme, uyandırma, toplu çözme, seri port
+fallback'i, alım anının select dönüşünden alınması ve MAVLinkThread alım modları
+"""
+import sys
+import os
+import socket
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+
+from core.link_reader import LinkReader
+
+
+def _packets(count, start=0):
+    mav = mavutil.mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    return b''.join(mav.attitude_encode(start + i, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0).pack(mav)
+                    for i in range(count))
+
+
+class SocketConnection:
+    """mavfile'ın LinkReader'ın kullandığı kısmı: fd, recv, mav, post_message"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.fd = sock.fileno()
+        self.mav = mavutil.mavlink.MAVLink(None)
+        self.posted = []
+
+    def recv(self, n=None):
+        try:
+            return self.sock.recv(n or 4096)
+        except BlockingIOError:
+            return b''
+
+    def post_message(self, msg):
+        self.posted.append(msg)
+
+
+class FakeSerialPort:
+    """select() ile beklenemeyen seri port (Windows): zaman aşımlı bloklayan okuma"""
+
+    def __init__(self, data):
+        self.data = data
+        self.timeout = 0.0
+        self.in_waiting = 0
+
+    def read(self, n):
+        chunk, self.data = self.data[:n], self.data[n:]
+        return chunk
+
+
+class SerialConnection(SocketConnection):
+    def __init__(self, data):
+        self.port = FakeSerialPort(data)
+        self.fd = None
+        self.mav = mavutil.mavlink.MAVLink(None)
+        self.posted = []
+
+    def recv(self, n=None):
+        return self.port.read(n or 4096)
+
+
+def test_wait_timeout_and_wakeup():
+    reader = LinkReader()
+    a, b = socket.socketpair()
+    a.setblocking(False)
+    try:
+        conn = SocketConnection(a)
+        assert not reader.wait(conn, 0.02)
+        assert reader.stats['wakeups'] == 1 and reader.stats['idle_wakeups'] == 1
+        threading.Timer(0.05, reader.wakeup).start()
+        start = time.monotonic()
+        assert not reader.wait(conn, 5.0)  # Kapatma: timeout beklenmeden döner
+        assert time.monotonic() - start < 1.0
+    finally:
+        reader.close()
+        a.close()
+        b.close()
+
+
+def test_batch_decode_and_ready_time():
+    reader = LinkReader()
+    a, b = socket.socketpair()
+    a.setblocking(False)
+    try:
+        conn = SocketConnection(a)
+        b.sendall(_packets(5))
+        before = time.perf_counter()
+        assert reader.wait(conn, 1.0)
+        ready = reader.ready_time
+        time.sleep(0.02)  # Okuma/çözme gecikmesi
+        messages = reader.read_batch(conn)
+        assert [m.time_boot_ms for m in messages] == [0, 1, 2, 3, 4] and conn.posted == messages
+        assert before <= ready < time.perf_counter() - 0.02
+        for _ in messages:
+            reader.record_latency(ready)
+        stats = reader.get_stats()
+        assert stats['packets'] == 5 and stats['batches'] == 1 and stats['max_batch'] == 5
+        assert stats['avg_batch'] == 5.0 and stats['latency_avg_ms'] >= 20.0  # Bekleme de gecikmeye dahil
+        assert stats['bytes'] == len(_packets(5))
+        reader.reset_stats()
+        assert reader.get_stats()['packets'] == 0
+    finally:
+        reader.close()
+        a.close()
+        b.close()
+
+
+def test_serial_fallback_keeps_first_byte():
+    data = _packets(3)
+    conn = SerialConnection(data)
+    reader = LinkReader()
+    try:
+        assert reader.wait(conn, 0.1)  # İlk bayt bloklayan okumayla alındı
+        assert reader._pending == data[:1] and conn.port.timeout == 0.0
+        assert reader.wait(conn, 0.1)  # Bekleyen bayt varken hemen döner
+        messages = reader.read_batch(conn)
+        assert len(messages) == 3 and reader.stats['bytes'] == len(data)
+        assert not reader.wait(conn, 0.01) and reader.stats['idle_wakeups'] == 1
+    finally:
+        reader.close()
+
+
+def test_mavlink_thread_rx_modes():
+    from core.mavlink_thread import MAVLinkThread
+    from core.synthetic_vehicle import SyntheticVehicle, open_transport, run
+
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    transport = open_transport(f'udpout:127.0.0.1:{port}')
+    vehicle = SyntheticVehicle(transport.write, streams={'ATTITUDE': 50.0, 'SYS_STATUS': 2.0})
+    feeder = threading.Thread(target=run, args=(vehicle, transport),
+                              kwargs={'duration': 4.0, 'report_interval': 0}, daemon=True)
+    feeder.start()
+
+    thread = MAVLinkThread()
+    thread.tlog_enabled = False
+    thread.auto_reconnect = False
+    try:
+        thread.set_rx_mode('select')
+        assert False, "geçersiz mod kabul edildi"
+    except ValueError:
+        pass
+    try:
+        assert thread.connect(f'udpin:127.0.0.1:{port}', 57600)
+        thread.start()
+        for mode in ('event', 'poll'):
+            thread.set_rx_mode(mode)
+            deadline = time.monotonic() + 2.0
+            while thread.get_rx_stats()['packets'] < 20 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            stats = thread.get_rx_stats()
+            assert stats['mode'] == mode and stats['packets'] >= 20, stats
+            assert stats['latency_avg_ms'] > 0 and stats['latency_max_ms'] >= stats['latency_avg_ms']
+            assert stats['decoder'] == thread._link_reader.decoder
+        assert thread.get_rx_stats()['max_batch'] == 1  # Eski döngü paket paket okur
+    finally:
+        thread.stop()
+        thread.wait(2000)
+        thread.bus.close()
+        feeder.join(5.0)
+        transport.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Wait timeout and wakeup", test_wait_timeout_and_wakeup),
+        ("Batch decode and ready time", test_batch_decode_and_ready_time),
+        ("Serial fallback keeps first byte", test_serial_fallback_keeps_first_byte),
+        ("MAVLink thread rx modes", test_mavlink_thread_rx_modes),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Link istatistikleri (mesaj tipi bazında hız, gecikme, kayıp paket) testleri
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.link_stats import LinkStats, LatencyHistogram
+
+
+class FakeMsg:
+    """pymavlink mesajının LinkStats'ın kullandığı kısmı"""
+
+    def __init__(self, msg_type, seq, sysid=1, compid=1, size=20):
+        self._type = msg_type
+        self._seq = seq
+        self._src = (sysid, compid)
+        self._buf = b'\x00' * size
+
+    def get_type(self):
+        return self._type
+
+    def get_seq(self):
+        return self._seq
+
+    def get_srcSystem(self):
+        return self._src[0]
+
+    def get_srcComponent(self):
+        return self._src[1]
+
+    def get_msgbuf(self):
+        return self._buf
+
+
+def test_histogram():
+    """Ortalama ve yüzdelikler kova sınırlarına göre hesaplanmalı"""
+    hist = LatencyHistogram()
+    for _ in range(90):
+        hist.add(15e-6)
+    for _ in range(10):
+        hist.add(3e-3)
+    summary = hist.summary()
+    assert summary['count'] == 100
+    assert summary['p50_us'] == 20
+    assert summary['p95_us'] == 5000
+    assert abs(summary['max_us'] - 3000) < 1e-6
+
+
+def test_sequence_gaps():
+    """Sequence boşlukları kaynak bazında kayıp olarak sayılmalı (255 -> 0 sarması dahil)"""
+    stats = LinkStats()
+    seqs = [250, 251, 253, 255, 0, 4]
+    stats.record_batch([FakeMsg('ATTITUDE', s) for s in seqs], 0.0)
+    # Başka bir bileşenin sayaçları ayrı tutulur
+    stats.record_batch([FakeMsg('HEARTBEAT', 7, compid=2), FakeMsg('HEARTBEAT', 8, compid=2)], 0.0)
+    snap = stats.snapshot()
+    assert snap['received'] == 8
+    assert snap['dropped'] == 5  # 252, 254, 1, 2, 3
+    assert snap['dropped_by_source'] == {(1, 1): 5}
+    assert abs(snap['loss_percent'] - 5 / 13 * 100) < 1e-9
+
+
+def test_per_type_counters():
+    """Çözme süresi batch'teki mesajlara paylaştırılmalı, işleyici süresi tipe yazılmalı"""
+    stats = LinkStats()
+    msgs = [FakeMsg('ATTITUDE', i, size=36) for i in range(4)]
+    stats.record_batch(msgs, 400e-6)
+    stats.record_handler('ATTITUDE', 50e-6)
+    stats.record_batch([FakeMsg('BAD_DATA', 0)], 0.0)
+    snap = stats.snapshot()
+    att = snap['types']['ATTITUDE']
+    assert att['count'] == 4
+    assert att['bytes'] == 144
+    assert abs(att['decode']['mean_us'] - 100) < 1e-6
+    assert att['handler']['count'] == 1
+    assert snap['bad_data'] == 1
+    assert 'BAD_DATA' not in snap['types']
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Histogram", test_histogram),
+        ("Sequence gaps", test_sequence_gaps),
+        ("Per-type counters", test_per_type_counters),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
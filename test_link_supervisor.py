@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Bağlantı gözetmeni (paralel port/baud algılama, üstel bekleme, aday sırası) testleri
+"""
+import sys
+import os
+import socket
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+from core.link_supervisor import Backoff, LinkSupervisor, PortProber
+from core.synthetic_vehicle import SyntheticVehicle, open_transport
+
+_mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+
+
+def heartbeat(mav_type=mavutil.mavlink.MAV_TYPE_FIXED_WING):
+    msg = _mav.heartbeat_encode(mav_type, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA, 0, 0, 0)
+    return mavlink.MAVLink(None).parse_buffer(msg.pack(_mav))[0]
+
+
+class FakeConnection:
+    """Yalnızca doğru baud'da heartbeat, yanlış baud'da çöp üreten port"""
+
+    def __init__(self, device, baud, good_baud):
+        self.device = device
+        self.baud = baud
+        self.good_baud = good_baud
+        self.closed = False
+        self.mav = self
+
+    def buf_len(self):
+        return 0
+
+    def set_baudrate(self, baud):
+        self.baud = baud
+
+    def recv_msg(self):
+        if self.good_baud is None:
+            return None
+        if self.baud != self.good_baud:
+            return mavlink.MAVLink_bad_data(b'\x55', 'Bad prefix')
+        return heartbeat()
+
+    def close(self):
+        self.closed = True
+
+
+def test_parallel_detect_skips_wrong_baud_and_busy_ports():
+    opened = []
+
+    def open_connection(device, baud):
+        if device == 'busy':
+            raise OSError('Port meşgul')
+        conn = FakeConnection(device, baud, {'silent': None, 'radio': 115200}[device])
+        opened.append(conn)
+        return conn
+
+    prober = PortProber(open_connection)
+    start = time.monotonic()
+    result = prober.detect([('silent', (57600, 115200)), ('busy', (57600,)), ('radio', (57600, 115200))],
+                           timeout=5.0)
+    elapsed = time.monotonic() - start
+    assert result is not None and result.device == 'radio' and result.baud == 115200
+    assert elapsed < 1.0, elapsed  # Çöp gelen baud'da beklenmeden geçilir
+    assert not result.connection.closed
+    time.sleep(0.1)
+    assert all(c.closed for c in opened if c is not result.connection)
+
+
+def test_backoff_and_candidate_order():
+    backoff = Backoff(initial=0.5, maximum=4.0, jitter=0.0)
+    assert [backoff.next_delay() for _ in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+    backoff.reset()
+    assert backoff.next_delay() == 0.5
+
+    supervisor = LinkSupervisor(list_ports=lambda: ['/dev/ttyS0', '/dev/ttyACM0', '/dev/ttyUSB0'])
+    supervisor.arm()
+    supervisor.connected('/dev/ttyUSB0', 115200)
+    candidates = supervisor.candidates()
+    assert candidates[0][0] == '/dev/ttyUSB0' and candidates[0][1][0] == 115200
+    assert len(candidates) == 3
+    supervisor.arm('udpin:0.0.0.0:14550')
+    assert supervisor.candidates() == [('udpin:0.0.0.0:14550', (0,))]
+
+
+def test_failed_attempt_schedules_backoff():
+    supervisor = LinkSupervisor(PortProber(lambda d, b: FakeConnection(d, b, None)), list_ports=lambda: [])
+    assert supervisor.time_until_attempt() == float('inf')
+    supervisor.arm()
+    assert supervisor.time_until_attempt() == 0.0
+    assert supervisor.attempt() is None
+    assert supervisor.time_until_attempt() > 0.3
+    supervisor.lost()
+    assert supervisor.time_until_attempt() == 0.0
+    supervisor.disarm()
+    assert not supervisor.enabled and supervisor.stop_event.is_set()
+
+
+def test_detects_synthetic_vehicle_on_pty():
+    transport = open_transport('pty')
+    vehicle = SyntheticVehicle(transport.write)
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            data = transport.read()
+            if data:
+                vehicle.handle_bytes(data)
+            vehicle.step()
+            time.sleep(0.01)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        supervisor = LinkSupervisor(list_ports=lambda: ['/dev/does-not-exist', transport.name])
+        supervisor.arm()
+        start = time.monotonic()
+        result = supervisor.attempt()
+        assert result is not None and result.device == transport.name
+        assert time.monotonic() - start < 2.0
+        assert result.heartbeat.get_srcSystem() == 1
+        result.connection.close()
+    finally:
+        stop.set()
+        thread.join(1.0)
+        transport.close()
+        os.close(transport.slave)
+
+
+def test_disconnect_then_reconnect():
+    """Bağlantı kesilince thread ve yönlendirici uçları yaşar; tekrar bağlanınca telemetri akar"""
+    from core.mavlink_thread import MAVLinkThread
+    from core.synthetic_vehicle import run
+
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    transport = open_transport(f'udpout:127.0.0.1:{port}')
+    vehicle = SyntheticVehicle(transport.write, streams={'ATTITUDE': 50.0})
+    feeder = threading.Thread(target=run, args=(vehicle, transport),
+                              kwargs={'duration': 5.0, 'report_interval': 0}, daemon=True)
+    feeder.start()
+
+    thread = MAVLinkThread()
+    thread.tlog_enabled = False
+    attitudes = []
+    thread.subscribe('ATTITUDE', attitudes.append)
+
+    def wait_attitudes(count):
+        deadline = time.monotonic() + 2.0
+        while len(attitudes) < count and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return len(attitudes) >= count
+
+    try:
+        assert thread.add_router_endpoint('udpout:127.0.0.1:9')
+        assert thread.connect(f'udpin:127.0.0.1:{port}', 57600)
+        thread.start()
+        assert wait_attitudes(5)
+        thread.disconnect_link()
+        assert thread.connection is None and not thread.is_connected and not thread.supervisor.enabled
+        time.sleep(0.2)
+        assert thread.isRunning() and len(thread.router.endpoints) == 1
+        received = len(attitudes)
+        assert thread.connect(f'udpin:127.0.0.1:{port}', 57600)
+        thread.start()  # Zaten çalışıyor: yeni thread açılmaz
+        assert wait_attitudes(received + 5), len(attitudes)
+    finally:
+        thread.stop()
+        thread.wait(2000)
+        thread.bus.close()
+        feeder.join(6.0)
+        transport.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Parallel detect skips wrong baud and busy ports", test_parallel_detect_skips_wrong_baud_and_busy_ports),
+        ("Backoff and candidate order", test_backoff_and_candidate_order),
+        ("Failed attempt schedules backoff", test_failed_attempt_schedules_backoff),
+        ("Detects synthetic vehicle on pty", test_detects_synthetic_vehicle_on_pty),
+        ("Disconnect then reconnect", test_disconnect_then_reconnect),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Çökmeye dayanıklı günlüklü (journal) kayıt testleri: temiz kapanış, süreç çökmesi sonrası kurtarma,
+yalnızca son segmentin onarılması, canlı journal'ın kilitle korunması
+"""
+import sys
+import os
+import csv
+import glob
+import subprocess
+import tempfile
+import textwrap
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.data_logger import CSV_HEADERS, DataLogger
+from core.log_journal import LogJournal, read_index, recover_journals, repair_last_segment
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _csv_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_clean_close_writes_csv_and_index():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(directory=directory, journal=True)
+        logger.start_logging()
+        assert os.path.isdir(logger.filename + '.journal') and not os.path.exists(logger.filename)
+        for i in range(3000):
+            logger.log_data({'alt': i, 'flight_mode': 'AUTO'})
+        logger.log_error("KRİTİK HATA")
+        path, log_path = logger.filename, logger.system_log_filename
+        logger.stop_logging()
+        assert logger.wait_finished(10.0)  # CSV/.log arka planda oluşturulur
+        rows = _csv_rows(path)
+        assert rows[0] == CSV_HEADERS and len(rows) == 3001 and rows[-1][3] == '2999'
+        with open(log_path, encoding='utf-8') as f:
+            assert f.read().endswith("[ERROR] KRİTİK HATA\n")
+        assert not glob.glob(os.path.join(directory, '*.journal'))
+        (entry,) = read_index(directory)
+        assert entry['rows'] == 3000 and entry['lines'] == 1 and entry['sealed'] and not entry['recovered']
+        assert recover_journals(directory) == []
+
+
+def test_recovery_after_process_crash():
+    with tempfile.TemporaryDirectory() as directory:
+        script = textwrap.dedent(f"""
+            import os, sys
+            sys.path.insert(0, {HERE!r})
+            from core.data_logger import DataLogger
+            logger = DataLogger(directory={directory!r}, journal=True)
+            logger.start_logging()
+            for i in range(500):
+                logger.log_data({{'alt': i}})
+            logger.log_action("kalkış")
+            assert logger.flush()
+            journal = logger.log_file
+            journal._file.write(b'\\x01\\xff\\x00\\x00\\x00\\x00\\x00\\x00\\x00yarim')  # Çökme anında yarım kalan kayıt
+            journal._file.flush()
+            os._exit(1)  # atexit/kapanış çalışmaz
+        """)
+        assert subprocess.run([sys.executable, '-c', script]).returncode == 1
+        (journal,) = glob.glob(os.path.join(directory, '*.journal'))
+        (info,) = recover_journals(directory)
+        assert info['recovered'] and not info['sealed'] and info['rows'] == 500 and info['lines'] == 1
+        assert info['truncated_bytes'] == 14 and info['repair_ms'] < 500
+        rows = _csv_rows(info['csv'])
+        assert rows[0] == CSV_HEADERS and len(rows) == 501 and rows[-1][3] == '499'
+        with open(info['log'], encoding='utf-8') as f:
+            text = f.read()
+        assert "[ACTION] kalkış" in text and "kurtarıldı: 500 satır" in text
+        assert not os.path.exists(journal)
+        (entry,) = read_index(directory)
+        assert entry['recovered'] and entry['csv'] == info['csv']
+
+
+def test_only_last_segment_is_repaired():
+    with tempfile.TemporaryDirectory() as directory:
+        base = os.path.join(directory, 'flight_log_test')
+        journal = LogJournal(base + '.csv', base + '.log', 'a,b\r\n', segment_bytes=600)
+        count = 0
+        while journal.segments < 4:
+            journal.append(f"{count},{count * 2}\r\n", 1, "satır\n" if count % 10 == 0 else '', int(count % 10 == 0))
+            count += 1
+        for _ in range(3):  # Yeni açılan son segmentte üç tur
+            journal.append(f"{count},{count * 2}\r\n", 1, '', 0)
+            count += 1
+        assert journal.segments == 4
+        journal._lock.close()  # Süreç ölünce kilit bırakılır
+        segments = sorted(glob.glob(os.path.join(journal.directory, '*.seg')))
+        assert len(segments) == journal.segments > 3
+        before = [(os.path.getsize(p), os.path.getmtime(p)) for p in segments[:-1]]
+        # Son turun commit kaydı bozuk: o tur atılır
+        with open(segments[-1], 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+        repair = repair_last_segment(journal.directory)
+        assert repair['segment'] == os.path.basename(segments[-1]) and repair['truncated_bytes'] > 0
+        assert [(os.path.getsize(p), os.path.getmtime(p)) for p in segments[:-1]] == before
+        (info,) = recover_journals(directory)
+        rows = _csv_rows(info['csv'])
+        assert rows[0] == ['a', 'b'] and len(rows) == count and rows[-1] == [str(count - 2), str(count * 2 - 4)]
+        assert info['rows'] == count - 1 and info['truncated_bytes'] == 0  # İkinci onarımda kırpılacak bir şey yok
+
+
+def test_recovery_skips_live_journal():
+    with tempfile.TemporaryDirectory() as directory:
+        # Aynı dizinde çalışan başka bir GCS'in açık oturumu
+        other = DataLogger(directory=directory, journal=True)
+        other.start_logging()
+        for i in range(100):
+            other.log_data({'alt': i})
+        assert other.flush()
+        journal = other.log_file.directory
+        with open(os.path.join(journal, 'lock'), encoding='ascii') as f:
+            assert f.read() == str(os.getpid())
+        assert recover_journals(directory) == []
+        assert os.path.isdir(journal) and len(glob.glob(os.path.join(journal, '*.seg'))) == 1
+        assert not os.path.exists(other.filename) and read_index(directory) == []
+        path = other.filename
+        other.stop_logging()
+        assert other.wait_finished(10.0)
+        assert len(_csv_rows(path)) == 101 and not os.path.exists(journal)
+        (entry,) = read_index(directory)
+        assert not entry['recovered']
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Clean close writes CSV and index", test_clean_close_writes_csv_and_index),
+        ("Recovery after process crash", test_recovery_after_process_crash),
+        ("Only last segment is repaired", test_only_last_segment_is_repaired),
+        ("Recovery skips live journal", test_recovery_skips_live_journal),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -96,13 +96,7 @@ def test_thread_stopping():
     path = create_test_log(1000)  # Large log
     
     try:
-        from PyQt6.QtCore import QCoreApplication
-        import sys
-        
-        # Create minimal Qt application
-        if not QCoreApplication.instance():
-            app = QCoreApplication(sys.argv)
-        
+        # LogReplayThread Qt'siz çalışır (core.event_bus.Worker)
         thread = LogReplayThread(path)
         
         # Start thread
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Sıkıştırılmış ve parçalara bölünen uçuş kayıtları testleri: akışlı gzip, boyut/süre ile döndürme,
+oynatma ve dönüştürme araçlarının .gz kayıtları diske açmadan okuması
+"""
+import sys
+import os
+import csv
+import tempfile
+import time
+from unittest import mock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.columnar_log import ColumnarLogReader, convert_csv, is_columnar_log
+from core.data_logger import CSV_HEADERS, DataLogger
+from core.log_files import is_compressed, open_log, read_log_bytes
+from core.log_replay_thread import LogReplayThread
+
+
+def _sample(i):
+    return {'lat': 40.0 + i * 1e-6, 'lon': 29.0, 'alt': i, 'voltage': 12.4, 'flight_mode': 'AUTO'}
+
+
+def test_gzip_stream_readable_while_writing_and_after_crash():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(directory=directory, compress='gzip')
+        logger.start_logging()
+        try:
+            for i in range(2000):
+                logger.log_data(_sample(i))
+            logger.log_action("kalkış")
+            assert logger.flush()
+            path, log_path = logger.filename, logger.system_log_filename
+            assert path.endswith('.csv.gz') and logger.system_log_filename.endswith('.log.gz')
+            # Kayıt sürerken (gzip sonu yazılmadan) flush noktasına kadar okunur
+            replay = LogReplayThread(path)
+            assert len(replay._rows) == 2000 and replay._rows[-1]['Altitude'] == '1999'
+            log_text = read_log_bytes(logger.system_log_filename).decode('utf-8')
+            assert log_text.endswith("[ACTION] kalkış\n")
+        finally:
+            logger.stop_logging()
+        assert is_compressed(path) and os.path.getsize(path) < 2000 * 60
+        with open_log(log_path) as f:
+            assert f.read() == log_text
+
+        # Kesilmiş dosya: okunabilen satırlar korunur
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        assert 0 < len(read_log_bytes(path)) < 2000 * 60
+        replay = LogReplayThread(path)
+        assert 0 < len(replay._rows) < 2000 and replay._rows[0]['Altitude'] == '0'
+
+
+def test_rotation_by_size_and_time():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(flush_interval=0.01, directory=directory, rotate_bytes=20000)
+        logger.start_logging()
+        for i in range(1500):
+            logger.log_data(_sample(i))
+            if i % 100 == 99:
+                logger.flush()
+        logger.stop_logging()
+        stats = logger.get_stats()
+        parts = [p for p in stats['files'] if p.endswith('.csv')]
+        assert stats['rotations'] >= 2 and len(parts) == stats['rotations'] + 1
+        assert parts[1].endswith('_002.csv') and all(os.path.exists(p) for p in stats['files'])
+        total = 0
+        for path in parts:
+            with open(path, newline='') as f:
+                rows = list(csv.reader(f))
+            assert rows[0] == CSV_HEADERS  # Her parça kendi başına okunabilir
+            total += len(rows) - 1
+        assert total == 1500 and stats['rows'] == 1500
+
+        logger = DataLogger(flush_interval=0.02, directory=directory, rotate_interval=0.1,
+                            log_format='columnar', compress='gzip')
+        logger.start_logging()
+        for i in range(30):
+            logger.log_data(_sample(i))
+            time.sleep(0.01)
+        logger.stop_logging()
+        parts = [p for p in logger.get_stats()['files'] if p.endswith('.flog.gz')]
+        assert len(parts) >= 2
+        counts = []
+        for path in parts:
+            reader = ColumnarLogReader(path)
+            try:
+                assert not reader.recovered
+                counts.append(len(reader))
+            finally:
+                reader.close()
+        assert sum(counts) == 30
+
+
+def test_closed_parts_synced_after_final_bytes():
+    synced = {}
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        st = os.fstat(fd)
+        synced[(st.st_dev, st.st_ino)] = st.st_size  # Son fsync anındaki boyut
+        real_fsync(fd)
+
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(flush_interval=0.02, directory=directory, rotate_interval=0.1,
+                            log_format='columnar', compress='gzip')
+        with mock.patch('os.fsync', fsync):
+            logger.start_logging()
+            for i in range(30):
+                logger.log_data(_sample(i))
+                logger.log_system(f"satır {i}")
+                time.sleep(0.01)
+            logger.stop_logging()
+        files = logger.get_stats()['files']
+        assert len(files) >= 4
+        for path in files:
+            # Kapanışta yazılan blok dizini ve gzip sonu da diske zorlanmış olmalı
+            st = os.stat(path)
+            assert synced.get((st.st_dev, st.st_ino)) == st.st_size, path
+
+
+def test_conversion_reads_compressed_csv():
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(directory=directory, compress='gzip')
+        logger.start_logging()
+        for i in range(300):
+            logger.log_data(_sample(i))
+        path = logger.filename
+        logger.stop_logging()
+        result = convert_csv(path)
+        assert result['path'] == path[:-len('.csv.gz')] + '.flog' and result['rows'] == 300
+        assert is_columnar_log(result['path']) and not is_columnar_log(path)
+        replay = LogReplayThread(result['path'])
+        assert len(replay._rows) == 300 and replay._rows[299]['Altitude'] == 299.0
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Gzip stream readable while writing and after crash", test_gzip_stream_readable_while_writing_and_after_crash),
+        ("Rotation by size and time", test_rotation_by_size_and_time),
+        ("Closed parts synced after final bytes", test_closed_parts_synced_after_final_bytes),
+        ("Conversion reads compressed CSV", test_conversion_reads_compressed_csv),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
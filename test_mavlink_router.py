@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+MAVLink yönlendirici (ham paket iletimi, uçlar arası aktarım, gecikme ölçümü) testleri
+"""
+import sys
+import os
+import socket
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+from core.mavlink_router import MavlinkRouter
+
+
+class FakeConnection:
+    """Yazılanları kaydeden, sıradaki okumaları döndüren uç bağlantısı"""
+
+    def __init__(self):
+        self.written = []
+        self.incoming = []
+        self.fd = None
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+    def recv(self, n=None):
+        return self.incoming.pop(0) if self.incoming else ''
+
+    def close(self):
+        pass
+
+
+def encoded_messages():
+    mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    buf = mav.heartbeat_encode(1, 3, 0, 0, 0).pack(mav)
+    buf += mav.attitude_encode(100, 0.1, 0.2, 0.3, 0, 0, 0).pack(mav)
+    parser = mavlink.MAVLink(None)
+    return buf, parser.parse_buffer(buf)
+
+
+def test_forwards_raw_packets_without_reencoding():
+    router = MavlinkRouter(open_connection=lambda spec: FakeConnection())
+    a = router.add_endpoint('udpout:a')
+    b = router.add_endpoint('udpout:b')
+    assert router.add_endpoint('udpout:a') is a
+    raw, messages = encoded_messages()
+    router.forward_from_vehicle(messages + [mavlink.MAVLink_bad_data(b'\x00', 'x')], rx_time=0.0)
+    assert a.connection.written == [raw] and b.connection.written == [raw]
+    stats = router.get_stats()
+    assert stats['to_endpoints_packets'] == 2
+    assert stats['to_endpoints_bytes'] == len(raw)
+    assert stats['latency']['count'] == 1
+
+
+def test_endpoint_traffic_goes_to_vehicle_and_other_endpoints():
+    router = MavlinkRouter(open_connection=lambda spec: FakeConnection())
+    a = router.add_endpoint('udpin:a')
+    b = router.add_endpoint('udpin:b')
+    a.connection.incoming = [b'\xfd\x01', b'\x02']
+    to_vehicle = []
+    assert router.service(to_vehicle.append) == 3
+    assert to_vehicle == [b'\xfd\x01', b'\x02']
+    assert b.connection.written == [b'\xfd\x01', b'\x02']
+    assert a.connection.written == []  # Kaynağa geri yazılmaz
+    assert router.remove_endpoint('udpin:a') and not router.remove_endpoint('udpin:a')
+    assert [e.spec for e in router.endpoints] == ['udpin:b']
+
+
+def test_udp_endpoint_roundtrip():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(2.0)
+    port = receiver.getsockname()[1]
+    router = MavlinkRouter()
+    try:
+        router.add_endpoint(f'udpout:127.0.0.1:{port}')
+        assert router.fds()
+        raw, messages = encoded_messages()
+        router.forward_from_vehicle(messages)
+        data, _ = receiver.recvfrom(4096)
+        assert data == raw
+    finally:
+        router.close()
+        receiver.close()
+
+
+def test_tcp_endpoint_reads_whole_chunks():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    router = MavlinkRouter()
+    client = None
+    try:
+        router.add_endpoint(f'tcpin:127.0.0.1:{port}')
+        client = socket.create_connection(('127.0.0.1', port), timeout=2.0)
+        payload = bytes(range(256)) * 8  # READS_PER_SERVICE * 8 bayttan fazla
+        client.sendall(payload)
+        to_vehicle = []
+        deadline = time.monotonic() + 2.0
+        total = 0
+        while not total and time.monotonic() < deadline:
+            time.sleep(0.05)
+            total = router.service(to_vehicle.append)
+        assert total == len(payload) and b''.join(to_vehicle) == payload, [len(d) for d in to_vehicle]
+        assert len(to_vehicle) == 1  # 8 baytlık parçalar halinde değil
+
+        raw, messages = encoded_messages()
+        router.forward_from_vehicle(messages)
+        received = b''
+        while len(received) < len(raw):
+            received += client.recv(4096)
+        assert received == raw
+    finally:
+        if client is not None:
+            client.close()
+        router.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Forwards raw packets without re-encoding", test_forwards_raw_packets_without_reencoding),
+        ("Endpoint traffic goes to vehicle and other endpoints", test_endpoint_traffic_goes_to_vehicle_and_other_endpoints),
+        ("UDP endpoint roundtrip", test_udp_endpoint_roundtrip),
+        ("TCP endpoint reads whole chunks", test_tcp_endpoint_reads_whole_chunks),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Mesaj dağıtıcı ve uçuş modu tablosu testleri: abonelik sırası, abonelikten çıkma, joker aboneler,
+hata yalıtımı ve araç tipine göre mod adı/numarası
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+
+from core.flight_modes import mode_name, mode_number, vehicle_family
+from core.message_dispatcher import MessageDispatcher
+
+
+class FakeMessage:
+    def __init__(self, msg_type):
+        self.msg_type = msg_type
+
+    def get_type(self):
+        return self.msg_type
+
+
+def test_subscribe_order_and_unsubscribe():
+    dispatcher = MessageDispatcher()
+    calls = []
+    first = lambda msg: calls.append('first')
+    second = lambda msg: calls.append('second')
+    third = lambda msg: calls.append('third')
+    for handler in (first, second, third):
+        assert dispatcher.subscribe('ATTITUDE', handler) is handler
+    dispatcher.subscribe('ATTITUDE', first)  # Aynı işleyici ikinci kez eklenmez
+    assert dispatcher.dispatch(FakeMessage('ATTITUDE'))
+    assert calls == ['first', 'second', 'third']
+
+    calls.clear()
+    dispatcher.unsubscribe('ATTITUDE', second)
+    dispatcher.dispatch(FakeMessage('ATTITUDE'))
+    assert calls == ['first', 'third']  # Kalanların sırası korunur
+    dispatcher.subscribe('ATTITUDE', second)
+    calls.clear()
+    dispatcher.dispatch(FakeMessage('ATTITUDE'))
+    assert calls == ['first', 'third', 'second']  # Yeniden eklenen sona gider
+
+    for handler in (first, second, third):
+        dispatcher.unsubscribe('ATTITUDE', handler)
+    dispatcher.unsubscribe('ATTITUDE', first)  # Olmayanı çıkarmak hata değil
+    assert dispatcher.subscribed_types() == set() and not dispatcher.is_subscribed('ATTITUDE')
+    calls.clear()
+    assert not dispatcher.dispatch(FakeMessage('ATTITUDE')) and calls == []
+    assert dispatcher.dispatched == 3 and dispatcher.skipped == 1
+
+
+def test_wildcard_runs_after_typed_handlers():
+    dispatcher = MessageDispatcher()
+    calls = []
+    everything = lambda msg: calls.append(('*', msg.get_type()))
+    dispatcher.subscribe('*', everything)
+    dispatcher.subscribe('*', everything)
+    dispatcher.subscribe('HEARTBEAT', lambda msg: calls.append(('HEARTBEAT', msg.get_type())))
+    assert dispatcher.is_subscribed('VFR_HUD') and dispatcher.subscribed_types() == {'HEARTBEAT'}
+    dispatcher.dispatch(FakeMessage('HEARTBEAT'))
+    dispatcher.dispatch(FakeMessage('VFR_HUD'))
+    assert calls == [('HEARTBEAT', 'HEARTBEAT'), ('*', 'HEARTBEAT'), ('*', 'VFR_HUD')]
+    dispatcher.unsubscribe('*', everything)
+    assert not dispatcher.is_subscribed('VFR_HUD') and not dispatcher.dispatch(FakeMessage('VFR_HUD'))
+
+
+def test_changes_during_dispatch_and_errors():
+    errors = []
+    timings = []
+    dispatcher = MessageDispatcher(on_error=lambda t, h, e: errors.append((t, str(e))),
+                                   on_timing=lambda t, s: timings.append((t, s)))
+    calls = []
+
+    def late(msg):
+        calls.append('late')
+
+    def first(msg):
+        calls.append('first')
+        # Dağıtım sırasında değişiklik bir sonraki mesajdan itibaren geçerli (kopyala-yaz)
+        dispatcher.unsubscribe('SYS_STATUS', first)
+        dispatcher.subscribe('SYS_STATUS', late)
+
+    def broken(msg):
+        raise RuntimeError("bozuk")
+
+    dispatcher.subscribe('SYS_STATUS', first)
+    dispatcher.subscribe('SYS_STATUS', broken)
+    dispatcher.subscribe('SYS_STATUS', lambda msg: calls.append('after'))
+    dispatcher.dispatch(FakeMessage('SYS_STATUS'))
+    assert calls == ['first', 'after'] and errors == [('SYS_STATUS', 'bozuk')]
+    dispatcher.dispatch(FakeMessage('SYS_STATUS'))
+    assert calls == ['first', 'after', 'after', 'late']
+    assert [t for t, _ in timings] == ['SYS_STATUS', 'SYS_STATUS'] and all(s >= 0 for _, s in timings)
+
+
+def test_mode_names_per_vehicle_type():
+    t = mavutil.mavlink
+    assert vehicle_family(t.MAV_TYPE_FIXED_WING) == 'plane'
+    assert vehicle_family(t.MAV_TYPE_VTOL_TILTROTOR) == 'plane'  # QuadPlane ArduPlane modlarını kullanır
+    assert vehicle_family(None) == 'plane'  # Tip bilinmiyorsa sabit kanat varsayılır
+    for mav_type in (t.MAV_TYPE_QUADROTOR, t.MAV_TYPE_HEXAROTOR, t.MAV_TYPE_OCTOROTOR, t.MAV_TYPE_TRICOPTER,
+                     t.MAV_TYPE_HELICOPTER, t.MAV_TYPE_COAXIAL, t.MAV_TYPE_DODECAROTOR):
+        assert vehicle_family(mav_type) == 'copter', mav_type
+    assert vehicle_family(t.MAV_TYPE_GROUND_ROVER) == 'rover'
+    assert vehicle_family(t.MAV_TYPE_SURFACE_BOAT) == 'rover'
+
+    # Aynı custom_mode araç tipine göre farklı mod
+    assert [mode_name(family, 10) for family in ('plane', 'copter', 'rover')] == ['AUTO', 'CUSTOM(10)', 'AUTO']
+    assert [mode_name(family, 3) for family in ('plane', 'copter', 'rover')] == ['TRAINING', 'AUTO', 'STEERING']
+    assert mode_name('plane', 21) == 'QLAND' and mode_name('copter', 9) == 'LAND' and mode_name('rover', 4) == 'HOLD'
+    assert mode_name('copter', None) == 'UNKNOWN' and mode_name('bilinmeyen', 11) == 'RTL'
+
+    assert mode_number('plane', 'guided') == 16 and mode_number('copter', 'GUIDED') == 4
+    assert mode_number('rover', 'GUIDED') == 15 and mode_number('copter', 'QHOVER') is None
+    assert mode_number('bilinmeyen', 'QHOVER') == 19 and mode_number('plane', None) is None
+    for family in ('plane', 'copter', 'rover'):
+        for number in range(30):
+            name = mode_name(family, number)
+            if not name.startswith('CUSTOM'):
+                assert mode_number(family, name) == number
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Subscribe order and unsubscribe", test_subscribe_order_and_unsubscribe),
+        ("Wildcard runs after typed handlers", test_wildcard_runs_after_typed_handlers),
+        ("Changes during dispatch and errors", test_changes_during_dispatch_and_errors),
+        ("Mode names per vehicle type", test_mode_names_per_vehicle_type),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Görev aktarım protokolü (yükleme, indirme ve özet tabanlı senkronizasyon) testleri
+"""
+import sys
+import os
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from core.mission_transfer import (MissionUpload, MissionDownload, MissionSync, waypoints_to_items,
+                                   make_item, mission_hash)
+
+ACCEPTED = mavutil.mavlink.MAV_MISSION_ACCEPTED
+
+
+class FakeMav:
+    """Gönderilen görev mesajlarını kaydeder"""
+
+    def __init__(self):
+        self.counts = []
+        self.items = []
+        self.requests = []
+        self.acks = []
+        self.partial = []
+        self.list_requests = 0
+
+    def mission_count_send(self, ts, tc, count, mission_type=0):
+        self.counts.append(count)
+
+    def mission_item_int_send(self, ts, tc, seq, frame, command, current, autocontinue,
+                              p1, p2, p3, p4, x, y, z, mission_type=0):
+        self.items.append((seq, command, x, y, z))
+
+    def mission_item_send(self, ts, tc, seq, *args):
+        self.items.append((seq,) + args)
+
+    def mission_request_list_send(self, ts, tc, mission_type=0):
+        self.list_requests += 1
+
+    def mission_request_int_send(self, ts, tc, seq, mission_type=0):
+        self.requests.append(seq)
+
+    def mission_ack_send(self, ts, tc, result, mission_type=0):
+        self.acks.append(result)
+
+    def mission_write_partial_list_send(self, ts, tc, start, end, mission_type=0):
+        self.partial.append((start, end))
+
+
+def request(seq):
+    return types.SimpleNamespace(seq=seq, mission_type=0)
+
+
+def ack(result=ACCEPTED):
+    return types.SimpleNamespace(type=result, mission_type=0)
+
+
+def count(n):
+    return types.SimpleNamespace(count=n, mission_type=0)
+
+
+def item_msg(item):
+    """Aracın göndereceği MISSION_ITEM_INT"""
+    return types.SimpleNamespace(
+        seq=item['seq'], frame=item['frame'], command=item['command'], current=item['current'],
+        autocontinue=item['autocontinue'], param1=item['param1'], param2=item['param2'],
+        param3=item['param3'], param4=item['param4'], x=int(round(item['x'] * 1e7)),
+        y=int(round(item['y'] * 1e7)), z=item['z'], mission_type=0)
+
+
+def serve_download(transfer, mav, onboard):
+    """Araç tarafı: istenen öğeleri sırayla yanıtla"""
+    transfer.handle_count(count(len(onboard)), mav, now=0.0)
+    while mav.requests:
+        seq = mav.requests.pop(0)
+        transfer.handle_item(item_msg(onboard[seq]), mav, now=0.0)
+
+
+def grid_items(n):
+    return [make_item(i, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT, 39.0 + i * 1e-5, 32.0, 100) for i in range(n)]
+
+
+def test_full_upload():
+    """Araç tüm öğeleri sırayla isteyip kabul edince aktarım başarılı olmalı"""
+    mav = FakeMav()
+    upload = MissionUpload(grid_items(500))
+    upload.start(mav, 1, 1, now=0.0)
+    assert mav.counts == [500]
+    for seq in range(500):
+        upload.handle_request(request(seq), mav, now=0.0)
+    assert upload.progress() == (500, 500)
+    assert upload.handle_ack(ack())
+    result = upload.result()
+    assert result['success'] and result['count'] == 500
+    assert mav.items[1][2] == int(round((39.0 + 1e-5) * 1e7))
+
+
+def test_out_of_order_and_repeated():
+    """Tekrarlanan ve sıra dışı istekler aynı öğeyle yanıtlanmalı, ilerleme bir kez sayılmalı"""
+    mav = FakeMav()
+    upload = MissionUpload(grid_items(3))
+    upload.start(mav, 1, 1, now=0.0)
+    assert upload.handle_request(request(0), mav, now=0.0)
+    assert not upload.handle_request(request(0), mav, now=0.1)
+    assert upload.handle_request(request(2), mav, now=0.2)
+    # Tüm öğeler gönderilmeden gelen ACK aktarımı bitirmemeli
+    assert not upload.handle_ack(ack())
+    assert upload.handle_request(request(1), mav, now=0.3)
+    assert [item[0] for item in mav.items] == [0, 0, 2, 1]
+    assert upload.handle_ack(ack())
+    assert upload.state == 'done'
+
+
+def test_timeout_retransmit_and_fail():
+    """İstek gelmezse son mesaj tekrarlanmalı, deneme hakkı bitince başarısız olmalı"""
+    mav = FakeMav()
+    upload = MissionUpload(grid_items(2), timeout=1.0, max_retries=2)
+    upload.start(mav, 1, 1, now=0.0)
+    upload.service(mav, now=1.1)
+    assert mav.counts == [2, 2]
+    upload.handle_request(request(0), mav, now=1.2)
+    upload.service(mav, now=2.3)
+    assert [item[0] for item in mav.items] == [0, 0]
+    upload.service(mav, now=3.4)
+    upload.service(mav, now=4.5)
+    assert upload.state == 'failed'
+    assert upload.result()['error'] == 'Zaman aşımı'
+
+
+def test_vehicle_error():
+    """Araç hata ACK'i gönderirse aktarım hata koduyla bitmeli"""
+    mav = FakeMav()
+    upload = MissionUpload(grid_items(2))
+    upload.start(mav, 1, 1, now=0.0)
+    assert upload.handle_ack(ack(mavutil.mavlink.MAV_MISSION_NO_SPACE))
+    assert upload.result()['error'] == 'YER YOK'
+
+
+def test_waypoints_get_home_item():
+    """Waypoint listesinin başına ev öğesi eklenmeli (ArduPilot 0. öğeyi ezer)"""
+    items = waypoints_to_items(
+        [{'lat': 39.1, 'lon': 32.1, 'alt': 50},
+         {'command': mavutil.mavlink.MAV_CMD_DO_SET_RELAY, 'param1': 0, 'param2': 1}],
+        home={'lat': 39.0, 'lon': 32.0, 'alt': 900})
+    assert len(items) == 3
+    assert items[0]['frame'] == mavutil.mavlink.MAV_FRAME_GLOBAL
+    assert (items[1]['seq'], items[1]['x']) == (1, 39.1)
+    assert items[2]['frame'] == mavutil.mavlink.MAV_FRAME_MISSION
+
+
+def test_pipelined_download():
+    """İndirmede pencere boyu kadar istek aynı anda gönderilmeli, eksikler yeniden istenmeli"""
+    onboard = grid_items(20)
+    mav = FakeMav()
+    download = MissionDownload(window=6)
+    download.start(mav, 1, 1, now=0.0)
+    assert mav.list_requests == 1
+    download.handle_count(count(20), mav, now=0.0)
+    assert mav.requests == [0, 1, 2, 3, 4, 5]
+    # 2 numaralı öğenin yanıtı kayboldu
+    for seq in (0, 1, 3):
+        download.handle_item(item_msg(onboard[seq]), mav, now=0.1)
+    assert mav.requests[6:] == [6, 7, 8]
+    download.service(mav, now=2.0)
+    assert sorted(mav.requests[9:]) == [2, 4, 5, 6, 7, 8]
+    for seq in range(20):
+        download.handle_item(item_msg(onboard[seq]), mav, now=2.1)
+    assert download.state == 'done'
+    assert mav.acks == [ACCEPTED]
+    assert download.result()['hash'] == mission_hash(onboard)
+
+
+def test_sync_skips_identical_mission():
+    """Araçtaki görev aynıysa (ev konumu farklı olsa bile) yükleme atlanmalı"""
+    local = grid_items(10)
+    onboard = [dict(item) for item in local]
+    onboard[0] = make_item(0, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT, 40.0, 33.0, 1000)
+    mav = FakeMav()
+    sync = MissionSync(local)
+    sync.start(mav, 1, 1, now=0.0)
+    serve_download(sync, mav, onboard)
+    assert sync.state == 'done'
+    assert sync.result()['action'] == 'skip'
+    assert mav.counts == [] and mav.partial == []
+
+
+def test_sync_uploads_changed_tail():
+    """Öğe sayısı aynı, içerik farklıysa yalnızca ilk farktan sonrası yazılmalı"""
+    local = grid_items(10)
+    onboard = [dict(item) for item in local]
+    onboard[7] = dict(onboard[7], z=150.0)
+    mav = FakeMav()
+    sync = MissionSync(local)
+    sync.start(mav, 1, 1, now=0.0)
+    serve_download(sync, mav, onboard)
+    assert sync.action == 'partial'
+    assert mav.partial == [(7, 9)]
+    for seq in (7, 8, 9):
+        sync.handle_request(request(seq), mav, now=0.5)
+    sync.handle_ack(ack(), mav, now=0.6)
+    result = sync.result()
+    assert result['success'] and result['uploaded'] == 3
+
+
+def vehicle_readback(item):
+    """ArduPilot gibi: saklanmayan parametreler 0, konumsuz komutun frame'i GLOBAL, *_INT frame"""
+    c = mavutil.mavlink
+    if item['command'] == c.MAV_CMD_DO_SET_RELAY:
+        return make_item(item['seq'], item['command'], frame=c.MAV_FRAME_GLOBAL,
+                         param1=item['param1'], param2=item['param2'])
+    frame = {c.MAV_FRAME_GLOBAL_RELATIVE_ALT: c.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT}.get(item['frame'], item['frame'])
+    return make_item(item['seq'], item['command'], item['x'], item['y'], item['z'], frame,
+                     param1=int(item['param1']))
+
+
+def test_sync_skips_mission_normalised_by_vehicle():
+    """Araç öğeleri normalleştirerek geri verse de aynı görev yeniden yüklenmemeli"""
+    waypoints = [{'lat': 39.0 + i * 1e-4, 'lon': 32.0, 'alt': 50, 'param1': 2, 'param2': 5.0, 'param3': 1.0}
+                 for i in range(4)]
+    waypoints.insert(2, {'command': mavutil.mavlink.MAV_CMD_DO_SET_RELAY, 'param1': 0, 'param2': 1})
+    local = waypoints_to_items(waypoints)
+    onboard = [vehicle_readback(item) for item in local]
+    assert onboard[3]['frame'] != local[3]['frame'] and onboard[1]['param2'] == 0.0
+    mav = FakeMav()
+    sync = MissionSync(local)
+    sync.start(mav, 1, 1, now=0.0)
+    serve_download(sync, mav, onboard)
+    assert sync.result()['action'] == 'skip' and mav.counts == [] and mav.partial == []
+
+    # Saklanan bir alan farklıysa yine fark bulunmalı
+    onboard[3] = dict(onboard[3], param2=0.0)
+    mav = FakeMav()
+    sync = MissionSync(local)
+    sync.start(mav, 1, 1, now=0.0)
+    serve_download(sync, mav, onboard)
+    assert sync.action == 'partial' and mav.partial == [(3, 5)]
+
+
+def test_sync_full_upload_on_count_change():
+    """Öğe sayısı farklıysa tam yükleme yapılmalı"""
+    mav = FakeMav()
+    sync = MissionSync(grid_items(5))
+    sync.start(mav, 1, 1, now=0.0)
+    serve_download(sync, mav, grid_items(3))
+    assert sync.action == 'full'
+    assert mav.counts == [5]
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Full upload", test_full_upload),
+        ("Out of order and repeated", test_out_of_order_and_repeated),
+        ("Timeout retransmit and fail", test_timeout_retransmit_and_fail),
+        ("Vehicle error", test_vehicle_error),
+        ("Waypoints get home item", test_waypoints_get_home_item),
+        ("Pipelined download", test_pipelined_download),
+        ("Sync skips identical mission", test_sync_skips_identical_mission),
+        ("Sync uploads changed tail", test_sync_uploads_changed_tail),
+        ("Sync skips mission normalised by vehicle", test_sync_skips_mission_normalised_by_vehicle),
+        ("Sync full upload on count change", test_sync_full_upload_on_count_change),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Parametre indirme, disk önbelleği ve _HASH_CHECK doğrulaması testleri
+"""
+import sys
+import os
+import struct
+import tempfile
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.param_cache import (ParamCache, ParamDownload, ParamManager, HASH_CHECK_ID, DEFAULT_CACHE_DIR,
+                              param_set_hash, relay_instances, battery_low_percent)
+
+PARAMS = [('BATT_CAPACITY', 5000.0, 4), ('BATT_LOW_MAH', 1000.0, 4),
+          ('RELAY1_FUNCTION', 1.0, 2), ('RELAY2_FUNCTION', 0.0, 2), ('RELAY3_FUNCTION', 1.0, 2)]
+
+
+class FakeMav:
+    """Gönderilen parametre isteklerini kaydeder"""
+
+    def __init__(self):
+        self.list_requests = 0
+        self.reads = []
+
+    def param_request_list_send(self, ts, tc):
+        self.list_requests += 1
+
+    def param_request_read_send(self, ts, tc, name, index):
+        self.reads.append(name.decode() if index < 0 else index)
+
+
+def value(index, params=PARAMS):
+    name, val, ptype = params[index]
+    return types.SimpleNamespace(param_id=name, param_value=val, param_type=ptype,
+                                 param_count=len(params), param_index=index)
+
+
+def hash_value(h):
+    raw = struct.unpack('<f', struct.pack('<I', h))[0]
+    return types.SimpleNamespace(param_id=HASH_CHECK_ID, param_value=raw, param_type=6,
+                                 param_count=len(PARAMS), param_index=65535)
+
+
+def test_download_rerequests_missing_in_bulk():
+    mav = FakeMav()
+    download = ParamDownload(timeout=1.0)
+    download.start(mav, 1, 1, now=0.0)
+    for i in (0, 2, 4):
+        download.handle_value(value(i), now=0.1)
+    download.service(mav, now=0.5)
+    assert mav.reads == []  # Akış sürerken istek yok
+    download.service(mav, now=1.2)
+    assert mav.reads == [1, 3]
+    assert mav.list_requests == 1  # Baştan başlamadı
+    download.handle_value(value(1), now=1.3)
+    download.handle_value(value(3), now=1.3)
+    assert download.state == 'done'
+    assert [p[0] for p in download.params()] == [p[0] for p in PARAMS]
+
+
+def _px4_crc32part(data, crc):
+    """PX4/NuttX crc32part'ın bit bit karşılığı (ters çevirme yok)"""
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0xEDB88320 if crc & 1 else 0)
+    return crc
+
+
+def test_hash_matches_px4_crc32part():
+    expected = 0
+    for name, value, _ in PARAMS:
+        expected = _px4_crc32part(name.encode('ascii'), expected)
+        expected = _px4_crc32part(struct.pack('<f', value), expected)
+    assert param_set_hash([(n, v) for n, v, _ in PARAMS]) == expected
+    assert param_set_hash([]) == 0  # zlib.crc32 gibi tersleseydi 0 kalmazdı
+    # INT32 parametre: float alanındaki ham bitler hash'e aynen girer
+    raw = struct.unpack('<f', struct.pack('<i', 123456))[0]
+    assert param_set_hash([('SYS_AUTOSTART', raw)]) == _px4_crc32part(
+        struct.pack('<i', 123456), _px4_crc32part(b'SYS_AUTOSTART', 0))
+    assert os.path.isabs(DEFAULT_CACHE_DIR) and ParamCache().directory == DEFAULT_CACHE_DIR
+
+
+def test_cache_roundtrip_and_helpers():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParamCache(tmp)
+        h = cache.save(3, PARAMS)
+        assert h == param_set_hash([(n, v) for n, v, _ in PARAMS])
+        assert cache.load(3)['params'] == PARAMS
+        assert cache.load(3, 0x1234) is None
+        assert cache.load(4) is None
+    params = {name: val for name, val, _ in PARAMS}
+    assert relay_instances(params) == [0, 2]
+    assert relay_instances({'RELAY_PIN': 54, 'RELAY_PIN2': -1, 'RELAY_PIN3': 13}) == [0, 2]
+    assert battery_low_percent(params) == 20.0
+    assert battery_low_percent({}) is None
+
+
+def test_ardupilot_cache_then_background_refresh():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParamCache(tmp)
+        cache.save(1, PARAMS)
+        manager = ParamManager(cache)
+        mav = FakeMav()
+        event = manager.start(mav, 1, 1, now=0.0)
+        assert event['source'] == 'cache' and event['count'] == len(PARAMS)
+        assert manager.get('BATT_LOW_MAH') == 1000.0
+        assert mav.reads == [HASH_CHECK_ID]
+        # _HASH_CHECK yanıtsız: arka planda tam indirme
+        assert manager.service(mav, now=2.0) is None
+        assert manager.state == 'download' and mav.list_requests == 1
+        changed = list(PARAMS)
+        changed[1] = ('BATT_LOW_MAH', 1500.0, 4)
+        events = [manager.handle_value(value(i, changed), mav) for i in range(len(changed))]
+        assert events[:-1] == [None] * (len(changed) - 1)
+        assert events[-1]['source'] == 'vehicle' and events[-1]['changed'] == ['BATT_LOW_MAH']
+        assert manager.get('BATT_LOW_MAH') == 1500.0
+        assert cache.load(1)['params'][1] == ('BATT_LOW_MAH', 1500.0, 4)
+
+
+def test_hash_check_match_skips_download():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParamCache(tmp)
+        h = cache.save(1, PARAMS, set_hash=0xCAFEBABE)
+        manager = ParamManager(cache)
+        mav = FakeMav()
+        manager.start(mav, 1, 1, now=0.0)
+        event = manager.handle_value(hash_value(h), mav)
+        assert event['verified'] and event['changed'] == []
+        assert manager.state == 'ready'
+        assert manager.service(mav, now=5.0) is None
+        assert mav.list_requests == 0
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Download re-requests missing in bulk", test_download_rerequests_missing_in_bulk),
+        ("Hash matches PX4 crc32part", test_hash_matches_px4_crc32part),
+        ("Cache roundtrip and helpers", test_cache_roundtrip_and_helpers),
+        ("ArduPilot cache then background refresh", test_ardupilot_cache_then_background_refresh),
+        ("Hash check match skips download", test_hash_check_match_skips_download),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Artımlı kural motoru (alan bağımlılığı, histerezis, debounce, maliyet ölçümü) testleri
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.rule_engine import Rule, RuleEngine, above, battery_rule, below
+
+
+def make_engine(limits):
+    return RuleEngine([
+        below('gps', 'gps_fix', lambda: limits['gps_fix'], message='GPS sinyali zayıf: {gps_fix}'),
+        below('battery', 'battery', 20, hysteresis=3, message='Düşük batarya: %{battery}', on_delay=2.0),
+        above('temperature', 'temperature', 70, hysteresis=5),
+    ])
+
+
+def test_only_dependent_rules_are_evaluated():
+    limits = {'gps_fix': 3}
+    engine = make_engine(limits)
+    # VFR_HUD benzeri örnek: kuralların alanı yok, hiçbir kural değerlendirilmez
+    assert engine.update({'alt': 10.0, 'speed': 12.0, 'heading': 90}, now=0.0) == []
+    assert engine.stats['evaluations'] == 0
+
+    events = engine.update({'gps_fix': 1, 'satellites': 4}, now=0.1)
+    assert [(e['type'], e['active'], e['message']) for e in events] == [('gps', True, 'GPS sinyali zayıf: 1')]
+    assert engine.update({'gps_fix': 1}, now=0.2) == []  # Değişmeyen alan: değerlendirme yok
+    assert engine.rules['gps'].stats['evaluations'] == 1
+    assert engine.stats['unchanged_fields'] == 1
+
+    limits['gps_fix'] = 1  # Eşik dışarıdan değişebilir (ör. araç parametresi)
+    events = engine.update({'gps_fix': 3}, now=0.3)
+    assert [(e['type'], e['active']) for e in events] == [('gps', False)]
+    assert engine.active() == []
+
+
+def test_hysteresis_and_debounce():
+    engine = make_engine({'gps_fix': 3})
+    assert engine.update({'battery': 19}, now=0.0) == []
+    assert engine.time_until_next(1.0) == 1.0
+    assert engine.update({'battery': 21}, now=1.0) == []  # Süre dolmadan düzeldi: alarm yok
+    assert engine.update({'battery': 18}, now=1.5) == []
+    assert engine.poll(now=3.0) == []
+    events = engine.poll(now=3.5)
+    assert [(e['type'], e['active'], e['message']) for e in events] == [('battery', True, 'Düşük batarya: %18')]
+
+    assert engine.update({'battery': 21}, now=4.0) == []  # Histerezis bandı: hâlâ aktif
+    assert engine.active() == ['battery']
+    events = engine.update({'battery': 23}, now=4.5)
+    assert [(e['type'], e['active']) for e in events] == [('battery', False)]
+
+    assert [e['type'] for e in engine.update({'temperature': 71}, now=5.0)] == ['temperature']
+    assert engine.update({'temperature': 67}, now=5.1) == []
+    assert engine.active() == ['temperature']
+
+
+def test_multi_field_rule_and_cost_stats():
+    rule = Rule('battery_percent', ('battery', 'voltage'),
+                trip=lambda b, v: not (b == 0 and v == 0) and 0 <= b < 20,
+                message='Düşük batarya seviyesi: %{battery} ({voltage:.1f} V)')
+    engine = RuleEngine([rule])
+    assert engine.update({'battery': 10}, now=0.0) == []  # voltage henüz gelmedi
+    assert rule.stats['evaluations'] == 0
+    assert engine.update({'battery': 0, 'voltage': 0.0}, now=0.1) == []  # USB: veri yok
+    events = engine.update({'battery': 15, 'voltage': 11.1}, now=0.2)
+    assert events[0]['message'] == 'Düşük batarya seviyesi: %15 (11.1 V)'
+
+    stats = engine.get_stats()
+    assert stats['rules']['battery_percent']['evaluations'] == 2
+    assert stats['rules']['battery_percent']['mean_us'] > 0
+    assert stats['rules']['battery_percent']['active'] is True
+
+    engine.reset()
+    assert engine.active() == [] and engine.update({'battery': 15}, now=1.0) == []
+
+
+def test_battery_rule_exemptions_and_band():
+    limit = {'value': 20}
+    engine = RuleEngine([battery_rule('battery', lambda: limit['value'], message='Batarya: %{battery}')])
+    assert engine.update({'battery': 0, 'voltage': 0.0}, now=0.0) == []  # USB: veri yok
+    assert engine.update({'battery': -1, 'voltage': 12.0}, now=0.1) == []  # Araç bilmiyor
+    assert engine.update({'battery': 19, 'voltage': 11.0}, now=0.2)[0]['message'] == 'Batarya: %19'
+    assert engine.update({'battery': 22}, now=0.3) == [] and engine.active() == ['battery']  # Histerezis
+    assert engine.update({'battery': 23}, now=0.4) and engine.active() == []
+    limit['value'] = 30  # Eşik her değerlendirmede okunur
+    assert engine.update({'battery': 25}, now=0.5) and engine.active() == ['battery']
+    assert engine.update({'battery': -1}, now=0.6) and engine.active() == []  # Bilinmiyor: temizlenir
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Only dependent rules are evaluated", test_only_dependent_rules_are_evaluated),
+        ("Hysteresis and debounce", test_hysteresis_and_debounce),
+        ("Multi-field rule and cost stats", test_multi_field_rule_and_cost_stats),
+        ("Battery rule exemptions and band", test_battery_rule_exemptions_and_band),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -83,14 +83,8 @@ def test_csv_structure():
 
 def test_seek_functionality():
     """Test seek functionality with a small log"""
-    from PyQt6.QtCore import QCoreApplication
-    import sys
     import time
     
-    # Create minimal Qt application if needed
-    if not QCoreApplication.instance():
-        app = QCoreApplication(sys.argv)
-    
     # Create test CSV
     fd, test_csv = tempfile.mkstemp(suffix='.csv', text=True)
     
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Mesaj yayın hızı yöneticisi testleri
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from core.stream_rates import StreamRateManager
+
+
+class FakeMav:
+    """Gönderilen istekleri kaydeden sahte mav nesnesi"""
+
+    def __init__(self):
+        self.intervals = {}
+        self.streams = {}
+
+    def command_long_send(self, target_system, target_component, command, confirmation,
+                          p1, p2, p3, p4, p5, p6, p7):
+        assert command == mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL
+        self.intervals[int(p1)] = p2
+
+    def request_data_stream_send(self, target_system, target_component, stream_id, rate, start):
+        self.streams[stream_id] = rate
+
+
+class FakeAck:
+    def __init__(self, command, result):
+        self.command = command
+        self.result = result
+
+
+def _service_all(manager, mav, now=0.0):
+    while manager.service(mav, 1, 1, now=now):
+        pass
+
+
+def test_subscribed_and_demands():
+    """Abonesi olmayan yayınlar kapanmalı, talepler taban hızı yükseltmeli"""
+    manager = StreamRateManager()
+    manager.set_subscribed({'ATTITUDE', 'HEARTBEAT', 'COMMAND_ACK'})
+    manager.request('hud', 'ATTITUDE', 20.0)
+    mav = FakeMav()
+    _service_all(manager, mav)
+    assert mav.intervals[mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE] == 1e6 / 20.0
+    assert mav.intervals[mavutil.mavlink.MAVLINK_MSG_ID_RAW_IMU] == -1
+    assert mavutil.mavlink.MAVLINK_MSG_ID_HEARTBEAT not in mav.intervals
+    # Talep kalkınca taban hıza dönmeli, yalnızca değişen mesaj gönderilmeli
+    manager.release('hud')
+    mav = FakeMav()
+    _service_all(manager, mav)
+    assert mav.intervals == {mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE: 1e6 / 4.0}
+
+
+def test_reassert_after_invalidate():
+    """Yeniden bağlantıdan sonra tüm hızlar tekrar gönderilmeli"""
+    manager = StreamRateManager()
+    manager.set_subscribed({'VFR_HUD'})
+    _service_all(manager, FakeMav())
+    manager.invalidate()
+    mav = FakeMav()
+    _service_all(manager, mav)
+    assert mav.intervals[mavutil.mavlink.MAVLINK_MSG_ID_VFR_HUD] == 1e6 / 4.0
+    assert len(mav.intervals) > 1
+
+
+def test_fallback_to_data_streams():
+    """ACK gelmezse REQUEST_DATA_STREAM ile grup bazında hız istenmeli"""
+    manager = StreamRateManager()
+    manager.set_subscribed({'ATTITUDE', 'VFR_HUD'})
+    manager.request('hud', 'ATTITUDE', 20.0)
+    manager.service(FakeMav(), 1, 1, now=0.0)
+    mav = FakeMav()
+    _service_all(manager, mav, now=manager.ACK_TIMEOUT + 1)
+    assert manager.use_message_interval is False
+    assert mav.streams[mavutil.mavlink.MAV_DATA_STREAM_EXTRA1] == 20
+    assert mav.streams[mavutil.mavlink.MAV_DATA_STREAM_EXTRA2] == 4
+    assert mav.streams[mavutil.mavlink.MAV_DATA_STREAM_RAW_SENSORS] == 0
+
+
+def test_ack_accepts_message_interval():
+    """Kabul edilen ACK yöntemi kesinleştirmeli, timeout sonrası fallback olmamalı"""
+    manager = StreamRateManager()
+    manager.set_subscribed({'ATTITUDE'})
+    manager.service(FakeMav(), 1, 1, now=0.0)
+    cmd = mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL
+    assert manager.handle_ack(FakeAck(cmd, mavutil.mavlink.MAV_RESULT_ACCEPTED))
+    assert not manager.handle_ack(FakeAck(400, mavutil.mavlink.MAV_RESULT_ACCEPTED))
+    _service_all(manager, FakeMav(), now=100.0)
+    assert manager.use_message_interval is True
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Subscribed and demands", test_subscribed_and_demands),
+        ("Reassert after invalidate", test_reassert_after_invalidate),
+        ("Fallback to data streams", test_fallback_to_data_streams),
+        ("ACK accepts message interval", test_ack_accepts_message_interval),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
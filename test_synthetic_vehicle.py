@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Sentetik MAVLink aracı (yayın hızları, görev/komut/parametre protokolleri, hata ekleme) testleri
+"""
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+from core.synthetic_vehicle import SyntheticVehicle, open_transport, run
+from core.mission_transfer import MissionUpload, MissionDownload, make_item, mission_hash
+
+
+class Link:
+    """Araç ile GCS tarafı MAVLink nesnesini bellekte birbirine bağlar"""
+
+    def __init__(self, **kwargs):
+        self.to_gcs = []
+        self.to_vehicle = []
+        self.vehicle = SyntheticVehicle(self.to_gcs.append, now=0.0, seed=1, **kwargs)
+        self.gcs = mavlink.MAVLink(self, srcSystem=255, srcComponent=190)
+        self.gcs.robust_parsing = True  # Bozuk paketler BAD_DATA olarak döner
+        self.now = 0.0
+
+    def write(self, buf):
+        self.to_vehicle.append(buf)
+
+    def pump(self, seconds=0.0, dt=0.01):
+        """Zamanı ilerlet; GCS'ye gelen mesajları döndür"""
+        received = []
+        end = self.now + seconds
+        while True:
+            while self.to_vehicle:
+                self.vehicle.handle_bytes(self.to_vehicle.pop(0))
+            self.vehicle.step(self.now)
+            data, self.to_gcs[:] = b''.join(self.to_gcs), []
+            received.extend(self.gcs.parse_buffer(data) or [])
+            if self.now >= end and not self.to_vehicle:
+                return received
+            self.now = min(end, self.now + dt) if self.now < end else self.now
+
+
+def count(messages, msg_type):
+    return sum(1 for m in messages if m.get_type() == msg_type)
+
+
+def test_stream_rates_and_message_interval():
+    link = Link(streams={'ATTITUDE': 100.0, 'GPS_RAW_INT': 10.0})
+    messages = link.pump(1.0, dt=0.001)
+    assert 95 <= count(messages, 'ATTITUDE') <= 101, count(messages, 'ATTITUDE')
+    assert 9 <= count(messages, 'GPS_RAW_INT') <= 11
+    assert 1 <= count(messages, 'HEARTBEAT') <= 2
+    link.gcs.command_long_send(1, 1, mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL, 0,
+                               mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE, 1e6 / 20, 0, 0, 0, 0, 0)
+    messages = link.pump(1.0, dt=0.001)
+    acks = [m for m in messages if m.get_type() == 'COMMAND_ACK']
+    assert acks and acks[0].result == mavutil.mavlink.MAV_RESULT_ACCEPTED
+    assert 18 <= count(messages, 'ATTITUDE') <= 22, count(messages, 'ATTITUDE')
+
+
+def test_mission_upload_and_download():
+    link = Link()
+    items = [make_item(0, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT, 40.0, 29.0, 0.0,
+                       frame=mavutil.mavlink.MAV_FRAME_GLOBAL)]
+    items += [make_item(i, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT, 40.0 + i * 1e-3, 29.0, 80.0) for i in range(1, 30)]
+    upload = MissionUpload(items)
+    upload.start(link.gcs, 1, 1, now=0.0)
+    for _ in range(200):
+        for msg in link.pump(0.01):
+            if msg.get_type() == 'MISSION_REQUEST_INT':
+                upload.handle_request(msg, link.gcs, now=link.now)
+            elif msg.get_type() == 'MISSION_ACK':
+                upload.handle_ack(msg, link.gcs, now=link.now)
+        if not upload.active:
+            break
+    assert upload.state == 'done', upload.error
+    assert len(link.vehicle.mission) == 30
+
+    download = MissionDownload()
+    download.start(link.gcs, 1, 1, now=link.now)
+    for _ in range(200):
+        for msg in link.pump(0.01):
+            if msg.get_type() == 'MISSION_COUNT':
+                download.handle_count(msg, link.gcs, now=link.now)
+            elif msg.get_type() == 'MISSION_ITEM_INT':
+                download.handle_item(msg, link.gcs, now=link.now)
+        if not download.active:
+            break
+    assert download.state == 'done'
+    assert mission_hash(download.mission()) == mission_hash(items)
+
+
+def test_arm_takeoff_and_auto_mission():
+    link = Link(streams={'GLOBAL_POSITION_INT': 1.0})
+    link.vehicle.mission += [make_item(1, mavutil.mavlink.MAV_CMD_NAV_TAKEOFF, z=30.0),
+                             make_item(2, mavutil.mavlink.MAV_CMD_NAV_WAYPOINT, 40.003, 29.0, 30.0),
+                             make_item(3, mavutil.mavlink.MAV_CMD_DO_SET_RELAY,
+                                       frame=mavutil.mavlink.MAV_FRAME_MISSION, param1=1, param2=1)]
+    link.gcs.command_long_send(1, 1, mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM, 0, 1, 0, 0, 0, 0, 0, 0)
+    link.gcs.command_long_send(1, 1, mavutil.mavlink.MAV_CMD_MISSION_START, 0, 0, 0, 0, 0, 0, 0, 0)
+    messages = link.pump(60.0, dt=0.05)
+    acks = [m.result for m in messages if m.get_type() == 'COMMAND_ACK']
+    assert acks == [mavutil.mavlink.MAV_RESULT_ACCEPTED] * 2, acks
+    reached = [m.seq for m in messages if m.get_type() == 'MISSION_ITEM_REACHED']
+    assert reached == [1, 2, 3], reached
+    assert link.vehicle.relays == {1: 1}
+    heartbeat = [m for m in messages if m.get_type() == 'HEARTBEAT'][-1]
+    assert heartbeat.base_mode & mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED
+    assert abs(link.vehicle.model.alt - 30.0) < 2.0
+
+
+def test_param_list_and_faults():
+    link = Link(extra_params=100, streams={}, hash_check=True)
+    link.gcs.param_request_list_send(1, 1)
+    messages = link.pump(0.2)
+    values = [m for m in messages if m.get_type() == 'PARAM_VALUE']
+    assert len(values) == len(link.vehicle.params) and values[-1].param_count == len(values)
+
+    lossy = Link(streams={'ATTITUDE': 100.0}, loss=0.3, corrupt=0.1)
+    messages = lossy.pump(2.0, dt=0.001)
+    stats = lossy.vehicle.get_stats()
+    assert stats['dropped'] > 20 and stats['corrupted'] > 5
+    assert count(messages, 'BAD_DATA') > 0
+    assert count(messages, 'ATTITUDE') < 200 - stats['dropped'] + 1
+
+
+def test_run_stops_on_event_and_closed_transport():
+    transport = open_transport('udpout:127.0.0.1:9')
+    vehicle = SyntheticVehicle(transport.write, streams={'ATTITUDE': 10.0})
+    stop = threading.Event()
+    threading.Timer(0.2, stop.set).start()
+    start = time.monotonic()
+    stats = run(vehicle, transport, report_interval=0, stop=stop)
+    assert time.monotonic() - start < 1.0 and stats['tx_packets'] > 0
+
+    # Taşıyıcı başka thread'den kapatılınca döngü istisnasız biter
+    errors = []
+    threading.excepthook, hook = (lambda args: errors.append(args.exc_value)), threading.excepthook
+    try:
+        runner = threading.Thread(target=run, args=(vehicle, transport),
+                                  kwargs={'report_interval': 0}, daemon=True)
+        runner.start()
+        time.sleep(0.2)
+        transport.close()
+        runner.join(2.0)
+        assert not runner.is_alive() and errors == [], errors
+    finally:
+        threading.excepthook = hook
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Stream rates and message interval", test_stream_rates_and_message_interval),
+        ("Mission upload and download", test_mission_upload_and_download),
+        ("Arm, takeoff and auto mission", test_arm_takeoff_and_auto_mission),
+        ("Param list and faults", test_param_list_and_faults),
+        ("Run stops on event and closed transport", test_run_stops_on_event_and_closed_transport),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
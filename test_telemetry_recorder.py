@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Dağıtım katmanına bağlı telemetri kaydı testleri: kaynak hızında satır, araç/alım zamanı, geniş tablo
+"""
+import sys
+import os
+import csv
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+from core.data_logger import CSV_HEADERS, DataLogger
+from core.mavlink_thread import MAVLinkThread
+from core.telemetry_recorder import TelemetryRecorder
+
+
+def _messages(sysid=1):
+    mav = mavlink.MAVLink(None, srcSystem=sysid, srcComponent=1)
+    buf = mav.heartbeat_encode(mavutil.mavlink.MAV_TYPE_QUADROTOR, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                               0, 3, mavutil.mavlink.MAV_STATE_ACTIVE).pack(mav)  # custom_mode 3 = AUTO
+    for i in range(10):
+        buf += mav.attitude_encode(1000 + i * 10, 0.1, -0.1, 1.0, 0, 0, 0).pack(mav)
+        if i % 5 == 4:
+            buf += mav.vfr_hud_encode(12.0, 11.5, 90, 50, 30.0 + i, -1.25).pack(mav)
+    buf += mav.gps_raw_int_encode(0, 3, 401234567, 291234567, 35000, 100, 100, 1150, 9000, 14).pack(mav)
+    buf += mav.sys_status_encode(0, 0, 0, 500, 12600, 250, 87, 0, 0, 0, 0, 0, 0).pack(mav)
+    return mavlink.MAVLink(None).parse_buffer(buf)
+
+
+def _record(messages, batch=None, **logger_args):
+    with tempfile.TemporaryDirectory() as directory:
+        thread = MAVLinkThread()
+        logger = DataLogger(directory=directory, **logger_args)
+        recorder = TelemetryRecorder(thread, logger)
+        recorder.attach()
+        for msg in messages[:3]:
+            thread._process_message(msg)  # Kayıt kapalıyken yazılmaz
+        logger.start_logging()
+        for i, msg in enumerate(messages):
+            if batch and i % batch == 0:
+                thread.rx_time = time.monotonic()  # Okuma döngüsü her batch'in alım anını yazar
+                time.sleep(0.002)
+            thread._process_message(msg)
+        path = logger.filename
+        logger.stop_logging()
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        return thread, recorder, rows
+
+
+def test_every_message_at_source_rate():
+    thread, recorder, rows = _record(_messages())
+    assert recorder.rows == {'HEARTBEAT': 1, 'ATTITUDE': 10, 'VFR_HUD': 2, 'GPS_RAW_INT': 1, 'SYS_STATUS': 1}
+    assert [r['Source'] for r in rows[:3]] == ['HEARTBEAT', 'ATTITUDE', 'ATTITUDE']
+    attitudes = [r for r in rows if r['Source'] == 'ATTITUDE']
+    assert [r['Vehicle Time (ms)'] for r in attitudes] == [str(1000 + i * 10) for i in range(10)]
+    assert rows[0]['Vehicle Time (ms)'] == ''  # HEARTBEAT'te araç zamanı yok
+    receive = [float(r['Receive Time']) for r in rows]
+    assert receive == sorted(receive) and all(float(r['Timestamp']) >= 0 for r in rows)
+
+
+def test_receive_time_is_batch_time():
+    messages = _messages()
+    _, _, rows = _record(messages, batch=4)
+    # Kayıt açıldıktan sonraki satırlar; aynı batch'teki mesajlar aynı alım anını taşır
+    receive = [r['Receive Time'] for r in rows]
+    batches = [receive[i:i + 4] for i in range(0, len(receive), 4)]
+    assert all(len(set(b)) == 1 for b in batches), receive
+    assert len(set(receive)) == len(batches)
+
+
+def test_wide_table_holds_last_values():
+    _, _, rows = _record(_messages())
+    first_hud = next(r for r in rows if r['Source'] == 'VFR_HUD')
+    assert first_hud['Vertical Speed'] == '-1.25' and first_hud['Altitude'] == '34.0'
+    last = rows[-1]
+    assert last['Source'] == 'SYS_STATUS' and last['Battery Voltage'] == '12.6' and last['Battery Remaining'] == '87'
+    # Önceki mesajların son değerleri aynı satırda
+    assert last['Flight Mode'] == 'AUTO' and last['System Status'] == 'ACTIVE'
+    assert last['GPS Fix Type'] == '3' and last['GPS Satellites'] == '14' and last['Latitude'] == '40.1234567'
+    assert abs(float(last['Roll']) - 5.7296) < 1e-3 and last['Data Loss'] == '0.0'
+    assert rows[0]['Roll'] == '' and list(rows[0]) == CSV_HEADERS
+
+
+def test_inactive_vehicle_and_detach():
+    messages = _messages(sysid=1)
+    other = _messages(sysid=2)
+    thread, recorder, rows = _record(messages + other[1:])
+    assert recorder.rows['ATTITUDE'] == 10  # Aktif olmayan aracın örnekleri yazılmaz
+    handler = recorder._handlers['ATTITUDE']
+    assert handler in thread.dispatcher._handlers['ATTITUDE']
+    recorder.detach()
+    assert 'ATTITUDE' in thread.dispatcher.subscribed_types()  # Thread'in kendi işleyicisi kalır
+    assert handler not in thread.dispatcher._handlers.get('ATTITUDE', ())
+    assert len(thread.dispatcher._handlers['ATTITUDE']) == 1
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Every message at source rate", test_every_message_at_source_rate),
+        ("Receive time is batch time", test_receive_time_is_batch_time),
+        ("Wide table holds last values", test_wide_table_holds_last_values),
+        ("Inactive vehicle and detach", test_inactive_vehicle_and_detach),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Birleştirilmiş (coalesced) telemetri yayını testleri
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.telemetry_snapshot import TelemetrySnapshot, TelemetryPublisher
+
+
+def test_coalescing():
+    """Aynı alana gelen ara örnekler tek değere birleşmeli"""
+    snap = TelemetrySnapshot()
+    pub = TelemetryPublisher(snap, rate_hz=20.0)
+    for i in range(50):
+        snap.update('attitude', {'roll': float(i), 'pitch': 1.0})
+    seq, frame = pub.poll(now=1.0)
+    assert seq == 1
+    assert frame['attitude']['roll'] == 49.0
+    assert snap.stats['updates'] == 50
+    assert snap.stats['coalesced'] == 98  # 49 roll + 49 pitch üzerine yazıldı
+    # Değişiklik yoksa yeni çerçeve yok
+    pub.mark_consumed(seq)
+    assert pub.poll(now=2.0) is None
+
+
+def test_rate_limit():
+    """Yayın aralığı dolmadan ikinci çerçeve gönderilmemeli"""
+    snap = TelemetrySnapshot()
+    pub = TelemetryPublisher(snap, rate_hz=10.0)
+    snap.update('telemetry', {'alt': 1})
+    seq, _ = pub.poll(now=0.0)
+    pub.mark_consumed(seq)
+    snap.update('telemetry', {'alt': 2})
+    assert pub.poll(now=0.05) is None
+    assert pub.poll(now=0.11) is not None
+
+
+def test_backlog_gating():
+    """Arayüz çerçeveleri onaylamadıkça backlog sınırı aşılmamalı"""
+    snap = TelemetrySnapshot()
+    pub = TelemetryPublisher(snap, rate_hz=100.0, max_backlog=2)
+    now = 0.0
+    published = 0
+    for _ in range(20):
+        snap.update('position', {'lat': now})
+        if pub.poll(now) is not None:
+            published += 1
+        now += 0.02
+    assert published == 2
+    assert pub.backlog == 2
+    assert snap.stats['skipped_backlog'] > 0
+    pub.mark_consumed(2)
+    assert pub.poll(now) is not None
+
+
+def test_sample_listener():
+    """Logger kanalı birleştirmeden bağımsız olarak her örneği almalı"""
+    snap = TelemetrySnapshot()
+    samples = []
+    snap.add_listener(lambda ch, data: samples.append((ch, data)))
+    for i in range(5):
+        snap.update('attitude', {'roll': i})
+    assert len(samples) == 5
+    assert samples[-1] == ('attitude', {'roll': 4})
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Coalescing", test_coalescing),
+        ("Rate limit", test_rate_limit),
+        ("Backlog gating", test_backlog_gating),
+        ("Sample listener", test_sample_listener),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+.tlog oynatma bağlantısı (çerçeve ayrıştırma, N kat hız zamanlaması, duraklatma) testleri
+"""
+import sys
+import os
+import struct
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+from core.tlog_replay import TlogReplayConnection, iter_tlog
+
+
+def tlog_bytes(timestamps):
+    mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    out = b''
+    for i, t in enumerate(timestamps):
+        out += struct.pack('>Q', int(t * 1e6))
+        out += mav.attitude_encode(i, 0.1 * i, 0, 0, 0, 0, 0).pack(mav)
+    return out
+
+
+def write_tlog(tmp, data):
+    path = os.path.join(tmp, 'replay.tlog')
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_iter_tlog_frames_and_resync():
+    data = tlog_bytes([100.0, 100.5])
+    frames = list(iter_tlog(b'\x01\x02\x03' + data + data[:20]))
+    assert len(frames) == 2, len(frames)
+    assert abs(frames[1][0] - 100.5) < 1e-6
+    messages = mavlink.MAVLink(None).parse_buffer(b''.join(f[1] for f in frames))
+    assert [m.time_boot_ms for m in messages] == [0, 1]
+
+
+def test_as_fast_as_possible_replays_everything():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = TlogReplayConnection(write_tlog(tmp, tlog_bytes([10.0 + i for i in range(50)])), speed=0)
+        assert conn.time_until_ready() == 0.0
+        messages = conn.mav.parse_buffer(conn.recv(1 << 20))
+        assert len(messages) == 50
+        assert conn.recv(4096) == b''
+        assert conn.finished and conn.time_until_ready() == float('inf')
+        conn.write(b'\x00')
+        stats = conn.get_stats()
+        assert stats['packets'] == 50 and stats['discarded_writes'] == 1
+        conn.close()
+
+
+def test_realtime_pacing_and_pause():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = TlogReplayConnection(write_tlog(tmp, tlog_bytes([0.0, 5.0])), speed=1.0)
+        assert len(conn.mav.parse_buffer(conn.recv(4096))) == 1
+        assert conn.time_until_ready() > 4.0
+        assert conn.recv(4096) == b''
+        conn.set_speed(1000.0)  # Zamanlama o anki konumdan yeniden eşlenir
+        conn.set_paused(True)
+        assert conn.recv(4096) == b'' and conn.time_until_ready() == float('inf')
+        conn.set_paused(False)
+        deadline = time.monotonic() + 1.0
+        data = b''
+        while not data and time.monotonic() < deadline:
+            data = conn.recv(4096)
+        assert len(conn.mav.parse_buffer(data)) == 1
+        conn.close()
+
+
+def test_empty_file_finishes_immediately():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = TlogReplayConnection(write_tlog(tmp, b''))
+        assert conn.recv(4096) == b''
+        assert conn.time_until_ready() == float('inf') and conn.finished
+        conn.close()
+
+
+def test_replay_connects_without_heartbeat_wait():
+    """Oynatma heartbeat beklemeden açılır; heartbeat öncesi paketler de dağıtılır"""
+    from pymavlink import mavutil
+    from core.mavlink_thread import MAVLinkThread
+
+    mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    data = tlog_bytes([i * 0.1 for i in range(10)])
+    data += struct.pack('>Q', int(7.0 * 1e6)) + mav.heartbeat_encode(
+        mavutil.mavlink.MAV_TYPE_FIXED_WING, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA, 0, 0, 0).pack(mav)
+    thread = MAVLinkThread()
+    attitudes = []
+    thread.subscribe('ATTITUDE', attitudes.append)
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            start = time.monotonic()
+            assert thread.connect_replay(write_tlog(tmp, data), 1.0)  # İlk heartbeat 7 s sonra
+            assert time.monotonic() - start < 0.5
+            assert thread.connection.get_stats()['packets'] == 0 and thread.vehicles.get(1) is None
+            thread.set_replay_speed(0)
+            thread.start()
+            deadline = time.monotonic() + 2.0
+            while thread.replay and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert not thread.replay
+            assert [m.time_boot_ms for m in attitudes] == list(range(10))
+            assert thread.vehicles.get(1) is not None  # Heartbeat dağıtımda aracı ekledi
+        finally:
+            thread.stop()
+            thread.wait(2000)
+            thread.bus.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Iter tlog frames and resync", test_iter_tlog_frames_and_resync),
+        ("As fast as possible replays everything", test_as_fast_as_possible_replays_everything),
+        ("Realtime pacing and pause", test_realtime_pacing_and_pause),
+        ("Empty file finishes immediately", test_empty_file_finishes_immediately),
+        ("Replay connects without heartbeat wait", test_replay_connects_without_heartbeat_wait),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
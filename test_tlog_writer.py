@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Ham .tlog kaydı (arka plan yazıcı thread'i, fsync, pymavlink ile geri okuma) testleri
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import ardupilotmega as mavlink
+from core.tlog_writer import TlogWriter
+
+
+def parsed_batch(count):
+    mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    buf = b''.join(mav.attitude_encode(i, 0.1 * i, 0, 0, 0, 0, 0).pack(mav) for i in range(count))
+    return mavlink.MAVLink(None).parse_buffer(buf)
+
+
+def test_written_file_is_readable_by_pymavlink():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'test.tlog')
+        writer = TlogWriter(path, fsync_interval=0.0)
+        writer.start()
+        writer.record(parsed_batch(5), timestamp=1000.0)
+        writer.record(parsed_batch(3) + [mavlink.MAVLink_bad_data(b'\x00', 'x')], timestamp=1001.5)
+        writer.stop()
+        stats = writer.get_stats()
+        assert stats['packets'] == 8 and stats['batches'] == 2 and stats['pending'] == 0
+        assert stats['fsyncs'] >= 1
+        log = mavutil.mavlink_connection(path)
+        messages = []
+        while True:
+            msg = log.recv_match(type='ATTITUDE')
+            if msg is None:
+                break
+            messages.append(msg)
+        log.close()
+        assert len(messages) == 8
+        assert abs(messages[0]._timestamp - 1000.0) < 1e-6
+        assert abs(messages[-1]._timestamp - 1001.5) < 1e-6
+
+
+def test_record_is_ignored_when_stopped_and_bounded():
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = TlogWriter(os.path.join(tmp, 'test.tlog'))
+        writer.record(parsed_batch(1))
+        assert writer.get_stats()['pending'] == 0
+        writer.start()
+        writer.MAX_PENDING_BATCHES = 0
+        writer.record(parsed_batch(1))
+        assert writer.get_stats()['dropped_batches'] == 1
+        writer.stop()
+
+
+if __name__ == '__main__':
+    tests = [
+        ("Written file is readable by pymavlink", test_written_file_is_readable_by_pymavlink),
+        ("Record is ignored when stopped and bounded", test_record_is_ignored_when_stopped_and_bounded),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
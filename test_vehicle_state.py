@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Çoklu araç durumu (sysid bazında VehicleState ve VehicleRegistry) testleri
+"""
+import sys
+import os
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pymavlink import mavutil
+from core.vehicle_state import VehicleRegistry
+
+
+def heartbeat(mav_type, custom_mode, armed=False):
+    base_mode = mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED if armed else 0
+    return types.SimpleNamespace(type=mav_type, autopilot=mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                                 base_mode=base_mode, custom_mode=custom_mode)
+
+
+def test_first_vehicle_becomes_active():
+    registry = VehicleRegistry()
+    assert registry.active_sysid is None
+    first = registry.add(1, 1)
+    second = registry.add(2, 1)
+    assert registry.active is first and registry.active_sysid == 1
+    assert registry.add(2, 1) is second
+    assert registry.sysids() == [1, 2]
+    assert registry.select(2) is second and registry.active_sysid == 2
+    assert registry.select(9) is None and registry.active_sysid == 2
+
+
+def test_lookup_table_is_copied_on_add():
+    registry = VehicleRegistry()
+    registry.add(1, 1)
+    table = registry._vehicles
+    registry.add(2, 1)
+    assert 2 not in table  # Okuyucunun elindeki tablo değişmez
+    assert registry.get(2) is not None
+
+
+def test_per_vehicle_state_and_summary():
+    registry = VehicleRegistry()
+    plane = registry.add(1, 1)
+    copter = registry.add(2, 1)
+    assert plane.update_heartbeat(heartbeat(mavutil.mavlink.MAV_TYPE_FIXED_WING, 10, armed=True), 100.0) == 'AUTO'
+    assert copter.update_heartbeat(heartbeat(mavutil.mavlink.MAV_TYPE_QUADROTOR, 6), 100.0) == 'RTL'
+    assert plane.armed and not copter.armed
+    assert copter.mode_family == 'copter'
+    copter.snapshot.update('position', {'lat': 41.1, 'lon': 29.0, 'alt': 12.0, 'heading': 90})
+    summaries = {v['sysid']: v for v in registry.summaries()}
+    assert summaries[1]['active'] and not summaries[2]['active']
+    assert summaries[2]['lat'] == 41.1 and summaries[2]['mode'] == 'RTL'
+    assert summaries[1]['lat'] is None
+
+
+if __name__ == '__main__':
+    tests = [
+        ("First vehicle becomes active", test_first_vehicle_becomes_active),
+        ("Lookup table is copied on add", test_lookup_table_is_copied_on_add),
+        ("Per-vehicle state and summary", test_per_vehicle_state_and_summary),
+    ]
+    passed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"{name}: PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"{name}: FAILED {e}")
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QTabWidget, QSplitter, QMessageBox, QScrollArea, QDialog)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QEvent
 import time
 import os
 from datetime import datetime
@@ -10,6 +10,8 @@ import math
 # Core components
 from core.mavlink_thread import MAVLinkThread
 from core.data_logger import DataLogger
+from core.log_journal import recover_journals
+from core.telemetry_recorder import TelemetryRecorder
 from core.safety_manager import SafetyManager
 from core.log_replay_thread import LogReplayThread
 from core.video_replay_thread import VideoReplayThread
@@ -46,13 +48,16 @@ class LaggerGCS(QMainWindow):
         self.flight_start_time = None
         self.event_history = []  # Olay geçmişi - sınırlı boyut
         self.last_telemetry = {}  # <-- Son telemetri değerlerini sakla
+        self._hall_verify_pending = False  # Yük bırakma Hall doğrulaması bekleniyor mu
         
         # Spam önleme için önceki uyarıları takip et
         self.previous_warnings = {}  # {warning_type: last_message}
         self.warning_cooldown = 30  # 30 saniye bekleme süresi
         
         # Managers and Loggers
-        self.data_logger = DataLogger()
+        # Önceki çalıştırma çöktüyse yarım kalan kayıt oturumları kurtarılır
+        self.recovered_logs = recover_journals()
+        self.data_logger = DataLogger(journal=True)
         self.mission_planner = MissionPlanner()
         
         # API anahtarını environment variable'dan al
@@ -70,6 +75,8 @@ class LaggerGCS(QMainWindow):
         self.video_replay_thread = None
         self.log_file_path = None
         self.video_file_path = None
+        self.tlog_replay_path = None  # .tlog canlı MAVLink hattından oynatılır
+        self._link_state = None  # Son bağlantı gözetmeni durumu
 
         self.initUI()
         self.connect_signals()
@@ -88,6 +95,8 @@ class LaggerGCS(QMainWindow):
         self.flight_panel = FlightPanel()
         self.flight_panel.setFixedHeight(400)
         self.control_panel = ControlPanel(self.data_logger)
+        for info in self.recovered_logs:
+            self.control_panel.log_message(f"Çökme sonrası kayıt kurtarıldı: {info['csv']} ({info['rows']} satır)")
         left_column.addWidget(self.flight_panel, 3)
         left_column.addWidget(self.control_panel, 2)
 
@@ -104,7 +113,7 @@ class LaggerGCS(QMainWindow):
         center_column.addWidget(scroll_area, 1)
 
         # Right Column
-        right_column_tabs = QTabWidget()
+        self.right_column_tabs = QTabWidget()
         self.connection_panel = ConnectionPanel()
         self.telemetry_panel = TelemetryPanel()
         self.otonomi_panel = OtonomiPanel()
@@ -114,16 +123,16 @@ class LaggerGCS(QMainWindow):
         teknofest_scroll = QScrollArea()
         teknofest_scroll.setWidget(self.teknofest_panel)
         teknofest_scroll.setWidgetResizable(True)
-        right_column_tabs.addTab(self.connection_panel, "Bağlantı")
-        right_column_tabs.addTab(self.telemetry_panel, "Telemetri")
-        right_column_tabs.addTab(self.otonomi_panel, "Eylemler")
-        right_column_tabs.addTab(teknofest_scroll, "Teknofest")
-        right_column_tabs.addTab(self.loglama_panel, "Loglama")  # <-- yeni sekme
+        self.right_column_tabs.addTab(self.connection_panel, "Bağlantı")
+        self.right_column_tabs.addTab(self.telemetry_panel, "Telemetri")
+        self.right_column_tabs.addTab(self.otonomi_panel, "Eylemler")
+        self.right_column_tabs.addTab(teknofest_scroll, "Teknofest")
+        self.right_column_tabs.addTab(self.loglama_panel, "Loglama")  # <-- yeni sekme
         # Main Splitter
         splitter = QSplitter(Qt.Orientation.Horizontal)
         splitter.addWidget(left_column_widget)
         splitter.addWidget(center_column_widget)
-        splitter.addWidget(right_column_tabs)
+        splitter.addWidget(self.right_column_tabs)
         splitter.setSizes([750, 750, 420])
         main_layout.addWidget(splitter)
         
@@ -137,6 +146,19 @@ class LaggerGCS(QMainWindow):
         self.safety_timer.timeout.connect(self.check_safety_status)
         self.safety_timer.start(5000)  # 5 saniye (1 saniye yerine)
         
+        # Link istatistikleri tablosu (yalnızca bağlıyken çalışır)
+        self.link_stats_timer = QTimer(self)
+        self.link_stats_timer.timeout.connect(self.refresh_link_stats)
+        
+        # Yük bırakma Hall doğrulaması zaman aşımı (doğrulanınca/yeniden başlatılınca durdurulur)
+        self.hall_verify_timer = QTimer(self)
+        self.hall_verify_timer.setSingleShot(True)
+        self.hall_verify_timer.timeout.connect(self._on_hall_verify_timeout)
+        
+        # Görünür bileşenlere göre MAVLink yayın hızı talepleri
+        self.right_column_tabs.currentChanged.connect(self.update_stream_demands)
+        self.update_stream_demands()
+        
         # MissionPlanner'ın map_panel referansını ayarla
         self.mission_planner.map_panel = self.map_panel
 
@@ -145,6 +167,8 @@ class LaggerGCS(QMainWindow):
         self.connection_panel.connect_clicked.connect(self.try_connect)
         self.connection_panel.disconnect_clicked.connect(self.try_disconnect)
         self.connection_panel.simulation_clicked.connect(self.start_simulation_mode)
+        self.connection_panel.vehicle_selected.connect(self.handle_vehicle_selected)
+        self.connection_panel.router_endpoint_added.connect(self.handle_router_endpoint_added)
         self.connection_panel.start_payload_mission_btn.clicked.connect(self.start_payload_mission)
         
         # Control Panel Signals
@@ -169,12 +193,24 @@ class LaggerGCS(QMainWindow):
         self.map_panel.map_clicked.connect(self.mission_panel.on_map_click)
         
         # MAVLink Thread Signals
+        self.mavlink_thread.telemetry_frame.connect(self.handle_telemetry_frame)
         self.mavlink_thread.telemetry_received.connect(self.handle_telemetry)
         self.mavlink_thread.attitude_received.connect(self.handle_attitude)
         self.mavlink_thread.position_received.connect(self.handle_position)
+        # Logger her mesajı dağıtım katmanından kaynak hızında alır (arayüz hızından bağımsız)
+        self.telemetry_recorder = TelemetryRecorder(self.mavlink_thread, self.data_logger)
+        self.telemetry_recorder.attach()
         self.mavlink_thread.error_occurred.connect(self.handle_error)
         self.mavlink_thread.emergency_triggered.connect(self.handle_emergency)
         self.mavlink_thread.mission_completed.connect(self.handle_mission_completed)
+        self.mavlink_thread.command_result.connect(self.handle_command_result)
+        self.mavlink_thread.mission_transfer_progress.connect(self.handle_mission_transfer_progress)
+        self.mavlink_thread.mission_transfer_finished.connect(self.handle_mission_transfer_finished)
+        self.mavlink_thread.params_updated.connect(self.handle_params_updated)
+        self.mavlink_thread.vehicles_changed.connect(self.handle_vehicles_changed)
+        self.mavlink_thread.replay_finished.connect(self.handle_tlog_replay_finished)
+        self.mavlink_thread.link_state.connect(self.handle_link_state)
+        self.mavlink_thread.hall_edge.connect(self.handle_hall_edge)
         
         # FPV devre dışı
         
@@ -222,6 +258,17 @@ class LaggerGCS(QMainWindow):
             self.control_panel.log_message("HATA: Port adı boş olamaz!")
             return
             
+        self.mavlink_thread.auto_reconnect = self.connection_panel.auto_reconnect_check.isChecked()
+        self.mavlink_thread.link_process = self.connection_panel.link_process_check.isChecked()
+        if port == self.connection_panel.AUTO or baud == 0:
+            # Arka planda paralel port/baud taraması; sonuç handle_link_state ile gelir
+            self.mavlink_thread.connect_auto(None if port == self.connection_panel.AUTO else port, baud or None)
+            if not self.mavlink_thread.isRunning():
+                self.mavlink_thread.start()
+            self.connection_panel.set_status(True)
+            self.control_panel.log_message("Araç aranıyor (tüm portlar/baud'lar)...")
+            return
+            
         # Baud rate doğrulaması - daha fazla seçenek
         valid_baud_rates = [9600, 19200, 38400, 57600, 115200, 230400, 460800, 921600]
         if baud not in valid_baud_rates:
@@ -229,9 +276,13 @@ class LaggerGCS(QMainWindow):
             # Hata vermek yerine uyarı ver ve devam et
             
         if self.mavlink_thread.connect(port, baud):
-            self.mavlink_thread.start()
+            if not self.mavlink_thread.isRunning():
+                self.mavlink_thread.start()
             self.connection_panel.set_status(True)
+            self.link_stats_timer.start(1000)
             self.control_panel.log_message(f"MAVLink bağlantısı başarılı: {port} @ {baud}")
+            if self.mavlink_thread.tlog is not None:
+                self.control_panel.log_message(f"Ham telemetri kaydı: {self.mavlink_thread.tlog.path}")
             self.flight_start_time = time.time()
             
             # Hall Effect sensör bağlantısını dene (COM6 varsayılan)
@@ -261,7 +312,8 @@ class LaggerGCS(QMainWindow):
                     except Exception as e:
                         self.control_panel.log_message(f"Hall Effect sensör bağlantı kesme hatası: {e}")
                 
-                self.mavlink_thread.stop()
+                # Thread durdurulmaz: tekrar bağlanınca aynı okuma döngüsü devam eder
+                self.mavlink_thread.disconnect_link()
         except Exception as e:
             self.control_panel.log_message(f"Bağlantı kesme hatası (mavlink): {e}")
         try:
@@ -270,10 +322,71 @@ class LaggerGCS(QMainWindow):
         except Exception as e:
             self.control_panel.log_message(f"Bağlantı kesme hatası (fpv): {e}")
         # UI durumunu sıfırla ve port listesini yenile
+        self.link_stats_timer.stop()
         self.connection_panel.set_status(False)
         self.connection_panel.refresh_ports()
+        self.map_panel.set_other_vehicles([])
         self.control_panel.log_message("Bağlantı kesildi.")
         
+    def handle_link_state(self, state: str, detail: str) -> None:
+        """Bağlantı gözetmeni: algılama, kopma ve yeniden bağlanma bildirimleri"""
+        previous, self._link_state = self._link_state, state
+        if state == 'connected':
+            self.link_stats_timer.start(1000)
+            if not self.flight_start_time:
+                self.flight_start_time = time.time()
+            self.control_panel.log_message(f"MAVLink bağlantısı kuruldu: {detail}")
+            if self.mavlink_thread.tlog is not None:
+                self.control_panel.log_message(f"Ham telemetri kaydı: {self.mavlink_thread.tlog.path}")
+        elif state == 'lost':
+            self.control_panel.log_message(f"UYARI: Bağlantı koptu ({detail}), yeniden bağlanılıyor...")
+        elif state == 'searching' and previous not in ('searching', 'lost'):
+            self.control_panel.log_message("Araç aranıyor...")
+
+    def refresh_link_stats(self) -> None:
+        """Bağlantı sekmesindeki RSSI/ping/kayıp ve mesaj tipi tablosunu güncelle"""
+        try:
+            stats = self.mavlink_thread.get_link_stats()
+        except Exception as e:
+            self.control_panel.log_message(f"Link istatistik hatası: {e}")
+            return
+        ping = stats.get('ping_ms')
+        self.connection_panel.update_connection_stats({
+            'rssi': stats.get('radio', {}).get('rssi', 'N/A'),
+            'ping': f"{ping:.0f} ms" if ping is not None else 'N/A',
+            'loss': f"{stats.get('loss_percent', 0.0):.1f}",
+        })
+        self.connection_panel.update_link_stats(stats)
+        self.connection_panel.update_router_stats(stats.get('router', {}))
+        self.refresh_vehicles()
+
+    def handle_router_endpoint_added(self, spec: str) -> None:
+        """Yönlendiriciye uç ekle (bağlantıdan bağımsız; bağlanınca trafik akmaya başlar)"""
+        if self.mavlink_thread.add_router_endpoint(spec):
+            self.control_panel.log_message(f"Yönlendirici ucu eklendi: {spec}")
+            self.connection_panel.update_router_stats(self.mavlink_thread.get_router_stats())
+
+    def refresh_vehicles(self) -> None:
+        """Araç listesini ve haritadaki diğer araçları güncelle"""
+        vehicles = self.mavlink_thread.get_vehicles()
+        self.connection_panel.update_vehicles(vehicles)
+        others = []
+        if self.connection_panel.overlay_check.isChecked():
+            others = [v for v in vehicles if not v['active'] and v['lat'] is not None]
+        self.map_panel.set_other_vehicles(others)
+
+    def handle_vehicles_changed(self, sysids: list) -> None:
+        """Bağlantıda yeni bir araç görüldü"""
+        self.control_panel.log_message(f"Bağlantıdaki araçlar: {', '.join(str(s) for s in sysids)}")
+        self.refresh_vehicles()
+
+    def handle_vehicle_selected(self, sysid: int) -> None:
+        """Komutların ve ana telemetrinin hedef aracını değiştir"""
+        if self.mavlink_thread.select_vehicle(sysid):
+            self.map_panel.clear_flight_trail()
+            self.control_panel.log_message(f"Aktif araç: sysid {sysid}")
+        self.refresh_vehicles()
+
     def handle_telemetry(self, data: Dict[str, Any]) -> None:
         """Telemetri verilerini işle"""
         if not isinstance(data, dict):
@@ -317,9 +430,6 @@ class LaggerGCS(QMainWindow):
                 except Exception as e:
                     print(f"Hall Effect sensör okuma hatası: {e}")
             
-            # Yeni kutucuklara veri aktarımı:
-            if self.data_logger.log_file:
-                self.data_logger.log_data(data)
             # HUD'u voltaj ve diğer telemetri ile güncelle
             hud_data = data.copy()
             if 'mode' not in hud_data and hasattr(self.flight_panel.hud, 'telemetry'):
@@ -330,14 +440,30 @@ class LaggerGCS(QMainWindow):
         except Exception as e:
             self.control_panel.log_message(f'HATA (telemetry): {e}')
 
+    def handle_telemetry_frame(self, frame: Dict[str, Any]) -> None:
+        """Birleştirilmiş telemetri çerçevesini (attitude/position/telemetry) işle"""
+        try:
+            if 'attitude' in frame:
+                self.handle_attitude(frame['attitude'])
+            if 'position' in frame:
+                self.handle_position(frame['position'])
+            if 'telemetry' in frame:
+                self.handle_telemetry(frame['telemetry'])
+        finally:
+            # Backlog takibi: MAVLink thread'i bir sonraki çerçeveyi ancak bu onaydan sonra gönderir
+            self.mavlink_thread.mark_frame_consumed(frame.get('seq', 0))
+
+    def _log_telemetry_sample(self, channel: str, data: Dict[str, Any]) -> None:
+        """Simülasyon örneğini kaydet (gerçek bağlantıda TelemetryRecorder yazar)"""
+        if self.data_logger.log_file:
+            self.data_logger.log_data(data)
+
     def handle_attitude(self, data: Dict[str, Any]) -> None:
         """Attitude verilerini işle"""
         if not isinstance(data, dict):
             self.control_panel.log_message("HATA: Geçersiz attitude verisi")
             return
         try:
-            import datetime
-            print(f"[handle_attitude] {datetime.datetime.now().isoformat()} data: {data}")
             # HUD'a attitude verisini iletirken mevcut mod bilgisini koru
             if hasattr(self.flight_panel.hud, 'telemetry') and 'mode' in self.flight_panel.hud.telemetry:
                 data = {**data, 'mode': self.flight_panel.hud.telemetry['mode']}
@@ -424,6 +550,10 @@ class LaggerGCS(QMainWindow):
             return
             
         try:
+            for condition in emergency_data.get('cleared', []):
+                # Histerezis bandının dışına çıkıldı: uyarı sona erdi
+                self.previous_warnings.pop(condition.get('type', 'unknown'), None)
+                self.control_panel.log_message(f"Acil durum sona erdi: {condition.get('message', '')}")
             conditions = emergency_data.get('conditions', [])
             if not conditions:
                 return
@@ -611,8 +741,8 @@ class LaggerGCS(QMainWindow):
             result = self.mavlink_thread.upload_mission(waypoints) if hasattr(self.mavlink_thread, 'upload_mission') else False
 
         if result:
-            self.control_panel.log_message("Görev başarıyla araca yüklendi.")
-            self.data_logger.log_action(f"Görev yüklendi: {len(raw_items) if raw_items else len(waypoints)} öğe")
+            # Aktarım MAVLink thread'inde sürer; sonuç handle_mission_transfer_finished ile gelir
+            self.control_panel.log_message("Görev yükleme başlatıldı.")
             # Görev bilgilerini logla (yalnızca işlenmiş waypoint formatında detay ver)
             if not raw_items:
                 for i, wp in enumerate(waypoints):
@@ -627,6 +757,48 @@ class LaggerGCS(QMainWindow):
             self.control_panel.log_message("Görev yükleme başarısız!")
             self.data_logger.log_error("Görev yükleme başarısız.")
 
+    def handle_mission_transfer_progress(self, direction: str, done: int, total: int) -> None:
+        """Görev aktarım ilerlemesini görev panelinde göster"""
+        label = "yükleniyor" if direction == 'upload' else "indiriliyor"
+        self.mission_panel.mission_info.setText(f"Görev {label}: {done}/{total}")
+
+    def handle_mission_transfer_finished(self, result: Dict[str, Any]) -> None:
+        """Görev aktarımı bitti (başarılı veya başarısız)"""
+        label = {'upload': "yükleme", 'download': "indirme", 'sync': "senkronizasyonu"}.get(result['direction'], "aktarımı")
+        if result['success']:
+            message = f"Görev {label} tamamlandı: {result['count']} öğe, {result['elapsed']:.1f} s"
+            action = result.get('action')
+            if action == 'skip':
+                message += " (araçtaki görev aynı, yükleme atlandı)"
+            elif action == 'partial':
+                message += f" (yalnızca {result['partial_from']}. öğeden sonrası yüklendi)"
+            self.control_panel.log_message(message)
+            self.data_logger.log_action(message)
+        else:
+            message = f"Görev {label} başarısız: {result['error']}"
+            self.control_panel.log_message(message)
+            self.data_logger.log_error(message)
+        self.mission_panel.mission_info.setText(message)
+
+    def handle_params_updated(self, event: Dict[str, Any]) -> None:
+        """Araç parametreleri önbellekten yüklendi / araçtan güncellendi"""
+        if event['error']:
+            message = f"Parametre indirme başarısız: {event['error']}"
+            self.control_panel.log_message(message)
+            self.data_logger.log_error(message)
+            return
+        if event['source'] == 'cache':
+            state = "doğrulandı" if event['verified'] else "araçla karşılaştırılıyor"
+            message = f"Parametreler önbellekten yüklendi ({event['count']}, {state})"
+        elif not event['changed']:
+            return
+        elif len(event['changed']) <= 5:
+            message = f"Değişen parametreler: {', '.join(event['changed'])}"
+        else:
+            message = f"Parametreler araçtan alındı: {event['count']} parametre, {len(event['changed'])} değişen, {event['elapsed']:.1f} s"
+        self.control_panel.log_message(message)
+        self.data_logger.log_action(message)
+
     def handle_start_mission(self) -> None:
         """Görev başlatma"""
         self.control_panel.log_message("Görev başlatılıyor...")
@@ -712,6 +884,27 @@ class LaggerGCS(QMainWindow):
             self.control_panel.log_message("HATA: MAVLink thread'de abort_mission fonksiyonu bulunamadı!")
             self.teknofest_panel.log_message("HATA: MAVLink thread'de abort_mission fonksiyonu bulunamadı!")
 
+    def update_stream_demands(self, *args) -> None:
+        """Ekranda görünen bileşenlerin ihtiyaç duyduğu mesaj hızlarını MAVLink thread'ine bildir"""
+        thread = self.mavlink_thread
+        if self.isMinimized():
+            thread.release_stream_rates('hud')
+        else:
+            # HUD yapay ufku ve hız/irtifa göstergeleri
+            thread.request_stream_rate('hud', 'ATTITUDE', 20.0)
+            thread.request_stream_rate('hud', 'VFR_HUD', 10.0)
+        if not self.isMinimized() and self.right_column_tabs.currentWidget() is self.telemetry_panel:
+            thread.request_stream_rate('telemetry_tab', 'SYS_STATUS', 4.0)
+            thread.request_stream_rate('telemetry_tab', 'GPS_RAW_INT', 5.0)
+        else:
+            thread.release_stream_rates('telemetry_tab')
+
+    def changeEvent(self, event) -> None:
+        """Pencere küçültülünce yüksek hızlı akışları bırak"""
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, 'right_column_tabs'):
+            self.update_stream_demands()
+        super().changeEvent(event)
+
     def closeEvent(self, event) -> None:
         """Uygulama kapatılırken kaynakları temizle"""
         try:
@@ -722,6 +915,8 @@ class LaggerGCS(QMainWindow):
                 self.safety_timer.stop()
             if hasattr(self, 'sim_timer'):
                 self.sim_timer.stop()
+            if hasattr(self, 'link_stats_timer'):
+                self.link_stats_timer.stop()
                 
             # Thread'leri durdur
             self.mavlink_thread.stop()
@@ -772,6 +967,7 @@ class LaggerGCS(QMainWindow):
             'system_status': 'SIM',
             'flight_mode': 'AUTO'
         }
+        self._log_telemetry_sample('telemetry', telemetry)
         self.handle_telemetry(telemetry)
         self.handle_position(telemetry) 
 
@@ -814,6 +1010,8 @@ class LaggerGCS(QMainWindow):
         self.payload_mission_active = True
         self.payload_target = {'lat': lat, 'lon': lon, 'drop_alt': drop_alt, 'cruise_alt': cruise_alt}
         self.payload_dropped = False
+        self._hall_verify_pending = False
+        self.hall_verify_timer.stop()
         self.payload_goto_drop_alt_sent = False
         self.payload_goto_cruise_alt_sent = False
         
@@ -822,7 +1020,7 @@ class LaggerGCS(QMainWindow):
         self.hall_sensor_threshold = 100  # Manyetik eşik (örnek)
         
         # Sensör bağlantısı
-        if not hasattr(self.mavlink_thread, 'hall_serial_port') or self.mavlink_thread.hall_serial_port is None:
+        if not self.mavlink_thread.hall.connected:
             self.mavlink_thread.connect_hall_sensor(self.hall_sensor_port)
 
     def check_payload_mission(self, pos_data: Dict[str, Any]) -> None:
@@ -852,6 +1050,9 @@ class LaggerGCS(QMainWindow):
                 
             # 3. Yükü bırak
             self.connection_panel.payload_status_label.setText("Durum: Yük bırakılıyor...")
+            # Komuttan önce kur: komut gecikmesi içinde gelen kenar da kaçırılmaz
+            self.mavlink_thread.hall.threshold = self.hall_sensor_threshold
+            self.mavlink_thread.hall.arm()
             result = self.mavlink_thread.release_payload()
             if result:
                 self.connection_panel.payload_status_label.setText("Durum: Yük bırakıldı, doğrulama bekleniyor...")
@@ -865,24 +1066,36 @@ class LaggerGCS(QMainWindow):
             self.control_panel.log_message(f"Yük bırakma algoritması hatası: {e}")
 
     def check_hall_effect_sensor(self) -> None:
-        """Hall effect sensöründen manyetik değer okuma ve yük bırakma doğrulaması"""
-        import threading
-        def sensor_check_loop():
-            import time
-            timeout = self.HALL_SENSOR_TIMEOUT  # Daha uzun timeout
-            start = time.time()
-            while time.time() - start < timeout:
-                value = self.mavlink_thread.read_hall_effect_value()
-                if value is not None and value < self.hall_sensor_threshold:
-                    # Başarılı
-                    from PyQt6.QtCore import QTimer
-                    QTimer.singleShot(0, self.on_payload_verified)
-                    return
-                time.sleep(1.0)  # 1 saniye bekle (0.5s yerine)
-            # Zaman aşımı
-            from PyQt6.QtCore import QTimer
-            QTimer.singleShot(0, lambda: self.connection_panel.payload_status_label.setText("Durum: Yük bırakma doğrulaması başarısız!"))
-        threading.Thread(target=sensor_check_loop, daemon=True).start()
+        """Yük bırakma doğrulaması: Hall servisinin düşen kenarı beklenir (yoklama yok)"""
+        self._hall_verify_pending = True
+        if self.mavlink_thread.hall.released.is_set():
+            self._confirm_hall_release()  # Kenar komut onayından önce geldi ya da sensör zaten düşüktü
+            return
+        self.hall_verify_timer.start(int(self.HALL_SENSOR_TIMEOUT * 1000))
+
+    def handle_hall_edge(self, edge: Dict[str, Any]) -> None:
+        """Hall sensör eşik geçişi (okuyucu thread'inden kuyruklu sinyal)"""
+        if edge.get('direction') == 'falling' and self.mavlink_thread.hall.released.is_set():
+            self._confirm_hall_release()
+
+    def _confirm_hall_release(self) -> None:
+        if not self._hall_verify_pending:
+            return
+        self._hall_verify_pending = False
+        self.hall_verify_timer.stop()
+        hall = self.mavlink_thread.hall
+        hall.disarm()
+        edge = hall.release_edge or {}
+        self.control_panel.log_message(
+            f"Hall sensör: yük bırakıldı ({edge.get('latency_ms', 0):.0f} ms, değer {edge.get('value')})")
+        self.on_payload_verified()
+
+    def _on_hall_verify_timeout(self) -> None:
+        if not self._hall_verify_pending:
+            return
+        self._hall_verify_pending = False
+        self.mavlink_thread.hall.disarm()
+        self.connection_panel.payload_status_label.setText("Durum: Yük bırakma doğrulaması başarısız!")
 
     def on_payload_verified(self) -> None:
         """Yük bırakma doğrulandı"""
@@ -1093,13 +1306,26 @@ class LaggerGCS(QMainWindow):
         except Exception as e:
             self.teknofest_panel.log_message(f"Görev devam ettirme hatası: {str(e)}")
     
+    def handle_command_result(self, result: Dict[str, Any]) -> None:
+        """Araçtan gelen COMMAND_ACK sonucunu (veya zaman aşımını) kullanıcıya bildir"""
+        latency = result.get('latency_ms')
+        latency_text = f" ({latency:.0f} ms)" if latency is not None else ""
+        message = f"{result['name']}: {result['result_name']}{latency_text}"
+        self.control_panel.log_message(message)
+        if result['name'].startswith("Elektromıknatıs"):
+            self.teknofest_panel.log_message(message)
+        if result['accepted']:
+            self.data_logger.log_action(message)
+        else:
+            self.data_logger.log_error(message)
+
     def handle_activate_magnet1(self):
         """Elektromıknatıs 1'i aktifleştir"""
         try:
             if hasattr(self.mavlink_thread, 'activate_magnet1'):
                 result = self.mavlink_thread.activate_magnet1()
                 if result:
-                    self.teknofest_panel.log_message("Elektromıknatıs 1 aktifleştirildi.")
+                    self.teknofest_panel.log_message("Elektromıknatıs 1 aktifleştirme komutu gönderildi, onay bekleniyor...")
                 else:
                     self.teknofest_panel.log_message("Elektromıknatıs 1 aktifleştirme başarısız!")
             else:
@@ -1113,7 +1339,7 @@ class LaggerGCS(QMainWindow):
             if hasattr(self.mavlink_thread, 'deactivate_magnet1'):
                 result = self.mavlink_thread.deactivate_magnet1()
                 if result:
-                    self.teknofest_panel.log_message("Elektromıknatıs 1 deaktifleştirildi.")
+                    self.teknofest_panel.log_message("Elektromıknatıs 1 deaktifleştirme komutu gönderildi, onay bekleniyor...")
                 else:
                     self.teknofest_panel.log_message("Elektromıknatıs 1 deaktifleştirme başarısız!")
             else:
@@ -1127,7 +1353,7 @@ class LaggerGCS(QMainWindow):
             if hasattr(self.mavlink_thread, 'activate_magnet2'):
                 result = self.mavlink_thread.activate_magnet2()
                 if result:
-                    self.teknofest_panel.log_message("Elektromıknatıs 2 aktifleştirildi.")
+                    self.teknofest_panel.log_message("Elektromıknatıs 2 aktifleştirme komutu gönderildi, onay bekleniyor...")
                 else:
                     self.teknofest_panel.log_message("Elektromıknatıs 2 aktifleştirme başarısız!")
             else:
@@ -1141,7 +1367,7 @@ class LaggerGCS(QMainWindow):
             if hasattr(self.mavlink_thread, 'deactivate_magnet2'):
                 result = self.mavlink_thread.deactivate_magnet2()
                 if result:
-                    self.teknofest_panel.log_message("Elektromıknatıs 2 deaktifleştirildi.")
+                    self.teknofest_panel.log_message("Elektromıknatıs 2 deaktifleştirme komutu gönderildi, onay bekleniyor...")
                 else:
                     self.teknofest_panel.log_message("Elektromıknatıs 2 deaktifleştirme başarısız!")
             else:
@@ -1240,6 +1466,12 @@ class LaggerGCS(QMainWindow):
             self.control_panel.log_message(f"Harici pencere seçimi hatası: {e}") 
 
     def on_log_file_selected(self, path):
+        if path.lower().endswith('.tlog'):
+            # Ham MAVLink kaydı: CSV thread'i yerine gerçek alım/çözme hattı kullanılır
+            self.tlog_replay_path = path
+            self.log_file_path = None
+            return
+        self.tlog_replay_path = None
         self.log_file_path = path
         # Otomatik .bin'den .csv'ye çevirme
         if path.lower().endswith('.bin'):
@@ -1301,7 +1533,33 @@ class LaggerGCS(QMainWindow):
         self.video_replay_thread = VideoReplayThread(self.video_file_path)
         self.video_replay_thread.frame_ready.connect(self.flight_panel.hud.update_fpv)
         self.video_replay_thread.finished.connect(self.on_video_replay_finished)
+    def _start_tlog_replay(self) -> None:
+        thread = self.mavlink_thread
+        if thread.replay:
+            thread.set_replay_paused(False)
+            return
+        if thread.is_connected:
+            QMessageBox.warning(self, 'Oynatma', 'Canlı bağlantı açıkken .tlog oynatılamaz. Önce bağlantıyı kesin.')
+            return
+        if not thread.connect_replay(self.tlog_replay_path, self.loglama_panel.current_speed()):
+            return
+        if not thread.isRunning():
+            thread.start()
+        self.map_panel.set_replay_mode(True)
+        self.control_panel.log_message(f"Tlog oynatılıyor: {self.tlog_replay_path}")
+
+    def handle_tlog_replay_finished(self, result: dict) -> None:
+        self.map_panel.set_replay_mode(False)
+        rx = result.get('rx', {})
+        self.control_panel.log_message(
+            f"Tlog oynatma bitti: {result['packets']} paket, {result['elapsed']:.2f} s, "
+            f"{result['packets_per_s']:.0f} paket/s, gecikme ort. {rx.get('latency_avg_ms', 0.0):.2f} ms, "
+            f"CPU %{rx.get('cpu_percent', 0.0):.0f}")
+
     def on_log_play(self):
+        if self.tlog_replay_path:
+            self._start_tlog_replay()
+            return
         if not self.log_replay_thread and self.log_file_path:
             self._init_log_replay_thread()
         if not self.video_replay_thread and self.video_file_path:
@@ -1315,11 +1573,15 @@ class LaggerGCS(QMainWindow):
         elif self.video_replay_thread:
             self.video_replay_thread.resume()
     def on_log_pause(self):
+        if self.tlog_replay_path:
+            self.mavlink_thread.set_replay_paused(True)
         if self.log_replay_thread:
             self.log_replay_thread.pause()
         if self.video_replay_thread:
             self.video_replay_thread.pause()
     def on_log_stop(self):
+        if self.tlog_replay_path:
+            self.mavlink_thread.stop_replay()
         if self.log_replay_thread:
             self.log_replay_thread.stop()
         if self.video_replay_thread:
@@ -1332,10 +1594,13 @@ class LaggerGCS(QMainWindow):
         if self.video_replay_thread:
             self.video_replay_thread.seek(idx)
     def on_log_speed(self, speed):
+        if self.tlog_replay_path:
+            self.mavlink_thread.set_replay_speed(speed)
         if self.log_replay_thread:
-            self.log_replay_thread.set_speed(speed)
+            # CSV/video oynatıcılarında 0 (azami hız) yerine en yüksek kaydırıcı değeri
+            self.log_replay_thread.set_speed(speed or 10.0)
         if self.video_replay_thread:
-            self.video_replay_thread.set_speed(speed)
+            self.video_replay_thread.set_speed(speed or 10.0)
     def on_log_replay_finished(self):
         # Disable replay mode when replay finishes
         self.map_panel.set_replay_mode(False)
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QHBoxLayout, 
                              QComboBox, QLabel, QPushButton, QGridLayout, 
-                             QListWidget, QListWidgetItem, QLineEdit, QMessageBox)
+                             QListWidget, QListWidgetItem, QLineEdit, QMessageBox,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox)
 from PyQt6.QtCore import pyqtSignal, Qt
 import serial.tools.list_ports
 
@@ -10,6 +11,20 @@ class ConnectionPanel(QWidget):
     connect_clicked = pyqtSignal(str, int)
     disconnect_clicked = pyqtSignal()
     simulation_clicked = pyqtSignal()
+    vehicle_selected = pyqtSignal(int)  # sysid
+    router_endpoint_added = pyqtSignal(str)  # pymavlink bağlantı dizesi
+    
+    # Bağlantı tipi -> (pymavlink öneki, varsayılan adres)
+    CONNECTION_TYPES = {
+        "Seri": (None, ""),
+        "UDP Dinle (udpin)": ("udpin", "0.0.0.0:14550"),
+        "UDP Gönder (udpout)": ("udpout", "127.0.0.1:14550"),
+        "TCP": ("tcp", "127.0.0.1:5760"),
+    }
+    
+    AUTO = "Otomatik"  # Port/baud arka planda paralel taranır (baud için 0 gönderilir)
+    
+    LINK_STATS_COLUMNS = ["Mesaj", "Hz", "B/s", "Çözme µs (ort/p95)", "İşleyici µs (ort/p95)"]
     
     def __init__(self):
         super().__init__()
@@ -24,6 +39,16 @@ class ConnectionPanel(QWidget):
         controls_group.setStyleSheet(ThemeColors.PANEL_STYLE)
         controls_layout = QGridLayout()
         
+        self.conn_type_combo = QComboBox()
+        self.conn_type_combo.setStyleSheet(ThemeColors.INPUT_STYLE)
+        self.conn_type_combo.addItems(list(self.CONNECTION_TYPES))
+        self.conn_type_combo.currentTextChanged.connect(self.on_connection_type_changed)
+        
+        self.address_input = QLineEdit()
+        self.address_input.setStyleSheet(ThemeColors.INPUT_STYLE)
+        self.address_input.setPlaceholderText("host:port")
+        self.address_input.setEnabled(False)
+        
         self.port_combo = QComboBox()
         self.port_combo.setStyleSheet(ThemeColors.INPUT_STYLE)
         
@@ -33,26 +58,56 @@ class ConnectionPanel(QWidget):
         
         self.baud_combo = QComboBox()
         self.baud_combo.setStyleSheet(ThemeColors.INPUT_STYLE)
-        self.baud_combo.addItems(['9600', '57600', '115200', '230400', '460800', '921600'])
+        self.baud_combo.addItems([self.AUTO, '9600', '57600', '115200', '230400', '460800', '921600'])
         self.baud_combo.setCurrentText('57600')
         
         self.connect_btn = QPushButton("Bağlan")
         self.connect_btn.setStyleSheet(ThemeColors.BUTTON_SUCCESS)
         self.connect_btn.clicked.connect(self.on_connect)
         
+        self.auto_reconnect_check = QCheckBox("Kopunca otomatik yeniden bağlan")
+        self.auto_reconnect_check.setChecked(True)
+        
+        # Port G/Ç'si ayrı süreçte: yoğun arayüz yükünde paket okuma gecikmez
+        self.link_process_check = QCheckBox("Bağlantıyı ayrı süreçte çalıştır")
+        self.link_process_check.setToolTip("Okuma, çözme ve .tlog kaydı ayrı süreçte; paketler ortak bellekten alınır")
+        
         self.sim_btn = QPushButton("Simülasyon")
         self.sim_btn.setStyleSheet(ThemeColors.BUTTON_PRIMARY)
         self.sim_btn.clicked.connect(self.on_simulation)
         
-        controls_layout.addWidget(QLabel("Port:"), 0, 0)
-        controls_layout.addWidget(self.port_combo, 0, 1)
-        controls_layout.addWidget(self.refresh_ports_btn, 0, 2)
-        controls_layout.addWidget(QLabel("Baud:"), 1, 0)
-        controls_layout.addWidget(self.baud_combo, 1, 1)
-        controls_layout.addWidget(self.connect_btn, 2, 0, 1, 2)
-        controls_layout.addWidget(self.sim_btn, 2, 2)
+        controls_layout.addWidget(QLabel("Tip:"), 0, 0)
+        controls_layout.addWidget(self.conn_type_combo, 0, 1, 1, 2)
+        controls_layout.addWidget(QLabel("Port:"), 1, 0)
+        controls_layout.addWidget(self.port_combo, 1, 1)
+        controls_layout.addWidget(self.refresh_ports_btn, 1, 2)
+        controls_layout.addWidget(QLabel("Baud:"), 2, 0)
+        controls_layout.addWidget(self.baud_combo, 2, 1)
+        controls_layout.addWidget(QLabel("Adres:"), 3, 0)
+        controls_layout.addWidget(self.address_input, 3, 1, 1, 2)
+        controls_layout.addWidget(self.connect_btn, 4, 0, 1, 2)
+        controls_layout.addWidget(self.sim_btn, 4, 2)
+        controls_layout.addWidget(self.auto_reconnect_check, 5, 0, 1, 3)
+        controls_layout.addWidget(self.link_process_check, 6, 0, 1, 3)
         controls_group.setLayout(controls_layout)
         
+        # Yönlendirici: araç trafiğini başka GCS'lere (Mission Planner vb.) aktar
+        router_group = QGroupBox("Yönlendirme")
+        router_group.setStyleSheet(ThemeColors.PANEL_STYLE)
+        router_layout = QGridLayout()
+        self.router_input = QLineEdit()
+        self.router_input.setStyleSheet(ThemeColors.INPUT_STYLE)
+        self.router_input.setPlaceholderText("udpout:127.0.0.1:14551")
+        self.router_add_btn = QPushButton("Ekle")
+        self.router_add_btn.setStyleSheet(ThemeColors.BUTTON_NORMAL)
+        self.router_add_btn.clicked.connect(self.on_router_add)
+        self.router_label = QLabel("Uç yok")
+        self.router_label.setWordWrap(True)
+        router_layout.addWidget(self.router_input, 0, 0)
+        router_layout.addWidget(self.router_add_btn, 0, 1)
+        router_layout.addWidget(self.router_label, 1, 0, 1, 2)
+        router_group.setLayout(router_layout)
+        
         # Connection status indicators
         status_group = QGroupBox("Bağlantı Durumu")
         status_group.setStyleSheet(ThemeColors.PANEL_STYLE)
@@ -75,6 +130,36 @@ class ConnectionPanel(QWidget):
         status_layout.addWidget(self.loss_value, 2, 1)
         status_group.setLayout(status_layout)
         
+        # Aynı bağlantıdaki araçlar (sysid) ve aktif araç seçimi
+        vehicles_group = QGroupBox("Araçlar")
+        vehicles_group.setStyleSheet(ThemeColors.PANEL_STYLE)
+        vehicles_layout = QGridLayout()
+        self.vehicle_combo = QComboBox()
+        self.vehicle_combo.setStyleSheet(ThemeColors.INPUT_STYLE)
+        self.vehicle_combo.activated.connect(self.on_vehicle_activated)
+        self.overlay_check = QCheckBox("Diğer araçları haritada göster")
+        self.overlay_check.setChecked(True)
+        vehicles_layout.addWidget(QLabel("Aktif araç:"), 0, 0)
+        vehicles_layout.addWidget(self.vehicle_combo, 0, 1)
+        vehicles_layout.addWidget(self.overlay_check, 1, 0, 1, 2)
+        vehicles_group.setLayout(vehicles_layout)
+        
+        # Mesaj tipi bazında canlı link istatistikleri
+        link_stats_group = QGroupBox("Link İstatistikleri")
+        link_stats_group.setStyleSheet(ThemeColors.PANEL_STYLE)
+        link_stats_layout = QVBoxLayout()
+        self.link_summary_label = QLabel("Bant: N/A | Düşen paket: N/A | Bozuk veri: N/A")
+        self.link_stats_table = QTableWidget(0, len(self.LINK_STATS_COLUMNS))
+        self.link_stats_table.setHorizontalHeaderLabels(self.LINK_STATS_COLUMNS)
+        self.link_stats_table.setStyleSheet(ThemeColors.INPUT_STYLE)
+        self.link_stats_table.verticalHeader().setVisible(False)
+        self.link_stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.link_stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.link_stats_table.setMinimumHeight(160)
+        link_stats_layout.addWidget(self.link_summary_label)
+        link_stats_layout.addWidget(self.link_stats_table)
+        link_stats_group.setLayout(link_stats_layout)
+        
         # Checklist Group
         checklist_group = QGroupBox("Uçuş Öncesi Kontrol Listesi")
         checklist_group.setStyleSheet(ThemeColors.PANEL_STYLE)
@@ -97,7 +182,10 @@ class ConnectionPanel(QWidget):
         checklist_group.setLayout(checklist_layout)
 
         layout.addWidget(controls_group)
+        layout.addWidget(router_group)
         layout.addWidget(status_group)
+        layout.addWidget(vehicles_group)
+        layout.addWidget(link_stats_group)
         layout.addWidget(checklist_group)
         
         # Görev Mekanizması Paneli
@@ -138,13 +226,51 @@ class ConnectionPanel(QWidget):
         
     def refresh_ports(self):
         self.port_combo.clear()
+        # Otomatik algılama her zaman seçilebilir: radyo bağlandıktan sonra takılabilir
+        self.port_combo.addItem(self.AUTO)
         ports = [port.device for port in serial.tools.list_ports.comports()]
-        if ports:
-            self.port_combo.addItems(ports)
-            self.connect_btn.setEnabled(True)
-        else:
-            self.port_combo.addItem("Port bulunamadı")
-            self.connect_btn.setEnabled(False)
+        self.port_combo.addItems(ports)
+        self.connect_btn.setEnabled(True)
+
+    def is_serial(self):
+        return self.CONNECTION_TYPES[self.conn_type_combo.currentText()][0] is None
+
+    def on_connection_type_changed(self, text):
+        prefix, default_address = self.CONNECTION_TYPES[text]
+        serial_link = prefix is None
+        self.port_combo.setEnabled(serial_link)
+        self.baud_combo.setEnabled(serial_link)
+        self.refresh_ports_btn.setEnabled(serial_link)
+        self.address_input.setEnabled(not serial_link)
+        defaults = [address for _, address in self.CONNECTION_TYPES.values()]
+        if not serial_link and self.address_input.text().strip() in defaults:
+            self.address_input.setText(default_address)
+        self.connect_btn.setEnabled(True)
+
+    def connection_string(self):
+        """Seçili tipe göre pymavlink bağlantı dizesi (seri için port adı)"""
+        prefix = self.CONNECTION_TYPES[self.conn_type_combo.currentText()][0]
+        if prefix is None:
+            return self.port_combo.currentText()
+        address = self.address_input.text().strip()
+        return f"{prefix}:{address}" if address else ""
+
+    def on_router_add(self):
+        spec = self.router_input.text().strip()
+        if spec:
+            self.router_endpoint_added.emit(spec)
+
+    def update_router_stats(self, stats):
+        """MAVLinkThread.get_router_stats() çıktısıyla yönlendirici özetini güncelle"""
+        endpoints = stats.get('endpoints', [])
+        if not endpoints:
+            self.router_label.setText("Uç yok")
+            return
+        latency = stats.get('latency', {})
+        lines = [f"{e['spec']}: tx {e['tx_bytes']} B, rx {e['rx_bytes']} B" for e in endpoints]
+        lines.append(f"Araç -> uç: {stats.get('to_endpoints_bytes_per_s', 0.0):.0f} B/s, "
+                     f"ek gecikme ort {latency.get('mean_us', 0.0):.0f} µs / p95 {latency.get('p95_us', 0.0):.0f} µs")
+        self.router_label.setText("\n".join(lines))
 
     def on_connect(self):
         if self.connect_btn.text() == "Bağlan":
@@ -156,9 +282,10 @@ class ConnectionPanel(QWidget):
                 if item.checkState() != Qt.CheckState.Checked:
                     QMessageBox.warning(self, "Checklist Eksik", "Tüm uçuş öncesi kontrol maddeleri işaretlenmeden bağlantı kurulamaz!")
                     return
-            port = self.port_combo.currentText()
-            if port and "bulunamadı" not in port:
-                baud = int(self.baud_combo.currentText())
+            port = self.connection_string()
+            if port:
+                baud_text = self.baud_combo.currentText()
+                baud = 0 if baud_text == self.AUTO else int(baud_text)
                 self.connect_clicked.emit(port, baud)
         else:
             self.disconnect_clicked.emit()
@@ -167,21 +294,63 @@ class ConnectionPanel(QWidget):
         if connected:
             self.connect_btn.setText("Bağlantıyı Kes")
             self.connect_btn.setStyleSheet(ThemeColors.BUTTON_DANGER)
+            self.conn_type_combo.setEnabled(False)
+            self.address_input.setEnabled(False)
             self.port_combo.setEnabled(False)
             self.baud_combo.setEnabled(False)
             self.refresh_ports_btn.setEnabled(False)
         else:
             self.connect_btn.setText("Bağlan")
             self.connect_btn.setStyleSheet(ThemeColors.BUTTON_SUCCESS)
-            self.port_combo.setEnabled(True)
-            self.baud_combo.setEnabled(True)
-            self.refresh_ports_btn.setEnabled(True)
+            self.conn_type_combo.setEnabled(True)
+            self.on_connection_type_changed(self.conn_type_combo.currentText())
             self.update_connection_stats({'rssi': 'N/A', 'ping': 'N/A', 'loss': 'N/A'})
+            self.link_stats_table.setRowCount(0)
+            self.vehicle_combo.clear()
+            self.link_summary_label.setText("Bant: N/A | Düşen paket: N/A | Bozuk veri: N/A")
             
     def update_connection_stats(self, stats):
         self.rssi_value.setText(str(stats.get('rssi', 'N/A')))
         self.ping_value.setText(str(stats.get('ping', 'N/A')))
         self.loss_value.setText(f"%{stats.get('loss', 'N/A')}")
 
+    def update_vehicles(self, vehicles):
+        """MAVLinkThread.get_vehicles() çıktısıyla araç listesini güncelle"""
+        self.vehicle_combo.blockSignals(True)
+        self.vehicle_combo.clear()
+        for vehicle in vehicles:
+            armed = "ARM" if vehicle['armed'] else "DISARM"
+            self.vehicle_combo.addItem(f"sysid {vehicle['sysid']} - {vehicle['mode']} ({armed})", vehicle['sysid'])
+            if vehicle['active']:
+                self.vehicle_combo.setCurrentIndex(self.vehicle_combo.count() - 1)
+        self.vehicle_combo.blockSignals(False)
+
+    def on_vehicle_activated(self, index):
+        sysid = self.vehicle_combo.itemData(index)
+        if sysid is not None:
+            self.vehicle_selected.emit(int(sysid))
+
+    def update_link_stats(self, stats):
+        """MAVLinkThread.get_link_stats() çıktısıyla tabloyu ve özet satırını güncelle"""
+        self.link_summary_label.setText(
+            f"Bant: {stats.get('bytes_per_s', 0.0):.0f} B/s | "
+            f"Düşen paket: {stats.get('dropped', 0)} | Bozuk veri: {stats.get('bad_data', 0)}")
+        types = stats.get('types', {})
+        # En yoğun mesajlar üstte
+        rows = sorted(types.items(), key=lambda item: item[1]['rate_hz'], reverse=True)
+        self.link_stats_table.setRowCount(len(rows))
+        for row, (msg_type, t) in enumerate(rows):
+            decode = t['decode']
+            handler = t['handler']
+            values = [
+                msg_type,
+                f"{t['rate_hz']:.1f}",
+                f"{t['bytes_per_s']:.0f}",
+                f"{decode['mean_us']:.0f} / {decode['p95_us']:.0f}",
+                f"{handler['mean_us']:.0f} / {handler['p95_us']:.0f}" if handler['count'] else "-",
+            ]
+            for col, value in enumerate(values):
+                self.link_stats_table.setItem(row, col, QTableWidgetItem(value))
+
     def on_simulation(self):
         self.simulation_clicked.emit() 
\ No newline at end of file
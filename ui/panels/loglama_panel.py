@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog, QHBoxLayout, QSlider
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog, QHBoxLayout, QSlider, QCheckBox
 from PyQt6.QtCore import pyqtSignal, Qt
 
 class LoglamaPanel(QWidget):
@@ -21,7 +21,7 @@ class LoglamaPanel(QWidget):
         layout = QVBoxLayout()
         # Dosya seçiciler
         file_layout = QHBoxLayout()
-        self.log_btn = QPushButton('Log (.bin) Seç')
+        self.log_btn = QPushButton('Log (.bin/.tlog) Seç')
         self.log_btn.clicked.connect(self.select_log_file)
         self.log_label = QLabel('Seçili log: -')
         self.video_btn = QPushButton('FPV Video (mp4) Seç')
@@ -46,12 +46,16 @@ class LoglamaPanel(QWidget):
         # Hız ayarı
         self.speed_slider = QSlider(Qt.Orientation.Horizontal)
         self.speed_slider.setMinimum(5)
-        self.speed_slider.setMaximum(20)
+        self.speed_slider.setMaximum(100)  # 0.5x - 10x
         self.speed_slider.setValue(10)
         self.speed_slider.setTickInterval(1)
         self.speed_slider.valueChanged.connect(self.on_speed_changed)
         control_layout.addWidget(QLabel('Hız'))
         control_layout.addWidget(self.speed_slider)
+        # .tlog oynatmada beklemeden (olabildiğince hızlı) oynat
+        self.max_speed_check = QCheckBox('Azami hız')
+        self.max_speed_check.toggled.connect(self.on_max_speed_toggled)
+        control_layout.addWidget(self.max_speed_check)
         layout.addLayout(control_layout)
         # Seek bar
         seek_layout = QVBoxLayout()
@@ -69,7 +73,7 @@ class LoglamaPanel(QWidget):
         self.setLayout(layout)
 
     def select_log_file(self):
-        file, _ = QFileDialog.getOpenFileName(self, 'Log Dosyası Seç', '', 'Pixhawk Logları (*.bin *.csv)')
+        file, _ = QFileDialog.getOpenFileName(self, 'Log Dosyası Seç', '', 'Pixhawk Logları (*.bin *.csv *.tlog *.flog *.gz)')
         if file:
             self.log_label.setText(f'Seçili log: {file}')
             self.log_file_selected.emit(file)
@@ -81,8 +85,18 @@ class LoglamaPanel(QWidget):
             self.video_file_selected.emit(file)
 
     def on_speed_changed(self, value):
+        if self.max_speed_check.isChecked():
+            return
         speed = value / 10.0
         self.speed_changed.emit(speed)
+
+    def on_max_speed_toggled(self, checked):
+        self.speed_slider.setEnabled(not checked)
+        self.speed_changed.emit(0.0 if checked else self.speed_slider.value() / 10.0)
+
+    def current_speed(self) -> float:
+        """Seçili oynatma hızı (0: olabildiğince hızlı)"""
+        return 0.0 if self.max_speed_check.isChecked() else self.speed_slider.value() / 10.0
     
     def on_seek_moved(self, value):
         """Called when user drags the slider"""
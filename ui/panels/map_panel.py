@@ -46,6 +46,7 @@ LEAFLET_HTML = """
     var polyMarkers = [];
     var polyLine = null;
     var tempInfinityMarkers = [];
+    var otherVehicleMarkers = {};  // sysid -> marker (aktif olmayan araçlar)
     
     // Flight trail points
     var trailPoints = [];
@@ -128,6 +129,32 @@ LEAFLET_HTML = """
         }
         trailPoints = [];
       }
+      // Diğer araçlar (çoklu araç)
+      var seen = {};
+      (data.others || []).forEach(function(v) {
+        seen[v.sysid] = true;
+        var icon = L.divIcon({
+          html: '<div style="transform: rotate(' + ((v.heading || 0) - 90) + 'deg); font-size: 20px; text-align: center; line-height: 28px; opacity: 0.6;">✈️</div>',
+          className: '',
+          iconSize: [28, 28],
+          iconAnchor: [14, 14]
+        });
+        var marker = otherVehicleMarkers[v.sysid];
+        if (!marker) {
+          marker = L.marker([v.lat, v.lon], {icon: icon}).addTo(map);
+          otherVehicleMarkers[v.sysid] = marker;
+        } else {
+          marker.setLatLng([v.lat, v.lon]);
+          marker.setIcon(icon);
+        }
+        marker.bindPopup('sysid ' + v.sysid + '<br>' + v.mode + '<br>Alt: ' + (v.alt || 0).toFixed(1) + 'm');
+      });
+      Object.keys(otherVehicleMarkers).forEach(function(sysid) {
+        if (!seen[sysid]) {
+          map.removeLayer(otherVehicleMarkers[sysid]);
+          delete otherVehicleMarkers[sysid];
+        }
+      });
       // Home
       if (data.home) {
         if (!homeMarker) {
@@ -201,6 +228,7 @@ class MapPanel(QWidget):
         self.last_center = [41.0082, 28.9784]
         self.last_zoom = 10
         self.temp_infinity_points = []  # Geçici sonsuzluk noktaları
+        self.other_vehicles = []  # Aktif olmayan araçlar: sysid, lat, lon, heading, mode, alt
         self.is_replaying = False  # Flag to track if we're in replay mode
         self.initUI()
         self.map_update_timer = QTimer(self)
@@ -238,6 +266,9 @@ class MapPanel(QWidget):
     def set_home_position(self, lat, lon):
         print(f"[MapPanel] set_home_position called: lat={lat}, lon={lon}")
         self.home_position = [lat, lon]
+    def set_other_vehicles(self, vehicles):
+        """Aktif araç dışındaki araçları haritada göster (boş liste = gizle)"""
+        self.other_vehicles = vehicles
     def add_emergency_marker(self, lat, lon, message):
         self.emergency_markers.append({'lat': lat, 'lon': lon, 'message': message})
 
@@ -256,6 +287,7 @@ class MapPanel(QWidget):
             'home': self.home_position,
             'polygons': [],
             'temp_infinity_points': self.temp_infinity_points,
+            'others': self.other_vehicles,
             'centerOnVehicle': self.is_replaying  # Center on vehicle during replay
         }
         if self.vehicle_position:
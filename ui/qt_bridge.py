@@ -0,0 +1,35 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.event_bus import set_main_executor
+
+
+class QtMainExecutor(QObject):
+    """Olay yolu 'main' abonelerini Qt olay döngüsüne (arayüz thread'i) aktaran ince adaptör.
+
+    Başka thread'den yapılan emit kuyruklu bağlantıyla arayüz thread'inde çalışır;
+    arayüz thread'inden yapılan emit doğrudan çağrılır (Qt AutoConnection).
+    """
+
+    _invoke = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._invoke.connect(self._run)
+
+    def _run(self, fn, args) -> None:
+        fn(*args)
+
+    def __call__(self, fn, args) -> None:
+        self._invoke.emit(fn, args)
+
+
+_executor = None
+
+
+def install_qt_executor(app) -> QtMainExecutor:
+    """QApplication oluşturulduktan sonra arayüz thread'inde bir kez çağrılır"""
+    global _executor
+    if _executor is None:
+        _executor = QtMainExecutor(app)
+        set_main_executor(_executor)
+    return _executor